@@ -0,0 +1,73 @@
+"""add_mail_keyset_pagination_indexes
+
+Revision ID: 5c1e7a9d2b40
+Revises: b93991de1d56
+Create Date: 2025-11-04 10:00:00.000000+09:00
+
+SkyBoot Mail SaaS 마이그레이션 스크립트
+- 다중 조직 지원
+- 데이터 격리 보장
+- 백업 및 복원 지원
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7a9d2b40'
+down_revision = 'b93991de1d56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    마이그레이션 업그레이드 실행
+
+    메일 목록/검색의 커서(키셋) 페이지네이션을 위한 복합 인덱스를 추가합니다.
+    - mails (org_id, created_at, mail_uuid): 받은 메일함/휴지통/검색 정렬
+    - mails (sender_uuid, status, created_at, mail_uuid): 보낸 메일함/임시보관함
+    - mail_in_folders (folder_uuid, mail_uuid), (user_uuid, mail_uuid): 폴더 조인 및 읽음 상태 조회
+    """
+    op.create_index('ix_mails_org_created_uuid', 'mails', ['org_id', 'created_at', 'mail_uuid'], unique=False)
+    op.create_index(
+        'ix_mails_sender_status_created_uuid', 'mails',
+        ['sender_uuid', 'status', 'created_at', 'mail_uuid'], unique=False
+    )
+    op.create_index('ix_mail_in_folders_folder_mail', 'mail_in_folders', ['folder_uuid', 'mail_uuid'], unique=False)
+    op.create_index('ix_mail_in_folders_user_mail', 'mail_in_folders', ['user_uuid', 'mail_uuid'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    마이그레이션 다운그레이드 실행
+
+    커서 페이지네이션용 복합 인덱스를 삭제합니다.
+    """
+    op.drop_index('ix_mail_in_folders_user_mail', table_name='mail_in_folders')
+    op.drop_index('ix_mail_in_folders_folder_mail', table_name='mail_in_folders')
+    op.drop_index('ix_mails_sender_status_created_uuid', table_name='mails')
+    op.drop_index('ix_mails_org_created_uuid', table_name='mails')
+
+
+def validate_saas_constraints() -> None:
+    """
+    SaaS 제약 조건 검증
+
+    마이그레이션 후 다음 사항을 확인합니다:
+    - 조직별 데이터 격리 유지
+    - 외래 키 제약 조건 유효성
+    - 인덱스 성능 최적화
+    """
+    # 구현 필요시 여기에 검증 로직 추가
+    pass
+
+
+def backup_critical_data() -> None:
+    """
+    중요 데이터 백업
+
+    마이그레이션 전 중요한 데이터를 백업합니다.
+    조직별로 분리된 백업을 생성하여 데이터 격리를 유지합니다.
+    """
+    # 구현 필요시 여기에 백업 로직 추가
+    pass
@@ -0,0 +1,116 @@
+"""add_mail_search_vector_and_trigram_indexes
+
+Revision ID: 8e4b2f6a1c73
+Revises: 5c1e7a9d2b40
+Create Date: 2025-11-05 10:00:00.000000+09:00
+
+SkyBoot Mail SaaS 마이그레이션 스크립트
+- 다중 조직 지원
+- 데이터 격리 보장
+- 백업 및 복원 지원
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2f6a1c73'
+down_revision = '5c1e7a9d2b40'
+branch_labels = None
+depends_on = None
+
+# 부분일치(ILIKE '%term%') 검색에 사용하는 트라이그램 인덱스 (인덱스명, 테이블, 컬럼)
+TRIGRAM_INDEXES = [
+    ('ix_mails_subject_trgm', 'mails', 'subject'),
+    ('ix_mails_body_text_trgm', 'mails', 'body_text'),
+    ('ix_mail_users_email_trgm', 'mail_users', 'email'),
+    ('ix_mail_recipients_recipient_email_trgm', 'mail_recipients', 'recipient_email'),
+]
+
+
+def upgrade() -> None:
+    """
+    마이그레이션 업그레이드 실행
+
+    메일 검색이 매 요청마다 to_tsvector를 계산하며 순차 스캔하지 않도록 합니다.
+    - mails.search_vector (tsvector) 컬럼 추가 및 기존 데이터 백필
+    - subject/body_text 변경 시 search_vector를 갱신하는 트리거
+    - search_vector GIN 인덱스
+    - pg_trgm 확장 및 제목/본문/이메일 트라이그램 GIN 인덱스
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('mails', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True, comment='전문 검색 벡터 (트리거 유지)'))
+
+    # 제목은 가중치 A, 본문은 가중치 B
+    op.execute("""
+        CREATE OR REPLACE FUNCTION mails_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', coalesce(NEW.subject, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(NEW.body_text, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER mails_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF subject, body_text ON mails
+        FOR EACH ROW EXECUTE FUNCTION mails_search_vector_update()
+    """)
+
+    # 기존 메일 백필
+    op.execute("""
+        UPDATE mails SET search_vector =
+            setweight(to_tsvector('simple', coalesce(subject, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(body_text, '')), 'B')
+    """)
+
+    op.create_index('ix_mails_search_vector', 'mails', ['search_vector'], unique=False, postgresql_using='gin')
+
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name, table_name, [column_name], unique=False,
+            postgresql_using='gin', postgresql_ops={column_name: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    """
+    마이그레이션 다운그레이드 실행
+
+    검색 인덱스, 트리거, search_vector 컬럼을 삭제합니다.
+    pg_trgm 확장은 다른 객체가 사용할 수 있으므로 유지합니다.
+    """
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
+
+    op.drop_index('ix_mails_search_vector', table_name='mails')
+    op.execute("DROP TRIGGER IF EXISTS mails_search_vector_trigger ON mails")
+    op.execute("DROP FUNCTION IF EXISTS mails_search_vector_update()")
+    op.drop_column('mails', 'search_vector')
+
+
+def validate_saas_constraints() -> None:
+    """
+    SaaS 제약 조건 검증
+
+    마이그레이션 후 다음 사항을 확인합니다:
+    - 조직별 데이터 격리 유지
+    - 외래 키 제약 조건 유효성
+    - 인덱스 성능 최적화
+    """
+    # 구현 필요시 여기에 검증 로직 추가
+    pass
+
+
+def backup_critical_data() -> None:
+    """
+    중요 데이터 백업
+
+    마이그레이션 전 중요한 데이터를 백업합니다.
+    조직별로 분리된 백업을 생성하여 데이터 격리를 유지합니다.
+    """
+    # 구현 필요시 여기에 백업 로직 추가
+    pass
@@ -0,0 +1,66 @@
+"""add_mail_attachment_content_sha256
+
+Revision ID: 4a7d1c9e2f58
+Revises: 8e4b2f6a1c73
+Create Date: 2025-11-06 10:00:00.000000+09:00
+
+SkyBoot Mail SaaS 마이그레이션 스크립트
+- 다중 조직 지원
+- 데이터 격리 보장
+- 백업 및 복원 지원
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a7d1c9e2f58'
+down_revision = '8e4b2f6a1c73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    마이그레이션 업그레이드 실행
+
+    업로드 시 스트리밍으로 계산한 첨부파일 내용 해시를 저장합니다.
+    - mail_attachments.content_sha256 컬럼 (기존 행은 NULL)
+    - 같은 내용의 첨부파일 조회용 인덱스
+    """
+    op.add_column('mail_attachments', sa.Column('content_sha256', sa.String(length=64), nullable=True, comment='파일 내용 SHA-256 (hex)'))
+    op.create_index('ix_mail_attachments_content_sha256', 'mail_attachments', ['content_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    마이그레이션 다운그레이드 실행
+
+    content_sha256 인덱스와 컬럼을 삭제합니다.
+    """
+    op.drop_index('ix_mail_attachments_content_sha256', table_name='mail_attachments')
+    op.drop_column('mail_attachments', 'content_sha256')
+
+
+def validate_saas_constraints() -> None:
+    """
+    SaaS 제약 조건 검증
+
+    마이그레이션 후 다음 사항을 확인합니다:
+    - 조직별 데이터 격리 유지
+    - 외래 키 제약 조건 유효성
+    - 인덱스 성능 최적화
+    """
+    # 구현 필요시 여기에 검증 로직 추가
+    pass
+
+
+def backup_critical_data() -> None:
+    """
+    중요 데이터 백업
+
+    마이그레이션 전 중요한 데이터를 백업합니다.
+    조직별로 분리된 백업을 생성하여 데이터 격리를 유지합니다.
+    """
+    # 구현 필요시 여기에 백업 로직 추가
+    pass
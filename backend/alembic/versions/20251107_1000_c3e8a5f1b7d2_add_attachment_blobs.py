@@ -0,0 +1,83 @@
+"""add_attachment_blobs
+
+Revision ID: c3e8a5f1b7d2
+Revises: 4a7d1c9e2f58
+Create Date: 2025-11-07 10:00:00.000000+09:00
+
+SkyBoot Mail SaaS 마이그레이션 스크립트
+- 다중 조직 지원
+- 데이터 격리 보장
+- 백업 및 복원 지원
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a5f1b7d2'
+down_revision = '4a7d1c9e2f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    마이그레이션 업그레이드 실행
+
+    조직별 내용 주소(SHA-256) 첨부파일 저장소 테이블을 생성합니다.
+    - (org_id, sha256) 유니크 제약으로 같은 내용은 조직당 한 번만 저장
+    - ref_count 로 참조 중인 mail_attachments 행 수를 관리
+
+    기존 첨부파일 파일 이전은 migrate_attachment_blobs.py 로 실행합니다.
+    """
+    op.create_table(
+        'attachment_blobs',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('org_id', sa.String(length=36), nullable=False, comment='조직 ID'),
+        sa.Column('sha256', sa.String(length=64), nullable=False, comment='파일 내용 SHA-256 (hex)'),
+        sa.Column('file_path', sa.String(length=500), nullable=False, comment='blob 파일 경로'),
+        sa.Column('file_size', sa.BigInteger(), nullable=False, comment='파일 크기 (bytes)'),
+        sa.Column('ref_count', sa.Integer(), nullable=False, comment='참조 중인 첨부파일 수'),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True, comment='생성 시간'),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.org_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('org_id', 'sha256', name='uq_attachment_blobs_org_sha256')
+    )
+    op.create_index('ix_attachment_blobs_id', 'attachment_blobs', ['id'], unique=False)
+    op.create_index('ix_attachment_blobs_org_id', 'attachment_blobs', ['org_id'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    마이그레이션 다운그레이드 실행
+
+    attachment_blobs 테이블을 삭제합니다.
+    (blob 경로를 가리키는 mail_attachments.file_path 는 그대로 유지되어 다운로드는 계속 동작)
+    """
+    op.drop_index('ix_attachment_blobs_org_id', table_name='attachment_blobs')
+    op.drop_index('ix_attachment_blobs_id', table_name='attachment_blobs')
+    op.drop_table('attachment_blobs')
+
+
+def validate_saas_constraints() -> None:
+    """
+    SaaS 제약 조건 검증
+
+    마이그레이션 후 다음 사항을 확인합니다:
+    - 조직별 데이터 격리 유지
+    - 외래 키 제약 조건 유효성
+    - 인덱스 성능 최적화
+    """
+    # 구현 필요시 여기에 검증 로직 추가
+    pass
+
+
+def backup_critical_data() -> None:
+    """
+    중요 데이터 백업
+
+    마이그레이션 전 중요한 데이터를 백업합니다.
+    조직별로 분리된 백업을 생성하여 데이터 격리를 유지합니다.
+    """
+    # 구현 필요시 여기에 백업 로직 추가
+    pass
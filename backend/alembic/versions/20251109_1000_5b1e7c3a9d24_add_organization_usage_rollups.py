@@ -0,0 +1,113 @@
+"""add_organization_usage_rollups
+
+Revision ID: 5b1e7c3a9d24
+Revises: 9f2d6b4e8a15
+Create Date: 2025-11-09 10:00:00.000000+09:00
+
+SkyBoot Mail SaaS 마이그레이션 스크립트
+- 다중 조직 지원
+- 데이터 격리 보장
+- 백업 및 복원 지원
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e7c3a9d24'
+down_revision = '9f2d6b4e8a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    마이그레이션 업그레이드 실행
+
+    조직 주간/월간 사용량 집계 테이블을 생성하고 기존 organization_usage 로 채웁니다.
+    - 일일 사용량 리셋 작업이 매일 어제가 속한 기간과 직전 기간을 다시 집계 (rolled_through 까지)
+    - 조직 삭제 시 집계 행도 함께 삭제 (ON DELETE CASCADE)
+    """
+    op.create_table(
+        'organization_usage_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('org_id', sa.String(length=36), nullable=False, comment='조직 ID'),
+        sa.Column('period_type', sa.String(length=10), nullable=False, comment='집계 단위 (week, month)'),
+        sa.Column('period_start', sa.Date(), nullable=False, comment='기간 시작일 (주: 월요일, 월: 1일)'),
+        sa.Column('period_end', sa.Date(), nullable=False, comment='기간 종료일'),
+        sa.Column('emails_sent', sa.Integer(), nullable=False, server_default='0', comment='기간 내 발송 메일 수'),
+        sa.Column('emails_received', sa.Integer(), nullable=False, server_default='0', comment='기간 내 수신 메일 수'),
+        sa.Column('user_days', sa.Integer(), nullable=False, server_default='0', comment='일별 사용자 수 합계 (평균 계산용)'),
+        sa.Column('days_counted', sa.Integer(), nullable=False, server_default='0', comment='집계된 일 수'),
+        sa.Column('peak_storage_gb', sa.Integer(), nullable=False, server_default='0', comment='기간 내 최대 저장 용량(GB)'),
+        sa.Column('rolled_through', sa.Date(), nullable=False, comment='집계에 반영된 마지막 날짜'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='생성 시간'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True, comment='수정 시간'),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.org_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('org_id', 'period_type', 'period_start', name='unique_org_usage_rollup_period')
+    )
+    op.create_index(op.f('ix_organization_usage_rollups_id'), 'organization_usage_rollups', ['id'], unique=False)
+    op.create_index('ix_organization_usage_rollups_period', 'organization_usage_rollups',
+                    ['period_type', 'period_start'], unique=False)
+
+    # 어제까지의 기존 일일 사용량으로 집계 채우기 (오늘은 다음 리셋 작업에서 반영)
+    for period_type, unit, length in (('week', 'week', "interval '6 days'"),
+                                      ('month', 'month', "interval '1 month' - interval '1 day'")):
+        op.execute(f"""
+            INSERT INTO organization_usage_rollups (
+                org_id, period_type, period_start, period_end,
+                emails_sent, emails_received, user_days, days_counted,
+                peak_storage_gb, rolled_through, created_at, updated_at
+            )
+            SELECT org_id, '{period_type}', period_start, (period_start + {length})::date,
+                   SUM(COALESCE(emails_sent_today, 0)),
+                   SUM(COALESCE(emails_received_today, 0)),
+                   SUM(COALESCE(current_users, 0)),
+                   COUNT(*),
+                   MAX(COALESCE(current_storage_gb, 0)),
+                   MAX(usage_day),
+                   now(), now()
+            FROM (
+                SELECT *, DATE(usage_date) AS usage_day,
+                       date_trunc('{unit}', DATE(usage_date))::date AS period_start
+                FROM organization_usage
+                WHERE DATE(usage_date) < CURRENT_DATE
+            ) u
+            GROUP BY org_id, period_start
+        """)
+
+
+def downgrade() -> None:
+    """
+    마이그레이션 다운그레이드 실행
+
+    organization_usage_rollups 테이블을 삭제합니다.
+    """
+    op.drop_index('ix_organization_usage_rollups_period', table_name='organization_usage_rollups')
+    op.drop_index(op.f('ix_organization_usage_rollups_id'), table_name='organization_usage_rollups')
+    op.drop_table('organization_usage_rollups')
+
+
+def validate_saas_constraints() -> None:
+    """
+    SaaS 제약 조건 검증
+
+    마이그레이션 후 다음 사항을 확인합니다:
+    - 조직별 데이터 격리 유지
+    - 외래 키 제약 조건 유효성
+    - 인덱스 성능 최적화
+    """
+    # 구현 필요시 여기에 검증 로직 추가
+    pass
+
+
+def backup_critical_data() -> None:
+    """
+    중요 데이터 백업
+
+    마이그레이션 전 중요한 데이터를 백업합니다.
+    조직별로 분리된 백업을 생성하여 데이터 격리를 유지합니다.
+    """
+    # 구현 필요시 여기에 백업 로직 추가
+    pass
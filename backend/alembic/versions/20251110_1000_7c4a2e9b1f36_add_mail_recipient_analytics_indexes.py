@@ -0,0 +1,65 @@
+"""add_mail_recipient_analytics_indexes
+
+Revision ID: 7c4a2e9b1f36
+Revises: 5b1e7c3a9d24
+Create Date: 2025-11-10 10:00:00.000000+09:00
+
+SkyBoot Mail SaaS 마이그레이션 스크립트
+- 다중 조직 지원
+- 데이터 격리 보장
+- 백업 및 복원 지원
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4a2e9b1f36'
+down_revision = '5b1e7c3a9d24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    마이그레이션 업그레이드 실행
+
+    메일 분석 SQL 집계를 위한 mail_recipients 복합 인덱스를 추가합니다.
+    - (recipient_uuid, mail_uuid): 받은 메일 일별/우선순위/상위 발신자 집계
+    - (mail_uuid, recipient_email): 보낸 메일의 상위 수신자 집계
+    """
+    op.create_index('ix_mail_recipients_recipient_mail', 'mail_recipients', ['recipient_uuid', 'mail_uuid'], unique=False)
+    op.create_index('ix_mail_recipients_mail_email', 'mail_recipients', ['mail_uuid', 'recipient_email'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    마이그레이션 다운그레이드 실행
+
+    메일 분석용 mail_recipients 복합 인덱스를 삭제합니다.
+    """
+    op.drop_index('ix_mail_recipients_mail_email', table_name='mail_recipients')
+    op.drop_index('ix_mail_recipients_recipient_mail', table_name='mail_recipients')
+
+
+def validate_saas_constraints() -> None:
+    """
+    SaaS 제약 조건 검증
+
+    마이그레이션 후 다음 사항을 확인합니다:
+    - 조직별 데이터 격리 유지
+    - 외래 키 제약 조건 유효성
+    - 인덱스 성능 최적화
+    """
+    # 구현 필요시 여기에 검증 로직 추가
+    pass
+
+
+def backup_critical_data() -> None:
+    """
+    중요 데이터 백업
+
+    마이그레이션 전 중요한 데이터를 백업합니다.
+    조직별로 분리된 백업을 생성하여 데이터 격리를 유지합니다.
+    """
+    # 구현 필요시 여기에 백업 로직 추가
+    pass
@@ -0,0 +1,129 @@
+"""add_organization_activity_rollups
+
+Revision ID: 3d8f5a2c6e71
+Revises: 7c4a2e9b1f36
+Create Date: 2025-11-11 10:00:00.000000+09:00
+
+SkyBoot Mail SaaS 마이그레이션 스크립트
+- 다중 조직 지원
+- 데이터 격리 보장
+- 백업 및 복원 지원
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d8f5a2c6e71'
+down_revision = '7c4a2e9b1f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    마이그레이션 업그레이드 실행
+
+    조직별 시간별/일별 활동 집계 테이블과 집계 진행 위치 테이블을 생성합니다.
+    - 활동 로그 집계 작업이 mail_logs/login_logs 를 진행 위치(last_id) 이후부터 누적
+    - 기존 로그는 진행 위치가 0 에서 시작하므로 첫 실행부터 배치 단위로 채워짐
+    - 진행 위치 이전의 빈 ID 구간을 기록하여 늦게 커밋된 로그도 다음 실행에서 반영
+    - 최근 활동 조회용 mail_logs (org_id, created_at) 인덱스 추가
+    """
+    op.create_table(
+        'organization_activity_hourly',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('org_id', sa.String(length=36), nullable=False, comment='조직 ID'),
+        sa.Column('hour_start', sa.DateTime(), nullable=False, comment='시간 구간 시작 (UTC)'),
+        sa.Column('source', sa.String(length=10), nullable=False, comment='원본 로그 (mail, login)'),
+        sa.Column('action', sa.String(length=50), nullable=False, comment='작업 (메일 로그 action 소문자, 로그인 상태)'),
+        sa.Column('event_count', sa.Integer(), nullable=False, server_default='0', comment='이벤트 수'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='수정 시간'),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.org_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('org_id', 'hour_start', 'source', 'action', name='unique_org_activity_hour')
+    )
+    op.create_index(op.f('ix_organization_activity_hourly_id'), 'organization_activity_hourly', ['id'], unique=False)
+
+    op.create_table(
+        'organization_activity_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('org_id', sa.String(length=36), nullable=False, comment='조직 ID'),
+        sa.Column('activity_date', sa.Date(), nullable=False, comment='활동 일자 (UTC)'),
+        sa.Column('source', sa.String(length=10), nullable=False, comment='원본 로그 (mail, login, user)'),
+        sa.Column('action', sa.String(length=50), nullable=False, comment='작업 (메일 로그 action 소문자, 로그인 상태, active)'),
+        sa.Column('event_count', sa.Integer(), nullable=False, server_default='0', comment='이벤트 수'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='수정 시간'),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.org_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('org_id', 'activity_date', 'source', 'action', name='unique_org_activity_day')
+    )
+    op.create_index(op.f('ix_organization_activity_daily_id'), 'organization_activity_daily', ['id'], unique=False)
+
+    op.create_table(
+        'organization_active_user_days',
+        sa.Column('org_id', sa.String(length=36), nullable=False, comment='조직 ID'),
+        sa.Column('activity_date', sa.Date(), nullable=False, comment='활동 일자 (UTC)'),
+        sa.Column('user_uuid', sa.String(length=36), nullable=False, comment='사용자 UUID'),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.org_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('org_id', 'activity_date', 'user_uuid')
+    )
+
+    op.create_table(
+        'activity_rollup_checkpoints',
+        sa.Column('source', sa.String(length=10), nullable=False, comment='원본 로그 (mail, login)'),
+        sa.Column('last_id', sa.BigInteger(), nullable=False, server_default='0', comment='집계에 반영된 마지막 로그 ID'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True, comment='수정 시간'),
+        sa.PrimaryKeyConstraint('source')
+    )
+
+    op.create_table(
+        'activity_rollup_gaps',
+        sa.Column('source', sa.String(length=10), nullable=False, comment='원본 로그 (mail, login)'),
+        sa.Column('start_id', sa.BigInteger(), nullable=False, comment='비어 있는 구간 시작 ID'),
+        sa.Column('end_id', sa.BigInteger(), nullable=False, comment='비어 있는 구간 끝 ID (포함)'),
+        sa.Column('detected_at', sa.DateTime(timezone=True), nullable=False, comment='구간을 발견한 시각'),
+        sa.PrimaryKeyConstraint('source', 'start_id')
+    )
+
+    op.create_index('ix_mail_logs_org_created', 'mail_logs', ['org_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    마이그레이션 다운그레이드 실행
+
+    활동 집계 테이블과 mail_logs 인덱스를 삭제합니다.
+    """
+    op.drop_index('ix_mail_logs_org_created', table_name='mail_logs')
+    op.drop_table('activity_rollup_gaps')
+    op.drop_table('activity_rollup_checkpoints')
+    op.drop_table('organization_active_user_days')
+    op.drop_index(op.f('ix_organization_activity_daily_id'), table_name='organization_activity_daily')
+    op.drop_table('organization_activity_daily')
+    op.drop_index(op.f('ix_organization_activity_hourly_id'), table_name='organization_activity_hourly')
+    op.drop_table('organization_activity_hourly')
+
+
+def validate_saas_constraints() -> None:
+    """
+    SaaS 제약 조건 검증
+
+    마이그레이션 후 다음 사항을 확인합니다:
+    - 조직별 데이터 격리 유지
+    - 외래 키 제약 조건 유효성
+    - 인덱스 성능 최적화
+    """
+    # 구현 필요시 여기에 검증 로직 추가
+    pass
+
+
+def backup_critical_data() -> None:
+    """
+    중요 데이터 백업
+
+    마이그레이션 전 중요한 데이터를 백업합니다.
+    조직별로 분리된 백업을 생성하여 데이터 격리를 유지합니다.
+    """
+    # 구현 필요시 여기에 백업 로직 추가
+    pass
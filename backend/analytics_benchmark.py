@@ -0,0 +1,209 @@
+"""
+메일 분석 성능 비교 스크립트
+
+기존 get_mail_analytics 방식(기간 내 메일 전체를 ORM 으로 읽고 메일마다 발신자/수신자 조회)과
+SQL 집계(MailAnalyticsService) 방식의 지연 시간을 비교합니다.
+SQL 집계는 캐시 없이(첫 요청)와 지난 날짜 구간 캐시 적중(이후 요청)을 나누어 측정합니다.
+
+사용 예:
+    python analytics_benchmark.py --mails 1000000 --period year
+    python analytics_benchmark.py --skip-seed --skip-legacy --iterations 20
+
+주의: PostgreSQL 전용이며, 벤치마크 전용 조직(bench_analytics_org)에 데이터를 생성합니다.
+기존 방식은 메일 수만큼 쿼리를 실행하므로 100만 건에서는 매우 오래 걸립니다. (--legacy-iterations 로 조절)
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import and_, text
+
+from app.database.user import SessionLocal, engine
+from app.model.mail_model import Mail, MailRecipient, MailUser
+from app.service.mail_analytics_service import PERIOD_DAYS, MailAnalyticsService, analytics_cache
+
+BENCH_ORG_ID = "bench_analytics_org"
+BENCH_USER_UUID = "bench-analytics-user-000-000000000000"
+SENDER_COUNT = 50
+
+
+def legacy_analytics(db, user_uuid: str, period: str) -> dict:
+    """기존 get_mail_analytics 의 집계 방식 (비교용)"""
+    now = datetime.utcnow()
+    start_date = now - timedelta(days=PERIOD_DAYS.get(period, 30))
+    sent_mails = db.query(Mail).filter(and_(
+        Mail.sender_uuid == user_uuid, Mail.org_id == BENCH_ORG_ID,
+        Mail.created_at >= start_date, Mail.status == 'sent'
+    )).all()
+    received_mails = db.query(Mail).join(MailRecipient, Mail.mail_uuid == MailRecipient.mail_uuid).filter(and_(
+        MailRecipient.recipient_uuid == user_uuid, Mail.org_id == BENCH_ORG_ID, Mail.created_at >= start_date
+    )).all()
+    daily_stats = {}
+    for mail in sent_mails + received_mails:
+        date_str = mail.created_at.strftime('%Y-%m-%d')
+        daily_stats[date_str] = daily_stats.get(date_str, 0) + 1
+    sender_stats, recipient_stats = {}, {}
+    for mail in received_mails:
+        sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
+        if sender:
+            sender_stats[sender.email] = sender_stats.get(sender.email, 0) + 1
+    for mail in sent_mails:
+        for recipient in db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all():
+            recipient_stats[recipient.recipient_email] = recipient_stats.get(recipient.recipient_email, 0) + 1
+    return {"daily": daily_stats, "senders": sender_stats, "recipients": recipient_stats}
+
+
+class AnalyticsBenchmark:
+    """메일 분석 성능 비교 클래스"""
+
+    def __init__(self, period: str):
+        self.period = period
+
+    def seed(self, mail_count: int, batch_size: int = 100000):
+        """보낸 메일/받은 메일을 반씩, 1년에 걸쳐 generate_series로 생성합니다."""
+        print(f"🌱 벤치마크 데이터 생성 시작 ({mail_count:,}건)")
+        with engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO organizations (org_id, org_code, name, subdomain, admin_email, is_active)
+                VALUES (:org_id, :org_id, 'Analytics Benchmark', :org_id, 'bench@skyboot.mail', true)
+                ON CONFLICT (org_id) DO NOTHING
+            """), {"org_id": BENCH_ORG_ID})
+            conn.execute(text("""
+                INSERT INTO mail_users (user_id, user_uuid, org_id, email, password_hash)
+                SELECT 'bench_analytics_' || g,
+                       CASE WHEN g = 0 THEN :user_uuid ELSE 'bench-analytics-sender-' || g END,
+                       :org_id, 'bench' || g || '@analytics.skyboot.mail', 'x'
+                FROM generate_series(0, :senders) AS g
+                ON CONFLICT (user_id) DO NOTHING
+            """), {"org_id": BENCH_ORG_ID, "user_uuid": BENCH_USER_UUID, "senders": SENDER_COUNT})
+
+        params = {"org_id": BENCH_ORG_ID, "user_uuid": BENCH_USER_UUID, "senders": SENDER_COUNT}
+        for start in range(0, mail_count, batch_size):
+            end = min(start + batch_size, mail_count)
+            started = time.time()
+            with engine.begin() as conn:
+                # 짝수: 벤치마크 사용자가 보낸 메일, 홀수: 다른 사용자가 벤치마크 사용자에게 보낸 메일
+                conn.execute(text("""
+                    INSERT INTO mails (mail_uuid, org_id, sender_uuid, subject, status, priority, created_at)
+                    SELECT 'bench_analytics_' || g, :org_id,
+                           CASE WHEN g % 2 = 0 THEN :user_uuid ELSE 'bench-analytics-sender-' || (1 + g % :senders) END,
+                           '분석 메일 ' || g, 'sent',
+                           (ARRAY['high','normal','normal','low'])[1 + g % 4],
+                           now() - ((g % 365) || ' days')::interval - ((g % 86400) || ' seconds')::interval
+                    FROM generate_series(:start, :end - 1) AS g
+                    ON CONFLICT (mail_uuid) DO NOTHING
+                """), {**params, "start": start, "end": end})
+                conn.execute(text("""
+                    INSERT INTO mail_recipients (mail_uuid, recipient_uuid, recipient_email, recipient_type)
+                    SELECT 'bench_analytics_' || g,
+                           CASE WHEN g % 2 = 0 THEN NULL ELSE :user_uuid END,
+                           CASE WHEN g % 2 = 0 THEN 'partner' || (g % 200) || '@example.com'
+                                ELSE 'bench0@analytics.skyboot.mail' END,
+                           'to'
+                    FROM generate_series(:start, :end - 1) AS g
+                """), {**params, "start": start, "end": end})
+            print(f"   진행률: {end:,}/{mail_count:,} ({time.time() - started:.1f}초)")
+
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE mails"))
+            conn.execute(text("ANALYZE mail_recipients"))
+
+    def measure(self, name: str, run: Callable[[], object], iterations: int) -> List[float]:
+        """run 을 iterations 회 실행하여 지연 시간(초) 목록을 반환합니다."""
+        print(f"⏱️ {name} 측정 ({iterations}회)")
+        durations = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            run()
+            durations.append(time.perf_counter() - started)
+        return durations
+
+    def analyze_performance(self, method_name: str, durations: List[float]):
+        """성능 분석"""
+        if not durations:
+            print(f"❌ {method_name}: 측정 데이터 없음")
+            return
+        ordered = sorted(durations)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"\n📊 {method_name} 성능 분석:")
+        print(f"   총 실행 횟수: {len(durations)}")
+        print(f"   평균 시간: {statistics.mean(durations) * 1000:.2f}ms")
+        print(f"   중간값: {statistics.median(durations) * 1000:.2f}ms")
+        print(f"   p95: {p95 * 1000:.2f}ms")
+        print(f"   최대 시간: {max(durations) * 1000:.2f}ms")
+
+    def cleanup(self):
+        """벤치마크 데이터를 삭제합니다."""
+        with engine.begin() as conn:
+            conn.execute(text("""
+                DELETE FROM mail_recipients WHERE mail_uuid IN (SELECT mail_uuid FROM mails WHERE org_id = :org_id)
+            """), {"org_id": BENCH_ORG_ID})
+            conn.execute(text("DELETE FROM mails WHERE org_id = :org_id"), {"org_id": BENCH_ORG_ID})
+            conn.execute(text("DELETE FROM mail_users WHERE org_id = :org_id"), {"org_id": BENCH_ORG_ID})
+            conn.execute(text("DELETE FROM organizations WHERE org_id = :org_id"), {"org_id": BENCH_ORG_ID})
+        print("🧹 벤치마크 데이터 삭제 완료")
+
+    def run(self, iterations: int, legacy_iterations: int):
+        """전체 비교 실행"""
+        db = SessionLocal()
+        try:
+            service = MailAnalyticsService(db)
+
+            def sql_uncached():
+                analytics_cache.clear()
+                service.get_analytics(BENCH_ORG_ID, BENCH_USER_UUID, self.period)
+
+            def sql_cached():
+                service.get_analytics(BENCH_ORG_ID, BENCH_USER_UUID, self.period)
+
+            def legacy():
+                legacy_analytics(db, BENCH_USER_UUID, self.period)
+                db.expunge_all()
+
+            uncached = self.measure("SQL 집계 (캐시 없음)", sql_uncached, iterations)
+            cached = self.measure("SQL 집계 (지난 구간 캐시 적중)", sql_cached, iterations)
+            legacy_durations = self.measure("기존 방식 (ORM 전체 로드 + 메일별 조회)", legacy, legacy_iterations)
+        finally:
+            db.close()
+
+        self.analyze_performance("SQL 집계 (캐시 없음)", uncached)
+        self.analyze_performance("SQL 집계 (캐시 적중)", cached)
+        self.analyze_performance("기존 방식", legacy_durations)
+
+        if legacy_durations and uncached:
+            speedup = statistics.median(legacy_durations) / max(statistics.median(uncached), 1e-9)
+            print(f"\n🔍 중간값 기준 SQL 집계가 {speedup:.1f}배 빠름")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="메일 분석 성능 비교")
+    parser.add_argument("--mails", type=int, default=1000000, help="생성할 메일 수")
+    parser.add_argument("--period", default="year", choices=sorted(PERIOD_DAYS), help="분석 기간")
+    parser.add_argument("--iterations", type=int, default=10, help="SQL 집계 측정 반복 횟수")
+    parser.add_argument("--legacy-iterations", type=int, default=1, help="기존 방식 측정 반복 횟수")
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 방식 측정 생략")
+    parser.add_argument("--skip-seed", action="store_true", help="데이터 생성 생략")
+    parser.add_argument("--cleanup", action="store_true", help="종료 후 벤치마크 데이터 삭제")
+    args = parser.parse_args()
+
+    benchmark = AnalyticsBenchmark(args.period)
+    try:
+        if not args.skip_seed:
+            benchmark.seed(args.mails)
+        benchmark.run(args.iterations, 0 if args.skip_legacy else args.legacy_iterations)
+    finally:
+        if args.cleanup:
+            benchmark.cleanup()
+
+
+if __name__ == "__main__":
+    main()
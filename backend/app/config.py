@@ -32,6 +32,11 @@ class SaaSSettings(BaseSettings):
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 30
     DB_POOL_TIMEOUT: int = 30
+    # 비동기 엔진(asyncpg) 연결 풀 - 비동기 핸들러 전용 (동기 엔진과 별도)
+    ASYNC_DB_POOL_SIZE: int = 20
+    ASYNC_DB_MAX_OVERFLOW: int = 30
+    ASYNC_DB_POOL_TIMEOUT: int = 30
+    ASYNC_DB_POOL_RECYCLE_SECONDS: int = 3600
     
     # Redis 설정 (캐싱 및 세션 관리)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -68,6 +73,27 @@ class SaaSSettings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     SMTP_FROM_EMAIL: str = "noreply@skyboot.mail"
     SMTP_FROM_NAME: str = "SkyBoot Mail SaaS"
+    SMTP_USE_TLS: bool = False
+    SMTP_TIMEOUT_SECONDS: int = 30
+    
+    # SMTP 연결 풀 설정 (릴레이별)
+    SMTP_POOL_MAX_CONNECTIONS: int = 5
+    SMTP_POOL_IDLE_TIMEOUT_SECONDS: int = 60
+    SMTP_POOL_MAX_MESSAGES_PER_CONNECTION: int = 100
+    
+    # 외부 발송 메일 큐 설정
+    # MAIL_QUEUE_BACKEND: redis | memory (미설정 시 테스트 환경은 memory, 그 외 redis)
+    MAIL_QUEUE_BACKEND: Optional[str] = None
+    MAIL_QUEUE_MAX_ATTEMPTS: int = 5
+    MAIL_QUEUE_RETRY_BASE_SECONDS: int = 30
+    MAIL_QUEUE_RETRY_MAX_SECONDS: int = 3600
+    MAIL_QUEUE_HEARTBEAT_TTL_SECONDS: int = 30
+    MAIL_QUEUE_SENDING_LEASE_SECONDS: int = 600  # sending 상태로 남은 메일(중단된 워커)을 다시 발송하기까지의 시간
+    MAIL_QUEUE_MARK_SENT_ATTEMPTS: int = 3  # SMTP 수락 후 sent 상태 기록 재시도 횟수 (발송은 다시 하지 않음)
+    MAIL_QUEUE_POLL_SECONDS: float = 1.0
+    MAIL_QUEUE_WORKER_CONCURRENCY: int = 4
+    # API 프로세스 안에서 실행할 워커 수 (memory 백엔드는 최소 1개 자동 실행)
+    MAIL_QUEUE_INPROCESS_WORKERS: int = 0
     
     # 메일 할당량 설정
     DEFAULT_MAIL_QUOTA_MB: int = int(os.getenv("DEFAULT_MAIL_QUOTA_MB", "1000"))  # 기본 1GB
@@ -86,6 +112,10 @@ class SaaSSettings(BaseSettings):
         "txt", "rtf", "csv", "zip", "rar", "7z",
         "jpg", "jpeg", "png", "gif", "bmp", "svg"
     ]
+    ATTACHMENT_UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 첨부파일 업로드 스트리밍 단위 (bytes)
+    ATTACHMENT_BLOB_DIR: str = "attachments/blobs"  # 내용(SHA-256) 기준 첨부파일 저장소 (조직별 중복 제거)
+    MAIL_RAW_MESSAGE_DIR: str = "attachments/raw"  # 발송 메일 원문(RFC 5322) 저장소 - 재시도/재발송/백업에서 재사용
+    MAIL_RAW_SPOOL_MAX_BYTES: int = 1024 * 1024  # 저장하지 않는 메시지를 메모리에 둘 최대 크기 (초과 시 임시 파일)
     
     # 보안 설정
     CORS_ORIGINS: List[str] = [
@@ -98,11 +128,31 @@ class SaaSSettings(BaseSettings):
     # 로깅 설정
     LOG_LEVEL: str = "INFO"
     LOG_DIR: str = "./logs"
-    LOG_ROTATION_SIZE: str = "10MB"
+    LOG_ROTATION_SIZE: str = "10MB"  # 로그 파일 크기 기준 로테이션 (예: 500KB, 10MB, 1GB)
     LOG_RETENTION_DAYS: int = 30
+    LOG_BACKUP_COUNT: int = 10  # 보관할 로테이션 파일 수
+    LOG_FORMAT: str = "json"  # json (structlog JSON) 또는 text
+    LOG_LEVELS: Dict[str, str] = {}  # 로거별 레벨 (예: {"app.middleware.tenant_middleware": "WARNING"})
+    LOG_SAMPLE_MAX_PER_WINDOW: int = 50  # 호출 위치별 구간당 최대 INFO 이하 로그 수 (0 이면 샘플링 안 함)
+    LOG_SAMPLE_WINDOW_SECONDS: float = 1.0
     
     # 성능 및 제한 설정
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_REDIS_TIMEOUT_SECONDS: float = 0.1
+    RATE_LIMIT_REDIS_RETRY_SECONDS: float = 5.0
+    RATE_LIMIT_FALLBACK_MAX_KEYS: int = 10000
+    
+    # 로컬 캐시 설정 (워커 간 무효화는 Redis pub/sub)
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    TENANT_CACHE_MAX_SIZE: int = 10000
+    TENANT_CACHE_TTL_SECONDS: int = 300
+    # 인증 주체 캐시 (짧은 TTL: 다른 워커로의 무효화 전파가 실패해도 빠르게 갱신)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    # 메일 분석 지난 날짜 구간 집계 캐시 (오늘 구간은 매번 집계)
+    MAIL_ANALYTICS_CACHE_MAX_SIZE: int = 10000
+    MAIL_ANALYTICS_CACHE_TTL_SECONDS: int = 3600
+    MAIL_ANALYTICS_TOP_CANDIDATES: int = 50  # 구간별로 조회하는 상위 발신자/수신자 후보 수
     MAX_CONCURRENT_REQUESTS: int = 100
     REQUEST_TIMEOUT_SECONDS: int = 30
     
@@ -117,6 +167,44 @@ class SaaSSettings(BaseSettings):
     BACKUP_RETENTION_DAYS: int = 90
     AUTO_BACKUP_ENABLED: bool = True
     BACKUP_SCHEDULE_CRON: str = "0 2 * * *"  # 매일 새벽 2시
+    MAIL_BACKUP_BATCH_SIZE: int = 500  # 메일 백업 내보내기 배치 크기 (서버 측 커서)
+    MAIL_BACKUP_STALL_TIMEOUT_SECONDS: int = 300  # 진행 상태 갱신이 없으면 생성 중 다운로드 종료
+    MAIL_BACKUP_STATUS_EVERY_FILES: int = 50  # 첨부파일/원문 추가 중 진행 상태 갱신 간격 (파일 수)
+    MAIL_BACKUP_STATUS_EVERY_MB: int = 64  # 첨부파일/원문 추가 중 진행 상태 갱신 간격 (MB)
+    
+    # 폴더 카운터 설정 (folder_counters)
+    FOLDER_COUNTER_RECONCILE_CRON: str = "30 3 * * *"  # 실제 mail_in_folders 기준 카운터 보정 주기 (매일 새벽 3시 30분)
+    FOLDER_COUNTER_RECONCILE_BATCH_SIZE: int = 500  # 보정 시 한 트랜잭션에서 처리할 폴더 수
+    
+    # 조직 사용량 카운터 설정 (Redis 카운터 + organization_usage 일괄 기록)
+    USAGE_COUNTER_REDIS_TIMEOUT_SECONDS: float = 0.1
+    USAGE_COUNTER_REDIS_RETRY_SECONDS: float = 5.0  # Redis 장애 후 DB 방식으로 처리하는 시간
+    USAGE_RESERVATION_TTL_SECONDS: int = 3600  # 발송 완료/해제되지 않은 예약이 풀리는 시간
+    USAGE_FLUSH_INTERVAL_SECONDS: int = 10  # organization_usage 기록 주기
+    USAGE_FLUSH_BATCH_SIZE: int = 500  # 한 번에 기록할 카운터 수
+    USAGE_RECONCILE_INTERVAL_SECONDS: int = 300  # 전체 카운터 재기록 주기 (기록 중 종료 대비)
+    
+    # 스케줄러 리더 임대 설정 (워커/노드 중 한 인스턴스만 작업 실행)
+    SCHEDULER_LEASE_SECONDS: int = 30  # 갱신되지 않은 임대가 만료되어 다른 인스턴스가 이어받는 시간
+    SCHEDULER_LEASE_RENEW_SECONDS: int = 10  # 임대 갱신 주기
+    SCHEDULER_HISTORY_SIZE: int = 50  # 작업별 보관 실행 이력 수
+    SCHEDULER_SHUTDOWN_GRACE_SECONDS: float = 10.0  # 종료 시 실행 중인 작업을 기다리는 시간
+    
+    # 활동 로그 집계 설정 (mail_logs/login_logs → 조직별 시간별/일별 집계)
+    ACTIVITY_ROLLUP_INTERVAL_SECONDS: int = 60  # 집계 주기
+    ACTIVITY_ROLLUP_BATCH_SIZE: int = 50000  # 한 트랜잭션에서 반영할 로그 ID 범위
+    ACTIVITY_ROLLUP_SETTLE_SECONDS: int = 10  # 진행 중인 트랜잭션의 로그를 건너뛰지 않도록 최근 로그는 다음 주기에 반영
+    ACTIVITY_ROLLUP_GAP_TIMEOUT_SECONDS: int = 3600  # 빈 로그 ID 구간을 늦은 커밋 대기로 추적하는 시간 (이후 롤백으로 간주)
+    
+    # Prometheus 메트릭 설정 (/metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str = ""  # 여러 워커 프로세스 합산용 디렉터리 (PROMETHEUS_MULTIPROC_DIR 환경 변수가 우선)
+    
+    # 시스템 상태 수집 설정 (워커별 백그라운드 수집, 대시보드/헬스 체크는 최근 샘플 사용)
+    SYSTEM_HEALTH_SAMPLE_INTERVAL_SECONDS: float = 5.0  # 수집 주기
+    SYSTEM_HEALTH_HISTORY_SIZE: int = 720  # 보관 샘플 수 (5초 주기 기준 1시간)
+    SYSTEM_HEALTH_SAMPLE_TIMEOUT_SECONDS: float = 1.0  # Redis/메일 큐 조회 제한 시간
+    SYSTEM_HEALTH_DISK_PATH: str = "/"  # 디스크 사용률 측정 경로
     
     # DevOps 설정
     DEVOPS_ENABLED: bool = True
@@ -130,10 +218,22 @@ class SaaSSettings(BaseSettings):
     VIRUS_SCAN_ENABLED: bool = True
     CLAMAV_HOST: str = os.getenv("CLAMAV_HOST", "localhost")
     CLAMAV_PORT: int = int(os.getenv("CLAMAV_PORT", "3310"))
+    CLAMAV_UNIX_SOCKET: Optional[str] = os.getenv("CLAMAV_UNIX_SOCKET")  # 설정 시 TCP 대신 Unix 소켓 사용
+    CLAMAV_POOL_MAX_CONNECTIONS: int = 4  # clamd 최대 동시 연결 수
+    CLAMAV_POOL_IDLE_TIMEOUT_SECONDS: float = 20.0  # 유휴 연결 유지 시간 (clamd IdleTimeout 기본 30초보다 짧게)
+    CLAMAV_RETRY_SECONDS: float = 30.0  # clamd 연결 실패 후 다시 시도하기까지 휴리스틱 검사만 사용하는 시간
+    CLAMAV_STREAM_MAX_LENGTH_MB: int = 25  # clamd StreamMaxLength 와 같게 (넘는 파일은 clamd 로 보내지 않고 휴리스틱 검사)
     VIRUS_SCAN_FALLBACK_ENABLED: bool = True  # ClamAV 사용 불가 시 휴리스틱 검사 사용
     VIRUS_SCAN_MAX_FILE_SIZE_MB: int = 100  # 바이러스 검사 최대 파일 크기
     VIRUS_QUARANTINE_DIR: str = os.getenv("VIRUS_QUARANTINE_DIR", "./quarantine")
     VIRUS_SCAN_TIMEOUT_SECONDS: int = 30
+    VIRUS_SCAN_ON_UPLOAD: bool = True  # 첨부파일 업로드 중 clamd 로 스트리밍 검사 (clamd 사용 가능 시)
+    VIRUS_SCAN_MAX_WORKERS: int = 4  # 동시에 실행할 파일 검사 수 (스레드 풀 크기)
+    VIRUS_SCAN_CACHE_MAX_SIZE: int = 10000  # 워커별 검사 결과 캐시 최대 항목 수
+    VIRUS_SCAN_CACHE_TTL_SECONDS: int = 3600  # 워커별 검사 결과 캐시 유효 시간
+    VIRUS_SCAN_REDIS_TTL_SECONDS: int = 7 * 24 * 3600  # Redis 검사 결과 캐시 유효 시간
+    VIRUS_SCAN_REDIS_TIMEOUT_SECONDS: float = 0.1
+    VIRUS_SCAN_SIGNATURE_REFRESH_SECONDS: int = 300  # ClamAV 시그니처 버전 재조회 주기
     
     # 모니터링 설정
     METRICS_ENABLED: bool = True
@@ -192,7 +292,9 @@ class SaaSSettings(BaseSettings):
             "user": self.SMTP_USER,
             "password": self.SMTP_PASSWORD,
             "from_email": self.SMTP_FROM_EMAIL,
-            "from_name": self.SMTP_FROM_NAME
+            "from_name": self.SMTP_FROM_NAME,
+            # Gmail SMTP는 기본적으로 TLS 사용
+            "use_tls": host == "smtp.gmail.com" or self.SMTP_USE_TLS
         }
     
     def is_production(self) -> bool:
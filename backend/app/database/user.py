@@ -1,9 +1,12 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from contextlib import contextmanager
 import os
 from ..config import settings
+from ..utils.metrics import TimedAsyncQueuePool, TimedQueuePool
 
 # 데이터베이스 URL 설정
 DATABASE_URL = getattr(settings, 'DATABASE_URL', 
@@ -12,6 +15,7 @@ DATABASE_URL = getattr(settings, 'DATABASE_URL',
 # SQLAlchemy 엔진 생성 (성능 최적화)
 engine = create_engine(
     DATABASE_URL,
+    poolclass=TimedQueuePool,  # 연결 대기 시간 메트릭 기록 (db_pool_checkout_wait_seconds)
     pool_pre_ping=True,  # 연결 상태 확인 활성화
     pool_recycle=3600,   # 1시간마다 연결 재생성
     pool_size=10,        # 연결 풀 크기
@@ -31,6 +35,44 @@ engine = create_engine(
 # 세션 로컬 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def to_async_database_url(url: str) -> str:
+    """
+    동기 드라이버 URL을 비동기 드라이버 URL로 변환합니다.
+
+    postgresql(+psycopg2) -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = to_async_database_url(DATABASE_URL)
+
+# 비동기 엔진 (asyncpg) - async def 핸들러에서 이벤트 루프를 막지 않고 쿼리 실행
+# 연결은 첫 쿼리 시점에 생성되므로 import 시 DB 접속이 필요하지 않음
+_async_engine_options = {"pool_pre_ping": True, "echo": False}
+if make_url(ASYNC_DATABASE_URL).get_backend_name() == "postgresql":
+    _async_engine_options.update(
+        poolclass=TimedAsyncQueuePool,
+        pool_recycle=settings.ASYNC_DB_POOL_RECYCLE_SECONDS,
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+        max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+        pool_timeout=settings.ASYNC_DB_POOL_TIMEOUT,
+        connect_args={
+            "timeout": 5,  # 연결 타임아웃
+            "server_settings": {"client_encoding": "utf8", "timezone": "Asia/Seoul"}  # 동기 엔진과 같은 인코딩/시간대
+        }
+    )
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options)
+
+# 비동기 세션 로컬 생성 (commit 후에도 응답 구성 시 추가 조회가 없도록 expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Base 클래스 생성
 Base = declarative_base()
 
@@ -47,6 +89,16 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    비동기 데이터베이스 세션을 생성하고 반환합니다.
+    
+    Yields:
+        AsyncSession: SQLAlchemy 비동기 데이터베이스 세션
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
 @contextmanager
 def get_db_session():
     """
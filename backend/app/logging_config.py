@@ -1,63 +1,244 @@
+"""
+로깅 설정
+
+요청 처리 스레드는 로그 레코드를 메모리 큐에 넣기만 하고(QueueHandler),
+포맷팅(structlog JSON)과 콘솔/파일 출력은 별도 스레드(QueueListener)에서 수행합니다.
+- 로거별 레벨: LOG_LEVEL(루트) + LOG_LEVELS({"로거 이름": "레벨"})
+- 샘플링: 호출 위치별로 LOG_SAMPLE_WINDOW_SECONDS 동안 LOG_SAMPLE_MAX_PER_WINDOW 개까지만 기록
+  (INFO 이하만 대상, 생략된 수는 다음 구간 첫 로그의 sampled_dropped 로 기록)
+- 파일 로테이션: LOG_ROTATION_SIZE 크기 기준, LOG_BACKUP_COUNT 개 보관
+
+여러 워커 프로세스가 같은 LOG_DIR 을 쓰면 로테이션 시점이 겹칠 수 있으므로
+운영 환경에서는 콘솔(JSON) 출력을 수집하거나 워커별 LOG_DIR 사용을 권장합니다.
+"""
+
+import atexit
+import copy
 import logging
 import logging.handlers
-import os
-from datetime import datetime
+import queue
+import re
+import threading
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+
+from .config import settings
+
+# 현재 실행 중인 큐 리스너 (setup_logging 을 다시 호출하면 교체)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    """'10MB' 같은 크기 문자열을 바이트 수로 변환합니다."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"잘못된 로그 파일 크기: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    호출 위치(파일, 줄 번호)별 로그 샘플링 필터
+
+    같은 위치의 INFO 이하 로그는 구간당 max_per_window 개까지만 통과시키고 나머지는 버립니다.
+    WARNING 이상은 항상 통과합니다.
+    """
+
+    def __init__(self, max_per_window: int, window_seconds: float, max_level: int = logging.INFO):
+        super().__init__()
+        self.max_per_window = max_per_window
+        self.window_seconds = window_seconds
+        self.max_level = max_level
+        self.dropped_total = 0
+        # (파일, 줄 번호) -> [구간 시작 시각, 통과 수, 생략 수]
+        self._windows: Dict[Tuple[str, int], List[float]] = {}
+        self._lock = threading.Lock()
 
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.max_per_window <= 0 or record.levelno > self.max_level:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.window_seconds:
+                self._windows[key] = [record.created, 1, 0]
+                if window is not None and window[2]:
+                    record.sampled_dropped = int(window[2])
+                return True
+            if window[1] < self.max_per_window:
+                window[1] += 1
+                return True
+            window[2] += 1
+            self.dropped_total += 1
+            return False
 
-def setup_logging():
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
     """
-    FastAPI 애플리케이션을 위한 간소화된 로깅 설정을 구성합니다.
-    성능 최적화를 위해 핸들러 수를 최소화했습니다.
+    같은 프로세스의 리스너 스레드로 레코드를 넘기는 QueueHandler
+
+    기본 prepare() 는 호출 스레드에서 전체 포맷팅을 수행하므로, 여기서는 메시지 인자만 합치고
+    (ORM 객체 등 인자를 다른 스레드에서 문자열로 바꾸지 않도록) 예외 포맷팅과 JSON 직렬화는 리스너에 맡깁니다.
     """
-    # 로그 디렉토리 생성 (절대 경로 사용)
-    current_dir = Path(os.getcwd())
-    log_dir = current_dir / "logs"
-    log_dir.mkdir(exist_ok=True)
-    
-    # 로거 설정
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # structlog 로거가 남긴 레코드는 이벤트 딕셔너리를 그대로 넘김
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _build_formatter() -> logging.Formatter:
+    """LOG_FORMAT 에 맞는 포맷터 (json: structlog JSON, text: 기존 텍스트 형식)"""
+    if settings.LOG_FORMAT.lower() == "text":
+        return logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+    return structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.stdlib.ExtraAdder(allow=["sampled_dropped"]),
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(ensure_ascii=False),
+        ],
+    )
+
+
+def _configure_structlog() -> None:
+    """structlog.get_logger() 로 남긴 로그도 같은 표준 logging 파이프라인을 거치도록 설정"""
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def setup_logging(log_dir: Optional[str] = None, console_stream=None):
+    """
+    FastAPI 애플리케이션을 위한 비동기(큐 기반) 로깅 설정을 구성합니다.
+
+    Args:
+        log_dir: 로그 파일 디렉토리 (기본값: settings.LOG_DIR)
+        console_stream: 콘솔 출력 스트림 (기본값: sys.stderr)
+
+    Returns:
+        logging.Logger: 루트 로거
+    """
+    global _listener
+
+    # 로그 디렉토리 생성
+    log_path = Path(log_dir or settings.LOG_DIR)
+    log_path.mkdir(parents=True, exist_ok=True)
+    log_file = log_path / "app.log"
+
+    # 이전 리스너가 있으면 남은 레코드를 모두 기록한 뒤 교체
+    shutdown_logging()
+
+    # 루트/로거별 레벨 (레벨 미달 로그는 레코드를 만들기 전에 걸러짐)
     logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
-    
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
     # 기존 핸들러 제거 (중복 방지)
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
-    
-    # 포맷터 설정
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # 콘솔 핸들러
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+        if not isinstance(handler, logging.handlers.QueueHandler):
+            handler.close()
+
+    formatter = _build_formatter()
+
+    # 실제 출력 핸들러 (리스너 스레드에서 실행)
+    console_handler = logging.StreamHandler(console_stream)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # 파일 핸들러 추가 (일별 로테이션)
-    today = datetime.now().strftime('%Y-%m-%d')
-    log_file = log_dir / f"app.log.{today}"
-    
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=parse_size(settings.LOG_ROTATION_SIZE),
+        backupCount=settings.LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+
+    # 요청 처리 스레드에는 큐 핸들러만 등록
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(
+        settings.LOG_SAMPLE_MAX_PER_WINDOW, settings.LOG_SAMPLE_WINDOW_SECONDS
+    ))
+    logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    _configure_structlog()
+
     # 로그 초기화 메시지
     logger.info("📝 로깅 시스템이 초기화되었습니다.")
     logger.info(f"📁 로그 파일: {log_file}")
-    
+
     return logger
 
 
+def shutdown_logging() -> None:
+    """
+    큐에 남은 로그를 모두 기록하고 리스너와 출력 핸들러를 종료합니다.
+
+    이후의 로그(서버 종료 과정, atexit 등)가 큐에 쌓여 버려지지 않도록
+    루트 로거의 큐 핸들러를 같은 콘솔 스트림에 직접 쓰는 핸들러로 교체합니다.
+    """
+    global _listener
+
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, LocalQueueHandler):
+            root.removeHandler(handler)
+    console_handler = listener.handlers[0]
+    fallback_handler = logging.StreamHandler(console_handler.stream)
+    fallback_handler.setFormatter(console_handler.formatter)
+    root.addHandler(fallback_handler)
+
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str = None):
     """
     로거 인스턴스를 반환합니다.
-    
+
     Args:
         name: 로거 이름 (기본값: None)
-    
+
     Returns:
         logging.Logger: 로거 인스턴스
     """
@@ -67,8 +248,8 @@ def get_logger(name: str = None):
 def get_mail_logger():
     """
     메일 전용 로거를 반환합니다.
-    
+
     Returns:
         logging.Logger: 메일 로거 인스턴스
     """
-    return logging.getLogger('mail')
\ No newline at end of file
+    return logging.getLogger('mail')
@@ -7,18 +7,20 @@ import logging
 import time
 import json
 import traceback
-from typing import Dict, Optional, Tuple, Callable
+from typing import Dict, List, Optional, Tuple, Callable
 from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
 import redis
 from datetime import datetime, timedelta
 
 from ..config import settings
+from ..utils.rate_limiter import RateLimitResult, RateLimitRule, SlidingWindowRateLimiter
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
-# Redis 연결 (캐시 및 속도 제한용)
+# Redis 연결 (상태 조회/리셋/위반 로그 등 관리 기능용, 요청 경로는 비동기 limiter 사용)
 try:
     redis_client = redis.Redis(
         host=settings.REDIS_HOST,
@@ -50,7 +52,7 @@ class RateLimitService:
         
         # 제외 경로 설정
         self.excluded_paths = [
-            "/docs", "/redoc", "/openapi.json", "/health", "/info"
+            "/docs", "/redoc", "/openapi.json", "/health", "/info", "/metrics"
         ]
         
         # 엔드포인트별 특별 제한
@@ -61,6 +63,9 @@ class RateLimitService:
             "/api/mail/bulk-send": 10,  # 대량 발송은 더 엄격하게
         }
         
+        # 요청 경로용 비동기 슬라이딩 윈도우 제한기 (Redis 장애 시 토큰 버킷)
+        self.limiter = SlidingWindowRateLimiter()
+        
         logger.info("🚦 속도 제한 서비스 초기화 완료")
     
     def _is_excluded_path(self, path: str) -> bool:
@@ -79,82 +84,77 @@ class RateLimitService:
             "method": request.method
         }
     
-    def _check_rate_limits(self, request: Request, client_info: Dict[str, str]) -> Tuple[bool, Dict]:
-        """속도 제한 검사"""
-        if not redis_client:
-            return True, {}
-        
-        current_time = int(time.time())
-        window_start = current_time - 60  # 1분 윈도우
-        
-        # IP 기반 제한 검사
-        ip_key = f"rate_limit:ip:{client_info['ip']}:{window_start // 60}"
-        
-        try:
-            current_count = redis_client.get(ip_key) or 0
-            current_count = int(current_count)
-            
-            limit = self.endpoint_limits.get(request.url.path, self.default_limits["per_ip"])
-            
-            if current_count >= limit:
-                return False, {
-                    "limit": limit,
-                    "current": current_count,
-                    "reset_time": (window_start // 60 + 1) * 60
-                }
-            
-            return True, {
-                "limit": limit,
-                "current": current_count,
-                "reset_time": (window_start // 60 + 1) * 60
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ Redis 속도 제한 검사 오류: {str(e)}")
-            return True, {}
-    
-    def _increment_counters(self, request: Request, client_info: Dict[str, str]):
-        """요청 카운터 증가"""
-        if not redis_client:
-            return
-        
-        current_time = int(time.time())
-        window_start = current_time - 60
-        
-        ip_key = f"rate_limit:ip:{client_info['ip']}:{window_start // 60}"
-        
+    def _normalize_path(self, path: str) -> str:
+        """버전 접두사(/api/v1)를 endpoint_limits 키 형식(/api)으로 정규화"""
+        if path.startswith(settings.API_V1_PREFIX):
+            return "/api" + path[len(settings.API_V1_PREFIX):]
+        return path
+
+    def _extract_principal(self, request: Request) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Authorization 헤더의 JWT에서 (사용자 UUID, 조직 ID)를 추출합니다.
+
+        DB 조회 없이 서명만 검증하며, 토큰이 없거나 유효하지 않으면 (None, None)을 반환합니다.
+        """
+        authorization = request.headers.get("authorization", "")
+        if not authorization.lower().startswith("bearer "):
+            return None, None
         try:
-            redis_client.incr(ip_key)
-            redis_client.expire(ip_key, 120)  # 2분 후 만료
-        except Exception as e:
-            logger.error(f"❌ Redis 카운터 증가 오류: {str(e)}")
-    
-    def _create_rate_limit_response(self, limit_info: Dict) -> JSONResponse:
+            payload = jwt.decode(authorization[7:].strip(), settings.SECRET_KEY, algorithms=["HS256"])
+        except JWTError:
+            return None, None
+        return payload.get("sub"), payload.get("org_id")
+
+    def _build_rules(self, request: Request, client_info: Dict[str, str]) -> List[RateLimitRule]:
+        """요청에 적용할 IP/사용자/조직/엔드포인트 제한 목록 생성"""
+        rules = [RateLimitRule("ip", client_info["ip"], self.default_limits["per_ip"])]
+
+        user_uuid, org_id = self._extract_principal(request)
+        if user_uuid:
+            rules.append(RateLimitRule("user", user_uuid, self.default_limits["per_user"]))
+        if org_id:
+            rules.append(RateLimitRule("organization", org_id, self.default_limits["per_org"]))
+
+        path = self._normalize_path(client_info["path"])
+        endpoint_limit = self.endpoint_limits.get(path)
+        if endpoint_limit is not None:
+            rules.append(RateLimitRule("endpoint", f"{path}:{client_info['ip']}", endpoint_limit))
+        return rules
+
+    async def check_request(self, request: Request) -> RateLimitResult:
+        """
+        요청의 모든 제한을 한 번에 검사하고 허용 시 카운터를 증가시킵니다.
+
+        Redis 왕복은 Lua 스크립트 1회이며, Redis 장애 시 프로세스 내 토큰 버킷을 사용합니다.
+        """
+        client_info = self._extract_client_info(request)
+        return await self.limiter.hit(self._build_rules(request, client_info))
+
+    def _create_rate_limit_response(self, result: RateLimitResult) -> JSONResponse:
         """속도 제한 응답 생성"""
         return JSONResponse(
             status_code=429,
             content={
                 "error": "Rate limit exceeded",
                 "message": "요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
-                "limit": limit_info.get("limit"),
-                "reset_time": limit_info.get("reset_time")
+                "limit": result.limit,
+                "scope": result.scope,
+                "reset_time": result.reset_time
             },
             headers={
-                "X-RateLimit-Limit": str(limit_info.get("limit", 0)),
+                "X-RateLimit-Limit": str(result.limit),
                 "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(limit_info.get("reset_time", 0)),
-                "Retry-After": "60"
+                "X-RateLimit-Reset": str(result.reset_time),
+                "Retry-After": str(result.retry_after)
             }
         )
     
-    def _add_rate_limit_headers(self, response: Response, limit_info: Dict):
+    def _add_rate_limit_headers(self, response: Response, result: RateLimitResult):
         """응답에 속도 제한 헤더 추가"""
-        if limit_info:
-            response.headers["X-RateLimit-Limit"] = str(limit_info.get("limit", 0))
-            response.headers["X-RateLimit-Remaining"] = str(
-                max(0, limit_info.get("limit", 0) - limit_info.get("current", 0))
-            )
-            response.headers["X-RateLimit-Reset"] = str(limit_info.get("reset_time", 0))
+        if result.scope:
+            response.headers["X-RateLimit-Limit"] = str(result.limit)
+            response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+            response.headers["X-RateLimit-Reset"] = str(result.reset_time)
 
     def get_rate_limit_status(self, limit_type: str, identifier: str) -> Dict:
         """
@@ -352,53 +352,30 @@ async def rate_limit_middleware(request: Request, call_next: Callable):
     """
     속도 제한 미들웨어
     
-    IP 주소, 사용자, 조직별로 요청 속도를 제한합니다.
+    IP 주소, 사용자, 조직, 엔드포인트별로 요청 속도를 제한합니다.
     """
-    start_time = time.time()
+    # 제외 경로 확인
+    if rate_limit_service._is_excluded_path(request.url.path):
+        return await call_next(request)
     
     try:
-        # Redis가 사용 불가능한 경우 제한 없이 통과
-        if not redis_client:
-            logger.warning("⚠️ Redis 연결 없음 - 속도 제한 비활성화")
-            response = await call_next(request)
-            return response
-        
-        # 제외 경로 확인
-        if rate_limit_service._is_excluded_path(request.url.path):
-            response = await call_next(request)
-            return response
-        
-        # 클라이언트 정보 추출
-        client_info = rate_limit_service._extract_client_info(request)
-        
-        # 속도 제한 확인
-        is_allowed, limit_info = rate_limit_service._check_rate_limits(request, client_info)
-        
-        if not is_allowed:
-            # 제한 초과 시 429 응답 반환
-            logger.warning(f"🚫 속도 제한 초과 - IP: {client_info['ip']}, 경로: {request.url.path}")
-            return rate_limit_service._create_rate_limit_response(limit_info)
-        
-        # 요청 처리
-        response = await call_next(request)
-        
-        # 카운터 증가
-        rate_limit_service._increment_counters(request, client_info)
-        
-        # 응답 헤더에 제한 정보 추가
-        rate_limit_service._add_rate_limit_headers(response, limit_info)
-        
-        # 처리 시간 로깅 (DEBUG 레벨)
-        processing_time = time.time() - start_time
-        logger.debug(f"⚡ 요청 처리 완료 - {request.method} {request.url.path} ({processing_time:.3f}초)")
-        
-        return response
-        
+        result = await rate_limit_service.check_request(request)
     except Exception as e:
         logger.error(f"❌ 속도 제한 미들웨어 오류: {str(e)}")
         # 오류 발생 시 제한 없이 통과
-        response = await call_next(request)
-        return response
+        return await call_next(request)
+    
+    if not result.allowed:
+        # 제한 초과 시 429 응답 반환
+        client_ip = request.client.host if request.client else "unknown"
+        logger.warning(f"🚫 속도 제한 초과 - 스코프: {result.scope}, IP: {client_ip}, 경로: {request.url.path}")
+        return rate_limit_service._create_rate_limit_response(result)
+    
+    response = await call_next(request)
+    
+    # 응답 헤더에 제한 정보 추가
+    rate_limit_service._add_rate_limit_headers(response, result)
+    return response
 
 
 # 호환성을 위한 클래스 (사용하지 않음)
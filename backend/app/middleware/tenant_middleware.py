@@ -13,11 +13,12 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.orm import Session
 from contextvars import ContextVar
-from datetime import datetime, timedelta
 
 from ..database.user import get_db
 from ..model.organization_model import Organization
 from ..config import settings
+from ..utils.cache_invalidation import cache_invalidation_bus
+from ..utils.local_cache import LRUTTLCache
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -26,10 +27,38 @@ logger = logging.getLogger(__name__)
 current_org_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_org', default=None)
 current_user_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_user', default=None)
 
-# 조직 정보 캐시 (메모리 기반)
-_organization_cache: Dict[str, Dict[str, Any]] = {}
-_cache_timestamps: Dict[str, datetime] = {}
-CACHE_EXPIRY_MINUTES = 5  # 5분 캐시 유지
+# 조직 정보 캐시 (org_code / org_id / subdomain / 기본 조직 키, LRU + TTL)
+# 조직 변경 시 invalidate_organization_cache()로 모든 워커의 항목을 무효화합니다.
+TENANT_CACHE_NAME = "tenant"
+tenant_cache = LRUTTLCache(
+    TENANT_CACHE_NAME,
+    max_size=settings.TENANT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS
+)
+
+
+def _evict_organization(payload: Dict[str, Any]) -> None:
+    """조직 ID에 해당하는 모든 캐시 항목과 기본 조직 항목을 삭제합니다."""
+    org_id = payload.get("org_id")
+    removed = tenant_cache.delete_where(
+        lambda key, org_info: key.startswith("default_org:") or (org_info or {}).get("id") == org_id
+    )
+    logger.debug(f"🗑️ 조직 캐시 무효화: {org_id} ({removed}개)")
+
+
+cache_invalidation_bus.register(TENANT_CACHE_NAME, _evict_organization)
+
+
+async def invalidate_organization_cache(org_id: str) -> None:
+    """
+    조직 정보 캐시를 모든 워커에서 무효화합니다.
+
+    조직 수정/삭제/설정 변경 후 호출합니다.
+
+    Args:
+        org_id: 조직 ID
+    """
+    await cache_invalidation_bus.publish(TENANT_CACHE_NAME, org_id=org_id)
 
 
 def _convert_settings_to_dict(settings_list) -> Dict[str, Any]:
@@ -77,7 +106,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.excluded_paths = excluded_paths or [
             "/docs", "/redoc", "/openapi.json", "/favicon.ico",
-            "/static", "/health", "/info", "/api/system",
+            "/static", "/health", "/info", "/metrics", "/api/system",
             "/api/v1/auth/login", "/api/v1/auth/register", "/api/v1/organizations/create"
             # "/api/v1/addressbook",  # 주석 처리: 조직 ID가 필요한 엔드포인트이므로 테넌트 검증 필요
             # 테스트용 제외 경로였던 "/api/v1/test-csv"는 조직 컨텍스트가 필요하므로 제외하지 않음
@@ -85,23 +114,6 @@ class TenantMiddleware(BaseHTTPMiddleware):
         self.default_org_code = default_org_code
         logger.info("🏢 통합 테넌트 미들웨어 초기화 완료")
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """
-        캐시가 유효한지 확인
-        
-        Args:
-            cache_key: 캐시 키
-            
-        Returns:
-            캐시 유효 여부
-        """
-        if cache_key not in _cache_timestamps:
-            return False
-        
-        cache_time = _cache_timestamps[cache_key]
-        expiry_time = cache_time + timedelta(minutes=CACHE_EXPIRY_MINUTES)
-        return datetime.now() < expiry_time
-    
     def _get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """
         캐시에서 조직 정보 조회
@@ -112,10 +124,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
         Returns:
             캐시된 조직 정보 또는 None
         """
-        if self._is_cache_valid(cache_key) and cache_key in _organization_cache:
-            logger.debug(f"🚀 캐시에서 조직 정보 조회: {cache_key}")
-            return _organization_cache[cache_key]
-        return None
+        return tenant_cache.get(cache_key)
     
     def _set_cache(self, cache_key: str, org_info: Dict[str, Any]) -> None:
         """
@@ -125,27 +134,9 @@ class TenantMiddleware(BaseHTTPMiddleware):
             cache_key: 캐시 키
             org_info: 조직 정보
         """
-        _organization_cache[cache_key] = org_info
-        _cache_timestamps[cache_key] = datetime.now()
+        tenant_cache.set(cache_key, org_info)
         logger.debug(f"💾 캐시에 조직 정보 저장: {cache_key}")
     
-    def _clear_expired_cache(self) -> None:
-        """
-        만료된 캐시 항목 정리
-        """
-        current_time = datetime.now()
-        expired_keys = []
-        
-        for cache_key, cache_time in _cache_timestamps.items():
-            expiry_time = cache_time + timedelta(minutes=CACHE_EXPIRY_MINUTES)
-            if current_time >= expiry_time:
-                expired_keys.append(cache_key)
-        
-        for key in expired_keys:
-            _organization_cache.pop(key, None)
-            _cache_timestamps.pop(key, None)
-            logger.debug(f"🗑️ 만료된 캐시 삭제: {key}")
-    
     async def dispatch(self, request: Request, call_next):
         """
         요청 처리 및 테넌트 컨텍스트 설정
@@ -161,14 +152,14 @@ class TenantMiddleware(BaseHTTPMiddleware):
         
         try:
             # 모든 요청에 대해 로그 출력 (디버깅용)
-            logger.info(f"🔍 테넌트 미들웨어 요청 처리 시작 - 경로: {request.url.path}, 메서드: {request.method}")
+            logger.debug(f"🔍 테넌트 미들웨어 요청 처리 시작 - 경로: {request.url.path}, 메서드: {request.method}")
             
             # 제외 경로 확인
             if self._is_excluded_path(request.url.path):
-                logger.info(f"🚫 테넌트 검증 제외 경로: {request.url.path}")
+                logger.debug(f"🚫 테넌트 검증 제외 경로: {request.url.path}")
                 return await call_next(request)
             
-            logger.info(f"🏢 테넌트 검증 필요 경로: {request.url.path}")
+            logger.debug(f"🏢 테넌트 검증 필요 경로: {request.url.path}")
             
             # 조직 정보 추출 및 설정
             org_info = await self._extract_organization_info(request)
@@ -496,9 +487,6 @@ class TenantMiddleware(BaseHTTPMiddleware):
             # 캐시 키 생성
             cache_key = f"org_code:{org_code}"
             
-            # 만료된 캐시 정리
-            self._clear_expired_cache()
-            
             # 캐시에서 조직 정보 조회
             cached_org = self._get_from_cache(cache_key)
             if cached_org:
@@ -546,9 +534,6 @@ class TenantMiddleware(BaseHTTPMiddleware):
             # 캐시 키 생성
             cache_key = f"org_id_uuid:{org_id}"
             
-            # 만료된 캐시 정리
-            self._clear_expired_cache()
-            
             # 캐시에서 조직 정보 조회
             cached_org = self._get_from_cache(cache_key)
             if cached_org:
@@ -602,9 +587,6 @@ class TenantMiddleware(BaseHTTPMiddleware):
             # 캐시 키 생성
             cache_key = f"org_subdomain:{subdomain}"
             
-            # 만료된 캐시 정리
-            self._clear_expired_cache()
-            
             # 캐시에서 조직 정보 조회
             cached_org = self._get_from_cache(cache_key)
             if cached_org:
@@ -650,9 +632,6 @@ class TenantMiddleware(BaseHTTPMiddleware):
         # 캐시 키 생성
         cache_key = f"default_org:{self.default_org_code}"
         
-        # 만료된 캐시 정리
-        self._clear_expired_cache()
-        
         # 캐시에서 조회
         cached_org = self._get_from_cache(cache_key)
         if cached_org:
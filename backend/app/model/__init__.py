@@ -1,9 +1,13 @@
 # Model package
 
 from .user_model import User, RefreshToken, LoginLog
-from .organization_model import Organization, OrganizationSettings, OrganizationUsage, OrganizationStatus
+from .organization_model import (
+    Organization, OrganizationSettings, OrganizationUsage, OrganizationUsageRollup, OrganizationStatus,
+    OrganizationActivityHourly, OrganizationActivityDaily, OrganizationActiveUserDay, ActivityRollupCheckpoint,
+    ActivityRollupGap
+)
 from .mail_model import (
-    MailUser, Mail, MailRecipient, MailAttachment, MailFolder, MailInFolder, MailLog,
+    MailUser, Mail, MailRecipient, MailAttachment, AttachmentBlob, MailFolder, MailInFolder, FolderCounter, MailLog,
     RecipientType, MailStatus, MailPriority, FolderType
 )
 
@@ -17,6 +21,12 @@ __all__ = [
     "Organization",
     "OrganizationSettings",
     "OrganizationUsage",
+    "OrganizationUsageRollup",
+    "OrganizationActivityHourly",
+    "OrganizationActivityDaily",
+    "OrganizationActiveUserDay",
+    "ActivityRollupCheckpoint",
+    "ActivityRollupGap",
     "OrganizationStatus",
     
     # Mail models
@@ -24,8 +34,10 @@ __all__ = [
     "Mail",
     "MailRecipient", 
     "MailAttachment",
+    "AttachmentBlob",
     "MailFolder",
     "MailInFolder",
+    "FolderCounter",
     "MailLog",
     
     # Enums
@@ -1,5 +1,6 @@
-from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from ..database.user import Base
 import uuid
@@ -18,6 +19,8 @@ class MailStatus(str, Enum):
     DRAFT = "draft"
     SENT = "sent"
     FAILED = "failed"
+    QUEUED = "queued"
+    SENDING = "sending"
 
 class MailPriority(str, Enum):
     """메일 우선순위 열거형"""
@@ -101,6 +104,8 @@ class Mail(Base):
     sent_at = Column(DateTime(timezone=True), nullable=True, comment="발송 시간")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성 시간")
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), comment="수정 시간")
+    # 전문 검색 벡터 (subject + body_text, DB 트리거가 유지 - 목록 조회 시 로드하지 않음)
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), comment="전문 검색 벡터 (트리거 유지)"))
     
     # 관계 설정
     organization = relationship("Organization", back_populates="mails")
@@ -109,12 +114,18 @@ class Mail(Base):
     attachments = relationship("MailAttachment", back_populates="mail")
     mail_in_folders = relationship("MailInFolder", back_populates="mail")
     logs = relationship("MailLog", back_populates="mail")
+    
+    __table_args__ = (
+        # 커서 페이지네이션용 (created_at, mail_uuid) 키셋 인덱스
+        Index('ix_mails_org_created_uuid', 'org_id', 'created_at', 'mail_uuid'),
+        Index('ix_mails_sender_status_created_uuid', 'sender_uuid', 'status', 'created_at', 'mail_uuid'),
+    )
 
 class MailRecipient(Base):
     """메일 수신자 모델"""
     __tablename__ = "mail_recipients"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     mail_uuid = Column(String(50), ForeignKey("mails.mail_uuid"), nullable=False, comment="메일 UUID (mails.mail_uuid 참조)")
     recipient_uuid = Column(String(50), ForeignKey("mail_users.user_uuid"), nullable=True, comment="수신자 UUID (mail_users.user_uuid 참조)")
     recipient_email = Column(String(255), nullable=False, comment="수신자 이메일 주소")
@@ -124,23 +135,46 @@ class MailRecipient(Base):
     # 관계 설정
     mail = relationship("Mail", back_populates="recipients")
     recipient = relationship("MailUser", foreign_keys=[recipient_uuid])
+    
+    __table_args__ = (
+        # 받은 메일 조회/분석 (수신자 → 메일), 보낸 메일의 수신자 집계 (메일 → 수신자 주소)
+        Index('ix_mail_recipients_recipient_mail', 'recipient_uuid', 'mail_uuid'),
+        Index('ix_mail_recipients_mail_email', 'mail_uuid', 'recipient_email'),
+    )
 
 class MailAttachment(Base):
     """메일 첨부파일 모델"""
     __tablename__ = "mail_attachments"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     attachment_uuid = Column(String(255), unique=True, nullable=False, comment="첨부파일 UUID")
     mail_uuid = Column(String(50), ForeignKey("mails.mail_uuid"), nullable=False, comment="메일 UUID (mails.mail_uuid 참조)")
     filename = Column(String(255), nullable=False, comment="파일명")
     file_path = Column(String(500), nullable=False, comment="파일 저장 경로")
     file_size = Column(BigInteger, nullable=False, comment="파일 크기 (bytes)")
     content_type = Column(String(100), comment="MIME 타입")
+    content_sha256 = Column(String(64), index=True, comment="파일 내용 SHA-256 (hex)")
     created_at = Column(DateTime, server_default=func.now(), comment="생성 시간")
     
     # 관계 설정
     mail = relationship("Mail", back_populates="attachments")
 
+class AttachmentBlob(Base):
+    """첨부파일 내용 저장소 모델 (조직별 SHA-256 단위로 한 번만 저장, 참조 카운트)"""
+    __tablename__ = "attachment_blobs"
+    
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
+    org_id = Column(String(36), ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False, index=True, comment="조직 ID")
+    sha256 = Column(String(64), nullable=False, comment="파일 내용 SHA-256 (hex)")
+    file_path = Column(String(500), nullable=False, comment="blob 파일 경로")
+    file_size = Column(BigInteger, nullable=False, comment="파일 크기 (bytes)")
+    ref_count = Column(Integer, nullable=False, default=1, comment="참조 중인 첨부파일 수")
+    created_at = Column(DateTime, server_default=func.now(), comment="생성 시간")
+    
+    __table_args__ = (
+        UniqueConstraint('org_id', 'sha256', name='uq_attachment_blobs_org_sha256'),
+    )
+
 class MailFolder(Base):
     """메일 폴더 모델"""
     __tablename__ = "mail_folders"
@@ -165,7 +199,7 @@ class MailInFolder(Base):
     """메일-폴더 관계 모델"""
     __tablename__ = "mail_in_folders"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     mail_uuid = Column(String(50), ForeignKey("mails.mail_uuid"), nullable=False, comment="메일 UUID (mails.mail_uuid 참조)")
     folder_uuid = Column(String(36), ForeignKey("mail_folders.folder_uuid"), nullable=False, comment="폴더 UUID")
     user_uuid = Column(String(36), ForeignKey("mail_users.user_uuid"), nullable=False, comment="사용자 UUID")
@@ -177,12 +211,27 @@ class MailInFolder(Base):
     mail = relationship("Mail", back_populates="mail_in_folders")
     folder = relationship("MailFolder", back_populates="mail_relations")
     user = relationship("MailUser")
+    
+    __table_args__ = (
+        Index('ix_mail_in_folders_folder_mail', 'folder_uuid', 'mail_uuid'),
+        Index('ix_mail_in_folders_user_mail', 'user_uuid', 'mail_uuid'),
+    )
+
+class FolderCounter(Base):
+    """폴더별 메일 수 카운터 모델 (mail_in_folders 변경과 같은 트랜잭션에서 증감)"""
+    __tablename__ = "folder_counters"
+    
+    folder_uuid = Column(String(36), ForeignKey("mail_folders.folder_uuid", ondelete="CASCADE"), primary_key=True, comment="폴더 UUID")
+    total_count = Column(Integer, nullable=False, default=0, comment="폴더 내 메일 수")
+    unread_count = Column(Integer, nullable=False, default=0, comment="읽지 않은 메일 수")
+    total_bytes = Column(BigInteger, nullable=False, default=0, comment="본문 + 첨부파일 크기 합계 (bytes)")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="수정 시간")
 
 class MailLog(Base):
     """메일 로그 모델"""
     __tablename__ = "mail_logs"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     mail_uuid = Column(String(50), ForeignKey("mails.mail_uuid"), nullable=False, comment="메일 UUID (mails.mail_uuid 참조)")
     user_uuid = Column(String(36), ForeignKey("mail_users.user_uuid"), comment="사용자 UUID")
     org_id = Column(String(36), ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False, comment="조직 ID")
@@ -196,3 +245,7 @@ class MailLog(Base):
     mail = relationship("Mail", back_populates="logs")
     user = relationship("MailUser", back_populates="mail_logs")
     organization = relationship("Organization", back_populates="mail_logs")
+    
+    __table_args__ = (
+        Index('ix_mail_logs_org_created', 'org_id', 'created_at'),
+    )
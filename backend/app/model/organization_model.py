@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, UniqueConstraint, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, Date, DateTime, Boolean, Text, UniqueConstraint, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database.user import Base
@@ -108,4 +108,95 @@ class OrganizationUsage(Base):
     
     __table_args__ = (
         UniqueConstraint('org_id', 'usage_date', name='unique_org_usage_date'),
-    )
\ No newline at end of file
+    )
+
+
+class OrganizationUsageRollup(Base):
+    """조직 주간/월간 사용량 집계 (일일 사용량 리셋 작업이 매일 기간 전체를 다시 집계)"""
+    __tablename__ = "organization_usage_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    org_id = Column(String(36), ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False, comment="조직 ID")
+    period_type = Column(String(10), nullable=False, comment="집계 단위 (week, month)")
+    period_start = Column(Date, nullable=False, comment="기간 시작일 (주: 월요일, 월: 1일)")
+    period_end = Column(Date, nullable=False, comment="기간 종료일")
+    
+    # 집계 메트릭
+    emails_sent = Column(Integer, nullable=False, default=0, comment="기간 내 발송 메일 수")
+    emails_received = Column(Integer, nullable=False, default=0, comment="기간 내 수신 메일 수")
+    user_days = Column(Integer, nullable=False, default=0, comment="일별 사용자 수 합계 (평균 계산용)")
+    days_counted = Column(Integer, nullable=False, default=0, comment="집계된 일 수")
+    peak_storage_gb = Column(Integer, nullable=False, default=0, comment="기간 내 최대 저장 용량(GB)")
+    rolled_through = Column(Date, nullable=False, comment="집계에 반영된 마지막 날짜")
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성 시간")
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), comment="수정 시간")
+    
+    __table_args__ = (
+        UniqueConstraint('org_id', 'period_type', 'period_start', name='unique_org_usage_rollup_period'),
+        Index('ix_organization_usage_rollups_period', 'period_type', 'period_start'),
+    )
+
+
+class OrganizationActivityHourly(Base):
+    """조직 시간별 활동 집계 (활동 로그 집계 작업이 mail_logs/login_logs 를 누적)"""
+    __tablename__ = "organization_activity_hourly"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    org_id = Column(String(36), ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False, comment="조직 ID")
+    hour_start = Column(DateTime, nullable=False, comment="시간 구간 시작 (UTC)")
+    source = Column(String(10), nullable=False, comment="원본 로그 (mail, login)")
+    action = Column(String(50), nullable=False, comment="작업 (메일 로그 action 소문자, 로그인 상태)")
+    event_count = Column(Integer, nullable=False, default=0, comment="이벤트 수")
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="수정 시간")
+    
+    __table_args__ = (
+        UniqueConstraint('org_id', 'hour_start', 'source', 'action', name='unique_org_activity_hour'),
+    )
+
+
+class OrganizationActivityDaily(Base):
+    """조직 일별 활동 집계 (source=user, action=active 행은 일별 활성 사용자 수)"""
+    __tablename__ = "organization_activity_daily"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    org_id = Column(String(36), ForeignKey("organizations.org_id", ondelete="CASCADE"), nullable=False, comment="조직 ID")
+    activity_date = Column(Date, nullable=False, comment="활동 일자 (UTC)")
+    source = Column(String(10), nullable=False, comment="원본 로그 (mail, login, user)")
+    action = Column(String(50), nullable=False, comment="작업 (메일 로그 action 소문자, 로그인 상태, active)")
+    event_count = Column(Integer, nullable=False, default=0, comment="이벤트 수")
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="수정 시간")
+    
+    __table_args__ = (
+        UniqueConstraint('org_id', 'activity_date', 'source', 'action', name='unique_org_activity_day'),
+    )
+
+
+class OrganizationActiveUserDay(Base):
+    """조직 사용자별 활동 일자 (일별 활성 사용자 수 계산용)"""
+    __tablename__ = "organization_active_user_days"
+    
+    org_id = Column(String(36), ForeignKey("organizations.org_id", ondelete="CASCADE"), primary_key=True, comment="조직 ID")
+    activity_date = Column(Date, primary_key=True, comment="활동 일자 (UTC)")
+    user_uuid = Column(String(36), primary_key=True, comment="사용자 UUID")
+
+
+class ActivityRollupCheckpoint(Base):
+    """활동 로그 집계 진행 위치 (원본 로그별로 집계에 반영된 마지막 ID)"""
+    __tablename__ = "activity_rollup_checkpoints"
+    
+    source = Column(String(10), primary_key=True, comment="원본 로그 (mail, login)")
+    last_id = Column(BigInteger, nullable=False, default=0, comment="집계에 반영된 마지막 로그 ID")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="수정 시간")
+
+
+class ActivityRollupGap(Base):
+    """진행 위치 이전에 비어 있던 로그 ID 구간 (늦게 커밋된 로그를 다음 집계에서 반영)"""
+    __tablename__ = "activity_rollup_gaps"
+    
+    source = Column(String(10), primary_key=True, comment="원본 로그 (mail, login)")
+    start_id = Column(BigInteger, primary_key=True, comment="비어 있는 구간 시작 ID")
+    end_id = Column(BigInteger, nullable=False, comment="비어 있는 구간 끝 ID (포함)")
+    detected_at = Column(DateTime(timezone=True), nullable=False, comment="구간을 발견한 시각")
@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.user_schema import UserBase
-from ..database.user import get_db
+from ..database.user import get_db, get_async_db, AsyncSessionLocal
 from ..model.user_model import User, RefreshToken, LoginLog
 from ..schemas import UserCreate, UserResponse, UserLogin, Token, TokenRefresh, AccessToken, MessageResponse, LoginLogCreate
 from ..schemas.auth_schema import (
@@ -11,7 +13,7 @@ from ..schemas.auth_schema import (
     TwoFactorLoginRequest, TwoFactorDisableRequest, AuthResponse, AuthApiResponse,
     SSOLoginRequest, RoleRequest, UserRoleUpdateRequest
 )
-from ..service.auth_service import AuthService, get_current_user
+from ..service.auth_service import AuthService, get_current_user, get_current_user_async
 from ..service.user_service import UserService
 from ..service import two_factor_service
 from ..service.sso_service import SSOService
@@ -28,7 +30,7 @@ router = APIRouter()
 async def login(
     user_credentials: UserLogin, 
     request: Request, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Token:
     """
     로그인 엔드포인트
@@ -40,15 +42,14 @@ async def login(
     client_ip = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent", None)
     
-    def safe_log_login_attempt(status: str, reason: str = None, user_uuid: str = None):
+    async def safe_log_login_attempt(status: str, reason: str = None, user_uuid: str = None):
         """
         안전한 로그인 로그 기록 함수
         트랜잭션 롤백 상태에서도 안전하게 로그를 기록합니다.
         """
         try:
             # 새로운 세션을 생성하여 독립적으로 로그 기록
-            from ..database.user import get_db_session
-            with get_db_session() as log_db:
+            async with AsyncSessionLocal() as log_db:
                 login_log = LoginLog(
                     user_uuid=user_uuid,
                     user_id=user_credentials.user_id,
@@ -58,16 +59,15 @@ async def login(
                     failure_reason=reason
                 )
                 log_db.add(login_log)
-                log_db.commit()
+                await log_db.commit()
         except Exception as e:
             logger.error(f"❌ 로그인 로그 기록 실패: {str(e)}")
     
     try:
         # 사용자 인증
-        auth_service = AuthService(db)
-        user = auth_service.authenticate_user(user_credentials.user_id, user_credentials.password)
+        user = await AuthService.authenticate_user_async(db, user_credentials.user_id, user_credentials.password)
         if not user:
-            safe_log_login_attempt("failed", "invalid_credentials")
+            await safe_log_login_attempt("failed", "invalid_credentials")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="잘못된 사용자 ID 또는 비밀번호입니다."
@@ -76,11 +76,11 @@ async def login(
         # 2FA 활성화 확인
         if user.is_2fa_enabled:
             # 2FA가 활성화된 경우 임시 토큰 반환
-            temp_token = auth_service.create_access_token(
+            temp_token = AuthService.create_access_token(
                 data={"sub": str(user.user_uuid), "temp": True, "requires_2fa": True},
                 expires_delta=timedelta(minutes=5)  # 5분 임시 토큰
             )
-            safe_log_login_attempt("2fa_required", user_uuid=str(user.user_uuid))
+            await safe_log_login_attempt("2fa_required", user_uuid=str(user.user_uuid))
             return Token(
                 access_token=temp_token,
                 token_type="bearer",
@@ -88,8 +88,9 @@ async def login(
             )
         
         # 일반 로그인 처리
-        tokens = auth_service.create_tokens(user)
-        safe_log_login_attempt("success", user_uuid=str(user.user_uuid))
+        # 토큰 생성/저장은 기존 동기 서비스 로직을 비동기 연결에서 실행
+        tokens = await db.run_sync(lambda session: AuthService(session).create_tokens(user))
+        await safe_log_login_attempt("success", user_uuid=str(user.user_uuid))
         
         logger.info(f"✅ 로그인 성공 - 사용자: {user.user_id}")
         return tokens
@@ -98,7 +99,7 @@ async def login(
         raise
     except Exception as e:
         logger.error(f"❌ 로그인 처리 중 오류: {str(e)}")
-        safe_log_login_attempt("error", str(e))
+        await safe_log_login_attempt("error", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="로그인 처리 중 오류가 발생했습니다."
@@ -414,7 +415,7 @@ async def register(
 
 
 @router.post("/refresh", response_model=AccessToken)
-async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)) -> AccessToken:
+async def refresh_token(token_data: TokenRefresh, db: AsyncSession = Depends(get_async_db)) -> AccessToken:
     """
     토큰 재발급 엔드포인트
     리프레시 토큰을 사용하여 새로운 액세스 토큰을 발급합니다.
@@ -440,10 +441,12 @@ async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db))
             )
         
         # 조직 내에서 사용자 조회
-        user = db.query(User).filter(
-            User.user_uuid == user_uuid,
-            User.org_id == org_id
-        ).first()
+        user = (await db.execute(
+            select(User).where(
+                User.user_uuid == user_uuid,
+                User.org_id == org_id
+            )
+        )).scalars().first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -451,12 +454,14 @@ async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db))
             )
         
         # 데이터베이스에서 리프레시 토큰 확인
-        stored_token = db.query(RefreshToken).filter(
-            RefreshToken.token == token_data.refresh_token,
-            RefreshToken.user_uuid == user.user_uuid,
-            RefreshToken.is_revoked == False,
-            RefreshToken.expires_at > datetime.utcnow()
-        ).first()
+        stored_token = (await db.execute(
+            select(RefreshToken).where(
+                RefreshToken.token == token_data.refresh_token,
+                RefreshToken.user_uuid == user.user_uuid,
+                RefreshToken.is_revoked == False,
+                RefreshToken.expires_at > datetime.utcnow()
+            )
+        )).scalars().first()
         
         if not stored_token:
             raise HTTPException(
@@ -490,7 +495,7 @@ async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db))
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_async)
 ) -> UserResponse:
     """
     현재 로그인한 사용자 정보 조회
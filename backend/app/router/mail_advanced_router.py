@@ -1,11 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, Form, UploadFile, File
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Form, UploadFile, File, BackgroundTasks
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, asc, func, text
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone
 import re
 import logging
+import io
 import json
 import os
 import zipfile
@@ -21,6 +22,11 @@ from ..model.mail_model import (
 )
 from ..schemas.mail_schema import FolderListResponse, FolderCreateResponse, FolderCreate, FolderUpdate
 from ..service.auth_service import get_current_user
+from ..service import folder_counter_service
+from ..service.mail_analytics_service import MailAnalyticsService
+from ..service.mail_backup_service import (
+    NDJSON_ENTRY, BackupJob, BackupJobStatus, read_job_status, run_backup_job, stream_backup_file, write_job_status
+)
 from ..middleware.tenant_middleware import get_current_org_id
 
 # 로깅 설정
@@ -63,16 +69,15 @@ async def get_folders(
             MailFolder.org_id == current_org_id
         ).all()
         
-        # 각 폴더의 메일 개수 계산
+        # 각 폴더의 메일 개수 (폴더 카운터 한 번에 조회)
+        counts = folder_counter_service.get_counts(db, [folder.folder_uuid for folder in folders])
         folder_list = []
         for folder in folders:
-            mail_count = db.query(MailInFolder).filter(MailInFolder.folder_uuid == folder.folder_uuid).count()
-            
             folder_list.append({
                 "folder_uuid": folder.folder_uuid,
                 "name": folder.name,
                 "folder_type": folder.folder_type,
-                "mail_count": mail_count,
+                "mail_count": counts[folder.folder_uuid].total if folder.folder_uuid else 0,
                 "created_at": folder.created_at
             })
         
@@ -256,8 +261,8 @@ async def update_folder(
         folder.updated_at = datetime.utcnow()
         db.commit()
         
-        # 메일 개수 계산
-        mail_count = db.query(MailInFolder).filter(MailInFolder.folder_uuid == folder.folder_uuid).count()
+        # 메일 개수 (폴더 카운터)
+        mail_count = folder_counter_service.get_count(db, folder.folder_uuid).total
         
         logger.info(f"✅ update_folder 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 폴더 UUID: {folder.folder_uuid}, 폴더명: {folder.name}")
         
@@ -328,6 +333,7 @@ async def delete_folder(
             db.query(MailInFolder).filter(
                 MailInFolder.folder_uuid == folder.folder_uuid
             ).update({"folder_uuid": inbox_folder.folder_uuid})
+            folder_counter_service.move_folder(db, folder.folder_uuid, inbox_folder.folder_uuid)
         else:
             # 받은편지함이 없으면 폴더 내 메일 관계 삭제
             db.query(MailInFolder).filter(
@@ -336,6 +342,7 @@ async def delete_folder(
                     MailInFolder.user_uuid == mail_user.user_uuid
                 )
             ).delete()
+            folder_counter_service.drop_folder(db, folder.folder_uuid)
         
         # 폴더 삭제
         db.delete(folder)
@@ -476,6 +483,7 @@ async def move_mail_to_folder(
 
 @router.post("/backup", response_model=None, summary="메일 백업")
 async def backup_mails(
+    background_tasks: BackgroundTasks,
     include_attachments: bool = Query(False, description="첨부파일 포함 여부"),
     date_from: Optional[str] = Query(None, description="백업 시작 날짜 (YYYYMMDD, YYYY-MM-DD, ISO8601 지원)"),
     date_to: Optional[str] = Query(None, description="백업 종료 날짜 (YYYYMMDD, YYYY-MM-DD, ISO8601 지원)"),
@@ -483,7 +491,12 @@ async def backup_mails(
     current_org_id: str = Depends(get_current_org_id),
     db: Session = Depends(get_db)
 ) -> dict:
-    """사용자 메일 백업"""
+    """
+    사용자 메일 백업 시작
+
+    백업 파일은 백그라운드 작업으로 생성됩니다. 진행 상태는 /backup/{backup_filename}/status 로 조회하고,
+    /backup/{backup_filename} 다운로드는 생성 중에도 바로 시작할 수 있습니다.
+    """
     try:
         logger.info(f"💾 backup_mails 시작 - 조직: {current_org_id}, 사용자: {current_user.email}")
 
@@ -525,173 +538,139 @@ async def backup_mails(
             logger.warning(f"⚠️ 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
             raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
         
-        # 백업할 메일 조회 (조직별 필터링 추가)
-        query = db.query(Mail).filter(
-            and_(
-                Mail.org_id == current_org_id,
-                or_(
-                    Mail.sender_uuid == mail_user.user_uuid,
-                    Mail.mail_uuid.in_(
-                        db.query(MailRecipient.mail_uuid).filter(
-                            MailRecipient.recipient_email == mail_user.email
-                        )
-                    )
-                )
-            )
-        )
-        
-        # 날짜 필터 파싱 및 적용 (sent_at 우선, 없으면 created_at 기준)
+        # 날짜 필터 파싱 (sent_at 우선, 없으면 created_at 기준)
         start_dt = _parse_date_param(date_from, end_of_day=False)
         end_dt = _parse_date_param(date_to, end_of_day=True)
-
-        if start_dt:
-            query = query.filter(
-                or_(
-                    and_(Mail.sent_at.isnot(None), Mail.sent_at >= start_dt),
-                    and_(Mail.sent_at.is_(None), Mail.created_at >= start_dt)
-                )
-            )
-        if end_dt:
-            query = query.filter(
-                or_(
-                    and_(Mail.sent_at.isnot(None), Mail.sent_at < end_dt),
-                    and_(Mail.sent_at.is_(None), Mail.created_at < end_dt)
-                )
-            )
-        
-        mails = query.all()
         
-        # 백업 파일 생성
+        # 백업 작업 등록 (빈 파일과 상태 파일을 먼저 만들어 바로 다운로드/상태 조회 가능)
         backup_filename = f"mail_backup_{current_user.email}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
         backup_path = os.path.join(BACKUP_DIR, backup_filename)
+        job = BackupJob(
+            backup_filename=backup_filename,
+            org_id=current_org_id,
+            user_uuid=mail_user.user_uuid,
+            include_attachments=include_attachments
+        )
+        open(backup_path, "wb").close()
+        write_job_status(backup_path, job)
+        background_tasks.add_task(run_backup_job, backup_path, job, start_dt, end_dt)
         
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # 메일 데이터 JSON 파일 생성
-            mail_data = []
-            
-            for mail in mails:
-                # 발신자 정보
-                sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
-                
-                # 수신자 정보
-                recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-                
-                # 첨부파일 정보
-                attachments = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).all()
-                
-                mail_info = {
-                    "id": mail.mail_uuid,
-                    "subject": mail.subject,
-                    "content": mail.body_text,
-                    "sender_email": sender.email if sender else None,
-                    "recipients": [
-                        {
-                            "email": r.recipient_email,
-                            "type": r.recipient_type,
-                            "name": r.recipient_email  # MailUser 모델에 name 필드가 없으므로 email 사용
-                        } for r in recipients
-                    ],
-                    "status": mail.status,
-                    "priority": mail.priority,
-                    "created_at": mail.created_at.isoformat() if mail.created_at else None,
-                    "sent_at": mail.sent_at.isoformat() if mail.sent_at else None,
-                    "attachments": [
-                        {
-                            "filename": a.filename,
-                            "file_path": a.file_path,
-                            "file_size": a.file_size,
-                            "content_type": a.content_type
-                        } for a in attachments
-                    ]
-                }
-                
-                mail_data.append(mail_info)
-                
-                # 첨부파일 포함
-                if include_attachments:
-                    for attachment in attachments:
-                        if attachment.file_path and os.path.exists(attachment.file_path):
-                            # ZIP 내 경로 설정
-                            zip_path = f"attachments/{mail.mail_uuid}/{attachment.filename}"
-                            zipf.write(attachment.file_path, zip_path)
-            
-            # 메일 데이터를 JSON 파일로 추가 (UTF-8 인코딩 명시)
-            temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8')
-            try:
-                json.dump(mail_data, temp_file, indent=2, ensure_ascii=False, default=str)
-                temp_file.flush()
-                temp_file.close()  # 파일을 명시적으로 닫음
-                zipf.write(temp_file.name, "mails.json")
-                logger.info(f"📄 JSON 파일 생성 완료 (UTF-8 인코딩): mails.json")
-            finally:
-                # 임시 파일 정리
-                if os.path.exists(temp_file.name):
-                    os.unlink(temp_file.name)
-        
-        # 백업 파일 크기 계산
-        backup_size = os.path.getsize(backup_path)
-        
-        logger.info(f"✅ backup_mails 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일 수: {len(mails)}, 파일 크기: {backup_size}, 범위: {date_from}~{date_to}")
+        logger.info(f"✅ backup_mails 작업 등록 - 조직: {current_org_id}, 사용자: {current_user.email}, 파일: {backup_filename}, 범위: {date_from}~{date_to}")
         
         return {
             "success": True,
-            "message": "메일 백업이 완료되었습니다.",
+            "message": "메일 백업이 시작되었습니다.",
             "data": {
                 "backup_filename": backup_filename,
                 "backup_path": backup_path,
-                "mail_count": len(mails),
-                "backup_size": backup_size,
+                "status": job.status,
                 "include_attachments": include_attachments,
                 "created_at": datetime.utcnow().isoformat()
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ backup_mails 오류 - 조직: {current_org_id}, 사용자: {current_user.email}, 에러: {str(e)}")
         raise HTTPException(status_code=500, detail=f"메일 백업 중 오류가 발생했습니다: {str(e)}")
 
 
+def _resolve_backup_path(backup_filename: str, current_user: User, current_org_id: str) -> Tuple[str, str]:
+    """
+    요청한 백업 파일명을 검증하고 (정규화된 파일명, 파일 경로)를 반환합니다.
+
+    Raises:
+        HTTPException: 다른 사용자의 파일이거나 백업 디렉터리를 벗어나는 경우 (403)
+    """
+    # 파일명 정규화: 앞뒤 공백 및 따옴표 제거, 경로 분리자 제거
+    normalized_name = backup_filename.strip().strip('"').strip("'")
+    normalized_name = os.path.basename(normalized_name)
+
+    if normalized_name != backup_filename:
+        logger.info(
+            f"ℹ️ 파일명 정규화 적용 - 원본: {backup_filename}, 정규화: {normalized_name}"
+        )
+
+    # 파일명 검증 (사용자 이메일 기반 프리픽스)
+    expected_prefix = f"mail_backup_{current_user.email}_"
+    if not normalized_name.startswith(expected_prefix):
+        logger.warning(
+            f"⚠️ 백업 파일 접근 거부 - 조직: {current_org_id}, 사용자: {current_user.email}, 파일: {normalized_name}"
+        )
+        raise HTTPException(status_code=403, detail="접근이 거부되었습니다")
+
+    # 경로 생성 및 디렉터리 탈출 방지
+    backup_path = os.path.join(BACKUP_DIR, normalized_name)
+    backup_dir_real = Path(BACKUP_DIR).resolve()
+    backup_path_real = Path(backup_path).resolve()
+    if backup_dir_real not in backup_path_real.parents and backup_path_real != backup_dir_real:
+        logger.warning(
+            f"⚠️ 경로 탈출 시도 차단 - 요청 경로: {backup_path_real}, 허용 경로: {backup_dir_real}"
+        )
+        raise HTTPException(status_code=403, detail="잘못된 파일 경로입니다")
+
+    return normalized_name, backup_path
+
+
+@router.get("/backup/{backup_filename}/status", response_model=None, summary="백업 진행 상태 조회")
+async def get_backup_status(
+    backup_filename: str,
+    current_user: User = Depends(get_current_user),
+    current_org_id: str = Depends(get_current_org_id)
+) -> dict:
+    """백업 작업 진행 상태 조회"""
+    _, backup_path = _resolve_backup_path(backup_filename, current_user, current_org_id)
+
+    job = read_job_status(backup_path)
+    if job is None:
+        if not os.path.exists(backup_path):
+            raise HTTPException(status_code=404, detail="백업 파일을 찾을 수 없습니다")
+        # 상태 파일이 없는 이전 방식 백업은 완료된 것으로 간주
+        return {
+            "success": True,
+            "message": "백업 상태 조회 완료",
+            "data": {"backup_filename": os.path.basename(backup_path), "status": BackupJobStatus.COMPLETED,
+                     "progress": 100.0, "backup_size": os.path.getsize(backup_path)}
+        }
+
+    return {
+        "success": True,
+        "message": "백업 상태 조회 완료",
+        "data": job.to_dict()
+    }
+
+
 @router.get("/backup/{backup_filename}", response_model=None, summary="백업 파일 다운로드")
 async def download_backup(
     backup_filename: str,
     current_user: User = Depends(get_current_user),
     current_org_id: str = Depends(get_current_org_id)
-) -> FileResponse:
-    """백업 파일 다운로드"""
+):
+    """백업 파일 다운로드 (생성 중이면 생성되는 대로 스트리밍)"""
     try:
         logger.info(f"📥 download_backup 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 파일: {backup_filename}")
 
-        # 파일명 정규화: 앞뒤 공백 및 따옴표 제거, 경로 분리자 제거
-        normalized_name = backup_filename.strip().strip('"').strip("'")
-        normalized_name = os.path.basename(normalized_name)
-
-        if normalized_name != backup_filename:
-            logger.info(
-                f"ℹ️ 파일명 정규화 적용 - 원본: {backup_filename}, 정규화: {normalized_name}"
-            )
-
-        # 파일명 검증 (사용자 이메일 기반 프리픽스)
-        expected_prefix = f"mail_backup_{current_user.email}_"
-        if not normalized_name.startswith(expected_prefix):
-            logger.warning(
-                f"⚠️ 백업 파일 접근 거부 - 조직: {current_org_id}, 사용자: {current_user.email}, 파일: {normalized_name}"
-            )
-            raise HTTPException(status_code=403, detail="접근이 거부되었습니다")
-
-        # 경로 생성 및 디렉터리 탈출 방지
-        backup_path = os.path.join(BACKUP_DIR, normalized_name)
-        backup_dir_real = Path(BACKUP_DIR).resolve()
-        backup_path_real = Path(backup_path).resolve()
-        if backup_dir_real not in backup_path_real.parents and backup_path_real != backup_dir_real:
-            logger.warning(
-                f"⚠️ 경로 탈출 시도 차단 - 요청 경로: {backup_path_real}, 허용 경로: {backup_dir_real}"
-            )
-            raise HTTPException(status_code=403, detail="잘못된 파일 경로입니다")
+        normalized_name, backup_path = _resolve_backup_path(backup_filename, current_user, current_org_id)
 
         # 파일 존재 확인
         if not os.path.exists(backup_path):
             raise HTTPException(status_code=404, detail="백업 파일을 찾을 수 없습니다")
 
+        job = read_job_status(backup_path)
+        if job is not None and job.status == BackupJobStatus.FAILED:
+            raise HTTPException(status_code=500, detail=f"백업 생성에 실패했습니다: {job.error}")
+
+        if job is not None and job.status == BackupJobStatus.RUNNING:
+            logger.info(
+                f"📡 download_backup 생성 중 스트리밍 - 조직: {current_org_id}, 사용자: {current_user.email}, 파일: {normalized_name}, 진행률: {job.progress}%"
+            )
+            return StreamingResponse(
+                stream_backup_file(backup_path),
+                media_type='application/zip',
+                headers={"Content-Disposition": f'attachment; filename="{normalized_name}"'}
+            )
+
         logger.info(
             f"✅ download_backup 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 파일: {normalized_name}"
         )
@@ -747,49 +726,62 @@ async def restore_mails(
             with zipfile.ZipFile(temp_file_path, 'r') as zipf:
                 logger.info(f"📦 ZIP 파일 내용: {zipf.namelist()}")
                 
-                # mails.json 파일 읽기
-                if 'mails.json' not in zipf.namelist():
+                # 스트리밍 백업 형식 (mails.ndjson, 한 줄에 메일 한 건)
+                if NDJSON_ENTRY in zipf.namelist():
+                    try:
+                        with zipf.open(NDJSON_ENTRY) as ndjson:
+                            mail_data = [
+                                json.loads(line) for line in io.TextIOWrapper(ndjson, encoding='utf-8') if line.strip()
+                            ]
+                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                        logger.error(f"❌ NDJSON 파싱 오류: {str(e)}")
+                        raise HTTPException(status_code=400, detail=f"NDJSON 파일 형식이 올바르지 않습니다: {str(e)}")
+                    logger.info(f"📊 NDJSON 파싱 성공 - 메일 데이터 개수: {len(mail_data)}개")
+                
+                # mails.json 파일 읽기 (이전 백업 형식)
+                elif 'mails.json' not in zipf.namelist():
                     logger.error(f"❌ mails.json 파일이 ZIP에 없습니다. 파일 목록: {zipf.namelist()}")
                     raise HTTPException(status_code=400, detail="Invalid backup file format")
                 
-                # JSON 파일을 바이트로 읽고 다양한 인코딩으로 디코딩 시도
-                json_bytes = zipf.read('mails.json')
-                logger.info(f"📄 JSON 파일 크기: {len(json_bytes)} bytes")
+                else:
+                    # JSON 파일을 바이트로 읽고 다양한 인코딩으로 디코딩 시도
+                    json_bytes = zipf.read('mails.json')
+                    logger.info(f"📄 JSON 파일 크기: {len(json_bytes)} bytes")
                 
-                # 다양한 인코딩 형식 시도
-                encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin-1']
-                json_content = None
+                    # 다양한 인코딩 형식 시도
+                    encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin-1']
+                    json_content = None
                 
-                for encoding in encodings:
-                    try:
-                        json_content = json_bytes.decode(encoding)
-                        logger.info(f"📄 JSON 파일 인코딩 감지: {encoding}")
-                        break
-                    except UnicodeDecodeError:
-                        continue
+                    for encoding in encodings:
+                        try:
+                            json_content = json_bytes.decode(encoding)
+                            logger.info(f"📄 JSON 파일 인코딩 감지: {encoding}")
+                            break
+                        except UnicodeDecodeError:
+                            continue
                 
-                if json_content is None:
-                    logger.error(f"❌ JSON 파일 인코딩을 감지할 수 없습니다")
-                    raise HTTPException(status_code=400, detail="JSON 파일 인코딩을 감지할 수 없습니다")
+                    if json_content is None:
+                        logger.error(f"❌ JSON 파일 인코딩을 감지할 수 없습니다")
+                        raise HTTPException(status_code=400, detail="JSON 파일 인코딩을 감지할 수 없습니다")
                 
-                logger.info(f"📄 JSON 내용 길이: {len(json_content)} characters")
-                logger.info(f"📄 JSON 내용 미리보기: {json_content[:200]}...")
+                    logger.info(f"📄 JSON 내용 길이: {len(json_content)} characters")
+                    logger.info(f"📄 JSON 내용 미리보기: {json_content[:200]}...")
                 
-                # JSON 파싱
-                try:
-                    mail_data = json.loads(json_content)
-                    logger.info(f"📊 JSON 파싱 성공 - 데이터 타입: {type(mail_data)}")
-                    if isinstance(mail_data, list):
-                        logger.info(f"📊 메일 데이터 개수: {len(mail_data)}개")
-                        if len(mail_data) > 0:
-                            logger.info(f"📧 첫 번째 메일 샘플: {mail_data[0]}")
-                    else:
-                        logger.warning(f"⚠️ 예상하지 못한 데이터 구조: {type(mail_data)}")
-                        logger.warning(f"⚠️ 데이터 내용: {mail_data}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ JSON 파싱 오류: {str(e)}")
-                    logger.error(f"JSON 내용: {json_content[:1000]}")
-                    raise HTTPException(status_code=400, detail=f"JSON 파일 형식이 올바르지 않습니다: {str(e)}")
+                    # JSON 파싱
+                    try:
+                        mail_data = json.loads(json_content)
+                        logger.info(f"📊 JSON 파싱 성공 - 데이터 타입: {type(mail_data)}")
+                        if isinstance(mail_data, list):
+                            logger.info(f"📊 메일 데이터 개수: {len(mail_data)}개")
+                            if len(mail_data) > 0:
+                                logger.info(f"📧 첫 번째 메일 샘플: {mail_data[0]}")
+                        else:
+                            logger.warning(f"⚠️ 예상하지 못한 데이터 구조: {type(mail_data)}")
+                            logger.warning(f"⚠️ 데이터 내용: {mail_data}")
+                    except json.JSONDecodeError as e:
+                        logger.error(f"❌ JSON 파싱 오류: {str(e)}")
+                        logger.error(f"JSON 내용: {json_content[:1000]}")
+                        raise HTTPException(status_code=400, detail=f"JSON 파일 형식이 올바르지 않습니다: {str(e)}")
             
             # 현재 사용자의 MailUser 정보 가져오기
             mail_user = db.query(MailUser).filter(
@@ -959,119 +951,15 @@ async def get_mail_analytics(
         if not mail_user:
             raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
         
-        # 기간 설정
-        now = datetime.utcnow()
-        if period == "week":
-            start_date = now - timedelta(weeks=1)
-        elif period == "month":
-            start_date = now - timedelta(days=30)
-        elif period == "year":
-            start_date = now - timedelta(days=365)
-        else:
-            start_date = now - timedelta(days=30)  # 기본값
-        
-        # 보낸 메일 통계 (조직별 격리)
-        sent_mails = db.query(Mail).filter(
-            and_(
-                Mail.sender_uuid == mail_user.user_uuid,
-                Mail.org_id == current_org_id,
-                Mail.created_at >= start_date,
-                Mail.status == 'sent'
-            )
-        ).all()
-        
-        # 받은 메일 통계 (조직별 격리)
-        received_mails = db.query(Mail).join(
-            MailRecipient, Mail.mail_uuid == MailRecipient.mail_uuid
-        ).filter(
-            and_(
-                MailRecipient.recipient_uuid == mail_user.user_uuid,
-                Mail.org_id == current_org_id,
-                Mail.created_at >= start_date
-            )
-        ).all()
-        
-        # 일별 통계
-        daily_stats = {}
-        for i in range((now - start_date).days + 1):
-            date = start_date + timedelta(days=i)
-            date_str = date.strftime('%Y-%m-%d')
-            daily_stats[date_str] = {
-                "sent": 0,
-                "received": 0
-            }
-        
-        for mail in sent_mails:
-            date_str = mail.created_at.strftime('%Y-%m-%d')
-            if date_str in daily_stats:
-                daily_stats[date_str]["sent"] += 1
-        
-        for mail in received_mails:
-            date_str = mail.created_at.strftime('%Y-%m-%d')
-            if date_str in daily_stats:
-                daily_stats[date_str]["received"] += 1
-        
-        # 우선순위별 통계
-        priority_stats = {
-            "high": 0,
-            "normal": 0,
-            "low": 0
-        }
-        
-        all_mails = sent_mails + received_mails
-        for mail in all_mails:
-            if mail.priority == 'high':
-                priority_stats["high"] += 1
-            elif mail.priority == 'low':
-                priority_stats["low"] += 1
-            else:
-                priority_stats["normal"] += 1
-        
-        # 상위 발신자/수신자 통계
-        sender_stats = {}
-        recipient_stats = {}
-        
-        for mail in received_mails:
-            sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
-            if sender:
-                sender_email = sender.email
-                sender_stats[sender_email] = sender_stats.get(sender_email, 0) + 1
-        
-        for mail in sent_mails:
-            recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-            for recipient in recipients:
-                recipient_email = recipient.recipient_email
-                recipient_stats[recipient_email] = recipient_stats.get(recipient_email, 0) + 1
+        # 일별/우선순위/상위 발신자·수신자를 SQL 로 집계 (지난 날짜 구간은 캐시)
+        data = MailAnalyticsService(db).get_analytics(current_org_id, mail_user.user_uuid, period)
         
-        # 상위 5개만 선택
-        top_senders = sorted(sender_stats.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_recipients = sorted(recipient_stats.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        logger.info(f"✅ get_mail_analytics 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 보낸메일: {len(sent_mails)}개, 받은메일: {len(received_mails)}개")
+        logger.info(f"✅ get_mail_analytics 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 보낸메일: {data['summary']['total_sent']}개, 받은메일: {data['summary']['total_received']}개")
         
         return {
             "success": True,
             "message": "메일 분석 조회 성공",
-            "data": {
-                "period": period,
-                "start_date": start_date.isoformat(),
-                "end_date": now.isoformat(),
-                "summary": {
-                    "total_sent": len(sent_mails),
-                    "total_received": len(received_mails),
-                    "total_mails": len(all_mails)
-                },
-                "daily_stats": daily_stats,
-                "priority_stats": priority_stats,
-                "top_senders": [{
-                    "email": email,
-                    "count": count
-                } for email, count in top_senders],
-                "top_recipients": [{
-                    "email": email,
-                    "count": count
-                } for email, count in top_recipients]
-            }
+            "data": data
         }
         
     except Exception as e:
@@ -1,14 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, Form
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, or_, desc, asc, func, select
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone
 import logging
 
-from ..database.user import get_db
+from ..database.user import get_db, get_async_db
 from ..model.user_model import User
-from ..model.mail_model import Mail, MailUser, MailRecipient, MailAttachment, MailFolder, MailInFolder, MailLog
+from ..model.mail_model import Mail, MailUser, MailRecipient, MailAttachment, MailFolder, MailInFolder, MailLog, FolderCounter
 from ..model.organization_model import Organization, OrganizationUsage, OrganizationSettings
 from ..schemas.mail_schema import (
     MailSearchRequest, MailSearchResponse, MailStatsResponse, APIResponse,
@@ -22,9 +23,10 @@ from ..schemas.mail_schema import (
     FiltersResponse, SavedSearchItem, SavedSearchesResponse, DateRange,
     AttachmentItem, AttachmentsResponse, VirusScanRequest, VirusScanResponse, VirusScanResultItem, AttachmentPreviewResponse
 )
-from ..service.auth_service import get_current_user
+from ..service.auth_service import get_current_user, get_current_user_async, get_current_mail_user_async
 from ..middleware.tenant_middleware import get_current_org_id
 from ..service.mail_service import MailService
+from ..service.mail_list_service import MailListService, text_search_condition
 from ..service.virus_scan_service import get_virus_scanner
 from ..config import settings
 import json
@@ -112,35 +114,9 @@ async def search_mails(
             )
         )
         
-        # 검색 조건 적용 (FTS + 부분일치 병행)
+        # 검색 조건 적용 (search_vector GIN 전문 검색 + 트라이그램 부분일치 병행)
         if search_request.query:
-            search_term = f"%{search_request.query}%"
-            # PostgreSQL FTS: subject + body_text 결합하여 검색
-            try:
-                fts_vector = func.to_tsvector(
-                    'simple',
-                    func.concat(
-                        func.coalesce(Mail.subject, ''),
-                        ' ',
-                        func.coalesce(Mail.body_text, '')
-                    )
-                )
-                fts_query = func.plainto_tsquery('simple', search_request.query)
-                query = query.filter(
-                    or_(
-                        fts_vector.op('@@')(fts_query),
-                        Mail.subject.ilike(search_term),
-                        Mail.body_text.ilike(search_term)
-                    )
-                )
-            except Exception:
-                # FTS 사용 불가 시 부분일치만 수행
-                query = query.filter(
-                    or_(
-                        Mail.subject.ilike(search_term),
-                        Mail.body_text.ilike(search_term)
-                    )
-                )
+            query = query.filter(text_search_condition(db, search_request.query))
         
         # 발신자 필터
         if search_request.sender_email:
@@ -222,77 +198,33 @@ async def search_mails(
         if search_request.priority:
             query = query.filter(Mail.priority == search_request.priority)
 
-        # 전체 개수
-        total_count = query.count()
-
-        # 기본 정렬: 최신순
-        query = query.order_by(desc(Mail.created_at))
-
-        # 페이지네이션
+        # 페이지 구성 (오프셋 또는 (created_at, mail_uuid) 커서 방식)
         page = search_request.page or 1
         limit = search_request.limit or 20
-        offset = (page - 1) * limit
-        mails = query.offset(offset).limit(limit).all()
-        
-        # 결과 구성
-        mail_list = []
-        for mail in mails:
-            # 발신자 정보
-            sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
-            if sender:
-                sender_response = MailUserResponse(
-                    user_uuid=sender.user_uuid,
-                    email=sender.email,
-                    display_name=sender.display_name,
-                    is_active=sender.is_active,
-                    created_at=sender.created_at,
-                    updated_at=sender.updated_at
-                )
-            else:
-                # 발신자가 없는 경우 None으로 설정
-                sender_response = None
-            
-            # 수신자 개수
-            recipient_count = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).count()
-            
-            # 첨부파일 개수
-            attachment_count = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).count()
-            
-            # 현재 사용자의 읽음 상태 확인 (MailRecipient 모델에 is_read 필드가 없으므로 기본값 사용)
-            current_recipient = db.query(MailRecipient).filter(
-                and_(
-                    MailRecipient.mail_uuid == mail.mail_uuid,
-                    MailRecipient.recipient_uuid == mail_user.user_uuid
-                )
-            ).first()
-            is_read = False  # 기본값으로 설정 (추후 읽음 상태 추적 기능 구현 필요)
-            
-            mail_list.append({
-                "id": mail.mail_uuid,
-                "mail_uuid": mail.mail_uuid,
-                "subject": mail.subject,
-                "status": mail.status,
-                "is_draft": mail.is_draft,
-                "priority": mail.priority,
-                "sent_at": mail.sent_at,
-                "created_at": mail.created_at,
-                "sender": sender_response,
-                "recipient_count": recipient_count,
-                "attachment_count": attachment_count,
-                "is_read": is_read
-            })
-        
-        # 총 페이지 수 계산
-        total_pages = (total_count + limit - 1) // limit
+        try:
+            list_page = MailListService(db).paginate_mails(
+                query,
+                mail_user=mail_user,
+                page=page,
+                limit=limit,
+                cursor=search_request.cursor,
+                use_cursor=search_request.use_cursor,
+                include_total=search_request.include_total
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        mail_list = list_page.mails
         
         logger.info(f"✅ search_mails 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 검색 결과: {len(mail_list)}개")
         
         return MailSearchResponse(
             mails=mail_list,
-            total=total_count,
+            total=list_page.total,
             page=page,
             limit=limit,
-            total_pages=total_pages
+            total_pages=list_page.total_pages,
+            has_next=list_page.has_next,
+            next_cursor=list_page.next_cursor
         )
         
     except HTTPException:
@@ -304,105 +236,65 @@ async def search_mails(
 
 @router.get("/stats", response_model=MailStatsResponse, summary="메일 통계")
 async def get_mail_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
+    db: AsyncSession = Depends(get_async_db),
     current_org_id: str = Depends(get_current_org_id)
 ) -> MailStatsResponse:
     """메일 통계 조회"""
     try:
         logger.info(f"📊 get_mail_stats 시작 - 조직: {current_org_id}, 사용자: {current_user.email}")
         
-        # 메일 사용자 조회 (조직별 필터링 추가)
-        mail_user = db.query(MailUser).filter(
-            MailUser.user_uuid == current_user.user_uuid,
-            MailUser.org_id == current_org_id
-        ).first()
-        
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
-        
-        # 보낸 메일 수 (조직별 필터링 추가)
-        sent_count = db.query(Mail).filter(
-            and_(
-                Mail.org_id == current_org_id,
-                Mail.sender_uuid == mail_user.user_uuid,
-                Mail.status == MailStatus.SENT
-            )
-        ).count()
-        
-        # 받은 메일 수 계산
-        inbox_folder = db.query(MailFolder).filter(
-            and_(
-                MailFolder.user_uuid == mail_user.user_uuid,
-                MailFolder.folder_type == FolderType.INBOX
-            )
-        ).first()
-        
-        received_count = 0
-        unread_count = 0
-        if inbox_folder:
-            received_count = db.query(Mail).join(
-                MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid
-            ).filter(
+        # 보낸/임시보관 메일 수 (상태별 GROUP BY 한 번으로 조회, 조직별 필터링)
+        # 보낸 메일 수는 기존 응답과 같이 상태 기준 (보낸편지함 폴더 카운터는 폴더 목록에서 사용)
+        status_counts = {getattr(status, "value", status): count for status, count in (await db.execute(
+            select(Mail.status, func.count()).where(
                 and_(
                     Mail.org_id == current_org_id,
-                    MailInFolder.folder_uuid == inbox_folder.folder_uuid
+                    Mail.sender_uuid == mail_user.user_uuid,
+                    Mail.status.in_([MailStatus.SENT, MailStatus.DRAFT])
                 )
-            ).count()
-            
-            # 읽지 않은 메일 수 (현재는 모든 받은 메일을 읽지 않음으로 처리)
-            # TODO: 읽음 상태 추적을 위한 별도 테이블 필요
-            unread_count = received_count
-        
-        # 임시보관함 메일 수 (조직별 필터링 추가)
-        draft_count = db.query(Mail).filter(
-            and_(
-                Mail.org_id == current_org_id,
-                Mail.sender_uuid == mail_user.user_uuid,
-                Mail.status == MailStatus.DRAFT
-            )
-        ).count()
-        
-        # 휴지통 메일 수
-        trash_folder = db.query(MailFolder).filter(
-            and_(
-                MailFolder.user_uuid == mail_user.user_uuid,
-                MailFolder.folder_type == FolderType.TRASH
-            )
-        ).first()
-        
-        trash_count = 0
-        if trash_folder:
-            trash_count = db.query(Mail).join(
-                MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid
-            ).filter(
+            ).group_by(Mail.status)
+        )).all()}
+        sent_count = status_counts.get(MailStatus.SENT.value, 0)
+        draft_count = status_counts.get(MailStatus.DRAFT.value, 0)
+        
+        # 받은 메일 수 / 읽지 않은 메일 수 (받은편지함 폴더 카운터)
+        inbox_row = (await db.execute(
+            select(MailFolder.folder_uuid, FolderCounter.total_count, FolderCounter.unread_count)
+            .outerjoin(FolderCounter, FolderCounter.folder_uuid == MailFolder.folder_uuid)
+            .where(
                 and_(
-                    Mail.org_id == current_org_id,
-                    MailInFolder.folder_uuid == trash_folder.folder_uuid
+                    MailFolder.user_uuid == mail_user.user_uuid,
+                    MailFolder.folder_type == FolderType.INBOX
                 )
-            ).count()
+            )
+        )).first()
+        
+        inbox_folder_uuid = inbox_row.folder_uuid if inbox_row else None
+        received_count = max(inbox_row.total_count or 0, 0) if inbox_row else 0
+        unread_count = max(inbox_row.unread_count or 0, 0) if inbox_row else 0
         
         # 오늘 발송/수신 메일 수 계산
         today = datetime.now().date()
-        today_sent = db.query(Mail).filter(
+        today_sent = (await db.execute(select(func.count()).select_from(Mail).where(
             and_(
                 Mail.sender_uuid == mail_user.user_uuid,
                 Mail.status == MailStatus.SENT,
                 func.date(Mail.sent_at) == today
             )
-        ).count()
+        ))).scalar_one()
         
         today_received = 0
-        if inbox_folder:
-            today_received = db.query(Mail).join(
+        if inbox_folder_uuid:
+            today_received = (await db.execute(select(func.count()).select_from(Mail).join(
                 MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid
-            ).filter(
+            ).where(
                 and_(
-                    MailInFolder.folder_uuid == inbox_folder.folder_uuid,
+                    MailInFolder.folder_uuid == inbox_folder_uuid,
                     func.date(Mail.created_at) == today
                 )
-            ).count()
+            ))).scalar_one()
         
         from ..schemas.mail_schema import MailStats
         
@@ -557,32 +449,23 @@ async def get_org_usage_history(
 async def get_unread_mails(
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 메일 수"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
+    db: AsyncSession = Depends(get_async_db),
     current_org_id: str = Depends(get_current_org_id)
 ) -> APIResponse:
     """읽지 않은 메일만 조회"""
     try:
         logger.info(f"📧 get_unread_mails 시작 - 조직: {current_org_id}, 사용자: {current_user.email}")
         
-        # 메일 사용자 조회 (조직별 필터링 추가)
-        mail_user = db.query(MailUser).filter(
-            MailUser.user_uuid == current_user.user_uuid,
-            MailUser.org_id == current_org_id
-        ).first()
-        
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
-        
         # 받은편지함 폴더 조회 (조직별 필터링 추가)
-        inbox_folder = db.query(MailFolder).filter(
+        inbox_folder = (await db.execute(select(MailFolder).where(
             and_(
                 MailFolder.user_uuid == mail_user.user_uuid,
                 MailFolder.org_id == current_org_id,
                 MailFolder.folder_type == FolderType.INBOX
             )
-        ).first()
+        ))).scalars().first()
         
         if not inbox_folder:
             return APIResponse(
@@ -601,9 +484,9 @@ async def get_unread_mails(
         
         # 읽지 않은 메일 쿼리 (조직별 필터링 및 읽지 않은 상태 필터링 추가)
         # MailRecipient 조인 제거 - 받은편지함 API와 동일한 방식 사용
-        query = db.query(Mail).join(
+        query = select(Mail).join(
             MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid
-        ).filter(
+        ).where(
             and_(
                 Mail.org_id == current_org_id,
                 MailInFolder.folder_uuid == inbox_folder.folder_uuid,
@@ -614,34 +497,36 @@ async def get_unread_mails(
             )
         )
         
-        # 전체 개수
-        total_count = query.count()
+        # 전체 개수 (받은편지함 폴더 카운터의 읽지 않은 메일 수)
+        total_count = max((await db.execute(
+            select(FolderCounter.unread_count).where(FolderCounter.folder_uuid == inbox_folder.folder_uuid)
+        )).scalar() or 0, 0)
         
         # 페이지네이션
         offset = (page - 1) * limit
-        mails = query.order_by(desc(Mail.created_at)).offset(offset).limit(limit).all()
+        mails = (await db.execute(query.order_by(desc(Mail.created_at)).offset(offset).limit(limit))).scalars().all()
         
         # 결과 구성
         mail_list = []
         for mail in mails:
             # 발신자 정보
-            sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
+            sender = (await db.execute(select(MailUser).where(MailUser.user_uuid == mail.sender_uuid))).scalars().first()
             sender_email = sender.email if sender else "Unknown"
             
             # 수신자 정보
-            recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
+            recipients = (await db.execute(select(MailRecipient).where(MailRecipient.mail_uuid == mail.mail_uuid))).scalars().all()
             to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
             
             # 현재 사용자의 읽음 상태 확인 (MailInFolder에서)
-            mail_in_folder = db.query(MailInFolder).filter(
+            mail_in_folder = (await db.execute(select(MailInFolder).where(
                 MailInFolder.mail_uuid == mail.mail_uuid,
                 # MailInFolder.org_id == current_org_id,
                 MailInFolder.user_uuid == mail_user.user_uuid
-            ).first()
+            ))).scalars().first()
             is_read = mail_in_folder.is_read if mail_in_folder else False
             
             # 첨부파일 개수
-            attachment_count = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).count()
+            attachment_count = (await db.execute(select(func.count()).select_from(MailAttachment).where(MailAttachment.mail_uuid == mail.mail_uuid))).scalar_one()
             
             mail_list.append({
                 "id": mail.mail_uuid,
@@ -801,29 +686,20 @@ async def get_starred_mails(
 @router.post("/{mail_uuid}/read", response_model=APIResponse, summary="메일 읽음 처리")
 async def mark_mail_as_read(
     mail_uuid: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
+    db: AsyncSession = Depends(get_async_db),
     current_org_id: str = Depends(get_current_org_id)
 ) -> APIResponse:
     """메일 읽음 처리"""
     try:
         logger.info(f"📧 mark_mail_as_read 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
-        # 메일 사용자 조회 (조직별 필터링 추가)
-        mail_user = db.query(MailUser).filter(
-            MailUser.user_uuid == current_user.user_uuid,
-            MailUser.org_id == current_org_id
-        ).first()
-        
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
-        
         # 메일 조회 (조직별 필터링 추가)
-        mail = db.query(Mail).filter(
+        mail = (await db.execute(select(Mail).where(
             Mail.mail_uuid == mail_uuid,
             Mail.org_id == current_org_id
-        ).first()
+        ))).scalars().first()
         
         if not mail:
             logger.warning(f"⚠️ 메일을 찾을 수 없음 - 조직: {current_org_id}, 메일UUID: {mail_uuid}")
@@ -831,23 +707,23 @@ async def mark_mail_as_read(
         
         # 권한 확인 (발신자이거나 수신자인지 확인)
         is_sender = mail.sender_uuid == mail_user.user_uuid
-        is_recipient = db.query(MailRecipient).filter(
+        is_recipient = (await db.execute(select(MailRecipient).where(
             and_(
                 MailRecipient.mail_uuid == mail.mail_uuid,
                 MailRecipient.recipient_uuid == mail_user.user_uuid
             )
-        ).first() is not None
+        ))).scalars().first() is not None
         
         if not (is_sender or is_recipient):
             raise HTTPException(status_code=403, detail="Access denied")
         
         # MailInFolder 테이블에서 읽음 상태 업데이트
-        mail_in_folder = db.query(MailInFolder).filter(
+        mail_in_folder = (await db.execute(select(MailInFolder).where(
             and_(
                 MailInFolder.mail_uuid == mail.mail_uuid,
                 MailInFolder.user_uuid == mail_user.user_uuid
             )
-        ).first()
+        ))).scalars().first()
         
         if not mail_in_folder:
             logger.warning(f"⚠️ MailInFolder 레코드를 찾을 수 없음 - 메일UUID: {mail_uuid}, 사용자UUID: {mail_user.user_uuid}")
@@ -859,12 +735,12 @@ async def mark_mail_as_read(
         mail_in_folder.read_at = read_at
         
         # 수신자 정보 확인 (응답용)
-        recipient = db.query(MailRecipient).filter(
+        recipient = (await db.execute(select(MailRecipient).where(
             and_(
                 MailRecipient.mail_uuid == mail.mail_uuid,
                 MailRecipient.recipient_uuid == mail_user.user_uuid
             )
-        ).first()
+        ))).scalars().first()
         
         # 로그 기록
         log_entry = MailLog(
@@ -877,7 +753,7 @@ async def mark_mail_as_read(
             user_agent=None   # TODO: 실제 User-Agent 추가
         )
         db.add(log_entry)
-        db.commit()
+        await db.commit()
         
         logger.info(f"✅ mark_mail_as_read 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
@@ -894,7 +770,7 @@ async def mark_mail_as_read(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ mark_mail_as_read 오류 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}, 에러: {str(e)}")
         return APIResponse(
             success=False,
@@ -906,50 +782,42 @@ async def mark_mail_as_read(
 @router.post("/{mail_uuid}/unread", response_model=APIResponse, summary="메일 읽지 않음 처리")
 async def mark_mail_as_unread(
     mail_uuid: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> APIResponse:
     """메일 읽지 않음 처리"""
     try:
         logger.info(f"📧 mark_mail_as_unread 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
-        # 메일 사용자 조회 (조직별 격리)
-        mail_user = db.query(MailUser).filter(
-            MailUser.user_uuid == current_user.user_uuid,
-            MailUser.org_id == current_org_id
-        ).first()
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
-        
         # 메일 조회 (조직별 격리)
-        mail = db.query(Mail).filter(
+        mail = (await db.execute(select(Mail).where(
             Mail.mail_uuid == mail_uuid,
             Mail.org_id == current_org_id
-        ).first()
+        ))).scalars().first()
         if not mail:
             raise HTTPException(status_code=404, detail="메일을 찾을 수 없습니다")
         
         # 권한 확인 (발신자이거나 수신자인지 확인)
         is_sender = mail.sender_uuid == mail_user.user_uuid
-        is_recipient = db.query(MailRecipient).filter(
+        is_recipient = (await db.execute(select(MailRecipient).where(
             and_(
                 MailRecipient.mail_uuid == mail.mail_uuid,
                 MailRecipient.recipient_uuid == mail_user.user_uuid
             )
-        ).first() is not None
+        ))).scalars().first() is not None
         
         if not (is_sender or is_recipient):
             raise HTTPException(status_code=403, detail="Access denied")
         
         # MailInFolder 테이블에서 읽지 않음 상태 업데이트
-        mail_in_folder = db.query(MailInFolder).filter(
+        mail_in_folder = (await db.execute(select(MailInFolder).where(
             and_(
                 MailInFolder.mail_uuid == mail.mail_uuid,
                 MailInFolder.user_uuid == mail_user.user_uuid
             )
-        ).first()
+        ))).scalars().first()
         
         if not mail_in_folder:
             logger.warning(f"⚠️ MailInFolder 레코드를 찾을 수 없음 - 메일UUID: {mail_uuid}, 사용자UUID: {mail_user.user_uuid}")
@@ -958,7 +826,7 @@ async def mark_mail_as_unread(
         # 읽지 않음 상태 업데이트
         mail_in_folder.is_read = False
         mail_in_folder.read_at = None
-        db.commit()
+        await db.commit()
         
         # 로그 기록
         log_entry = MailLog(
@@ -971,7 +839,7 @@ async def mark_mail_as_unread(
             user_agent=None   # TODO: 실제 User-Agent 추가
         )
         db.add(log_entry)
-        db.commit()
+        await db.commit()
         
         logger.info(f"✅ mark_mail_as_unread 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
@@ -986,7 +854,7 @@ async def mark_mail_as_unread(
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ mark_mail_as_unread 오류 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}, 에러: {str(e)}")
         return APIResponse(
             success=False,
@@ -1281,8 +1149,7 @@ async def get_search_suggestions(
             raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
         
         suggestions = []
-        
-        # 제목에서 검색 (조직별 필터링 추가)
+        # 제목에서 검색 (조직별 필터링 추가, 부분일치는 ix_mails_subject_trgm 트라이그램 인덱스 사용)
         subject_suggestions = db.query(Mail.subject).filter(
             and_(
                 Mail.org_id == current_org_id,
@@ -1689,7 +1556,6 @@ async def virus_scan_attachments(
         if not settings.VIRUS_SCAN_ENABLED:
             raise HTTPException(status_code=503, detail="바이러스 검사 기능이 비활성화되어 있습니다")
         
-        results: List[VirusScanResultItem] = []
         infected_count = 0
         
         # 바이러스 스캐너 인스턴스 가져오기
@@ -1697,12 +1563,15 @@ async def virus_scan_attachments(
         
         logger.info(f"🦠 바이러스 검사 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 첨부파일 수: {len(req.attachment_uuids)}")
 
+        # 1단계: 첨부파일 확인 (검증 실패는 결과 자리에 바로 기록)
+        slots: List[Optional[VirusScanResultItem]] = []
+        to_scan: List[Tuple[int, MailAttachment, str]] = []
         for att_uuid in req.attachment_uuids:
             try:
                 # 첨부파일 및 조직 소속 확인
                 attachment = db.query(MailAttachment).filter(MailAttachment.attachment_uuid == att_uuid).first()
                 if not attachment:
-                    results.append(VirusScanResultItem(
+                    slots.append(VirusScanResultItem(
                         attachment_uuid=att_uuid,
                         status="error",
                         engine="validation",
@@ -1713,7 +1582,7 @@ async def virus_scan_attachments(
 
                 mail = db.query(Mail).filter(Mail.mail_uuid == attachment.mail_uuid).first()
                 if not mail or mail.org_id != current_org_id:
-                    results.append(VirusScanResultItem(
+                    slots.append(VirusScanResultItem(
                         attachment_uuid=att_uuid,
                         status="error",
                         engine="validation",
@@ -1725,7 +1594,7 @@ async def virus_scan_attachments(
                 # 안전한 경로 해석 후 존재 여부 확인
                 resolved_path = _resolve_attachment_path(attachment)
                 if not resolved_path or not os.path.exists(resolved_path):
-                    results.append(VirusScanResultItem(
+                    slots.append(VirusScanResultItem(
                         attachment_uuid=att_uuid,
                         status="error",
                         engine="validation",
@@ -1737,7 +1606,7 @@ async def virus_scan_attachments(
                 # 파일 크기 확인
                 file_size_mb = os.path.getsize(resolved_path) / (1024 * 1024)
                 if file_size_mb > settings.VIRUS_SCAN_MAX_FILE_SIZE_MB:
-                    results.append(VirusScanResultItem(
+                    slots.append(VirusScanResultItem(
                         attachment_uuid=att_uuid,
                         status="error",
                         engine="validation",
@@ -1746,36 +1615,13 @@ async def virus_scan_attachments(
                     ))
                     continue
 
-                # ClamAV 바이러스 검사 수행
-                logger.info(f"🔍 바이러스 검사 수행 - 파일: {attachment.filename}, 크기: {file_size_mb:.1f}MB")
-                scan_result = virus_scanner.scan_file(resolved_path)
-                
-                # 결과 변환
-                if scan_result.error_message:
-                    status = "error"
-                    message = scan_result.error_message
-                elif scan_result.is_infected:
-                    status = "infected"
-                    message = f"바이러스 발견: {scan_result.virus_name}"
-                    infected_count += 1
-                    
-                    # 감염된 파일 로깅
-                    logger.warning(f"🦠 바이러스 발견 - 조직: {current_org_id}, 파일: {attachment.filename}, 바이러스: {scan_result.virus_name}")
-                else:
-                    status = "clean"
-                    message = None
-
-                results.append(VirusScanResultItem(
-                    attachment_uuid=att_uuid,
-                    status=status,
-                    engine=scan_result.engine,
-                    message=message,
-                    sha256=scan_result.file_hash
-                ))
+                logger.info(f"🔍 바이러스 검사 대상 - 파일: {attachment.filename}, 크기: {file_size_mb:.1f}MB")
+                to_scan.append((len(slots), attachment, resolved_path))
+                slots.append(None)
                 
             except Exception as inner_e:
                 logger.error(f"❌ 첨부파일 바이러스 검사 중 오류 - 첨부UUID: {att_uuid}, 에러: {str(inner_e)}")
-                results.append(VirusScanResultItem(
+                slots.append(VirusScanResultItem(
                     attachment_uuid=att_uuid,
                     status="error",
                     engine="system_error",
@@ -1783,6 +1629,35 @@ async def virus_scan_attachments(
                     sha256=None
                 ))
 
+        # 2단계: 스레드 풀에서 병렬 검사 (업로드 시 저장한 해시로 캐시 조회, 같은 내용은 한 번만 검사)
+        scan_results = await virus_scanner.scan_files(
+            [(resolved_path, attachment.content_sha256) for _, attachment, resolved_path in to_scan]
+        )
+        for (slot, attachment, _), scan_result in zip(to_scan, scan_results):
+            # 결과 변환
+            if scan_result.error_message:
+                status = "error"
+                message = scan_result.error_message
+            elif scan_result.is_infected:
+                status = "infected"
+                message = f"바이러스 발견: {scan_result.virus_name}"
+                infected_count += 1
+                
+                # 감염된 파일 로깅
+                logger.warning(f"🦠 바이러스 발견 - 조직: {current_org_id}, 파일: {attachment.filename}, 바이러스: {scan_result.virus_name}")
+            else:
+                status = "clean"
+                message = None
+
+            slots[slot] = VirusScanResultItem(
+                attachment_uuid=attachment.attachment_uuid,
+                status=status,
+                engine=scan_result.engine,
+                message=message,
+                sha256=scan_result.file_hash
+            )
+        results = [item for item in slots if item is not None]
+
         # 검사 완료 로깅
         logger.info(f"✅ 바이러스 검사 완료 - 조직: {current_org_id}, 총 파일: {len(req.attachment_uuids)}, 감염: {infected_count}")
         
@@ -2013,7 +1888,7 @@ async def process_scheduled_mails(
 
             atts = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).all()
             attachments = [
-                {"file_path": a.file_path, "filename": a.filename}
+                {"file_path": a.file_path, "filename": a.filename, "content_type": a.content_type}
                 for a in atts if a.file_path
             ]
 
@@ -2024,7 +1899,8 @@ async def process_scheduled_mails(
                 body_text=mail.body_text or "",
                 body_html=mail.body_html,
                 org_id=current_org_id,
-                attachments=attachments
+                attachments=attachments,
+                mail=mail
             )
 
             if result.get("success"):
@@ -1,41 +1,45 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query, Form, status, Request
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, asc, select
 from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 import os
 import uuid
 import shutil
 from datetime import datetime, timedelta
-import mimetypes
 import logging
 import json
 
-from ..database.user import get_db
+from ..database.user import get_db, get_async_db
 from ..model.user_model import User
 from ..model.mail_model import FolderType, Mail, MailUser, MailRecipient, MailAttachment, MailFolder, MailInFolder, MailLog, generate_mail_uuid
 from ..model import Organization
 from ..schemas.mail_schema import (
     APIResponse,
     MailSendRequest,
-    MailListResponse,
     MailSendResponse,
     MailDetailResponse,
     MailListWithPaginationResponse,
-    MailUserResponse,
     RecipientResponse,
     AttachmentResponse,
-    PaginationResponse,
     RecipientType,
     MailStatus,
     MailPriority,
 )
 from ..service.mail_service import MailService
+from ..service.attachment_blob_store import AttachmentBlobStore
+from ..service.attachment_upload_service import StoredAttachment, discard_stored, store_upload
+from ..service.virus_scan_service import get_virus_scanner
+from ..service.mail_list_service import MailListService
+from ..service.mail_queue_service import MailJob, get_mail_queue
+from ..service.mail_recipient_service import MailRecipientService, split_addresses
 from ..service.organization_service import OrganizationService
-from ..service.auth_service import get_current_user
+from ..service.auth_service import get_current_user, get_current_user_async, get_current_mail_user_async
 from ..middleware.tenant_middleware import get_current_org_id, get_current_organization
+from ..config import settings
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -173,6 +177,28 @@ async def safe_attachments_handler(
         return None
 
 
+async def _enqueue_outbound_mail(db: Session, mail: Mail, mail_user: MailUser, org_id: str) -> None:
+    """
+    저장된 queued 메일을 발송 큐에 등록합니다.
+
+    큐 등록에 실패하면 메일을 failed로 표시하고 503을 반환합니다.
+    """
+    try:
+        await get_mail_queue().enqueue(MailJob(mail_uuid=mail.mail_uuid, org_id=org_id))
+    except Exception as queue_error:
+        logger.error(f"❌ 메일 발송 대기열 등록 실패 - 조직: {org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(queue_error)}")
+        mail.status = MailStatus.FAILED
+        db.add(MailLog(
+            mail_uuid=mail.mail_uuid,
+            user_uuid=mail_user.user_uuid,
+            org_id=org_id,
+            action="SEND_FAILED",
+            details=f"발송 대기열 등록 실패: {str(queue_error)}"
+        ))
+        db.commit()
+        raise HTTPException(status_code=503, detail="메일 발송 대기열 등록에 실패했습니다. 잠시 후 다시 시도해주세요.")
+
+
 @router.post("/send", response_model=MailSendResponse, summary="메일 발송")
 async def send_mail(
     to_emails: str = Form(..., description="수신자 이메일 (쉼표로 구분)"),
@@ -196,6 +222,10 @@ async def send_mail(
     메일 발송 API
     조직 내에서 메일을 발송합니다.
     """
+    stored_attachments: List[StoredAttachment] = []
+    blob_store = AttachmentBlobStore(db)
+    # 일일 발송 제한 예약 ID (저장/등록이 실패하면 해제)
+    reservation_id = None
     try:
         logger.info(f"📤 메일 발송 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 수신자: {to_emails}")
         logger.debug(f"🔍 첨부파일 정보 - 타입: {type(attachments)}, 값: {attachments}")
@@ -206,7 +236,7 @@ async def send_mail(
             MailUser.org_id == current_org_id
         ).first()
         if not mail_user:
-            raise HTTPException(status_code=404, detail="Mail user not found in this organization")
+            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
         
         # is_draft 파라미터 처리 (콤보 선택값을 불리언으로 변환)
         is_draft_bool = (is_draft == DraftSelection.true)
@@ -221,10 +251,10 @@ async def send_mail(
             subject=subject,
             body_text=content,
             priority=priority,
-            status=MailStatus.DRAFT if is_draft_bool else MailStatus.SENT,
+            status=MailStatus.DRAFT if is_draft_bool else MailStatus.QUEUED,
             is_draft=is_draft_bool,
             created_at=datetime.utcnow(),
-            sent_at=None if is_draft_bool else datetime.utcnow(),
+            sent_at=None,  # 실제 발송 시간은 발송 워커가 기록
             message_id=str(uuid.uuid4())
         )
         
@@ -243,116 +273,15 @@ async def send_mail(
             except Exception as e:
                 logger.warning(f"⚠️ 첨부파일 자동 보정 실패: {e}")
 
-        # 수신자 처리
-        recipients = []
-        
-        # TO 수신자 처리 (조직별 격리)
-        if to_emails:
-            for email in to_emails.split(','):
-                email = email.strip()
-                if email:
-                    # 같은 조직 내에서 수신자 사용자 찾기
-                    recipient_user = db.query(MailUser).filter(
-                        MailUser.email == email,
-                        MailUser.org_id == current_org_id
-                    ).first()
-                    
-                    if not recipient_user:
-                        # 조직 내에 없는 경우 외부 사용자로 임시 생성
-                        external_user_uuid = str(uuid.uuid4())
-                        recipient_user = MailUser(
-                            user_id=f"external_{external_user_uuid[:8]}",  # user_id 필드 추가
-                            user_uuid=external_user_uuid,
-                            email=email,
-                            password_hash="external_user",  # 외부 사용자 표시
-                            is_active=False,
-                            org_id=current_org_id  # 현재 조직에 속하도록 설정
-                        )
-                        db.add(recipient_user)
-                        db.flush()
-                    
-                    recipient_type_value = RecipientType.TO.value
-                    logger.info(f"🔍 DEBUG: RecipientType.TO.value = {recipient_type_value}")
-                    logger.info(f"🔍 DEBUG: type(recipient_type_value) = {type(recipient_type_value)}")
-                    
-                    recipient = MailRecipient(
-                        mail_uuid=mail.mail_uuid,
-                        recipient_uuid=recipient_user.user_uuid,
-                        recipient_email=email,  # 누락된 recipient_email 필드 추가
-                        recipient_type=recipient_type_value
-                    )
-                    logger.info(f"🔍 DEBUG: recipient.recipient_type = {recipient.recipient_type}")
-                    logger.info(f"🔍 DEBUG: type(recipient.recipient_type) = {type(recipient.recipient_type)}")
-                    recipients.append(recipient)
-                    db.add(recipient)
-        
-        # CC 수신자 처리 (조직별 격리)
-        if cc_emails:
-            for email in cc_emails.split(','):
-                email = email.strip()
-                if email:
-                    # 같은 조직 내에서 수신자 사용자 찾기
-                    recipient_user = db.query(MailUser).filter(
-                        MailUser.email == email,
-                        MailUser.org_id == current_org_id
-                    ).first()
-                    
-                    if not recipient_user:
-                        # 조직 내에 없는 경우 외부 사용자로 임시 생성
-                        external_user_uuid = str(uuid.uuid4())
-                        recipient_user = MailUser(
-                            user_id=f"external_{external_user_uuid[:8]}",  # user_id 필드 추가
-                            user_uuid=external_user_uuid,
-                            email=email,
-                            password_hash="external_user",  # 외부 사용자 표시
-                            is_active=False,
-                            org_id=current_org_id  # 현재 조직에 속하도록 설정
-                        )
-                        db.add(recipient_user)
-                        db.flush()
-                    
-                    recipient = MailRecipient(
-                        mail_uuid=mail.mail_uuid,
-                        recipient_uuid=recipient_user.user_uuid,
-                        recipient_email=email,  # 누락된 recipient_email 필드 추가
-                        recipient_type=RecipientType.CC.value
-                    )
-                    recipients.append(recipient)
-                    db.add(recipient)
-        
-        # BCC 수신자 처리 (조직별 격리)
-        if bcc_emails:
-            for email in bcc_emails.split(','):
-                email = email.strip()
-                if email:
-                    # 같은 조직 내에서 수신자 사용자 찾기
-                    recipient_user = db.query(MailUser).filter(
-                        MailUser.email == email,
-                        MailUser.org_id == current_org_id
-                    ).first()
-                    
-                    if not recipient_user:
-                        # 조직 내에 없는 경우 외부 사용자로 임시 생성
-                        external_user_uuid = str(uuid.uuid4())
-                        recipient_user = MailUser(
-                            user_id=f"external_{external_user_uuid[:8]}",  # user_id 필드 추가
-                            user_uuid=external_user_uuid,
-                            email=email,
-                            password_hash="external_user",  # 외부 사용자 표시
-                            is_active=False,
-                            org_id=current_org_id  # 현재 조직에 속하도록 설정
-                        )
-                        db.add(recipient_user)
-                        db.flush()
-                    
-                    recipient = MailRecipient(
-                        mail_uuid=mail.mail_uuid,
-                        recipient_uuid=recipient_user.user_uuid,
-                        recipient_email=email,  # 누락된 recipient_email 필드 추가
-                        recipient_type=RecipientType.BCC.value
-                    )
-                    recipients.append(recipient)
-                    db.add(recipient)
+        # 수신자 처리 (조직별 격리) - 전체 주소를 한 번에 조회하고 외부 사용자/수신자 행은 일괄 삽입
+        recipient_service = MailRecipientService(db)
+        recipients = recipient_service.resolve(
+            org_id=current_org_id,
+            to_emails=split_addresses(to_emails),
+            cc_emails=split_addresses(cc_emails),
+            bcc_emails=split_addresses(bcc_emails)
+        )
+        recipient_service.add_recipients(mail.mail_uuid, recipients)
         
         # 조직 크기 제한 조회
         size_limits = await _get_org_size_limits(db, current_org_id)
@@ -362,60 +291,39 @@ async def send_mail(
         body_bytes = len(content.encode("utf-8")) if content else 0
         total_mail_bytes = subject_bytes + body_bytes
 
-        # 첨부파일 처리
+        # 첨부파일 처리 - 청크 단위로 디스크에 스트리밍하며 크기 제한/해시 계산 (제한 초과 시 즉시 413)
+        # clamd 를 사용할 수 있으면 디스크에 쓰는 동시에 바이러스 검사 (감염 시 422)
         attachment_list = []
+        upload_scanner = get_virus_scanner() if settings.VIRUS_SCAN_ENABLED and settings.VIRUS_SCAN_ON_UPLOAD else None
         try:
             if attachments is not None and len(attachments) > 0:
                 logger.info(f"📎 첨부파일 처리 시작 - 개수: {len(attachments)}")
                 for i, attachment in enumerate(attachments):
                     if attachment and attachment.filename:
                         logger.info(f"📎 첨부파일 처리 중 - 파일명: {attachment.filename}, 타입: {attachment.content_type}")
-                        
-                        # 파일 저장
-                        file_id = str(uuid.uuid4())
-                        file_extension = os.path.splitext(attachment.filename)[1]
-                        saved_filename = f"{file_id}{file_extension}"
-                        file_path = os.path.join(ATTACHMENT_DIR, saved_filename)
-                        
-                        # 파일 내용 저장
-                        with open(file_path, "wb") as buffer:
-                            file_content = await attachment.read()
-                            # 개별 첨부 크기 제한 확인
-                            file_size_bytes = len(file_content)
-                            if file_size_bytes > size_limits["max_attachment_bytes"]:
-                                raise HTTPException(
-                                    status_code=413,
-                                    detail=(
-                                        f"첨부파일 크기 초과: {attachment.filename} ({file_size_bytes} bytes). "
-                                        f"허용 최대: {size_limits['max_attachment_mb']} MB"
-                                    ),
-                                )
-                            buffer.write(file_content)
-                        
-                        # 첨부파일 정보 저장
-                        mail_attachment = MailAttachment(
-                            attachment_uuid=file_id,
-                            mail_uuid=mail.mail_uuid,
-                            filename=attachment.filename,
-                            file_path=file_path,
-                            file_size=os.path.getsize(file_path),
-                            content_type=attachment.content_type or mimetypes.guess_type(attachment.filename)[0]
+                        stored = await store_upload(
+                            attachment, ATTACHMENT_DIR, size_limits,
+                            mail_bytes_so_far=total_mail_bytes,
+                            virus_scanner=upload_scanner
                         )
-                        attachment_list.append(mail_attachment)
-                        db.add(mail_attachment)
-                        logger.info(f"✅ 첨부파일 저장 완료 - 파일명: {attachment.filename}, 크기: {mail_attachment.file_size}바이트")
+                        stored_attachments.append(stored)
+                        logger.info(f"✅ 첨부파일 저장 완료 - 파일명: {stored.filename}, 크기: {stored.file_size}바이트, SHA-256: {stored.sha256[:12]}")
                         # 총 메일 크기에 첨부 크기 반영
-                        total_mail_bytes += mail_attachment.file_size
+                        total_mail_bytes += stored.file_size
                     else:
                         logger.warning(f"⚠️ 유효하지 않은 첨부파일 건너뜀 - 인덱스: {i}, 파일명: {getattr(attachment, 'filename', 'None')}")
             else:
                 logger.info(f"📎 첨부파일 없음 - attachments: {attachments}")
+        except HTTPException:
+            raise
         except Exception as attachment_error:
             logger.error(f"❌ 첨부파일 처리 중 오류 발생: {str(attachment_error)}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
-            # 첨부파일 오류가 있어도 메일 발송은 계속 진행
-            attachment_list = []
+            # 첨부파일 오류가 있어도 메일 발송은 계속 진행 (저장된 파일과 크기는 제외)
+            await discard_stored(stored_attachments)
+            total_mail_bytes -= sum(stored.file_size for stored in stored_attachments)
+            stored_attachments = []
         
         # 총 메일 크기 제한 확인
         if total_mail_bytes > size_limits["max_mail_bytes"]:
@@ -427,105 +335,55 @@ async def send_mail(
                 ),
             )
         
+        # 일일 메일 발송 제한 검증 (수신자 전체 수 기준) - 초과 시 저장하지 않고 거절
+        if not is_draft_bool:
+            organization = db.query(Organization).filter(Organization.org_id == current_org_id).first()
+            if not organization:
+                raise HTTPException(status_code=404, detail="조직을 찾을 수 없습니다")
+            await MailService(db)._check_daily_email_limit(
+                org_id=current_org_id,
+                max_emails_per_day=getattr(organization, "max_emails_per_day", 0),
+                email_count=len(recipients),
+                reservation_id=mail.mail_uuid
+            )
+            reservation_id = mail.mail_uuid
+        
+        # 첨부파일을 조직 blob 저장소에 등록 (같은 내용은 한 번만 저장하고 참조 수 증가)
+        for stored in stored_attachments:
+            blob_path = await blob_store.adopt(current_org_id, stored.file_path, stored.sha256, stored.file_size)
+            mail_attachment = stored.to_model(mail.mail_uuid, file_path=blob_path)
+            attachment_list.append(mail_attachment)
+            db.add(mail_attachment)
+        
         # 메일 로그 생성
         mail_log = MailLog(
             mail_uuid=mail.mail_uuid,
             user_uuid=mail_user.user_uuid,
             org_id=current_org_id,
-            action="SEND",
-            details=f"메일 발송 - 수신자: {len(recipients)}명"
+            action="SEND" if is_draft_bool else "QUEUED",
+            details=f"메일 발송 - 수신자: {len(recipients)}명" if is_draft_bool else f"메일 발송 대기열 등록 - 수신자: {len(recipients)}명"
         )
         db.add(mail_log)
         
         # 먼저 메일과 수신자 정보를 커밋 (외래키 제약 조건 해결)
         try:
             db.commit()
+            # 커밋된 첨부파일은 이후 단계가 실패해도 삭제하지 않음
+            stored_attachments = []
+            await blob_store.after_commit()
             logger.info(f"💾 메일 및 수신자 정보 저장 완료 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
         except Exception as commit_error:
             db.rollback()
+            await blob_store.after_rollback()
             logger.error(f"❌ 메일 저장 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(commit_error)}")
             raise HTTPException(status_code=500, detail=f"메일 저장에 실패했습니다: {str(commit_error)}")
         
-        # 실제 메일 발송 (SMTP) - 임시보관함이 아닌 경우에만
-        smtp_result = {'success': True, 'error': None}  # 임시보관함의 경우 기본값
-        if not is_draft_bool:
-            try:
-                mail_service = MailService(db)
-                
-                # 첨부파일 정보를 메일 서비스 형식으로 변환
-                attachment_data = []
-                if attachment_list:
-                    for attachment in attachment_list:
-                        attachment_data.append({
-                            "filename": attachment.filename,
-                            "file_path": attachment.file_path,
-                            "file_size": attachment.file_size,
-                            "content_type": attachment.content_type
-                        })
-                
-                # 일일 메일 발송 제한 검증 (수신자 전체 수 기준)
-                organization = db.query(Organization).filter(Organization.org_id == current_org_id).first()
-                if not organization:
-                    raise HTTPException(status_code=404, detail="조직을 찾을 수 없습니다")
-                await mail_service._check_daily_email_limit(
-                    org_id=current_org_id,
-                    max_emails_per_day=getattr(organization, "max_emails_per_day", 0),
-                    email_count=len(recipients)
-                )
-                
-                smtp_result = await mail_service.send_email_smtp(
-                    sender_email=mail_user.email,
-                    recipient_emails=[r.recipient_email for r in recipients],
-                    subject=subject,
-                    body_text=content,
-                    body_html=None,  # Form 데이터에서는 HTML 본문이 없음
-                    org_id=current_org_id,
-                    attachments=attachment_data if attachment_data else None
-                )
-            
-                # SMTP 발송 결과 디버깅
-                logger.info(f"🔍 SMTP 발송 결과 디버깅 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
-                logger.info(f"🔍 SMTP 결과 타입: {type(smtp_result)}")
-                logger.info(f"🔍 SMTP 결과 전체: {smtp_result}")
-                logger.info(f"🔍 SMTP success 값: {smtp_result.get('success')}")
-                logger.info(f"🔍 SMTP success 타입: {type(smtp_result.get('success'))}")
-                logger.info(f"🔍 SMTP success 조건 결과: {smtp_result.get('success', False)}")
-                logger.info(f"🔍 NOT 조건 결과: {not smtp_result.get('success', False)}")
-                
-                if not smtp_result.get('success', False):
-                    logger.error(f"❌ SMTP 발송 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {smtp_result.get('error')}")
-                    mail.status = MailStatus.FAILED
-                    
-                    # 실패 로그 추가
-                    fail_log = MailLog(
-                        mail_uuid=mail.mail_uuid,
-                        user_uuid=mail_user.user_uuid,
-                        org_id=current_org_id,
-                        action="SEND_FAILED",
-                        details=f"SMTP 발송 실패: {smtp_result.get('error')}"
-                    )
-                    db.add(fail_log)
-                else:
-                    logger.info(f"✅ SMTP 발송 성공 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
-                    
-            except Exception as smtp_error:
-                logger.error(f"❌ SMTP 발송 예외 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(smtp_error)}")
-                mail.status = MailStatus.FAILED
-                
-                # 실패 로그 추가
-                fail_log = MailLog(
-                    mail_uuid=mail.mail_uuid,
-                    user_uuid=mail_user.user_uuid,
-                    org_id=current_org_id,
-                    action="SEND_FAILED",
-                    details=f"SMTP 발송 예외: {str(smtp_error)}"
-                )
-                db.add(fail_log)
-                smtp_result = {'success': False, 'error': str(smtp_error)}
-        else:
+        # SMTP 발송은 발송 워커가 처리 (app.tasks.mail_delivery)
+        if is_draft_bool:
             logger.info(f"📝 임시보관함 메일 생성 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
         
         # 메일 폴더 할당 처리 (임시보관함 또는 보낸편지함)
+        delivered = 0
         try:
             if is_draft_bool:
                 # 임시보관함 폴더 조회
@@ -592,111 +450,75 @@ async def send_mail(
                 else:
                     logger.warning(f"⚠️ 발신자 보낸편지함을 찾을 수 없음 - 조직: {current_org_id}, 사용자: {mail_user.user_uuid}")
                 
-                # 수신자들의 받은편지함에 메일 추가 (임시보관함이 아닌 경우에만)
-                logger.info(f"📥 수신자 받은편지함에 메일 추가 시작 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
-                for recipient in recipients:
-                    try:
-                        # 수신자의 메일 사용자 정보 조회
-                        recipient_mail_user = db.query(MailUser).filter(
-                            and_(
-                                MailUser.email == recipient.recipient_email,
-                                MailUser.org_id == current_org_id
-                            )
-                        ).first()
-                        
-                        if recipient_mail_user:
-                            # 수신자의 받은편지함 폴더 조회
-                            inbox_folder = db.query(MailFolder).filter(
-                                and_(
-                                    MailFolder.user_uuid == recipient_mail_user.user_uuid,
-                                    MailFolder.org_id == current_org_id,
-                                    MailFolder.folder_type == FolderType.INBOX
-                                )
-                            ).first()
-                            
-                            if inbox_folder:
-                                # 이미 할당되어 있는지 확인
-                                existing_inbox_relation = db.query(MailInFolder).filter(
-                                    and_(
-                                        MailInFolder.mail_uuid == mail.mail_uuid,
-                                        MailInFolder.folder_uuid == inbox_folder.folder_uuid,
-                                        MailInFolder.user_uuid == recipient_mail_user.user_uuid
-                                    )
-                                ).first()
-                                
-                                if not existing_inbox_relation:
-                                    # 수신자의 받은편지함에 메일 할당
-                                    recipient_mail_in_folder = MailInFolder(
-                                        mail_uuid=mail.mail_uuid,
-                                        folder_uuid=inbox_folder.folder_uuid,
-                                        user_uuid=recipient_mail_user.user_uuid,
-                                        is_read=False  # 새 메일은 읽지 않음 상태
-                                    )
-                                    db.add(recipient_mail_in_folder)
-                                    logger.info(f"📥 메일을 수신자 받은편지함에 할당 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자: {recipient.recipient_email}")
-                                else:
-                                    logger.debug(f"📥 메일이 이미 수신자 받은편지함에 할당됨 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자: {recipient.recipient_email}")
-                            else:
-                                logger.warning(f"⚠️ 수신자 받은편지함을 찾을 수 없음 - 조직: {current_org_id}, 수신자: {recipient.recipient_email}")
-                        else:
-                            logger.warning(f"⚠️ 수신자 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 수신자: {recipient.recipient_email}")
-                    except Exception as recipient_error:
-                        logger.error(f"❌ 수신자 받은편지함 할당 중 오류 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자: {recipient.recipient_email}, 오류: {str(recipient_error)}")
-                        # 개별 수신자 할당 실패는 전체 메일 발송 실패로 처리하지 않음
+                # 수신자들의 받은편지함에 메일 일괄 추가 (임시보관함이 아닌 경우에만)
+                delivered = recipient_service.deliver_to_inboxes(mail.mail_uuid, current_org_id, recipients)
                 
         except Exception as folder_error:
+            db.rollback()
+            delivered = 0
             logger.error(f"❌ 폴더 할당 중 오류 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(folder_error)}")
             # 폴더 할당 실패는 메일 발송 실패로 처리하지 않음
         
-        # 폴더 할당 정보 커밋
+        # 폴더 할당 정보 커밋 (받은편지함 배달은 커밋된 뒤에 수신 수에 반영)
         try:
             db.commit()
             logger.info(f"📁 폴더 할당 완료 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
+            await MailService(db)._record_received(current_org_id, delivered)
         except Exception as folder_commit_error:
             logger.error(f"❌ 폴더 할당 커밋 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(folder_commit_error)}")
             # 폴더 할당 실패는 메일 발송 실패로 처리하지 않음
         
-        # SMTP 발송 결과에 따라 응답 결정
-        if smtp_result.get('success', False):
-            # 메일 발송 성공 시 저장 용량 업데이트
-            try:
-                # 메일 크기 계산 (MB 단위로 변환)
-                total_mail_size_mb = total_mail_bytes / (1024 * 1024)
-                
-                # MailService 인스턴스 생성 및 저장 용량 업데이트
-                mail_service = MailService(db=db)
-                await mail_service._update_user_storage_usage(
-                    org_id=current_org_id,
-                    user_uuid=mail_user.user_uuid,
-                    storage_size_mb=total_mail_size_mb,
-                    operation='add'
-                )
-                
-                logger.info(f"📊 저장 용량 업데이트 완료 - 조직: {current_org_id}, 사용자: {mail_user.user_uuid}, 추가 용량: {total_mail_size_mb:.2f}MB")
-                
-            except Exception as storage_error:
-                logger.error(f"⚠️ 저장 용량 업데이트 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(storage_error)}")
-                # 저장 용량 업데이트 실패는 메일 발송 성공에 영향을 주지 않음
+        # 저장 용량 업데이트 (메일은 저장 시점에 용량을 차지)
+        try:
+            # 메일 크기 계산 (MB 단위로 변환)
+            total_mail_size_mb = total_mail_bytes / (1024 * 1024)
             
-            logger.info(f"✅ 메일 발송 완료 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자 수: {len(recipients)}, 첨부파일 수: {len(attachment_list)}")
+            # MailService 인스턴스 생성 및 저장 용량 업데이트
+            mail_service = MailService(db=db)
+            await mail_service._update_user_storage_usage(
+                org_id=current_org_id,
+                user_uuid=mail_user.user_uuid,
+                storage_size_mb=total_mail_size_mb,
+                operation='add'
+            )
+            
+            logger.info(f"📊 저장 용량 업데이트 완료 - 조직: {current_org_id}, 사용자: {mail_user.user_uuid}, 추가 용량: {total_mail_size_mb:.2f}MB")
+            
+        except Exception as storage_error:
+            logger.error(f"⚠️ 저장 용량 업데이트 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(storage_error)}")
+            # 저장 용량 업데이트 실패는 메일 발송 성공에 영향을 주지 않음
+        
+        if is_draft_bool:
+            logger.info(f"✅ 임시보관함 저장 완료 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 첨부파일 수: {len(attachment_list)}")
             return MailSendResponse(
                 success=True,
                 message="메일이 성공적으로 발송되었습니다.",
                 mail_uuid=mail.mail_uuid,
                 sent_at=mail.sent_at
             )
-        else:
-            logger.error(f"❌ 메일 발송 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {smtp_result.get('error')}")
-            raise HTTPException(
-                status_code=500, 
-                detail=f"메일 발송에 실패했습니다: {smtp_result.get('error', '알 수 없는 오류')}"
-            )
+        
+        # 발송 대기열 등록 (커밋 이후 등록하여 워커가 저장된 메일을 읽도록 보장)
+        await _enqueue_outbound_mail(db, mail, mail_user, current_org_id)
+        
+        logger.info(f"📮 메일 발송 대기열 등록 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자 수: {len(recipients)}, 첨부파일 수: {len(attachment_list)}")
+        return MailSendResponse(
+            success=True,
+            message="메일이 발송 대기열에 등록되었습니다.",
+            mail_uuid=mail.mail_uuid,
+            sent_at=None
+        )
         
     except HTTPException:
         db.rollback()
+        await blob_store.after_rollback()
+        await discard_stored(stored_attachments)
+        await MailService(db)._release_daily_email_reservation(current_org_id, reservation_id)
         raise
     except Exception as e:
         db.rollback()
+        await blob_store.after_rollback()
+        await discard_stored(stored_attachments)
+        await MailService(db)._release_daily_email_reservation(current_org_id, reservation_id)
         logger.error(f"❌ 메일 발송 실패 - 조직: {current_org_id}, 사용자: {current_user.email}, 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"메일 발송 중 오류가 발생했습니다: {str(e)}")
 
@@ -712,6 +534,8 @@ async def send_mail_json(
     JSON 요청으로 메일 발송 API
     조직 내에서 메일을 발송합니다.
     """
+    # 일일 발송 제한 예약 ID (저장이 실패하면 해제)
+    reservation_id = None
     try:
         logger.info(f"📤 메일 발송 시작 (JSON) - 조직: {current_org_id}, 사용자: {current_user.email}, 수신자: {mail_data.to}")
         
@@ -736,7 +560,7 @@ async def send_mail_json(
             MailUser.org_id == current_org_id
         ).first()
         if not mail_user:
-            raise HTTPException(status_code=404, detail="Mail user not found in this organization")
+            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
         
         # 메일 생성 (조직 ID 포함) - 년월일_시분초_uuid[12] 형식
         mail_uuid = generate_mail_uuid()
@@ -747,119 +571,42 @@ async def send_mail_json(
             subject=mail_data.subject,
             body_text=mail_data.body_text,
             body_html=mail_data.body_html,
-            sent_at=datetime.utcnow(),
-            status=MailStatus.SENT,
+            sent_at=None,  # 실제 발송 시간은 발송 워커가 기록
+            status=MailStatus.QUEUED,
             priority=mail_data.priority
         )
         db.add(mail)
         db.flush()
         
-        # 수신자 처리
-        recipients = []
+        # 수신자 처리 (조직별 격리) - 전체 주소를 한 번에 조회하고 외부 사용자/수신자 행은 일괄 삽입
+        recipient_service = MailRecipientService(db)
+        recipients = recipient_service.resolve(
+            org_id=current_org_id,
+            to_emails=mail_data.to,
+            cc_emails=mail_data.cc,
+            bcc_emails=mail_data.bcc
+        )
+        recipient_service.add_recipients(mail.mail_uuid, recipients)
         
-        # TO 수신자 처리 (조직별 격리)
-        if mail_data.to:
-            for email in mail_data.to:
-                # 같은 조직 내에서 수신자 사용자 찾기
-                recipient_user = db.query(MailUser).filter(
-                    MailUser.email == email,
-                    MailUser.org_id == current_org_id
-                ).first()
-                
-                if not recipient_user:
-                    # 조직 내에 없는 경우 외부 사용자로 임시 생성
-                    external_user_uuid = str(uuid.uuid4())
-                    recipient_user = MailUser(
-                        user_id=external_user_uuid,  # user_id 추가
-                        user_uuid=external_user_uuid,
-                        email=email,
-                        password_hash="external_user",  # 외부 사용자 표시
-                        is_active=False,
-                        org_id=current_org_id  # 현재 조직에 속하도록 설정
-                    )
-                    db.add(recipient_user)
-                    db.flush()
-                
-                recipient = MailRecipient(
-                    mail_uuid=mail.mail_uuid,
-                    recipient_uuid=recipient_user.user_uuid,  # 누락된 recipient_uuid 필드 추가
-                    recipient_email=email,
-                    recipient_type=RecipientType.TO.value
-                )
-                recipients.append(recipient)
-                db.add(recipient)
-        
-        # CC 수신자 처리 (조직별 격리)
-        if mail_data.cc:
-            for email in mail_data.cc:
-                # 같은 조직 내에서 수신자 사용자 찾기
-                recipient_user = db.query(MailUser).filter(
-                    MailUser.email == email,
-                    MailUser.org_id == current_org_id
-                ).first()
-                
-                if not recipient_user:
-                    # 조직 내에 없는 경우 외부 사용자로 임시 생성
-                    external_user_uuid = str(uuid.uuid4())
-                    recipient_user = MailUser(
-                        user_id=external_user_uuid,  # user_id 추가
-                        user_uuid=external_user_uuid,
-                        email=email,
-                        password_hash="external_user",  # 외부 사용자 표시
-                        is_active=False,
-                        org_id=current_org_id  # 현재 조직에 속하도록 설정
-                    )
-                    db.add(recipient_user)
-                    db.flush()
-                
-                recipient = MailRecipient(
-                    mail_uuid=mail.mail_uuid,
-                    recipient_uuid=recipient_user.user_uuid,  # 누락된 recipient_uuid 필드 추가
-                    recipient_email=email,
-                    recipient_type=RecipientType.CC.value
-                )
-                recipients.append(recipient)
-                db.add(recipient)
-        
-        # BCC 수신자 처리 (조직별 격리)
-        if mail_data.bcc:
-            for email in mail_data.bcc:
-                # 같은 조직 내에서 수신자 사용자 찾기
-                recipient_user = db.query(MailUser).filter(
-                    MailUser.email == email,
-                    MailUser.org_id == current_org_id
-                ).first()
-                
-                if not recipient_user:
-                    # 조직 내에 없는 경우 외부 사용자로 임시 생성
-                    external_user_uuid = str(uuid.uuid4())
-                    recipient_user = MailUser(
-                        user_id=external_user_uuid,  # user_id 추가
-                        user_uuid=external_user_uuid,
-                        email=email,
-                        password_hash="external_user",  # 외부 사용자 표시
-                        is_active=False,
-                        org_id=current_org_id  # 현재 조직에 속하도록 설정
-                    )
-                    db.add(recipient_user)
-                    db.flush()
-                
-                recipient = MailRecipient(
-                    mail_uuid=mail.mail_uuid,
-                    recipient_uuid=recipient_user.user_uuid,  # 누락된 recipient_uuid 필드 추가
-                    recipient_email=email,
-                    recipient_type=RecipientType.BCC.value
-                )
-                recipients.append(recipient)
-                db.add(recipient)
+        # 일일 메일 발송 제한 검증 (수신자 전체 수 기준) - 초과 시 저장하지 않고 거절
+        organization = db.query(Organization).filter(Organization.org_id == current_org_id).first()
+        if not organization:
+            raise HTTPException(status_code=404, detail="조직을 찾을 수 없습니다")
+        await MailService(db)._check_daily_email_limit(
+            org_id=current_org_id,
+            max_emails_per_day=getattr(organization, "max_emails_per_day", 0),
+            email_count=len(recipients),
+            reservation_id=mail.mail_uuid
+        )
+        reservation_id = mail.mail_uuid
         
         # 메일 로그 생성
         mail_log = MailLog(
             mail_uuid=mail.mail_uuid,
             user_uuid=mail_user.user_uuid,
             org_id=current_org_id,
-            action="SEND",
-            details=f"메일 발송 - 수신자: {len(recipients)}명"
+            action="QUEUED",
+            details=f"메일 발송 대기열 등록 - 수신자: {len(recipients)}명"
         )
         db.add(mail_log)
         
@@ -872,328 +619,166 @@ async def send_mail_json(
             logger.error(f"❌ 메일 저장 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(commit_error)}")
             raise HTTPException(status_code=500, detail=f"메일 저장에 실패했습니다: {str(commit_error)}")
 
-        # 실제 메일 발송 (SMTP)
+        # 폴더 할당 처리 (SMTP 발송은 발송 워커가 처리)
         try:
-            mail_service = MailService(db)
-            
-            # 일일 메일 발송 제한 검증 (수신자 전체 수 기준)
-            organization = db.query(Organization).filter(Organization.org_id == current_org_id).first()
-            if not organization:
-                raise HTTPException(status_code=404, detail="조직을 찾을 수 없습니다")
-            await mail_service._check_daily_email_limit(
-                org_id=current_org_id,
-                max_emails_per_day=getattr(organization, "max_emails_per_day", 0),
-                email_count=len(recipients)
-            )
-            smtp_result = await mail_service.send_email_smtp(
-                sender_email=mail_user.email,
-                recipient_emails=[r.recipient_email for r in recipients],
-                subject=mail_data.subject,
-                body_text=mail_data.body_text,
-                body_html=mail_data.body_html,
-                org_id=current_org_id
-            )
-            
-            if not smtp_result.get('success', False):
-                logger.error(f"❌ SMTP 발송 실패 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {smtp_result.get('error')}")
-                # 메일 상태를 실패로 업데이트
-                mail.status = MailStatus.FAILED
-                
-                # 실패 로그 추가
-                fail_log = MailLog(
-                    mail_uuid=mail.mail_uuid,
-                    user_uuid=mail_user.user_uuid,
-                    org_id=current_org_id,
-                    action="SEND_FAILED",
-                    details=f"SMTP 발송 실패: {smtp_result.get('error')}"
+            # 발신자의 보낸편지함 조회
+            sent_folder = db.query(MailFolder).filter(
+                and_(
+                    MailFolder.user_uuid == mail_user.user_uuid,
+                    MailFolder.org_id == current_org_id,
+                    MailFolder.folder_type == FolderType.SENT
                 )
-                db.add(fail_log)
-                db.commit()
-            else:
-                logger.info(f"✅ SMTP 발송 성공 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
-                
-        except Exception as smtp_error:
-            logger.error(f"❌ SMTP 발송 예외 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(smtp_error)}")
-            # 메일 상태를 실패로 업데이트
-            mail.status = MailStatus.FAILED
+            ).first()
             
-            # 실패 로그 추가
-            fail_log = MailLog(
-                mail_uuid=mail.mail_uuid,
-                user_uuid=mail_user.user_uuid,
-                org_id=current_org_id,
-                action="SEND_FAILED",
-                details=f"SMTP 발송 예외: {str(smtp_error)}"
-            )
-            db.add(fail_log)
-            db.commit()
-            smtp_result = {'success': False, 'error': str(smtp_error)}
-        
-        # SMTP 발송 결과에 따라 처리 분기
-        logger.info(f"🔍 SMTP 발송 결과 디버깅 - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
-        logger.info(f"🔍 SMTP 결과 타입: {type(smtp_result)}")
-        logger.info(f"🔍 SMTP 결과 전체: {smtp_result}")
-        logger.info(f"🔍 SMTP success 값: {smtp_result.get('success')}")
-        logger.info(f"🔍 SMTP success 타입: {type(smtp_result.get('success'))}")
-        logger.info(f"🔍 SMTP success 조건 결과: {smtp_result.get('success', False)}")
-        
-        if smtp_result.get('success', False):
-            # SMTP 발송 성공 시 폴더 할당 처리
-            try:
-                # 발신자의 보낸편지함 조회
-                sent_folder = db.query(MailFolder).filter(
+            if sent_folder:
+                # 이미 할당되어 있는지 확인
+                existing_relation = db.query(MailInFolder).filter(
                     and_(
-                        MailFolder.user_uuid == mail_user.user_uuid,
-                        MailFolder.org_id == current_org_id,
-                        MailFolder.folder_type == FolderType.SENT
+                        MailInFolder.mail_uuid == mail.mail_uuid,
+                        MailInFolder.folder_uuid == sent_folder.folder_uuid
                     )
                 ).first()
                 
-                if sent_folder:
-                    # 이미 할당되어 있는지 확인
-                    existing_relation = db.query(MailInFolder).filter(
-                        and_(
-                            MailInFolder.mail_uuid == mail.mail_uuid,
-                            MailInFolder.folder_uuid == sent_folder.folder_uuid
-                        )
-                    ).first()
-                    
-                    if not existing_relation:
-                        # 발신자의 보낸편지함에 메일 할당
-                        mail_in_folder = MailInFolder(
-                            mail_uuid=mail.mail_uuid,
-                            folder_uuid=sent_folder.folder_uuid,
-                            user_uuid=mail_user.user_uuid
-                        )
-                        db.add(mail_in_folder)
-                        db.commit()
-                        logger.info(f"📁 메일을 발신자 보낸편지함에 할당 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
-                    else:
-                        logger.debug(f"📁 메일이 이미 보낸편지함에 할당됨 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
+                if not existing_relation:
+                    # 발신자의 보낸편지함에 메일 할당
+                    mail_in_folder = MailInFolder(
+                        mail_uuid=mail.mail_uuid,
+                        folder_uuid=sent_folder.folder_uuid,
+                        user_uuid=mail_user.user_uuid
+                    )
+                    db.add(mail_in_folder)
+                    db.commit()
+                    logger.info(f"📁 메일을 발신자 보낸편지함에 할당 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
                 else:
-                    logger.warning(f"⚠️ 발신자 보낸편지함을 찾을 수 없음 (JSON) - 조직: {current_org_id}, 사용자: {mail_user.user_uuid}")
-                
-                # 수신자의 받은편지함에 메일 추가 (JSON)
-                for recipient in recipients:
-                    try:
-                        # 수신자의 MailUser 정보 조회
-                        recipient_mail_user = db.query(MailUser).filter(
-                            and_(
-                                MailUser.email == recipient.recipient_email,
-                                MailUser.org_id == current_org_id
-                            )
-                        ).first()
-                        
-                        if recipient_mail_user:
-                            # 수신자의 받은편지함 폴더 조회
-                            inbox_folder = db.query(MailFolder).filter(
-                                and_(
-                                    MailFolder.user_uuid == recipient_mail_user.user_uuid,
-                                    MailFolder.folder_type == FolderType.INBOX
-                                )
-                            ).first()
-                            
-                            if inbox_folder:
-                                # 이미 할당되어 있는지 확인
-                                existing_inbox_relation = db.query(MailInFolder).filter(
-                                    and_(
-                                        MailInFolder.mail_uuid == mail.mail_uuid,
-                                        MailInFolder.folder_uuid == inbox_folder.folder_uuid
-                                    )
-                                ).first()
-                                
-                                if not existing_inbox_relation:
-                                    # 수신자의 받은편지함에 메일 할당
-                                    mail_in_inbox = MailInFolder(
-                                        mail_uuid=mail.mail_uuid,
-                                        folder_uuid=inbox_folder.folder_uuid,
-                                        user_uuid=recipient_mail_user.user_uuid
-                                    )
-                                    db.add(mail_in_inbox)
-                                    db.commit()
-                                    logger.info(f"📥 메일을 수신자 받은편지함에 할당 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자: {recipient.recipient_email}")
-                                else:
-                                    logger.debug(f"📥 메일이 이미 수신자 받은편지함에 할당됨 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자: {recipient.recipient_email}")
-                            else:
-                                logger.warning(f"⚠️ 수신자 받은편지함을 찾을 수 없음 (JSON) - 조직: {current_org_id}, 수신자: {recipient.recipient_email}")
-                        else:
-                            logger.warning(f"⚠️ 수신자 MailUser를 찾을 수 없음 (JSON) - 조직: {current_org_id}, 수신자: {recipient.recipient_email}")
-                    except Exception as recipient_folder_error:
-                        logger.error(f"❌ 수신자 받은편지함 할당 중 오류 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자: {recipient.recipient_email}, 오류: {str(recipient_folder_error)}")
-                        # 수신자 폴더 할당 실패는 메일 발송 실패로 처리하지 않음
-                    
-            except Exception as folder_error:
-                logger.error(f"❌ 폴더 할당 중 오류 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(folder_error)}")
-                # 폴더 할당 실패는 메일 발송 실패로 처리하지 않음
+                    logger.debug(f"📁 메일이 이미 보낸편지함에 할당됨 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}")
+            else:
+                logger.warning(f"⚠️ 발신자 보낸편지함을 찾을 수 없음 (JSON) - 조직: {current_org_id}, 사용자: {mail_user.user_uuid}")
             
-            logger.info(f"✅ 메일 발송 완료 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자 수: {len(recipients)}")
-            return MailSendResponse(
-                success=True,
-                message="메일이 성공적으로 발송되었습니다.",
-                mail_uuid=mail.mail_uuid,
-                sent_at=mail.sent_at
-            )
-        else:
-            logger.error(f"❌ 메일 발송 실패 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {smtp_result.get('error')}")
-            raise HTTPException(
-                status_code=500, 
-                detail=f"메일 발송에 실패했습니다: {smtp_result.get('error', '알 수 없는 오류')}"
-            )
+            # 수신자의 받은편지함에 메일 일괄 추가 (JSON)
+            delivered = recipient_service.deliver_to_inboxes(mail.mail_uuid, current_org_id, recipients)
+            db.commit()
+            await MailService(db)._record_received(current_org_id, delivered)
+                
+        except Exception as folder_error:
+            db.rollback()
+            logger.error(f"❌ 폴더 할당 중 오류 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 오류: {str(folder_error)}")
+            # 폴더 할당 실패는 메일 발송 실패로 처리하지 않음
+        
+        # 발송 대기열 등록 (커밋 이후 등록하여 워커가 저장된 메일을 읽도록 보장)
+        await _enqueue_outbound_mail(db, mail, mail_user, current_org_id)
+        
+        logger.info(f"📮 메일 발송 대기열 등록 (JSON) - 조직: {current_org_id}, 메일 ID: {mail.mail_uuid}, 수신자 수: {len(recipients)}")
+        return MailSendResponse(
+            success=True,
+            message="메일이 발송 대기열에 등록되었습니다.",
+            mail_uuid=mail.mail_uuid,
+            sent_at=None
+        )
         
     except HTTPException:
         db.rollback()
+        await MailService(db)._release_daily_email_reservation(current_org_id, reservation_id)
         raise
     except Exception as e:
         db.rollback()
+        await MailService(db)._release_daily_email_reservation(current_org_id, reservation_id)
         logger.error(f"❌ 메일 발송 실패 (JSON) - 조직: {current_org_id}, 사용자: {current_user.email}, 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"메일 발송 중 오류가 발생했습니다: {str(e)}")
 
 
+async def _load_recipients_and_attachments(db: AsyncSession, mail_uuid: str) -> tuple:
+    """
+    메일 상세 응답용 수신자(TO/CC/BCC) 주소와 첨부파일 정보를 조회합니다.
+
+    Returns:
+        (to_emails, cc_emails, bcc_emails, attachment_list)
+    """
+    recipients = (await db.execute(
+        select(MailRecipient).where(MailRecipient.mail_uuid == mail_uuid)
+    )).scalars().all()
+    to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
+    cc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.CC]
+    bcc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.BCC]
+
+    attachments = (await db.execute(
+        select(MailAttachment).where(MailAttachment.mail_uuid == mail_uuid)
+    )).scalars().all()
+    attachment_list = [
+        {
+            "id": attachment.id,
+            "filename": attachment.filename,
+            "file_size": attachment.file_size,
+            "content_type": attachment.content_type
+        }
+        for attachment in attachments
+    ]
+    return to_emails, cc_emails, bcc_emails, attachment_list
+
+
 @router.get("/inbox", response_model=MailListWithPaginationResponse, summary="받은 메일함")
 async def get_inbox_mails(
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
     search: Optional[str] = Query(None, description="검색어 (제목, 발신자)"),
     status: Optional[MailStatus] = Query(None, description="메일 상태 필터"),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 커서 방식)"),
+    use_cursor: bool = Query(False, description="커서 방식 페이지네이션 사용 (첫 페이지 요청 시 true)"),
+    include_total: bool = Query(True, description="전체 항목 수 계산 여부"),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> MailListWithPaginationResponse:
     """받은 메일함 조회"""
     try:
         logger.info(f"📥 받은 메일함 조회 시작 - 조직: {current_org_id}, 사용자: {current_user.email}")
         
-        # 메일 사용자 조회 (조직별 필터링)
-        logger.info(f"🔍 메일 사용자 조회 - current_user.user_uuid: {current_user.user_uuid}, org_id: {current_org_id}")
-        mail_user = db.query(MailUser).filter(
-            and_(
-                MailUser.user_uuid == current_user.user_uuid,
-                MailUser.org_id == current_org_id
-            )
-        ).first()
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="해당 조직에서 메일 사용자를 찾을 수 없습니다")
-        
         logger.info(f"✅ 메일 사용자 발견 - mail_user.user_uuid: {mail_user.user_uuid}, mail_user.org_id: {mail_user.org_id}")
 
         # 받은 메일함 폴더 조회
         logger.info(f"🔍 받은 메일함 폴더 조회 - user_uuid: {mail_user.user_uuid}, org_id: {current_org_id}")
-        inbox_folder = db.query(MailFolder).filter(
-            and_(
+        inbox_folder = (await db.execute(
+            select(MailFolder).where(
                 MailFolder.user_uuid == mail_user.user_uuid,
                 MailFolder.org_id == current_org_id,
                 MailFolder.folder_type == FolderType.INBOX
             )
-        ).first()
+        )).scalars().first()
         
         if not inbox_folder:
             # 디버깅을 위해 해당 사용자의 모든 폴더 조회
-            all_folders = db.query(MailFolder).filter(
-                and_(
+            all_folders = (await db.execute(
+                select(MailFolder).where(
                     MailFolder.user_uuid == mail_user.user_uuid,
                     MailFolder.org_id == current_org_id
                 )
-            ).all()
+            )).scalars().all()
             logger.error(f"❌ Inbox 폴더 없음 - 사용자의 모든 폴더: {[(f.name, f.folder_type, f.folder_uuid) for f in all_folders]}")
             raise HTTPException(status_code=404, detail="Inbox folder not found")
         
         logger.info(f"✅ Inbox 폴더 발견 - folder_uuid: {inbox_folder.folder_uuid}, name: {inbox_folder.name}")
         
-        # 기본 쿼리 (조직별 필터링 포함)
-        query = db.query(Mail).join(
-            MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid
-        ).filter(
-            and_(
-                MailInFolder.folder_uuid == inbox_folder.folder_uuid,
-                Mail.org_id == current_org_id
-            )
-        )
-        
-        # 검색 조건 추가
-        if search:
-            query = query.filter(
-                or_(
-                    Mail.subject.ilike(f"%{search}%"),
-                    Mail.body_text.ilike(f"%{search}%")
-                )
-            )
-        
-        # 상태 필터
-        if status:
-            query = query.filter(Mail.status == status)
-        
-        # 전체 개수
-        total_count = query.count()
-        
-        # 페이지네이션
-        offset = (page - 1) * limit
-        mails = query.order_by(desc(Mail.created_at)).offset(offset).limit(limit).all()
-        
-        # 응답 데이터 구성
-        mail_list = []
-        for mail in mails:
-            # 발신자 정보 (조직별 필터링)
-            sender = db.query(MailUser).filter(
-                and_(
-                    MailUser.user_uuid == mail.sender_uuid,
-                    MailUser.org_id == current_org_id
-                )
-            ).first()
-            sender_email = sender.email if sender else "Unknown"
-            
-            # 수신자 정보
-            recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-            to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
-            cc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.CC]
-            bcc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.BCC]
-            
-            # 현재 사용자의 읽음 상태 조회 (MailInFolder에서)
-            mail_in_folder = db.query(MailInFolder).filter(
-                and_(
-                    MailInFolder.mail_uuid == mail.mail_uuid,
-                    MailInFolder.user_uuid == mail_user.user_uuid
-                )
-            ).first()
-            
-            # 첨부파일 개수
-            attachment_count = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).count()
-            
-            # 발송자 정보 구성
-            sender_info = MailUserResponse(
-                user_uuid=sender.user_uuid,
-                email=sender.email,
-                display_name=sender.display_name,
-                is_active=sender.is_active,
-                created_at=sender.created_at,
-                updated_at=sender.updated_at
-            ) if sender else None
-            
-            mail_response = MailListResponse(
-                mail_uuid=mail.mail_uuid,
-                subject=mail.subject,
-                status=mail.status,
-                is_draft=mail.is_draft,
-                priority=mail.priority,
-                sent_at=mail.sent_at,
-                created_at=mail.created_at,
-                sender=sender_info,
-                recipient_count=len(recipients),
-                attachment_count=attachment_count,
-                is_read=mail_in_folder.is_read if mail_in_folder else False
-            )
-            mail_list.append(mail_response)
+        # 목록 엔진으로 페이지 구성 (페이지 크기와 무관한 고정 쿼리 수, 비동기 연결에서 실행)
+        try:
+            list_page = await db.run_sync(lambda session: MailListService(session).build_page(
+                mail_user=mail_user,
+                org_id=current_org_id,
+                folder_type=FolderType.INBOX.value,
+                page=page,
+                limit=limit,
+                search=search,
+                status=status,
+                folder=inbox_folder,
+                cursor=cursor,
+                use_cursor=use_cursor,
+                include_total=include_total
+            ))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        mail_list = list_page.mails
         
         # 페이지네이션 정보
-        total_pages = (total_count + limit - 1) // limit
-        pagination = PaginationResponse(
-            page=page,
-            limit=limit,
-            total=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1
-        )
+        pagination = list_page.to_pagination()
         
         logger.info(f"✅ 받은 메일함 조회 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일 수: {len(mail_list)}")
         
@@ -1212,59 +797,44 @@ async def get_inbox_mails(
 @router.get("/inbox/{mail_uuid}", response_model=MailDetailResponse, summary="받은 메일 상세 조회")
 async def get_inbox_mail_detail(
     mail_uuid: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> MailDetailResponse:
     """받은 메일 상세 조회"""
     try:
         logger.info(f"📧 get_inbox_mail_detail 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
         # 메일 조회 (조직별 격리)
-        mail = db.query(Mail).filter(
-            Mail.mail_uuid == mail_uuid,    
-            Mail.org_id == current_org_id
-        ).first()
+        mail = (await db.execute(
+            select(Mail).where(
+                Mail.mail_uuid == mail_uuid,
+                Mail.org_id == current_org_id
+            )
+        )).scalars().first()
         if not mail:
             raise HTTPException(status_code=404, detail="메일을 찾을 수 없습니다")
         
         # 발신자 정보 (조직별 격리)
-        sender = db.query(MailUser).filter(
-            MailUser.user_uuid == mail.sender_uuid,
-            MailUser.org_id == current_org_id
-        ).first()
+        sender = (await db.execute(
+            select(MailUser).where(
+                MailUser.user_uuid == mail.sender_uuid,
+                MailUser.org_id == current_org_id
+            )
+        )).scalars().first()
         sender_email = sender.email if sender else "Unknown"
         
-        # 수신자 정보
-        recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-        to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
-        cc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.CC]
-        bcc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.BCC]
-        
-        # 첨부파일 정보
-        attachments = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).all()
-        attachment_list = []
-        for attachment in attachments:
-            attachment_list.append({
-                "id": attachment.id,
-                "filename": attachment.filename,
-                "file_size": attachment.file_size,
-                "content_type": attachment.content_type
-            })
-        
-        # 현재 사용자의 메일-폴더 관계 찾기 (조직별 격리)
-        mail_user = db.query(MailUser).filter(
-            MailUser.email == current_user.email,
-            MailUser.org_id == current_org_id
-        ).first()
-        if not mail_user:
-            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
+        # 수신자 및 첨부파일 정보
+        to_emails, cc_emails, bcc_emails, attachment_list = await _load_recipients_and_attachments(db, mail.mail_uuid)
         
         # 현재 사용자의 받은편지함에서 해당 메일 찾기
-        mail_in_folder = db.query(MailInFolder).filter(
-            MailInFolder.mail_uuid == mail.mail_uuid,  
-            MailInFolder.user_uuid == mail_user.user_uuid
-        ).first()
+        mail_in_folder = (await db.execute(
+            select(MailInFolder).where(
+                MailInFolder.mail_uuid == mail.mail_uuid,
+                MailInFolder.user_uuid == mail_user.user_uuid
+            )
+        )).scalars().first()
         
         read_at = None
         if mail_in_folder:
@@ -1272,7 +842,7 @@ async def get_inbox_mail_detail(
             if not mail_in_folder.is_read:
                 mail_in_folder.is_read = True
                 mail_in_folder.read_at = datetime.utcnow()
-                db.commit()
+                await db.commit()
             read_at = mail_in_folder.read_at
         
         logger.info(f"✅ get_inbox_mail_detail 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
@@ -1297,6 +867,8 @@ async def get_inbox_mail_detail(
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ get_inbox_mail_detail 실패 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}, 에러: {str(e)}")
         raise HTTPException(status_code=500, detail=f"메일 상세 조회 중 오류가 발생했습니다: {str(e)}")
@@ -1307,95 +879,37 @@ async def get_sent_mails(
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
     search: Optional[str] = Query(None, description="검색어 (제목, 수신자)"),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 커서 방식)"),
+    use_cursor: bool = Query(False, description="커서 방식 페이지네이션 사용 (첫 페이지 요청 시 true)"),
+    include_total: bool = Query(True, description="전체 항목 수 계산 여부"),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> MailListWithPaginationResponse:
     """보낸 메일함 조회"""
     try:
         logger.info(f"📤 보낸 메일함 조회 시작 - 조직: {current_org_id}, 사용자: {current_user.email}")
         
-        # 메일 사용자 조회 (조직별 필터링)
-        mail_user = db.query(MailUser).filter(
-            and_(
-                MailUser.user_uuid == current_user.user_uuid,
-                MailUser.org_id == current_org_id
-            )
-        ).first()
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="해당 조직에서 메일 사용자를 찾을 수 없습니다")
-        
-        # 기본 쿼리 - 발신자가 현재 사용자인 메일 (조직별 필터링 포함)
-        query = db.query(Mail).filter(
-            and_(
-                Mail.sender_uuid == mail_user.user_uuid,
-                Mail.status == MailStatus.SENT,
-                Mail.org_id == current_org_id
-            )
-        )
-        
-        # 검색 조건 추가
-        if search:
-            query = query.filter(
-                or_(
-                    Mail.subject.ilike(f"%{search}%"),
-                    Mail.body_text.ilike(f"%{search}%")
-                )
-            )
-        
-        # 전체 개수
-        total_count = query.count()
-        
-        # 페이지네이션
-        offset = (page - 1) * limit
-        mails = query.order_by(desc(Mail.sent_at)).offset(offset).limit(limit).all()
-        
-        # 응답 데이터 구성
-        mail_list = []
-        for mail in mails:
-            # 수신자 정보
-            recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-            to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
-            
-            # 첨부파일 개수
-            attachment_count = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).count()
-            
-            # 발송자 정보 구성
-            sender_info = MailUserResponse(
-                user_uuid=mail_user.user_uuid,
-                email=mail_user.email,
-                display_name=mail_user.display_name,
-                is_active=mail_user.is_active,
-                created_at=mail_user.created_at,
-                updated_at=mail_user.updated_at
-            )
-            
-            mail_response = MailListResponse(
-                mail_uuid=mail.mail_uuid,
-                subject=mail.subject,
-                status=mail.status,
-                is_draft=mail.is_draft,
-                priority=mail.priority,
-                sent_at=mail.sent_at,
-                created_at=mail.created_at,
-                sender=sender_info,
-                recipient_count=len(recipients),
-                attachment_count=attachment_count,
-                is_read=None  # 보낸 메일함에서는 읽음 상태가 없음
-            )
-            mail_list.append(mail_response)
+        # 목록 엔진으로 페이지 구성 (페이지 크기와 무관한 고정 쿼리 수, 비동기 연결에서 실행)
+        try:
+            list_page = await db.run_sync(lambda session: MailListService(session).build_page(
+                mail_user=mail_user,
+                org_id=current_org_id,
+                folder_type=FolderType.SENT.value,
+                page=page,
+                limit=limit,
+                search=search,
+                cursor=cursor,
+                use_cursor=use_cursor,
+                include_total=include_total
+            ))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        mail_list = list_page.mails
         
         # 페이지네이션 정보
-        total_pages = (total_count + limit - 1) // limit
-        pagination = PaginationResponse(
-            page=page,
-            limit=limit,
-            total=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1
-        )
+        pagination = list_page.to_pagination()
         
         logger.info(f"✅ 보낸 메일함 조회 완료 - org_id: {current_org_id}, user: {current_user.email}, 메일 수: {len(mail_list)}")
         
@@ -1414,53 +928,30 @@ async def get_sent_mails(
 @router.get("/sent/{mail_uuid}", response_model=MailDetailResponse, summary="보낸 메일 상세")
 async def get_sent_mail_detail(
     mail_uuid: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> MailDetailResponse:
     """보낸 메일 상세 조회"""
     try:
         logger.info(f"📧 보낸 메일 상세 조회 시작 - org_id: {current_org_id}, user: {current_user.email}, mail_uuid: {mail_uuid}")
         
-        # 메일 사용자 조회 (조직별 필터링)
-        mail_user = db.query(MailUser).filter(
-            and_(
-                MailUser.user_uuid == current_user.user_uuid,
-                MailUser.org_id == current_org_id
-            )
-        ).first()
-        if not mail_user:
-            raise HTTPException(status_code=404, detail="해당 조직에서 메일 사용자를 찾을 수 없습니다")
-        
         logger.info(f"🔍 mail_user 정보: {mail_user.__dict__}")
         
         # 메일 조회 (조직별 필터링)
-        mail = db.query(Mail).filter(
-            and_(
+        mail = (await db.execute(
+            select(Mail).where(
                 Mail.mail_uuid == mail_uuid,
                 Mail.org_id == current_org_id,
                 Mail.sender_uuid == mail_user.user_uuid
             )
-        ).first()
+        )).scalars().first()
         if not mail:
             raise HTTPException(status_code=404, detail="메일을 찾을 수 없거나 접근 권한이 없습니다")
         
-        # 수신자 정보
-        recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-        to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
-        cc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.CC]
-        bcc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.BCC]
-        
-        # 첨부파일 정보
-        attachments = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).all()
-        attachment_list = []
-        for attachment in attachments:
-            attachment_list.append({
-                "id": attachment.id,
-                "filename": attachment.filename,
-                "file_size": attachment.file_size,
-                "content_type": attachment.content_type
-            })
+        # 수신자 및 첨부파일 정보
+        to_emails, cc_emails, bcc_emails, attachment_list = await _load_recipients_and_attachments(db, mail.mail_uuid)
         
         logger.info(f"✅ 보낸 메일 상세 조회 완료 - org_id: {current_org_id}, user: {current_user.email}, mail_uuid: {mail_uuid}")
         
@@ -1496,107 +987,39 @@ async def get_draft_mails(
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
     search: Optional[str] = Query(None, description="검색어 (제목, 수신자)"),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 커서 방식)"),
+    use_cursor: bool = Query(False, description="커서 방식 페이지네이션 사용 (첫 페이지 요청 시 true)"),
+    include_total: bool = Query(True, description="전체 항목 수 계산 여부"),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> MailListWithPaginationResponse:
     """임시보관함 조회"""
     try:
         logger.info(f"📧 임시보관함 조회 시작 - org_id: {current_org_id}, user: {current_user.email}")
         
-        # 메일 사용자 조회 (조직별 필터링)
-        mail_user = db.query(MailUser).filter(
-            and_(
-                MailUser.user_uuid == current_user.user_uuid,
-                MailUser.org_id == current_org_id
-            )
-        ).first()
-        if not mail_user:
-            raise HTTPException(status_code=404, detail="해당 조직에서 메일 사용자를 찾을 수 없습니다")
-        
         logger.info(f"🔍 임시보관함 mail_user 정보: {mail_user.__dict__}")
         
-        # 기본 쿼리 - 임시보관 상태인 메일 (조직별 필터링)
-        query = db.query(Mail).filter(
-            and_(
-                Mail.sender_uuid == mail_user.user_uuid,    
-                Mail.status == MailStatus.DRAFT,
-                Mail.org_id == current_org_id
-            )
-        )
-        
-        # 검색 조건 추가
-        if search:
-            query = query.filter(
-                or_(
-                    Mail.subject.ilike(f"%{search}%"),
-                    Mail.body_text.ilike(f"%{search}%")
-                )
-            )
-        
-        # 전체 개수
-        total_count = query.count()
-        
-        # 페이지네이션
-        offset = (page - 1) * limit
-        mails = query.order_by(desc(Mail.created_at)).offset(offset).limit(limit).all()
-        
-        # 응답 데이터 구성
-        mail_list = []
-        logger.info(f"🔍 임시보관함 메일 개수: {len(mails)}")
-        
-        for i, mail in enumerate(mails):
-            logger.info(f"🔍 메일 {i+1} 처리 시작 - mail_uuid: {mail.mail_uuid}")
-            
-            # 수신자 정보
-            recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-            recipient_count = len(recipients)
-            logger.info(f"🔍 수신자 개수: {recipient_count}")
-            
-            # 첨부파일 개수
-            attachment_count = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).count()
-            logger.info(f"🔍 첨부파일 개수: {attachment_count}")
-            
-            # 발송자 정보
-            logger.info(f"🔍 발송자 정보 생성 시작")
-            sender_response = MailUserResponse(
-                user_uuid=mail_user.user_uuid,
-                email=mail_user.email,
-                display_name=mail_user.display_name,
-                is_active=mail_user.is_active,
-                created_at=mail_user.created_at,
-                updated_at=mail_user.updated_at
-            )
-            logger.info(f"🔍 발송자 정보 생성 완료")
-            
-            logger.info(f"🔍 MailListResponse 생성 시작")
-            mail_response = MailListResponse(
-                mail_uuid=mail.mail_uuid,
-                subject=mail.subject or "(제목 없음)",
-                status=mail.status,
-                is_draft=True,  # 임시보관함이므로 True
-                priority=mail.priority,
-                sent_at=mail.sent_at,
-                created_at=mail.created_at,
-                sender=sender_response,
-                recipient_count=recipient_count,
-                attachment_count=attachment_count,
-                is_read=None  # 임시보관함에서는 읽음 상태가 의미 없음
-            )
-            logger.info(f"🔍 MailListResponse 생성 완료")
-            mail_list.append(mail_response)
-            logger.info(f"🔍 메일 {i+1} 처리 완료")
+        # 목록 엔진으로 페이지 구성 (페이지 크기와 무관한 고정 쿼리 수, 비동기 연결에서 실행)
+        try:
+            list_page = await db.run_sync(lambda session: MailListService(session).build_page(
+                mail_user=mail_user,
+                org_id=current_org_id,
+                folder_type=FolderType.DRAFT.value,
+                page=page,
+                limit=limit,
+                search=search,
+                cursor=cursor,
+                use_cursor=use_cursor,
+                include_total=include_total
+            ))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        mail_list = list_page.mails
         
         # 페이지네이션 정보
-        total_pages = (total_count + limit - 1) // limit
-        pagination = PaginationResponse(
-            page=page,
-            limit=limit,
-            total=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1
-        )
+        pagination = list_page.to_pagination()
         
         logger.info(f"✅ 임시보관함 조회 완료 - org_id: {current_org_id}, user: {current_user.email}, 메일 수: {len(mail_list)}")
         
@@ -1615,51 +1038,28 @@ async def get_draft_mails(
 @router.get("/drafts/{mail_uuid}", response_model=MailDetailResponse, summary="임시보관함 메일 상세 조회")
 async def get_draft_mail_detail(
     mail_uuid: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> MailDetailResponse:
     """임시보관함 메일 상세 조회"""
     try:
         logger.info(f"📧 get_draft_mail_detail 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
-        # 메일 사용자 조회 (조직별 필터링)
-        mail_user = db.query(MailUser).filter(
-            and_(
-                MailUser.user_uuid == current_user.user_uuid,
-                MailUser.org_id == current_org_id
-            )
-        ).first()
-        if not mail_user:
-            raise HTTPException(status_code=404, detail="해당 조직에서 메일 사용자를 찾을 수 없습니다")
-        
         # 메일 조회 (조직별 필터링 및 발신자 확인)
-        mail = db.query(Mail).filter(
-            and_(
+        mail = (await db.execute(
+            select(Mail).where(
                 Mail.mail_uuid == mail_uuid,
                 Mail.org_id == current_org_id,
                 Mail.sender_uuid == mail_user.user_uuid
             )
-        ).first()
+        )).scalars().first()
         if not mail:
             raise HTTPException(status_code=404, detail="임시보관함 메일을 찾을 수 없거나 접근 권한이 없습니다")
         
-        # 수신자 정보
-        recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()    
-        to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
-        cc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.CC]
-        bcc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.BCC]
-        
-        # 첨부파일 정보
-        attachments = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).all()
-        attachment_list = []
-        for attachment in attachments:
-            attachment_list.append({
-                "id": attachment.id,
-                "filename": attachment.filename,
-                "file_size": attachment.file_size,
-                "content_type": attachment.content_type
-            })
+        # 수신자 및 첨부파일 정보
+        to_emails, cc_emails, bcc_emails, attachment_list = await _load_recipients_and_attachments(db, mail.mail_uuid)
         
         logger.info(f"✅ get_draft_mail_detail 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
@@ -1692,13 +1092,17 @@ async def get_draft_mail_detail(
 
 @router.get("/trash", response_model=MailListWithPaginationResponse, summary="휴지통 조회")
 async def get_deleted_mails(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"), 
     search: Optional[str] = Query(None, description="검색 키워드"),
-    status: Optional[MailStatus] = Query(None, description="메일 상태 필터 (inbox | sent | draft | trash | failed)")
+    status: Optional[MailStatus] = Query(None, description="메일 상태 필터 (inbox | sent | draft | trash | failed)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 커서 방식)"),
+    use_cursor: bool = Query(False, description="커서 방식 페이지네이션 사용 (첫 페이지 요청 시 true)"),
+    include_total: bool = Query(True, description="전체 항목 수 계산 여부")
 ) -> MailListWithPaginationResponse:
     """
     휴지통 메일을 조회합니다.
@@ -1709,6 +1113,9 @@ async def get_deleted_mails(
         search: 검색어 (제목/본문 텍스트 매칭)
         status: 메일 상태 필터 - 콤보(드롭다운) 선택 지원
             허용값: inbox, sent, draft, trash, failed
+        cursor: 이전 응답의 next_cursor (지정 시 (created_at, mail_uuid) 키셋 방식)
+        use_cursor: 첫 페이지를 커서 방식으로 요청할 때 true
+        include_total: false이면 전체 개수를 계산하지 않음 (total/total_pages가 null)
 
     Returns:
         페이지네이션이 적용된 휴지통 메일 목록 응답
@@ -1716,113 +1123,40 @@ async def get_deleted_mails(
     try:
         logger.info(f"📧 get_deleted_mails 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 페이지: {page}, 제한: {limit}")
         
-        # 메일 사용자 조회 (조직별 필터링 추가)
-        mail_user = db.query(MailUser).filter(
-            MailUser.user_uuid == current_user.user_uuid,
-            MailUser.org_id == current_org_id
-        ).first()
-        
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
-        
         # 휴지통 폴더 조회
-        trash_folder = db.query(MailFolder).filter(
-            and_(
+        trash_folder = (await db.execute(
+            select(MailFolder).where(
                 MailFolder.user_uuid == mail_user.user_uuid,
                 MailFolder.org_id == current_org_id,
                 MailFolder.folder_type == FolderType.TRASH
             )
-        ).first()
+        )).scalars().first()
         
         if not trash_folder:
             logger.warning(f"⚠️ 휴지통 폴더를 찾을 수 없음 - 사용자: {mail_user.user_uuid}")
             raise HTTPException(status_code=404, detail="휴지통 폴더를 찾을 수 없습니다")
         
-        # 기본 쿼리 (조직별 필터링 추가)
-        query = db.query(Mail).join(
-            MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid
-        ).filter(
-            Mail.org_id == current_org_id,
-            MailInFolder.folder_uuid == trash_folder.folder_uuid
-        )
-        
-        # 검색 조건 추가
-        if search:
-            query = query.filter(
-                or_(
-                    Mail.subject.ilike(f"%{search}%"),
-                    Mail.body_text.ilike(f"%{search}%")
-                )
-            )
-        
-        # 상태 필터
-        if status:
-            query = query.filter(Mail.status == status)
-        
-        # 전체 개수
-        total_count = query.count()
-        
-        # 페이지네이션
-        offset = (page - 1) * limit
-        mails = query.order_by(desc(Mail.created_at)).offset(offset).limit(limit).all()
-        
-        # 응답 데이터 구성
-        mail_list = []
-        for mail in mails:
-            # 발신자 정보
-            sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
-            sender_response = None
-            if sender:
-                sender_response = MailUserResponse(
-                    user_uuid=sender.user_uuid,
-                    email=sender.email,
-                    display_name=sender.display_name,
-                    is_active=sender.is_active,
-                    created_at=sender.created_at,
-                    updated_at=sender.updated_at
-                )
-            
-            # 수신자 개수
-            recipient_count = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).count()
-            
-            # 첨부파일 개수
-            attachment_count = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).count()
-            
-            # 읽음 상태 확인 (수신자인 경우)
-            is_read = None
-            if mail.sender_uuid != mail_user.user_uuid:
-                recipient_record = db.query(MailRecipient).filter(
-                    MailRecipient.mail_uuid == mail.mail_uuid,
-                    MailRecipient.recipient_uuid == mail_user.user_uuid
-                ).first()
-                is_read = recipient_record.is_read if recipient_record else None
-            
-            mail_response = MailListResponse(
-                mail_uuid=mail.mail_uuid,
-                subject=mail.subject,
-                status=MailStatus(mail.status),
-                is_draft=mail.status == MailStatus.DRAFT.value,
-                priority=MailPriority(mail.priority),
-                sent_at=mail.sent_at,
-                created_at=mail.created_at,
-                sender=sender_response,
-                recipient_count=recipient_count,
-                attachment_count=attachment_count,
-                is_read=is_read
-            )
-            mail_list.append(mail_response)
+        # 목록 엔진으로 페이지 구성 (페이지 크기와 무관한 고정 쿼리 수, 비동기 연결에서 실행)
+        try:
+            list_page = await db.run_sync(lambda session: MailListService(session).build_page(
+                mail_user=mail_user,
+                org_id=current_org_id,
+                folder_type=FolderType.TRASH.value,
+                page=page,
+                limit=limit,
+                search=search,
+                status=status,
+                folder=trash_folder,
+                cursor=cursor,
+                use_cursor=use_cursor,
+                include_total=include_total
+            ))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        mail_list = list_page.mails
         
         # 페이지네이션 정보
-        total_pages = (total_count + limit - 1) // limit
-        pagination = PaginationResponse(
-            page=page,
-            limit=limit,
-            total=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1
-        )
+        pagination = list_page.to_pagination()
         
         logger.info(f"✅ get_deleted_mails 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일 수: {len(mail_list)}")
         
@@ -1841,54 +1175,33 @@ async def get_deleted_mails(
 @router.get("/trash/{mail_uuid}", response_model=MailDetailResponse, summary="휴지통 메일 상세 조회")
 async def get_trash_mail_detail(
     mail_uuid: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    mail_user: MailUser = Depends(get_current_mail_user_async),
     current_org_id: str = Depends(get_current_org_id)
 ) -> MailDetailResponse:
     """휴지통 메일 상세 조회"""
     try:
         logger.info(f"📧 get_trash_mail_detail 시작 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
-        # 메일 사용자 조회 (조직별 필터링 추가)
-        mail_user = db.query(MailUser).filter(
-            MailUser.user_uuid == current_user.user_uuid,
-            MailUser.org_id == current_org_id
-        ).first()
-        
-        if not mail_user:
-            logger.warning(f"⚠️ 메일 사용자를 찾을 수 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
-            raise HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
-        
         # 메일 조회 (조직별 필터링 추가)
-        mail = db.query(Mail).filter(
-            Mail.mail_uuid == mail_uuid,
-            Mail.org_id == current_org_id
-        ).first()
+        mail = (await db.execute(
+            select(Mail).where(
+                Mail.mail_uuid == mail_uuid,
+                Mail.org_id == current_org_id
+            )
+        )).scalars().first()
         
         if not mail:
             logger.warning(f"⚠️ 메일을 찾을 수 없음 - 조직: {current_org_id}, 메일UUID: {mail_uuid}")
             raise HTTPException(status_code=404, detail="조직 내에서 메일을 찾을 수 없습니다")
         
         # 발신자 정보
-        sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
+        sender = (await db.execute(select(MailUser).where(MailUser.user_uuid == mail.sender_uuid))).scalars().first()
         sender_email = sender.email if sender else "Unknown"
         
-        # 수신자 정보
-        recipients = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).all()
-        to_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.TO]
-        cc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.CC]
-        bcc_emails = [r.recipient_email for r in recipients if r.recipient_type == RecipientType.BCC]
-        
-        # 첨부파일 정보
-        attachments = db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).all()
-        attachment_list = []
-        for attachment in attachments:
-            attachment_list.append({
-                "id": attachment.id,
-                "filename": attachment.filename,
-                "file_size": attachment.file_size,
-                "content_type": attachment.content_type
-            })
+        # 수신자 및 첨부파일 정보
+        to_emails, cc_emails, bcc_emails, attachment_list = await _load_recipients_and_attachments(db, mail.mail_uuid)
         
         logger.info(f"✅ get_trash_mail_detail 완료 - 조직: {current_org_id}, 사용자: {current_user.email}, 메일UUID: {mail_uuid}")
         
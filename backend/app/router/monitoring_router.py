@@ -3,14 +3,21 @@
 - 조직별 사용량 통계 API
 - 조직별 감사 로그 API  
 - 조직별 대시보드 API
+- SMTP 연결 풀 메트릭 API
+- 메일 발송 큐 상태 API
+- 로컬 캐시 적중률 API
+- 바이러스 검사 캐시/지연 시간 API
+- 스케줄러 작업 리더/실행 이력 API
+- 시스템 상태 샘플 API
 """
 
 import logging
 from datetime import datetime, date
-from typing import Optional
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..database.user import get_db
 from ..model.user_model import User
 from ..model.organization_model import Organization
@@ -19,9 +26,17 @@ from ..service.auth_service import get_current_user, get_current_admin_user
 from ..schemas.monitoring_schema import (
     UsageRequest, UsageResponse,
     AuditRequest, AuditResponse, AuditActionType,
+    AuditSummaryRequest, AuditSummaryResponse,
     DashboardRequest, DashboardResponse
 )
 from ..schemas.user_schema import MessageResponse
+from ..utils.smtp_pool import smtp_pool_manager
+from ..service.mail_queue_service import get_mail_queue
+from ..utils.cache_invalidation import cache_invalidation_bus
+from ..utils.local_cache import get_cache_stats
+from ..service.virus_scan_service import get_virus_scanner
+from ..utils.cluster_scheduler import cluster_scheduler
+from ..utils.system_health import system_health_sampler
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +170,56 @@ async def get_audit_logs(
         )
 
 
+@router.get("/audit/summary",
+           response_model=AuditSummaryResponse,
+           summary="조직별 감사 요약 조회",
+           description="메일 작업, 로그인 성공/실패, 활성 사용자 수를 일별 또는 시간별로 요약합니다.")
+async def get_audit_summary(
+    request: AuditSummaryRequest = Depends(),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    조직별 감사 요약을 조회합니다.
+    
+    원본 로그 대신 주기적으로 누적되는 활동 로그 집계를 조회하므로
+    최근 집계 주기(ACTIVITY_ROLLUP_INTERVAL_SECONDS) 이내의 활동은 다음 집계 후 반영됩니다.
+    
+    **권한:**
+    - 조직 관리자만 조회 가능
+    
+    **응답 데이터:**
+    - totals: 기간 전체 작업별 합계
+    - buckets: 구간별 mail_actions, login_success, login_failed, active_users(일별만)
+    """
+    try:
+        logger.info(f"📋 감사 요약 API 호출 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
+        
+        if current_user.role not in ["admin", "org_admin"]:
+            logger.warning(f"⚠️ 감사 요약 접근 권한 없음 - 사용자: {current_user.email}, 역할: {current_user.role}")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="감사 로그 조회 권한이 없습니다. 관리자만 접근 가능합니다."
+            )
+        
+        return MonitoringService(db).get_audit_summary(current_user.org_id, request)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"❌ 감사 요약 조회 실패 - 조직: {current_user.org_id}, 오류: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"잘못된 요청입니다: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"❌ 감사 요약 조회 오류 - 조직: {current_user.org_id}, 오류: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="감사 요약 조회 중 오류가 발생했습니다."
+        )
+
+
 @router.get("/dashboard", response_model=DashboardResponse, summary="대시보드 데이터 조회")
 async def get_dashboard_data(
     request: DashboardRequest = Depends(),
@@ -211,16 +276,15 @@ async def health_check(
     try:
         logger.info(f"🔍 모니터링 시스템 상태 확인 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
         
-        # 모니터링 서비스 초기화 테스트
-        monitoring_service = MonitoringService(db)
-        
         # 기본 데이터베이스 쿼리 테스트
         org_count = db.query(Organization).filter(Organization.org_id == current_user.org_id).count()
         if org_count == 0:
             raise ValueError("조직 정보를 찾을 수 없습니다.")
         
-        # Redis 연결 테스트 (선택적)
-        redis_status = "연결됨" if monitoring_service.redis_client else "연결 안됨"
+        # Redis 연결 상태 (백그라운드 수집기의 최근 샘플 기준)
+        snapshot = system_health_sampler.latest()
+        redis_connected = bool(snapshot) and snapshot.get("redis_connected_clients") is not None
+        redis_status = "연결됨" if redis_connected else "연결 안됨"
         
         logger.info(f"✅ 모니터링 시스템 상태 확인 완료 - 조직: {current_user.org_id}, Redis: {redis_status}")
         
@@ -233,4 +297,137 @@ async def health_check(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"모니터링 시스템 상태 확인 중 오류가 발생했습니다: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/system-health",
+           summary="시스템 상태 조회",
+           description="백그라운드 수집기가 주기적으로 측정한 CPU/메모리/디스크, DB 연결 풀, Redis, 메일 큐 상태와 최근 이력을 조회합니다.")
+async def get_system_health(
+    history_limit: int = Query(60, ge=0, le=settings.SYSTEM_HEALTH_HISTORY_SIZE, description="반환할 최근 샘플 수"),
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    이 워커 프로세스의 시스템 상태 샘플을 조회합니다.
+    
+    **권한:**
+    - 관리자
+    
+    **응답:**
+    - interval_seconds: 수집 주기
+    - latest: 최근 샘플 (cpu/memory/disk 사용률, db_pools, redis_connected_clients, mail_queue 등)
+    - history: 최근 샘플 목록 (오래된 순)
+    """
+    logger.info(f"🩺 시스템 상태 조회 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
+    return {
+        "interval_seconds": system_health_sampler.interval_seconds,
+        "latest": system_health_sampler.latest(),
+        "history": system_health_sampler.history(history_limit) if history_limit else [],
+        "failures": system_health_sampler.failures,
+    }
+
+
+@router.get("/smtp-pool",
+           summary="SMTP 연결 풀 메트릭 조회",
+           description="릴레이별 SMTP 연결 풀의 연결 생성/재사용/재연결/대기 시간 메트릭을 조회합니다.")
+async def get_smtp_pool_metrics(
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    SMTP 연결 풀 메트릭을 조회합니다.
+    
+    **권한:**
+    - 관리자
+    
+    **응답:**
+    - pools: 릴레이별 메트릭 (in_use, idle, created, reused, reconnects, failures, avg_wait_ms 등)
+    """
+    logger.info(f"📊 SMTP 연결 풀 메트릭 조회 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
+    return {"pools": smtp_pool_manager.metrics()}
+
+
+@router.get("/mail-queue",
+           summary="메일 발송 큐 상태 조회",
+           description="발송 대기(ready), 재시도 대기(delayed), 처리 중, 최종 실패(dead) 작업 수와 활성 워커 수를 조회합니다.")
+async def get_mail_queue_stats(
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    메일 발송 큐 깊이를 조회합니다.
+    
+    **권한:**
+    - 관리자
+    """
+    logger.info(f"📊 메일 발송 큐 상태 조회 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
+    try:
+        return await get_mail_queue().stats()
+    except Exception as e:
+        logger.error(f"❌ 메일 발송 큐 상태 조회 오류: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="메일 발송 큐 상태를 조회할 수 없습니다."
+        )
+
+
+@router.get("/cache-stats",
+           summary="로컬 캐시 통계 조회",
+           description="이 워커 프로세스의 로컬 캐시(조직 정보 등) 적중/미스, 제거, 무효화 횟수를 조회합니다.")
+async def get_local_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    로컬 캐시 적중률과 캐시 무효화 버스 상태를 조회합니다.
+    
+    **권한:**
+    - 관리자
+    
+    **응답:**
+    - caches: 캐시별 통계 (size, hits, misses, hit_ratio, evictions, expirations, invalidations)
+    - invalidation: pub/sub 구독 상태와 송수신 메시지 수
+    """
+    logger.info(f"📊 로컬 캐시 통계 조회 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
+    return {"caches": get_cache_stats(), "invalidation": cache_invalidation_bus.stats()}
+
+
+@router.get("/virus-scan-stats",
+           summary="바이러스 검사 통계 조회",
+           description="이 워커 프로세스의 바이러스 검사 결과 캐시 적중률과 검사 지연 시간 히스토그램을 조회합니다.")
+async def get_virus_scan_stats(
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    바이러스 검사 결과 캐시와 검사 지연 시간을 조회합니다.
+    
+    **권한:**
+    - 관리자
+    
+    **응답:**
+    - max_workers: 검사 스레드 풀 크기
+    - engine_signature: 캐시 키에 사용하는 엔진 시그니처 버전
+    - cache: 조회 수, 워커별 캐시/Redis 적중 수, hit_ratio
+    - latency: 실제 검사(scan)와 캐시 적중(cache_hit) 지연 시간 히스토그램 (초)
+    """
+    logger.info(f"📊 바이러스 검사 통계 조회 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
+    return get_virus_scanner().get_scan_stats()
+
+
+@router.get("/scheduler",
+           summary="스케줄러 작업 상태 조회",
+           description="정기 작업별 다음 실행 시각, 현재 리더 인스턴스, 최근 실행 이력(모든 인스턴스 공용)을 조회합니다.")
+async def get_scheduler_stats(
+    history_limit: int = Query(10, ge=1, le=50, description="작업별 실행 이력 수"),
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    클러스터 스케줄러 작업 상태를 조회합니다.
+    
+    **권한:**
+    - 관리자
+    
+    **응답:**
+    - instance: 이 워커 프로세스의 인스턴스 ID
+    - jobs: 작업별 trigger, next_run_time, leader, is_leader, running, history
+      (history: instance, started_at, duration_ms, status, error)
+    """
+    logger.info(f"📊 스케줄러 작업 상태 조회 - 조직: {current_user.org_id}, 사용자: {current_user.email}")
+    return await cluster_scheduler.stats(history_limit=history_limit)
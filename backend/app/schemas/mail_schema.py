@@ -16,6 +16,8 @@ class MailStatus(str, Enum):
     DRAFT = "draft"
     TRASH = "trash"
     FAILED = "failed"
+    QUEUED = "queued"
+    SENDING = "sending"
 
 class MailPriority(str, Enum):
     """메일 우선순위 열거형"""
@@ -276,24 +278,30 @@ class MailSearchRequest(BaseModel):
     date_to: Optional[datetime] = Field(None, description="종료 날짜")
     page: int = Field(1, ge=1, description="페이지 번호")
     limit: int = Field(20, ge=1, le=100, description="페이지당 항목 수")
+    cursor: Optional[str] = Field(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 커서 방식)")
+    use_cursor: bool = Field(False, description="커서 방식 페이지네이션 사용 여부")
+    include_total: bool = Field(True, description="전체 결과 수 계산 여부")
 
 class MailSearchResponse(BaseModel):
     """메일 검색 응답 스키마"""
     mails: List[MailListResponse] = Field(..., description="검색된 메일 목록")
-    total: int = Field(..., description="총 검색 결과 수")
+    total: Optional[int] = Field(None, description="총 검색 결과 수 (include_total=false 시 None)")
     page: int = Field(..., description="현재 페이지")
     limit: int = Field(..., description="페이지당 항목 수")
-    total_pages: int = Field(..., description="총 페이지 수")
+    total_pages: Optional[int] = Field(None, description="총 페이지 수 (include_total=false 시 None)")
+    has_next: bool = Field(False, description="다음 페이지 존재 여부")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (커서 방식)")
 
 # 페이지네이션 응답 스키마
 class PaginationResponse(BaseModel):
     """페이지네이션 응답 스키마"""
     page: int = Field(..., description="현재 페이지")
     limit: int = Field(..., description="페이지당 항목 수")
-    total: int = Field(..., description="총 항목 수")
-    total_pages: int = Field(..., description="총 페이지 수")
+    total: Optional[int] = Field(None, description="총 항목 수 (include_total=false 시 None)")
+    total_pages: Optional[int] = Field(None, description="총 페이지 수 (include_total=false 시 None)")
     has_next: bool = Field(..., description="다음 페이지 존재 여부")
     has_prev: bool = Field(..., description="이전 페이지 존재 여부")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (커서 방식)")
 
 # 메일 목록과 페이지네이션을 포함하는 응답 스키마
 class MailListWithPaginationResponse(BaseModel):
@@ -87,6 +87,24 @@ class AuditResponse(BaseModel):
     page_size: int
 
 
+class AuditSummaryBucket(BaseModel):
+    """감사 요약 구간 (시간 또는 일)"""
+    bucket_start: datetime
+    mail_actions: Dict[str, int] = {}
+    login_success: int = 0
+    login_failed: int = 0
+    active_users: Optional[int] = None
+
+
+class AuditSummaryResponse(BaseModel):
+    """감사 요약 응답 (활동 로그 집계 기준)"""
+    granularity: str
+    start_date: date
+    end_date: date
+    totals: Dict[str, int] = {}
+    buckets: List[AuditSummaryBucket] = []
+
+
 class SystemHealthMetrics(BaseModel):
     """시스템 건강 상태 메트릭"""
     cpu_usage_percent: float
@@ -191,6 +209,13 @@ class AuditRequest(BaseModel):
     page_size: int = 20
 
 
+class AuditSummaryRequest(BaseModel):
+    """감사 요약 요청"""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    granularity: str = Field("day", pattern="^(day|hour)$", description="집계 단위 (day, hour)")
+
+
 class DashboardRequest(BaseModel):
     """대시보드 요청"""
     refresh: bool = False
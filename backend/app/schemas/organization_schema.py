@@ -255,6 +255,10 @@ class OrganizationStats(BaseModel):
     storage_limit_mb: int = Field(..., description="저장 공간 제한 (MB)")
     storage_usage_percent: float = Field(..., description="저장 공간 사용률 (%)")
     user_usage_percent: float = Field(..., description="사용자 사용률 (%)")
+    attachment_logical_bytes: int = Field(0, description="첨부파일 논리 크기 합계 (bytes, 중복 포함)")
+    attachment_stored_bytes: int = Field(0, description="첨부파일 실제 저장 크기 (bytes)")
+    attachment_bytes_saved: int = Field(0, description="중복 제거로 절약한 크기 (bytes)")
+    attachment_dedup_ratio: float = Field(1.0, description="중복 제거 비율 (논리 크기 / 저장 크기)")
 
 
 class OrganizationCreateRequest(BaseModel):
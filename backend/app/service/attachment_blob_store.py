@@ -0,0 +1,246 @@
+"""
+첨부파일 내용 주소(SHA-256) 저장소
+
+같은 조직에서 같은 내용의 첨부파일은 디스크에 한 번만 저장하고
+attachment_blobs.ref_count 로 이를 참조하는 MailAttachment 수를 셉니다.
+- 조직 단위로 중복을 제거하여 다른 조직의 파일 보유 여부가 드러나지 않음
+- 참조 증감은 UPDATE ... SET ref_count = ref_count ± 1 로 행 잠금 안에서 처리
+- blob 파일 이름에 세대 토큰을 붙여, 참조가 0이 되어 삭제된 해시가 다시 등록되어도 파일 경로가 겹치지 않음
+- 파일 이동/삭제는 트랜잭션 결과에 맞춰 after_commit / after_rollback 에서 마무리
+"""
+import hashlib
+import logging
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..model.mail_model import AttachmentBlob, Mail, MailAttachment
+
+logger = logging.getLogger(__name__)
+
+# 같은 해시의 blob 이 동시에 만들어지거나 삭제될 때 재시도 횟수
+_ADOPT_ATTEMPTS = 3
+
+
+async def _remove_quietly(path: str) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ 첨부파일 삭제 실패 - 경로: {path}, 오류: {str(e)}")
+
+
+async def hash_file(path: str, chunk_size: Optional[int] = None) -> Tuple[str, int]:
+    """파일을 청크 단위로 읽어 (SHA-256 hex, 크기)를 반환합니다."""
+    chunk_size = chunk_size or settings.ATTACHMENT_UPLOAD_CHUNK_SIZE
+    digest = hashlib.sha256()
+    size = 0
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class AttachmentBlobStore:
+    """조직별 첨부파일 blob 저장소 (Session 하나의 트랜잭션 단위로 사용)"""
+
+    def __init__(self, db: Session, root: Optional[str] = None):
+        self.db = db
+        self.root = root or settings.ATTACHMENT_BLOB_DIR
+        # 이번 트랜잭션에서 만든 blob: (blob 경로, 원본 경로) - 롤백 시 원래 위치로 되돌림
+        self._created: List[Tuple[str, str]] = []
+        # 기존 blob 으로 대체되어 커밋 후 삭제할 원본 파일
+        self._superseded: List[str] = []
+        # 참조가 0이 되어 커밋 후 삭제할 blob 파일
+        self._released: List[str] = []
+
+    def _new_blob_path(self, org_id: str, sha256: str) -> str:
+        return os.path.join(self.root, org_id, sha256[:2], f"{sha256}-{uuid.uuid4().hex[:12]}")
+
+    def _blob_filter(self, org_id: str, sha256: str):
+        return (AttachmentBlob.org_id == org_id, AttachmentBlob.sha256 == sha256)
+
+    def _increment(self, org_id: str, sha256: str) -> Optional[str]:
+        """기존 blob 의 참조를 1 늘리고 파일 경로를 반환합니다. (없으면 None)"""
+        result = self.db.execute(
+            update(AttachmentBlob)
+            .where(*self._blob_filter(org_id, sha256))
+            .values(ref_count=AttachmentBlob.ref_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return None
+        return self.db.execute(
+            select(AttachmentBlob.file_path).where(*self._blob_filter(org_id, sha256))
+        ).scalar_one()
+
+    async def adopt(self, org_id: str, source_path: str, sha256: str, file_size: int) -> str:
+        """
+        디스크에 있는 파일을 조직 blob 으로 등록하고 blob 파일 경로를 반환합니다.
+
+        같은 내용의 blob 이 있으면 참조만 늘리고 source_path 는 커밋 후 삭제합니다.
+        없으면 blob 행을 만들고 source_path 를 blob 경로로 이동합니다.
+
+        Args:
+            org_id: 조직 ID
+            source_path: 업로드/기존 첨부파일 경로
+            sha256: 파일 내용 SHA-256 (hex)
+            file_size: 파일 크기 (bytes)
+
+        Returns:
+            MailAttachment.file_path 에 저장할 blob 경로
+        """
+        for _ in range(_ADOPT_ATTEMPTS):
+            blob_path = self._increment(org_id, sha256)
+            if blob_path is not None:
+                self._superseded.append(source_path)
+                return blob_path
+
+            blob_path = self._new_blob_path(org_id, sha256)
+            try:
+                with self.db.begin_nested():
+                    self.db.add(AttachmentBlob(
+                        org_id=org_id,
+                        sha256=sha256,
+                        file_path=blob_path,
+                        file_size=file_size,
+                        ref_count=1
+                    ))
+            except IntegrityError:
+                # 다른 요청이 같은 내용의 blob 을 먼저 만든 경우 - 참조 증가로 재시도
+                continue
+
+            await aiofiles.os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            await aiofiles.os.replace(source_path, blob_path)
+            self._created.append((blob_path, source_path))
+            return blob_path
+
+        raise RuntimeError(f"첨부파일 blob 등록 실패 - 조직: {org_id}, SHA-256: {sha256}")
+
+    def release(self, org_id: str, sha256: Optional[str]) -> bool:
+        """
+        첨부파일 하나의 blob 참조를 해제합니다.
+
+        참조가 0이 되면 blob 행을 삭제하고 파일은 커밋 후 삭제 대상으로 기록합니다.
+        blob 저장소로 이전되지 않은 첨부파일(해시 없음/blob 없음)은 False 를 반환합니다.
+        """
+        if not sha256:
+            return False
+        result = self.db.execute(
+            update(AttachmentBlob)
+            .where(*self._blob_filter(org_id, sha256))
+            .values(ref_count=AttachmentBlob.ref_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return False
+
+        blob = self.db.execute(
+            select(AttachmentBlob.id, AttachmentBlob.file_path, AttachmentBlob.ref_count)
+            .where(*self._blob_filter(org_id, sha256))
+        ).one()
+        if blob.ref_count <= 0:
+            self.db.execute(
+                delete(AttachmentBlob)
+                .where(AttachmentBlob.id == blob.id)
+                .execution_options(synchronize_session=False)
+            )
+            self._released.append(blob.file_path)
+        return True
+
+    async def after_commit(self) -> None:
+        """커밋 후 대체된 원본 파일과 참조가 0이 된 blob 파일을 삭제합니다."""
+        for path in self._superseded + self._released:
+            await _remove_quietly(path)
+        if self._released:
+            logger.info(f"🗑️ 참조가 없는 첨부파일 blob 삭제 - {len(self._released)}개")
+        self._created, self._superseded, self._released = [], [], []
+
+    async def after_rollback(self) -> None:
+        """롤백 후 이번 트랜잭션에서 blob 으로 옮긴 파일을 원래 위치로 되돌립니다."""
+        for blob_path, source_path in reversed(self._created):
+            try:
+                await aiofiles.os.replace(blob_path, source_path)
+            except OSError as e:
+                logger.warning(f"⚠️ blob 파일 복원 실패 - 경로: {blob_path}, 오류: {str(e)}")
+        self._created, self._superseded, self._released = [], [], []
+
+    def dedup_stats(self, org_id: str) -> Dict[str, Any]:
+        """
+        조직의 첨부파일 중복 제거 통계
+
+        Returns:
+            logical_bytes(참조 수 x 크기), stored_bytes(실제 저장 크기), bytes_saved, dedup_ratio
+        """
+        logical_bytes, stored_bytes = self.db.execute(
+            select(
+                func.coalesce(func.sum(AttachmentBlob.file_size * AttachmentBlob.ref_count), 0),
+                func.coalesce(func.sum(AttachmentBlob.file_size), 0)
+            ).where(AttachmentBlob.org_id == org_id)
+        ).one()
+        logical_bytes, stored_bytes = int(logical_bytes), int(stored_bytes)
+        return {
+            "logical_bytes": logical_bytes,
+            "stored_bytes": stored_bytes,
+            "bytes_saved": logical_bytes - stored_bytes,
+            "dedup_ratio": round(logical_bytes / stored_bytes, 2) if stored_bytes else 1.0,
+        }
+
+    async def migrate_legacy_attachments(self, batch_size: int = 200) -> Dict[str, int]:
+        """
+        blob 저장소 도입 전에 저장된 첨부파일을 blob 저장소로 이전합니다.
+
+        file_path 가 blob 저장소 밖에 있는 첨부파일을 id 순으로 배치 처리하며,
+        해시가 없으면 파일을 읽어 계산하고 file_path/content_sha256 을 갱신합니다.
+        배치마다 커밋하므로 중단 후 다시 실행하면 남은 첨부파일부터 이어서 처리합니다.
+
+        Returns:
+            migrated(이전), deduplicated(기존 blob 재사용), missing(파일 없음) 건수
+        """
+        counts = {"migrated": 0, "deduplicated": 0, "missing": 0}
+        root_prefix = os.path.join(self.root, "")
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                select(MailAttachment, Mail.org_id)
+                .join(Mail, Mail.mail_uuid == MailAttachment.mail_uuid)
+                .where(MailAttachment.id > last_id, ~MailAttachment.file_path.startswith(root_prefix))
+                .order_by(MailAttachment.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            try:
+                for attachment, org_id in rows:
+                    last_id = attachment.id
+                    if not os.path.isfile(attachment.file_path):
+                        counts["missing"] += 1
+                        logger.warning(f"⚠️ 이전할 첨부파일 없음 - 첨부파일: {attachment.attachment_uuid}, 경로: {attachment.file_path}")
+                        continue
+                    sha256, size = await hash_file(attachment.file_path)
+                    created_before = len(self._created)
+                    attachment.file_path = await self.adopt(org_id, attachment.file_path, sha256, size)
+                    attachment.content_sha256 = sha256
+                    attachment.file_size = size
+                    counts["migrated"] += 1
+                    if len(self._created) == created_before:
+                        counts["deduplicated"] += 1
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                await self.after_rollback()
+                raise
+            await self.after_commit()
+            logger.info(f"📦 첨부파일 blob 이전 진행 - 마지막 ID: {last_id}, 누적: {counts}")
+
+        return counts
@@ -0,0 +1,169 @@
+"""
+첨부파일 업로드 스트리밍 서비스
+
+UploadFile 을 메모리에 모두 읽지 않고 고정 크기 청크로 디스크에 씁니다.
+- aiofiles 로 기록하여 이벤트 루프를 막지 않음
+- 청크마다 누적 크기를 검사해 조직 제한(첨부파일/메일 전체)을 넘는 즉시 중단하고 임시 파일 삭제
+- 같은 패스에서 SHA-256 과 크기를 계산하여 MailAttachment 생성에 전달
+- <파일>.part 에 쓰고 완료 시 최종 경로로 교체하므로 중단된 업로드가 첨부파일로 남지 않음
+- virus_scanner 를 주면 디스크에 쓰는 청크를 clamd 로도 보내 업로드와 동시에 바이러스 검사
+"""
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import os
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, UploadFile
+
+from ..config import settings
+from ..model.mail_model import MailAttachment
+from .virus_scan_service import VirusScanService
+
+logger = logging.getLogger(__name__)
+
+# 업로드 중 임시 파일 접미사
+PARTIAL_SUFFIX = ".part"
+
+
+@dataclass
+class StoredAttachment:
+    """디스크에 저장된 첨부파일 메타데이터"""
+    attachment_uuid: str
+    filename: str
+    file_path: str
+    file_size: int
+    sha256: str
+    content_type: Optional[str]
+
+    def to_model(self, mail_uuid: str, file_path: Optional[str] = None) -> MailAttachment:
+        """
+        MailAttachment 행을 만듭니다. (크기/해시는 업로드 중 계산한 값 사용)
+
+        file_path 를 주면 업로드 경로 대신 사용합니다. (blob 저장소에 등록한 경로)
+        """
+        return MailAttachment(
+            attachment_uuid=self.attachment_uuid,
+            mail_uuid=mail_uuid,
+            filename=self.filename,
+            file_path=file_path or self.file_path,
+            file_size=self.file_size,
+            content_type=self.content_type,
+            content_sha256=self.sha256
+        )
+
+
+def _attachment_too_large(filename: str, size_limits: dict) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=(
+            f"첨부파일 크기 초과: {filename} ({size_limits['max_attachment_bytes']} bytes 초과). "
+            f"허용 최대: {size_limits['max_attachment_mb']} MB"
+        ),
+    )
+
+
+def _mail_too_large(total_bytes: int, size_limits: dict) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=(
+            f"메일 전체 크기 초과: {total_bytes} bytes 이상. "
+            f"허용 최대: {size_limits['max_mail_mb']} MB"
+        ),
+    )
+
+
+def _attachment_infected(filename: str, virus_name: Optional[str]) -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail=f"첨부파일에서 바이러스가 발견되었습니다: {filename} ({virus_name or '알 수 없는 바이러스'})",
+    )
+
+
+async def _remove_quietly(path: str) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ 첨부파일 임시 파일 삭제 실패 - 경로: {path}, 오류: {str(e)}")
+
+
+async def store_upload(
+    upload: UploadFile,
+    directory: str,
+    size_limits: dict,
+    mail_bytes_so_far: int = 0,
+    chunk_size: Optional[int] = None,
+    virus_scanner: Optional[VirusScanService] = None
+) -> StoredAttachment:
+    """
+    업로드 파일 하나를 청크 단위로 디스크에 저장합니다.
+
+    Args:
+        upload: 업로드 파일
+        directory: 저장 디렉토리
+        size_limits: _get_org_size_limits 결과 (max_attachment_bytes, max_mail_bytes 등)
+        mail_bytes_so_far: 이 파일 이전까지의 메일 크기 (본문 + 앞선 첨부파일)
+        chunk_size: 읽기 단위 (기본: ATTACHMENT_UPLOAD_CHUNK_SIZE)
+        virus_scanner: 업로드 중 스트리밍 검사에 사용할 검사 서비스 (clamd 를 쓸 수 없으면 검사 생략)
+
+    Returns:
+        저장된 첨부파일 정보
+
+    Raises:
+        HTTPException: 첨부파일 또는 메일 전체 크기 제한 초과 시 (413), 바이러스 발견 시 (422)
+    """
+    chunk_size = chunk_size or settings.ATTACHMENT_UPLOAD_CHUNK_SIZE
+    attachment_uuid = str(uuid.uuid4())
+    file_path = os.path.join(directory, f"{attachment_uuid}{os.path.splitext(upload.filename)[1]}")
+    partial_path = file_path + PARTIAL_SUFFIX
+
+    digest = hashlib.sha256()
+    size = 0
+    scan = await virus_scanner.open_upload_scan() if virus_scanner else None
+    try:
+        async with aiofiles.open(partial_path, "wb") as out:
+            while chunk := await upload.read(chunk_size):
+                size += len(chunk)
+                if size > size_limits["max_attachment_bytes"]:
+                    raise _attachment_too_large(upload.filename, size_limits)
+                if mail_bytes_so_far + size > size_limits["max_mail_bytes"]:
+                    raise _mail_too_large(mail_bytes_so_far + size, size_limits)
+                digest.update(chunk)
+                if scan:
+                    await asyncio.gather(out.write(chunk), scan.write(chunk))
+                else:
+                    await out.write(chunk)
+        if scan:
+            verdict = await scan.finish(file_path, digest.hexdigest())
+            scan = None
+            if verdict and verdict.is_infected:
+                logger.warning(f"🦠 업로드 중 바이러스 발견 - 파일: {upload.filename}, 바이러스: {verdict.virus_name}")
+                raise _attachment_infected(upload.filename, verdict.virus_name)
+        await aiofiles.os.replace(partial_path, file_path)
+    except BaseException:
+        if scan:
+            await scan.abort()
+        await _remove_quietly(partial_path)
+        raise
+
+    return StoredAttachment(
+        attachment_uuid=attachment_uuid,
+        filename=upload.filename,
+        file_path=file_path,
+        file_size=size,
+        sha256=digest.hexdigest(),
+        content_type=upload.content_type or mimetypes.guess_type(upload.filename)[0]
+    )
+
+
+async def discard_stored(stored: List[StoredAttachment]) -> None:
+    """요청이 실패했을 때 이미 저장한 첨부파일을 삭제합니다."""
+    for attachment in stored:
+        await _remove_quietly(attachment.file_path)
@@ -9,15 +9,19 @@ import json
 from jose import jwt, JWTError
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
 
-from ..model import User, RefreshToken, Organization
+from ..model import User, RefreshToken, Organization, MailUser
 from ..schemas.user_schema import UserCreate, UserLogin, Token
 from ..config import settings
-from ..database.user import get_db
+from ..database.user import get_db, get_async_db
+from . import principal_cache
 from ..middleware.tenant_middleware import get_current_org_id
 
 # 로거 설정
@@ -391,6 +395,59 @@ class AuthService:
             logger.error(f"❌ 사용자 인증 실패: {str(e)}")
             return None
     
+    @staticmethod
+    async def authenticate_user_async(db: AsyncSession, user_id: str, password: str,
+                                      org_id: Optional[str] = None) -> Optional[User]:
+        """
+        사용자 인증을 수행합니다. (비동기 세션 사용, authenticate_user와 동일한 검증)
+        
+        사용자와 조직 활성 상태는 한 번에 조회하고, bcrypt 검증은 스레드풀에서 실행하여
+        이벤트 루프를 막지 않습니다.
+        
+        Args:
+            db: 비동기 데이터베이스 세션
+            user_id: 사용자 ID
+            password: 비밀번호
+            org_id: 조직 ID (선택사항)
+            
+        Returns:
+            인증된 사용자 객체 또는 None
+        """
+        try:
+            logger.info(f"🔐 사용자 인증 시도 - 사용자 ID: {user_id}, 조직 ID: {org_id}")
+            
+            stmt = select(User, Organization.is_active).outerjoin(
+                Organization, Organization.org_id == User.org_id
+            ).where(User.user_id == user_id)
+            if org_id:
+                stmt = stmt.where(User.org_id == org_id)
+            
+            row = (await db.execute(stmt)).first()
+            if row is None:
+                logger.warning(f"❌ 사용자를 찾을 수 없음 - 사용자 ID: {user_id}, 조직 ID: {org_id}")
+                return None
+            
+            user, organization_active = row
+            if not organization_active:
+                logger.warning(f"❌ 조직이 비활성화됨 - 조직 ID: {user.org_id}")
+                return None
+            
+            # 비밀번호 검증 (CPU 작업이므로 스레드풀에서 실행)
+            if not await run_in_threadpool(AuthService.verify_password, password, user.hashed_password):
+                logger.warning(f"❌ 비밀번호 불일치 - 사용자 ID: {user_id}")
+                return None
+            
+            if not user.is_active:
+                logger.warning(f"❌ 비활성화된 사용자 - 사용자 ID: {user_id}")
+                return None
+            
+            logger.info(f"✅ 사용자 인증 성공 - 사용자 ID: {user_id}, 조직 ID: {user.org_id}")
+            return user
+            
+        except Exception as e:
+            logger.error(f"❌ 사용자 인증 실패: {str(e)}")
+            return None
+    
     def authenticate_user_by_email(self, email: str, password: str, org_id: Optional[str] = None):
         """
         이메일 기반 사용자 인증을 수행합니다.
@@ -545,6 +602,51 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     except JWTError:
         return None
 
+def _credentials_exception() -> HTTPException:
+    """인증 실패 예외"""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="인증 정보를 확인할 수 없습니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _decode_principal(credentials: HTTPAuthorizationCredentials) -> tuple:
+    """
+    액세스 토큰을 검증하고 (사용자 UUID, 조직 ID, 토큰 ID)를 반환합니다.
+    
+    Raises:
+        HTTPException: 토큰이 유효하지 않은 경우 (401)
+    """
+    try:
+        # 토큰 검증
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: str = payload.get("sub")
+        org_id: str = payload.get("org_id")  # UUID 문자열로 수정
+        
+        if user_id is None or org_id is None:
+            raise _credentials_exception()
+            
+    except JWTError:
+        raise _credentials_exception()
+    
+    return user_id, org_id, payload.get("jti")
+
+
+def _inactive_organization_exception() -> HTTPException:
+    """비활성 조직 예외"""
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="조직이 비활성화되었습니다."
+    )
+
+
+def _mail_user_not_found(current_user: User, current_org_id: str) -> HTTPException:
+    """조직 내 메일 사용자 없음 예외"""
+    logger.warning(f"⚠️ 메일 사용자 없음 - 조직: {current_org_id}, 사용자: {current_user.email}")
+    return HTTPException(status_code=404, detail="조직 내에서 메일 사용자를 찾을 수 없습니다")
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -562,23 +664,13 @@ def get_current_user(
     Raises:
         HTTPException: 인증 실패 시
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="인증 정보를 확인할 수 없습니다.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    user_id, org_id, jti = _decode_principal(credentials)
     
-    try:
-        # 토큰 검증
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        org_id: str = payload.get("org_id")  # UUID 문자열로 수정
-        
-        if user_id is None or org_id is None:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
+    # 인증 주체 캐시 확인 (적중 시 조회 쿼리 없음, 조직 활성 상태는 저장 시 확인됨)
+    cache_key = principal_cache.token_key(user_id, org_id, jti)
+    cached_user = principal_cache.get_cached(db, cache_key, User)
+    if cached_user is not None:
+        return cached_user
     
     # 사용자 조회 (조직 컨텍스트 포함)
     user = db.query(User).filter(
@@ -587,18 +679,132 @@ def get_current_user(
     ).first()
     
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     # 조직 활성화 상태 확인
     organization = db.query(Organization).filter(Organization.org_id == org_id).first()
     if not organization or not organization.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="조직이 비활성화되었습니다."
-        )
+        raise _inactive_organization_exception()
+    
+    principal_cache.store(cache_key, user)
+    return user
+
+
+def get_current_mail_user(
+    current_user: User = Depends(get_current_user),
+    current_org_id: str = Depends(get_current_org_id),
+    db: Session = Depends(get_db)
+) -> MailUser:
+    """
+    현재 사용자의 조직 내 메일 사용자를 반환합니다. (인증 주체 캐시 사용)
+    
+    Args:
+        current_user: 현재 사용자
+        current_org_id: 현재 조직 ID
+        db: 데이터베이스 세션
+        
+    Returns:
+        메일 사용자 객체
+        
+    Raises:
+        HTTPException: 조직에 메일 사용자가 없는 경우 (404)
+    """
+    cache_key = principal_cache.mail_user_key(current_user.user_uuid, current_org_id)
+    mail_user = principal_cache.get_cached(db, cache_key, MailUser)
+    if mail_user is not None:
+        return mail_user
+    
+    mail_user = db.query(MailUser).filter(
+        MailUser.user_uuid == current_user.user_uuid,
+        MailUser.org_id == current_org_id
+    ).first()
+    if not mail_user:
+        raise _mail_user_not_found(current_user, current_org_id)
     
+    principal_cache.store(cache_key, mail_user)
+    return mail_user
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    현재 인증된 사용자를 반환합니다. (비동기 세션 사용, get_current_user와 동일한 검증)
+    
+    Args:
+        credentials: HTTP Authorization 헤더
+        db: 비동기 데이터베이스 세션
+        
+    Returns:
+        현재 사용자 객체 (db 세션에 속함)
+        
+    Raises:
+        HTTPException: 인증 실패 시
+    """
+    user_id, org_id, jti = _decode_principal(credentials)
+    
+    # 캐시 적중 시 스냅샷을 비동기 세션에 붙여 반환 (쿼리 없음)
+    cache_key = principal_cache.token_key(user_id, org_id, jti)
+    cached_user = principal_cache.get_cached(db.sync_session, cache_key, User)
+    if cached_user is not None:
+        return cached_user
+    
+    # 사용자와 조직 활성 상태를 한 번에 조회
+    row = (await db.execute(
+        select(User, Organization.is_active)
+        .outerjoin(Organization, Organization.org_id == User.org_id)
+        .where(User.user_uuid == user_id, User.org_id == org_id)
+    )).first()
+    
+    if row is None:
+        raise _credentials_exception()
+    
+    user, organization_active = row
+    if not organization_active:
+        raise _inactive_organization_exception()
+    
+    principal_cache.store(cache_key, user)
     return user
 
+
+async def get_current_mail_user_async(
+    current_user: User = Depends(get_current_user_async),
+    current_org_id: str = Depends(get_current_org_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> MailUser:
+    """
+    현재 사용자의 조직 내 메일 사용자를 반환합니다. (비동기 세션 사용)
+    
+    Args:
+        current_user: 현재 사용자
+        current_org_id: 현재 조직 ID
+        db: 비동기 데이터베이스 세션
+        
+    Returns:
+        메일 사용자 객체 (db 세션에 속함)
+        
+    Raises:
+        HTTPException: 조직에 메일 사용자가 없는 경우 (404)
+    """
+    cache_key = principal_cache.mail_user_key(current_user.user_uuid, current_org_id)
+    mail_user = principal_cache.get_cached(db.sync_session, cache_key, MailUser)
+    if mail_user is not None:
+        return mail_user
+    
+    mail_user = (await db.execute(
+        select(MailUser).where(
+            MailUser.user_uuid == current_user.user_uuid,
+            MailUser.org_id == current_org_id
+        )
+    )).scalars().first()
+    if not mail_user:
+        raise _mail_user_not_found(current_user, current_org_id)
+    
+    principal_cache.store(cache_key, mail_user)
+    return mail_user
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """
     현재 활성화된 사용자를 반환합니다.
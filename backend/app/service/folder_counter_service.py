@@ -0,0 +1,446 @@
+"""
+폴더별 메일 수 카운터 (folder_counters)
+
+메일 통계와 목록의 전체 개수가 요청마다 mails ⋈ mail_in_folders 를 COUNT(*) 하지 않도록
+폴더별 전체/읽지 않은 메일 수와 크기(bytes)를 mail_in_folders 변경과 같은 트랜잭션에서 유지합니다.
+
+- ORM 으로 MailInFolder 를 추가/이동/삭제하거나 is_read 를 바꾸면 flush 때 전체/읽지 않은 메일 수를 반영
+- 추가된 메일의 크기는 첨부파일까지 flush 된 commit 직전에, 삭제/이동되는 메일의 크기는 행이 지워지기 전에 계산
+- ORM 을 거치지 않는 일괄 INSERT/UPDATE/DELETE 는 record_inserted / move_folder / drop_folder 로 직접 반영
+- 카운터는 폴더 UUID 순서로 UPSERT 하여 같은 폴더들을 갱신하는 트랜잭션 간 교착을 피함
+- reconcile_folder_counters 가 mail_in_folders 기준으로 어긋난 카운터를 주기적으로 보정
+"""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..model.mail_model import FolderCounter, Mail, MailAttachment, MailFolder, MailInFolder
+
+logger = logging.getLogger(__name__)
+
+# 세션별로 commit 직전에 크기를 더할 (폴더 UUID, 메일 UUID) 를 모아두는 session.info 키
+_PENDING_KEY = "folder_counters_pending"
+# before_flush 에서 계산하여 after_flush 에 반영할 증감을 담는 session.info 키
+_FLUSH_KEY = "folder_counters_flush"
+
+
+@dataclass
+class FolderCounts:
+    """폴더 카운터 값"""
+    total: int = 0
+    unread: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class _PendingSizes:
+    # 폴더 UUID -> 크기를 아직 더하지 않은 메일 UUID 목록
+    added: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+
+
+def _pending(session: Session) -> _PendingSizes:
+    pending = session.info.get(_PENDING_KEY)
+    if pending is None:
+        pending = session.info[_PENDING_KEY] = _PendingSizes()
+    return pending
+
+
+def _unread(is_read: Optional[bool]) -> int:
+    return 0 if is_read else 1
+
+
+def _committed_rows(session: Session, instances: List[MailInFolder]) -> Dict[Any, Tuple[str, str, Optional[bool]]]:
+    """
+    flush 전 DB 에 있는 (폴더 UUID, 메일 UUID, 읽음 상태) 를 id 별로 한 번에 조회합니다.
+
+    commit 후 만료된 객체는 변경 전 값이 속성 히스토리에 남지 않으므로 DB 에서 읽습니다.
+    """
+    ids = [inspect(instance).identity[0] for instance in instances if inspect(instance).identity]
+    if not ids:
+        return {}
+    rows = session.execute(
+        select(MailInFolder.id, MailInFolder.folder_uuid, MailInFolder.mail_uuid, MailInFolder.is_read)
+        .where(MailInFolder.id.in_(ids))
+    )
+    return {row_id: (folder_uuid, mail_uuid, is_read) for row_id, folder_uuid, mail_uuid, is_read in rows}
+
+
+def _dialect(session: Session) -> str:
+    return session.get_bind().dialect.name
+
+
+def mail_size_expression(dialect_name: str):
+    """메일 크기 = 텍스트/HTML 본문 바이트 수 + 첨부파일 크기 합계"""
+    length = func.octet_length if dialect_name == "postgresql" else func.length
+    attachment_bytes = (
+        select(func.coalesce(func.sum(MailAttachment.file_size), 0))
+        .where(MailAttachment.mail_uuid == Mail.mail_uuid)
+        .scalar_subquery()
+    )
+    return func.coalesce(length(Mail.body_text), 0) + func.coalesce(length(Mail.body_html), 0) + attachment_bytes
+
+
+def mail_sizes(session: Session, mail_uuids: Iterable[str]) -> Dict[str, int]:
+    """메일 UUID 별 크기를 한 번의 쿼리로 조회합니다."""
+    mail_uuids = list(set(mail_uuids))
+    if not mail_uuids:
+        return {}
+    rows = session.execute(
+        select(Mail.mail_uuid, mail_size_expression(_dialect(session))).where(Mail.mail_uuid.in_(mail_uuids))
+    )
+    return {mail_uuid: int(size or 0) for mail_uuid, size in rows}
+
+
+def _apply(session: Session, deltas: Dict[str, List[int]], verify_folders: bool = True) -> None:
+    """
+    폴더별 [전체, 읽지 않음, 크기] 증감을 폴더 UUID 순서로 UPSERT 합니다.
+
+    verify_folders 이면 같은 트랜잭션에서 삭제된 폴더는 건너뜁니다.
+    (호출자가 방금 조회한 폴더라면 생략)
+    """
+    changed = {folder_uuid: delta for folder_uuid, delta in deltas.items() if folder_uuid and any(delta)}
+    if not changed:
+        return
+
+    if verify_folders:
+        existing = set(session.execute(
+            select(MailFolder.folder_uuid).where(MailFolder.folder_uuid.in_(list(changed)))
+        ).scalars())
+        changed = {folder_uuid: delta for folder_uuid, delta in changed.items() if folder_uuid in existing}
+    rows = [
+        {"folder_uuid": folder_uuid, "total_count": total, "unread_count": unread, "total_bytes": size}
+        for folder_uuid, (total, unread, size) in sorted(changed.items())
+    ]
+    if not rows:
+        return
+
+    table = FolderCounter.__table__
+    dialect = _dialect(session)
+    if dialect in ("postgresql", "sqlite"):
+        stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.folder_uuid],
+            set_={
+                "total_count": table.c.total_count + stmt.excluded.total_count,
+                "unread_count": table.c.unread_count + stmt.excluded.unread_count,
+                "total_bytes": table.c.total_bytes + stmt.excluded.total_bytes,
+                "updated_at": func.now(),
+            },
+        )
+        session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        result = session.execute(
+            update(table)
+            .where(table.c.folder_uuid == row["folder_uuid"])
+            .values(
+                total_count=table.c.total_count + row["total_count"],
+                unread_count=table.c.unread_count + row["unread_count"],
+                total_bytes=table.c.total_bytes + row["total_bytes"],
+                updated_at=func.now(),
+            )
+        )
+        if not result.rowcount:
+            session.execute(table.insert().values(**row))
+
+
+def _new_deltas() -> Dict[str, List[int]]:
+    return defaultdict(lambda: [0, 0, 0])
+
+
+def _add(session: Session, deltas: Dict[str, List[int]], folder_uuid: str, mail_uuid: str, unread: int) -> None:
+    deltas[folder_uuid][0] += 1
+    deltas[folder_uuid][1] += unread
+    _pending(session).added[folder_uuid].append(mail_uuid)
+
+
+def _remove(session: Session, deltas: Dict[str, List[int]], folder_uuid: str, mail_uuid: str,
+            unread: int, sizes: Dict[str, int]) -> None:
+    deltas[folder_uuid][0] -= 1
+    deltas[folder_uuid][1] -= unread
+    pending = session.info.get(_PENDING_KEY)
+    added = pending.added.get(folder_uuid) if pending else None
+    if added and mail_uuid in added:
+        # 같은 트랜잭션에서 추가된 행이면 아직 크기를 더하지 않았으므로 빼지 않음
+        added.remove(mail_uuid)
+    else:
+        deltas[folder_uuid][2] -= sizes.get(mail_uuid, 0)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_folder_changes(session: Session, flush_context, instances) -> None:
+    """flush 될 MailInFolder 추가/이동/삭제와 읽음 상태 변경을 모아둡니다."""
+    added: List[Tuple[str, str, int]] = []
+    removed: List[Tuple[str, str, int]] = []
+    deltas = _new_deltas()
+
+    for instance in session.new:
+        if isinstance(instance, MailInFolder):
+            added.append((instance.folder_uuid, instance.mail_uuid, _unread(instance.is_read)))
+
+    deleted = [instance for instance in session.deleted if isinstance(instance, MailInFolder)]
+    dirty = [
+        instance for instance in session.dirty
+        if isinstance(instance, MailInFolder) and session.is_modified(instance)
+    ]
+    committed = _committed_rows(session, deleted + dirty)
+
+    for instance in deleted:
+        original = committed.get(inspect(instance).identity[0])
+        if original:
+            folder_uuid, mail_uuid, is_read = original
+            removed.append((folder_uuid, mail_uuid, _unread(is_read)))
+
+    for instance in dirty:
+        original = committed.get(inspect(instance).identity[0])
+        if not original:
+            continue
+        old_folder, mail_uuid, old_is_read = original
+        new_folder = instance.folder_uuid
+        old_unread, new_unread = _unread(old_is_read), _unread(instance.is_read)
+        if old_folder != new_folder:
+            removed.append((old_folder, mail_uuid, old_unread))
+            added.append((new_folder, mail_uuid, new_unread))
+        elif old_unread != new_unread:
+            deltas[new_folder][1] += new_unread - old_unread
+
+    if not (added or removed or deltas):
+        return
+
+    sizes = mail_sizes(session, {mail_uuid for _, mail_uuid, _ in removed})
+    for folder_uuid, mail_uuid, unread in removed:
+        _remove(session, deltas, folder_uuid, mail_uuid, unread, sizes)
+    for folder_uuid, mail_uuid, unread in added:
+        _add(session, deltas, folder_uuid, mail_uuid, unread)
+
+    session.info[_FLUSH_KEY] = deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_folder_changes(session: Session, flush_context) -> None:
+    """
+    모아둔 증감을 같은 트랜잭션에서 반영합니다.
+
+    행이 INSERT 된 뒤에 실행되므로 같은 flush 에서 만든 폴더도 반영되고, 삭제된 폴더는 건너뜁니다.
+    """
+    deltas = session.info.pop(_FLUSH_KEY, None)
+    if deltas:
+        _apply(session, deltas)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_pending_sizes(session: Session) -> None:
+    """commit 직전에 이번 트랜잭션에서 추가된 메일의 크기를 카운터에 더합니다."""
+    if _PENDING_KEY not in session.info and not (session.new or session.deleted or session.dirty):
+        return
+    session.flush()
+    pending: Optional[_PendingSizes] = session.info.pop(_PENDING_KEY, None)
+    if not pending or not pending.added:
+        return
+
+    sizes = mail_sizes(session, {mail_uuid for mail_uuids in pending.added.values() for mail_uuid in mail_uuids})
+    deltas = _new_deltas()
+    for folder_uuid, mail_uuids in pending.added.items():
+        deltas[folder_uuid][2] += sum(sizes.get(mail_uuid, 0) for mail_uuid in mail_uuids)
+    _apply(session, deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_sizes(session: Session) -> None:
+    """롤백된 변경의 크기는 반영하지 않습니다."""
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_FLUSH_KEY, None)
+
+
+def record_inserted(session: Session, rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    ORM 을 거치지 않고 일괄 INSERT 한 mail_in_folders 행을 카운터에 반영합니다.
+
+    Args:
+        session: INSERT 를 실행한 세션 (같은 트랜잭션)
+        rows: INSERT 한 행 (folder_uuid, mail_uuid, is_read)
+    """
+    deltas = _new_deltas()
+    for row in rows:
+        _add(session, deltas, row["folder_uuid"], row["mail_uuid"], _unread(row.get("is_read")))
+    _apply(session, deltas, verify_folders=False)
+
+
+def move_folder(session: Session, source_uuid: str, target_uuid: str) -> None:
+    """
+    폴더의 모든 메일을 다른 폴더로 일괄 UPDATE 할 때 원본 카운터를 대상 폴더에 합칩니다.
+
+    원본 폴더의 카운터 행은 삭제됩니다.
+    """
+    pending = session.info.get(_PENDING_KEY)
+    if pending and source_uuid in pending.added:
+        pending.added[target_uuid].extend(pending.added.pop(source_uuid))
+
+    counter = session.execute(
+        select(FolderCounter.total_count, FolderCounter.unread_count, FolderCounter.total_bytes)
+        .where(FolderCounter.folder_uuid == source_uuid)
+        .with_for_update()
+    ).first()
+    if counter is None:
+        return
+    session.execute(delete(FolderCounter).where(FolderCounter.folder_uuid == source_uuid))
+    _apply(session, {target_uuid: list(counter)}, verify_folders=False)
+
+
+def drop_folder(session: Session, folder_uuid: str) -> None:
+    """폴더의 mail_in_folders 를 일괄 DELETE 할 때 카운터 행을 삭제합니다."""
+    pending = session.info.get(_PENDING_KEY)
+    if pending:
+        pending.added.pop(folder_uuid, None)
+    session.execute(delete(FolderCounter).where(FolderCounter.folder_uuid == folder_uuid))
+
+
+def get_counts(session: Session, folder_uuids: Iterable[str]) -> Dict[str, FolderCounts]:
+    """
+    폴더 UUID 별 카운터를 조회합니다. (카운터 행이 없는 폴더는 0)
+
+    Args:
+        session: DB 세션
+        folder_uuids: 폴더 UUID 목록
+
+    Returns:
+        폴더 UUID -> FolderCounts
+    """
+    folder_uuids = [folder_uuid for folder_uuid in set(folder_uuids) if folder_uuid]
+    counts = {folder_uuid: FolderCounts() for folder_uuid in folder_uuids}
+    if not folder_uuids:
+        return counts
+    rows = session.execute(
+        select(FolderCounter.folder_uuid, FolderCounter.total_count, FolderCounter.unread_count, FolderCounter.total_bytes)
+        .where(FolderCounter.folder_uuid.in_(folder_uuids))
+    )
+    for folder_uuid, total, unread, size in rows:
+        counts[folder_uuid] = FolderCounts(total=max(total or 0, 0), unread=max(unread or 0, 0), bytes=max(size or 0, 0))
+    return counts
+
+
+def get_count(session: Session, folder_uuid: Optional[str]) -> FolderCounts:
+    """폴더 하나의 카운터를 조회합니다."""
+    if not folder_uuid:
+        return FolderCounts()
+    return get_counts(session, [folder_uuid])[folder_uuid]
+
+
+def _actual_counts(session: Session, folder_uuids: List[str]) -> Dict[str, FolderCounts]:
+    """mail_in_folders 기준 실제 값을 한 번의 GROUP BY 로 계산합니다."""
+    length = func.octet_length if _dialect(session) == "postgresql" else func.length
+    attachment_bytes = (
+        select(MailAttachment.mail_uuid, func.sum(MailAttachment.file_size).label("size"))
+        .group_by(MailAttachment.mail_uuid)
+        .subquery()
+    )
+    mail_bytes = (
+        func.coalesce(length(Mail.body_text), 0)
+        + func.coalesce(length(Mail.body_html), 0)
+        + func.coalesce(attachment_bytes.c.size, 0)
+    )
+    rows = session.execute(
+        select(
+            MailInFolder.folder_uuid,
+            func.count(MailInFolder.id),
+            func.count(MailInFolder.id).filter(MailInFolder.is_read.isnot(True)),
+            func.coalesce(func.sum(mail_bytes), 0),
+        )
+        .join(Mail, Mail.mail_uuid == MailInFolder.mail_uuid)
+        .outerjoin(attachment_bytes, attachment_bytes.c.mail_uuid == Mail.mail_uuid)
+        .where(MailInFolder.folder_uuid.in_(folder_uuids))
+        .group_by(MailInFolder.folder_uuid)
+    )
+    actual = {folder_uuid: FolderCounts() for folder_uuid in folder_uuids}
+    for folder_uuid, total, unread, size in rows:
+        actual[folder_uuid] = FolderCounts(total=total, unread=unread, bytes=int(size or 0))
+    return actual
+
+
+def _ensure_rows(session: Session, folder_uuids: List[str]) -> None:
+    """카운터 행이 없는 폴더에 0 으로 된 행을 만듭니다. (이미 있으면 그대로)"""
+    table = FolderCounter.__table__
+    rows = [{"folder_uuid": folder_uuid, "total_count": 0, "unread_count": 0, "total_bytes": 0} for folder_uuid in folder_uuids]
+    dialect = _dialect(session)
+    if dialect in ("postgresql", "sqlite"):
+        stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+        session.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.folder_uuid]), rows)
+        return
+    existing = set(session.execute(select(table.c.folder_uuid).where(table.c.folder_uuid.in_(folder_uuids))).scalars())
+    missing = [row for row in rows if row["folder_uuid"] not in existing]
+    if missing:
+        session.execute(table.insert(), missing)
+
+
+def reconcile_folder_counters(session: Session, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    모든 폴더의 카운터를 mail_in_folders 기준 실제 값과 비교하여 보정합니다.
+
+    폴더 UUID 순서로 batch_size 개씩 카운터 행을 잠그고(FOR UPDATE) 다시 계산한 뒤
+    배치마다 commit 하므로 잠금 시간이 짧고, 진행 중인 메일 수신/이동과 순서가 엇갈리지 않습니다.
+
+    Args:
+        session: DB 세션
+        batch_size: 한 트랜잭션에서 보정할 폴더 수
+
+    Returns:
+        검사한 폴더 수, 보정한 카운터 수, 삭제한 고아 카운터 수
+    """
+    batch_size = batch_size or settings.FOLDER_COUNTER_RECONCILE_BATCH_SIZE
+    result = {"checked": 0, "corrected": 0, "orphaned": 0}
+    last_uuid = ""
+
+    while True:
+        folder_uuids = list(session.execute(
+            select(MailFolder.folder_uuid)
+            .where(MailFolder.folder_uuid.isnot(None), MailFolder.folder_uuid > last_uuid)
+            .order_by(MailFolder.folder_uuid)
+            .limit(batch_size)
+        ).scalars())
+        if not folder_uuids:
+            break
+        last_uuid = folder_uuids[-1]
+
+        _ensure_rows(session, folder_uuids)
+        counters = {
+            counter.folder_uuid: counter
+            for counter in session.execute(
+                select(FolderCounter)
+                .where(FolderCounter.folder_uuid.in_(folder_uuids))
+                .order_by(FolderCounter.folder_uuid)
+                .with_for_update()
+            ).scalars()
+        }
+        actual = _actual_counts(session, folder_uuids)
+
+        for folder_uuid in folder_uuids:
+            expected = actual[folder_uuid]
+            counter = counters[folder_uuid]
+            if (counter.total_count, counter.unread_count, counter.total_bytes) != (expected.total, expected.unread, expected.bytes):
+                logger.info(
+                    f"🔧 폴더 카운터 보정 - 폴더: {folder_uuid}, "
+                    f"전체: {counter.total_count}→{expected.total}, 읽지 않음: {counter.unread_count}→{expected.unread}, "
+                    f"크기: {counter.total_bytes}→{expected.bytes}"
+                )
+                counter.total_count = expected.total
+                counter.unread_count = expected.unread
+                counter.total_bytes = expected.bytes
+                result["corrected"] += 1
+
+        result["checked"] += len(folder_uuids)
+        session.commit()
+
+    orphaned = session.execute(
+        delete(FolderCounter).where(~FolderCounter.folder_uuid.in_(select(MailFolder.folder_uuid).where(MailFolder.folder_uuid.isnot(None))))
+    )
+    result["orphaned"] = orphaned.rowcount or 0
+    session.commit()
+    return result
@@ -0,0 +1,196 @@
+"""
+메일 사용 분석 서비스
+
+기간 내 메일을 모두 ORM 객체로 읽어 Python 에서 집계하고, 메일마다 발신자/수신자를 다시
+조회하던 방식을 SQL 집계로 대체합니다.
+- 일별/우선순위별 개수: GROUP BY (날짜, priority) 한 번씩 (보낸 메일, 받은 메일)
+- 상위 발신자/수신자: GROUP BY + ORDER BY count DESC LIMIT 으로 DB 에서 상위 N 개만 조회
+- 오늘 이전의 지난 날짜 구간은 결과가 바뀌지 않으므로 워커별 캐시에 저장하고,
+  오늘 구간만 매번 집계하여 합칩니다.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, desc, func, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..model.mail_model import Mail, MailRecipient, MailUser
+from ..utils.local_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+# 분석 기간별 일 수 (알 수 없는 값은 month)
+PERIOD_DAYS = {"week": 7, "month": 30, "year": 365}
+
+# 응답에 포함하는 상위 발신자/수신자 수
+TOP_N = 5
+
+# 지난 날짜 구간 집계 캐시 ((org_id, user_uuid, period, 기준일) -> _Aggregate)
+ANALYTICS_CACHE_NAME = "mail_analytics"
+analytics_cache = LRUTTLCache(
+    ANALYTICS_CACHE_NAME,
+    max_size=settings.MAIL_ANALYTICS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.MAIL_ANALYTICS_CACHE_TTL_SECONDS
+)
+
+
+@dataclass
+class _Aggregate:
+    """한 구간의 집계 결과"""
+    daily_sent: Dict[str, int] = field(default_factory=dict)
+    daily_received: Dict[str, int] = field(default_factory=dict)
+    priority: Dict[str, int] = field(default_factory=lambda: {"high": 0, "normal": 0, "low": 0})
+    # 상위 후보 (구간별로 TOP_CANDIDATES 개까지)
+    senders: Dict[str, int] = field(default_factory=dict)
+    recipients: Dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: "_Aggregate") -> "_Aggregate":
+        merged = _Aggregate()
+        for name in ("daily_sent", "daily_received", "priority", "senders", "recipients"):
+            target = getattr(merged, name)
+            for source in (getattr(self, name), getattr(other, name)):
+                for key, count in source.items():
+                    target[key] = target.get(key, 0) + count
+        return merged
+
+
+def _day_key(value: Any) -> str:
+    """DB 가 반환한 날짜 값(date, datetime, 문자열)을 YYYY-MM-DD 로 변환합니다."""
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def _priority_key(value: Optional[str]) -> str:
+    return value if value in ("high", "low") else "normal"
+
+
+def _top(counts: Dict[str, int], limit: int) -> List[Tuple[str, int]]:
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+class MailAnalyticsService:
+    """메일 사용 분석 서비스"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _aggregate(self, org_id: str, user_uuid: str, start: datetime, end: Optional[datetime]) -> _Aggregate:
+        """[start, end) 구간을 SQL 로 집계합니다. (end 가 None 이면 현재까지)"""
+        limit = settings.MAIL_ANALYTICS_TOP_CANDIDATES
+        day = func.date(Mail.created_at)
+        period = [Mail.org_id == org_id, Mail.created_at >= start]
+        if end is not None:
+            period.append(Mail.created_at < end)
+        sent_filter = and_(Mail.sender_uuid == user_uuid, Mail.status == "sent", *period)
+        received_filter = and_(MailRecipient.recipient_uuid == user_uuid, *period)
+        result = _Aggregate()
+
+        # 보낸 메일: 일별 × 우선순위
+        for row in self.db.execute(
+            select(day, Mail.priority, func.count()).where(sent_filter).group_by(day, Mail.priority)
+        ):
+            key = _day_key(row[0])
+            result.daily_sent[key] = result.daily_sent.get(key, 0) + row[2]
+            result.priority[_priority_key(row[1])] += row[2]
+
+        # 받은 메일: 일별 × 우선순위
+        for row in self.db.execute(
+            select(day, Mail.priority, func.count())
+            .select_from(Mail)
+            .join(MailRecipient, MailRecipient.mail_uuid == Mail.mail_uuid)
+            .where(received_filter)
+            .group_by(day, Mail.priority)
+        ):
+            key = _day_key(row[0])
+            result.daily_received[key] = result.daily_received.get(key, 0) + row[2]
+            result.priority[_priority_key(row[1])] += row[2]
+
+        # 상위 발신자 (받은 메일 기준)
+        sender_count = func.count().label("count")
+        result.senders = {
+            row[0]: row[1] for row in self.db.execute(
+                select(MailUser.email, sender_count)
+                .select_from(Mail)
+                .join(MailRecipient, MailRecipient.mail_uuid == Mail.mail_uuid)
+                .join(MailUser, MailUser.user_uuid == Mail.sender_uuid)
+                .where(received_filter)
+                .group_by(MailUser.email)
+                .order_by(desc(sender_count), MailUser.email)
+                .limit(limit)
+            )
+        }
+
+        # 상위 수신자 (보낸 메일 기준)
+        recipient_count = func.count().label("count")
+        result.recipients = {
+            row[0]: row[1] for row in self.db.execute(
+                select(MailRecipient.recipient_email, recipient_count)
+                .select_from(Mail)
+                .join(MailRecipient, MailRecipient.mail_uuid == Mail.mail_uuid)
+                .where(sent_filter)
+                .group_by(MailRecipient.recipient_email)
+                .order_by(desc(recipient_count), MailRecipient.recipient_email)
+                .limit(limit)
+            )
+        }
+        return result
+
+    def get_analytics(self, org_id: str, user_uuid: str, period: str,
+                      now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        사용자의 보낸/받은 메일 분석 결과를 반환합니다.
+
+        기간은 오늘(UTC)을 포함한 일 단위이며, 오늘 이전 구간은 캐시된 집계를 사용합니다.
+        상위 발신자/수신자는 구간별 상위 MAIL_ANALYTICS_TOP_CANDIDATES 개를 합쳐 고르므로,
+        후보 밖의 주소가 오늘 메일만으로 상위 5개에 들어오는 경우는 반영되지 않을 수 있습니다.
+
+        Args:
+            org_id: 조직 ID
+            user_uuid: 메일 사용자 UUID
+            period: week, month, year
+            now: 기준 시각 (UTC, 테스트용)
+        """
+        now = now or datetime.utcnow()
+        days = PERIOD_DAYS.get(period, PERIOD_DAYS["month"])
+        today: date = now.date()
+        today_start = datetime.combine(today, time.min)
+        start = today_start - timedelta(days=days)
+
+        cache_key = (org_id, user_uuid, period, today.isoformat())
+        closed = analytics_cache.get(cache_key)
+        if closed is None:
+            closed = self._aggregate(org_id, user_uuid, start, today_start)
+            analytics_cache.set(cache_key, closed)
+        else:
+            logger.debug(f"📦 메일 분석 지난 구간 캐시 사용 - 조직: {org_id}, 사용자: {user_uuid}, 기간: {period}")
+        total = closed.merge(self._aggregate(org_id, user_uuid, today_start, None))
+
+        daily_stats = {}
+        for offset in range(days + 1):
+            key = (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+            daily_stats[key] = {
+                "sent": total.daily_sent.get(key, 0),
+                "received": total.daily_received.get(key, 0),
+            }
+
+        total_sent = sum(total.daily_sent.values())
+        total_received = sum(total.daily_received.values())
+        return {
+            "period": period,
+            "start_date": start.isoformat(),
+            "end_date": now.isoformat(),
+            "summary": {
+                "total_sent": total_sent,
+                "total_received": total_received,
+                "total_mails": total_sent + total_received,
+            },
+            "daily_stats": daily_stats,
+            "priority_stats": total.priority,
+            "top_senders": [{"email": email, "count": count} for email, count in _top(total.senders, TOP_N)],
+            "top_recipients": [{"email": email, "count": count} for email, count in _top(total.recipients, TOP_N)],
+        }
@@ -0,0 +1,412 @@
+"""
+메일 백업 내보내기 서비스
+
+사용자 메일함을 메모리 사용량이 메일 수와 무관한 방식으로 ZIP 백업 파일에 씁니다.
+- 서버 측 커서(yield_per)로 메일을 배치 단위로 읽고, 배치마다 발신자/수신자/첨부파일을
+  IN 쿼리로 한 번에 조회 (메일당 쿼리 없음)
+- 메일 한 건을 NDJSON 한 줄(mails.ndjson)로 ZIP 항목에 바로 기록
+- 첨부파일 포함 시 발송 때 저장된 MIME 원문(messages/<메일 UUID>.eml)도 그대로 추가
+- ZIP은 앞에서부터만 기록(data descriptor 사용)하므로 생성 중인 파일을 그대로 스트리밍 다운로드 가능
+- 진행 상태는 백업 파일 옆의 상태 파일(<백업 파일>.status.json)에 기록되어 모든 워커에서 조회 가능
+"""
+import asyncio
+import io
+import json
+import logging
+import os
+import time
+import zipfile
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..model.mail_model import Mail, MailAttachment, MailRecipient, MailUser
+from .raw_message_store import RawMessageStore
+
+logger = logging.getLogger(__name__)
+
+# ZIP 내 메일 데이터 항목 이름 (한 줄에 메일 한 건)
+NDJSON_ENTRY = "mails.ndjson"
+# 상태 파일 접미사
+STATUS_SUFFIX = ".status.json"
+# 생성 중 다운로드 시 읽기 단위와 새 데이터 대기 간격
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_POLL_INTERVAL = 0.2
+
+
+class BackupJobStatus:
+    """백업 작업 상태"""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class BackupJob:
+    """백업 작업 진행 정보 (상태 파일 내용)"""
+    backup_filename: str
+    org_id: str
+    user_uuid: str
+    include_attachments: bool
+    status: str = BackupJobStatus.RUNNING
+    total: int = 0
+    processed: int = 0
+    backup_size: int = 0
+    error: Optional[str] = None
+    started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    updated_at: float = field(default_factory=time.time)
+    finished_at: Optional[str] = None
+
+    @property
+    def progress(self) -> float:
+        """진행률 (%)"""
+        if self.status == BackupJobStatus.COMPLETED:
+            return 100.0
+        return round(self.processed * 100 / self.total, 1) if self.total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["progress"] = self.progress
+        return data
+
+
+def status_path(backup_path: str) -> str:
+    """백업 파일의 상태 파일 경로"""
+    return backup_path + STATUS_SUFFIX
+
+
+def write_job_status(backup_path: str, job: BackupJob) -> None:
+    """상태 파일을 원자적으로 갱신합니다. (읽는 쪽이 쓰다 만 파일을 보지 않도록 교체)"""
+    job.updated_at = time.time()
+    temp_path = f"{status_path(backup_path)}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(job.to_dict(), f, ensure_ascii=False)
+    os.replace(temp_path, status_path(backup_path))
+
+
+def read_job_status(backup_path: str) -> Optional[BackupJob]:
+    """상태 파일을 읽습니다. 없으면 None (이전 방식으로 만든 백업)"""
+    try:
+        with open(status_path(backup_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    data.pop("progress", None)
+    return BackupJob(**data)
+
+
+class _AppendOnlyFile:
+    """
+    seek 할 수 없는 파일 래퍼
+
+    zipfile은 seek 할 수 없는 출력에 쓸 때 로컬 헤더를 되돌아가 고치지 않고 data descriptor를 사용합니다.
+    따라서 파일이 앞에서부터만 자라며, 생성 중에도 이미 기록된 부분은 바뀌지 않습니다.
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._raw.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, *args):
+        raise io.UnsupportedOperation("append-only")
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def close(self) -> None:
+        self._raw.close()
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class MailBackupService:
+    """메일 백업 내보내기 서비스"""
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.MAIL_BACKUP_BATCH_SIZE
+        self.raw_message_store = RawMessageStore()
+
+    def _filters(self, mail_user: MailUser, org_id: str,
+                 start_dt: Optional[datetime], end_dt: Optional[datetime]) -> List[Any]:
+        """사용자가 보냈거나 받은 메일 조건 (sent_at 우선, 없으면 created_at 기준 날짜 범위)"""
+        conditions = [
+            Mail.org_id == org_id,
+            or_(
+                Mail.sender_uuid == mail_user.user_uuid,
+                Mail.mail_uuid.in_(
+                    select(MailRecipient.mail_uuid).where(MailRecipient.recipient_email == mail_user.email)
+                )
+            )
+        ]
+        if start_dt:
+            conditions.append(or_(
+                and_(Mail.sent_at.isnot(None), Mail.sent_at >= start_dt),
+                and_(Mail.sent_at.is_(None), Mail.created_at >= start_dt)
+            ))
+        if end_dt:
+            conditions.append(or_(
+                and_(Mail.sent_at.isnot(None), Mail.sent_at < end_dt),
+                and_(Mail.sent_at.is_(None), Mail.created_at < end_dt)
+            ))
+        return conditions
+
+    def count_mails(self, mail_user: MailUser, org_id: str,
+                    start_dt: Optional[datetime] = None, end_dt: Optional[datetime] = None) -> int:
+        """백업 대상 메일 수"""
+        return self.db.execute(
+            select(func.count()).select_from(Mail).where(*self._filters(mail_user, org_id, start_dt, end_dt))
+        ).scalar_one()
+
+    def iter_entries(self, mail_user: MailUser, org_id: str,
+                     start_dt: Optional[datetime] = None,
+                     end_dt: Optional[datetime] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        백업 항목을 배치 단위로 생성합니다.
+
+        배치마다 메일 행은 서버 측 커서에서, 발신자/수신자/첨부파일은 IN 쿼리 3회로 읽습니다.
+
+        Yields:
+            NDJSON 한 줄로 기록할 메일 정보 목록
+        """
+        stmt = select(
+            Mail.mail_uuid, Mail.sender_uuid, Mail.subject, Mail.body_text,
+            Mail.status, Mail.priority, Mail.created_at, Mail.sent_at
+        ).where(
+            *self._filters(mail_user, org_id, start_dt, end_dt)
+        ).order_by(Mail.created_at, Mail.mail_uuid).execution_options(yield_per=self.batch_size)
+
+        for rows in self.db.execute(stmt).partitions():
+            mail_uuids = [row.mail_uuid for row in rows]
+
+            senders = dict(self.db.execute(
+                select(MailUser.user_uuid, MailUser.email).where(
+                    MailUser.user_uuid.in_({row.sender_uuid for row in rows})
+                )
+            ).all())
+
+            recipients: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for r in self.db.execute(
+                select(MailRecipient.mail_uuid, MailRecipient.recipient_email, MailRecipient.recipient_type)
+                .where(MailRecipient.mail_uuid.in_(mail_uuids))
+                .order_by(MailRecipient.id)
+            ):
+                recipients[r.mail_uuid].append({
+                    "email": r.recipient_email,
+                    "type": r.recipient_type,
+                    "name": r.recipient_email  # MailUser 모델에 name 필드가 없으므로 email 사용
+                })
+
+            attachments: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for a in self.db.execute(
+                select(MailAttachment.mail_uuid, MailAttachment.filename, MailAttachment.file_path,
+                       MailAttachment.file_size, MailAttachment.content_type)
+                .where(MailAttachment.mail_uuid.in_(mail_uuids))
+                .order_by(MailAttachment.id)
+            ):
+                attachments[a.mail_uuid].append({
+                    "filename": a.filename,
+                    "file_path": a.file_path,
+                    "file_size": a.file_size,
+                    "content_type": a.content_type
+                })
+
+            yield [
+                {
+                    "id": row.mail_uuid,
+                    "subject": row.subject,
+                    "content": row.body_text,
+                    "sender_email": senders.get(row.sender_uuid),
+                    "recipients": recipients.get(row.mail_uuid, []),
+                    "status": row.status,
+                    "priority": row.priority,
+                    "created_at": _isoformat(row.created_at),
+                    "sent_at": _isoformat(row.sent_at),
+                    "attachments": attachments.get(row.mail_uuid, [])
+                }
+                for row in rows
+            ]
+
+    def iter_attachment_files(self, mail_user: MailUser, org_id: str,
+                              start_dt: Optional[datetime] = None,
+                              end_dt: Optional[datetime] = None) -> Iterator[Tuple[str, str]]:
+        """백업 대상 메일의 첨부파일 (저장 경로, ZIP 내 경로)을 서버 측 커서로 생성합니다."""
+        stmt = select(MailAttachment.mail_uuid, MailAttachment.filename, MailAttachment.file_path).where(
+            MailAttachment.mail_uuid.in_(
+                select(Mail.mail_uuid).where(*self._filters(mail_user, org_id, start_dt, end_dt))
+            )
+        ).order_by(MailAttachment.id).execution_options(yield_per=self.batch_size)
+
+        for row in self.db.execute(stmt):
+            yield row.file_path, f"attachments/{row.mail_uuid}/{row.filename}"
+
+    def iter_raw_message_files(self, mail_user: MailUser, org_id: str,
+                               start_dt: Optional[datetime] = None,
+                               end_dt: Optional[datetime] = None) -> Iterator[Tuple[str, str]]:
+        """발송 시 저장된 메일 원문 (저장 경로, ZIP 내 경로)을 서버 측 커서로 생성합니다. (원문이 없는 메일은 제외)"""
+        stmt = select(Mail.mail_uuid).where(
+            *self._filters(mail_user, org_id, start_dt, end_dt)
+        ).order_by(Mail.created_at, Mail.mail_uuid).execution_options(yield_per=self.batch_size)
+
+        for row in self.db.execute(stmt):
+            raw_path = self.raw_message_store.path(org_id, row.mail_uuid)
+            if os.path.exists(raw_path):
+                yield raw_path, f"messages/{row.mail_uuid}.eml"
+
+    def _add_files(self, zipf: zipfile.ZipFile, output: _AppendOnlyFile, backup_path: str,
+                   job: BackupJob, files: Iterator[Tuple[str, str]]) -> None:
+        """
+        (저장 경로, ZIP 내 경로) 파일들을 ZIP 에 추가합니다.
+
+        메일 데이터 기록이 끝난 뒤라 processed 는 늘지 않으므로, 생성 중 다운로드가 작업을 멈춘 것으로
+        보지 않도록 MAIL_BACKUP_STATUS_EVERY_FILES 개 또는 MAIL_BACKUP_STATUS_EVERY_MB 마다 상태 파일을 갱신합니다.
+        """
+        every_bytes = settings.MAIL_BACKUP_STATUS_EVERY_MB * 1024 * 1024
+        files_since_status = bytes_since_status = 0
+        for file_path, zip_path in files:
+            if not file_path or not os.path.exists(file_path):
+                continue
+            zipf.write(file_path, zip_path)
+            output.flush()
+            files_since_status += 1
+            bytes_since_status += os.path.getsize(file_path)
+            if files_since_status >= settings.MAIL_BACKUP_STATUS_EVERY_FILES or bytes_since_status >= every_bytes:
+                write_job_status(backup_path, job)
+                files_since_status = bytes_since_status = 0
+
+    def export(self, backup_path: str, job: BackupJob, mail_user: MailUser,
+               start_dt: Optional[datetime] = None, end_dt: Optional[datetime] = None) -> BackupJob:
+        """
+        백업 ZIP 파일을 생성하고 배치마다 진행 상태를 갱신합니다.
+
+        Args:
+            backup_path: 생성할 백업 파일 경로
+            job: 진행 정보 (상태 파일에 기록)
+            mail_user: 백업할 메일 사용자
+            start_dt: 시작 일시 (포함)
+            end_dt: 종료 일시 (미포함)
+
+        Returns:
+            완료(또는 실패) 상태의 작업 정보
+        """
+        try:
+            job.total = self.count_mails(mail_user, job.org_id, start_dt, end_dt)
+            write_job_status(backup_path, job)
+
+            with open(backup_path, "wb") as raw:
+                output = _AppendOnlyFile(raw)
+                with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zipf:
+                    with zipf.open(NDJSON_ENTRY, "w", force_zip64=True) as ndjson:
+                        for batch in self.iter_entries(mail_user, job.org_id, start_dt, end_dt):
+                            for mail_info in batch:
+                                ndjson.write((json.dumps(mail_info, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                            job.processed += len(batch)
+                            output.flush()
+                            write_job_status(backup_path, job)
+
+                    # 열려 있는 ZIP 항목에는 다른 항목을 쓸 수 없으므로 첨부파일은 메일 데이터 뒤에 추가
+                    if job.include_attachments:
+                        self._add_files(zipf, output, backup_path, job,
+                                        self.iter_attachment_files(mail_user, job.org_id, start_dt, end_dt))
+                        # 발송 시 저장한 MIME 원문을 다시 인코딩하지 않고 그대로 추가
+                        self._add_files(zipf, output, backup_path, job,
+                                        self.iter_raw_message_files(mail_user, job.org_id, start_dt, end_dt))
+
+            job.status = BackupJobStatus.COMPLETED
+            job.backup_size = os.path.getsize(backup_path)
+            logger.info(f"✅ 메일 백업 생성 완료 - 파일: {job.backup_filename}, 메일 수: {job.processed}, 크기: {job.backup_size}")
+        except Exception as e:
+            job.status = BackupJobStatus.FAILED
+            job.error = str(e)
+            logger.error(f"❌ 메일 백업 생성 실패 - 파일: {job.backup_filename}, 오류: {str(e)}")
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            write_job_status(backup_path, job)
+        return job
+
+
+def run_backup_job(backup_path: str, job: BackupJob, start_dt: Optional[datetime] = None,
+                   end_dt: Optional[datetime] = None,
+                   session_factory: Optional[Callable[[], Session]] = None) -> BackupJob:
+    """
+    백그라운드 작업 진입점 - 요청 세션과 별도의 세션으로 백업을 생성합니다.
+
+    Args:
+        backup_path: 생성할 백업 파일 경로
+        job: 진행 정보
+        start_dt: 시작 일시 (포함)
+        end_dt: 종료 일시 (미포함)
+        session_factory: 세션 생성 함수 (기본: SessionLocal)
+    """
+    if session_factory is None:
+        from ..database.user import SessionLocal
+        session_factory = SessionLocal
+
+    db = session_factory()
+    try:
+        mail_user = db.query(MailUser).filter(
+            MailUser.user_uuid == job.user_uuid,
+            MailUser.org_id == job.org_id
+        ).first()
+        if mail_user:
+            return MailBackupService(db).export(backup_path, job, mail_user, start_dt, end_dt)
+        job.error = "조직 내에서 메일 사용자를 찾을 수 없습니다"
+    except Exception as e:
+        job.error = str(e)
+        logger.error(f"❌ 메일 백업 작업 오류 - 파일: {job.backup_filename}, 오류: {str(e)}")
+    finally:
+        db.close()
+
+    job.status = BackupJobStatus.FAILED
+    job.finished_at = datetime.utcnow().isoformat()
+    write_job_status(backup_path, job)
+    return job
+
+
+async def stream_backup_file(backup_path: str, chunk_size: int = STREAM_CHUNK_SIZE,
+                             poll_interval: float = STREAM_POLL_INTERVAL) -> AsyncIterator[bytes]:
+    """
+    백업 파일을 읽어 전송합니다. 생성 중이면 새로 기록되는 부분을 기다리며 완료될 때까지 이어서 보냅니다.
+
+    작업이 실패하거나 진행 상태가 MAIL_BACKUP_STALL_TIMEOUT_SECONDS 동안 갱신되지 않으면 전송을 중단합니다.
+    """
+    import aiofiles
+
+    async with aiofiles.open(backup_path, "rb") as f:
+        while True:
+            chunk = await f.read(chunk_size)
+            if chunk:
+                yield chunk
+                continue
+
+            job = read_job_status(backup_path)
+            if job is None or job.status == BackupJobStatus.COMPLETED:
+                # 완료 표시 전에 기록된 나머지 데이터까지 전송
+                while chunk := await f.read(chunk_size):
+                    yield chunk
+                return
+            if job.status == BackupJobStatus.FAILED:
+                logger.warning(f"⚠️ 백업 생성 실패로 다운로드 중단 - 파일: {job.backup_filename}, 오류: {job.error}")
+                return
+            if time.time() - job.updated_at > settings.MAIL_BACKUP_STALL_TIMEOUT_SECONDS:
+                logger.warning(f"⚠️ 백업 진행 상태 갱신 없음 - 다운로드 중단: {job.backup_filename}")
+                return
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,462 @@
+"""
+메일 목록 조회 엔진
+
+받은 메일함, 보낸 메일함, 임시보관함, 휴지통, 검색 결과 목록을 고정된 쿼리 수로 구성합니다.
+행마다 발신자/수신자/읽음 상태/첨부파일 수를 따로 조회하지 않고,
+조인과 selectinload, 그룹 집계 쿼리로 한 페이지를 한 번에 만듭니다.
+
+페이지네이션은 두 가지 방식을 지원합니다.
+- 오프셋 방식: page/limit (기존 동작)
+- 커서 방식: (created_at, mail_uuid) 키셋 커서. 깊은 페이지도 첫 페이지와 같은 비용으로 조회됩니다.
+"""
+import base64
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, desc, func, or_, tuple_
+from sqlalchemy.orm import Query, Session, aliased, selectinload
+
+from ..model.mail_model import (
+    FolderType, Mail, MailAttachment, MailFolder, MailInFolder, MailRecipient, MailUser
+)
+from ..schemas.mail_schema import MailListResponse, MailStatus, MailUserResponse, PaginationResponse
+from . import folder_counter_service
+
+logger = logging.getLogger(__name__)
+
+# 폴더 기반(MailInFolder 조인) 목록
+FOLDER_JOINED_TYPES = {FolderType.INBOX.value, FolderType.TRASH.value}
+
+# 발신자 기준 목록 (보낸 메일함/임시보관함)과 해당 메일 상태
+SENDER_OWNED_STATUSES = {
+    FolderType.SENT.value: MailStatus.SENT.value,
+    FolderType.DRAFT.value: MailStatus.DRAFT.value,
+}
+
+# 외부 호출부에서 사용하는 폴더 별칭
+FOLDER_ALIASES = {
+    "drafts": FolderType.DRAFT.value,
+}
+
+
+def text_search_condition(db: Session, term: str) -> Any:
+    """
+    제목/본문 검색 조건을 만듭니다.
+
+    PostgreSQL에서는 트리거로 유지되는 mails.search_vector(GIN 인덱스)에 대한 전문 검색과
+    트라이그램 인덱스를 타는 ILIKE 부분일치를 함께 사용합니다.
+    그 외 DB(SQLite 테스트 등)에서는 ILIKE 부분일치만 사용합니다.
+
+    Args:
+        db: 데이터베이스 세션
+        term: 검색어
+
+    Returns:
+        SQLAlchemy 필터 조건
+    """
+    pattern = f"%{term}%"
+    substring_match = or_(Mail.subject.ilike(pattern), Mail.body_text.ilike(pattern))
+    if db.get_bind().dialect.name != "postgresql":
+        return substring_match
+    return or_(
+        Mail.search_vector.op("@@")(func.plainto_tsquery("simple", term)),
+        substring_match
+    )
+
+
+def encode_cursor(created_at: datetime, mail_uuid: str) -> str:
+    """
+    (created_at, mail_uuid) 키를 불투명한 커서 문자열로 인코딩합니다.
+
+    Args:
+        created_at: 마지막 항목의 생성 시간
+        mail_uuid: 마지막 항목의 메일 UUID
+
+    Returns:
+        URL-safe base64 커서 문자열
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "u": mail_uuid}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    커서 문자열을 (created_at, mail_uuid) 키로 디코딩합니다.
+
+    Args:
+        cursor: encode_cursor로 만든 커서 문자열
+
+    Returns:
+        (created_at, mail_uuid) 튜플
+
+    Raises:
+        ValueError: 커서 형식이 올바르지 않은 경우
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        return datetime.fromisoformat(payload["c"]), str(payload["u"])
+    except Exception:
+        raise ValueError("유효하지 않은 커서입니다")
+
+
+@dataclass
+class MailListPage:
+    """메일 목록 한 페이지 결과"""
+    mails: List[MailListResponse]
+    total: Optional[int]
+    page: int
+    limit: int
+    has_next: bool = False
+    next_cursor: Optional[str] = None
+    # include_recipients=True 일 때만 채워지는 메일별 수신자 목록
+    recipients: Dict[str, List[MailRecipient]] = field(default_factory=dict)
+    # 페이지에 포함된 Mail ORM 객체 (요약/미리보기 등 부가 정보용)
+    rows: List[Mail] = field(default_factory=list)
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        """총 페이지 수 (전체 개수를 계산하지 않은 경우 None)"""
+        if self.total is None:
+            return None
+        return (self.total + self.limit - 1) // self.limit if self.limit else 0
+
+    def to_pagination(self) -> PaginationResponse:
+        """페이지네이션 응답 스키마로 변환합니다."""
+        return PaginationResponse(
+            page=self.page,
+            limit=self.limit,
+            total=self.total,
+            total_pages=self.total_pages,
+            has_next=self.has_next,
+            has_prev=self.page > 1,
+            next_cursor=self.next_cursor
+        )
+
+
+def _to_user_response(user: Optional[MailUser]) -> Optional[MailUserResponse]:
+    """MailUser를 응답 스키마로 변환합니다."""
+    if not user:
+        return None
+    return MailUserResponse(
+        user_uuid=user.user_uuid,
+        email=user.email,
+        display_name=user.display_name,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        updated_at=user.updated_at
+    )
+
+
+class MailListService:
+    """
+    메일 목록 조회 엔진
+
+    한 페이지를 구성하는 데 페이지 크기와 무관하게 고정된 수의 쿼리만 사용합니다.
+    (전체 개수 1회(선택), 본문 목록 1회, 수신자 집계 또는 selectinload 1회, 첨부파일 집계 1회)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_folder(self, mail_user: MailUser, org_id: str, folder_type: str) -> Optional[MailFolder]:
+        """
+        사용자의 시스템 폴더를 조회합니다.
+
+        Args:
+            mail_user: 메일 사용자
+            org_id: 조직 ID
+            folder_type: 폴더 타입 (inbox, sent, draft, trash)
+
+        Returns:
+            폴더 객체 (없으면 None)
+        """
+        return self.db.query(MailFolder).filter(
+            and_(
+                MailFolder.user_uuid == mail_user.user_uuid,
+                MailFolder.org_id == org_id,
+                MailFolder.folder_type == folder_type
+            )
+        ).first()
+
+    def build_page(
+        self,
+        mail_user: MailUser,
+        org_id: str,
+        folder_type: str,
+        page: int = 1,
+        limit: int = 20,
+        search: Optional[str] = None,
+        status: Optional[Any] = None,
+        folder: Optional[MailFolder] = None,
+        include_recipients: bool = False,
+        cursor: Optional[str] = None,
+        use_cursor: bool = False,
+        include_total: bool = True
+    ) -> MailListPage:
+        """
+        폴더의 메일 목록 한 페이지를 구성합니다.
+
+        Args:
+            mail_user: 현재 메일 사용자
+            org_id: 조직 ID
+            folder_type: 폴더 타입 (inbox, sent, draft/drafts, trash)
+            page: 페이지 번호 (오프셋 방식)
+            limit: 페이지당 항목 수
+            search: 검색어 (제목/본문)
+            status: 메일 상태 필터
+            folder: 미리 조회한 폴더 (inbox/trash에서 생략 시 직접 조회)
+            include_recipients: 수신자 목록을 함께 로드할지 여부
+            cursor: 이전 페이지의 next_cursor (지정 시 커서 방식)
+            use_cursor: 커서 방식 사용 여부 (첫 페이지 요청용)
+            include_total: 전체 개수 계산 여부
+
+        Returns:
+            MailListPage 결과
+
+        Raises:
+            ValueError: 지원하지 않는 폴더 타입, 폴더 없음, 잘못된 커서인 경우
+        """
+        folder_type = FOLDER_ALIASES.get(folder_type, folder_type)
+        Sender = aliased(MailUser)
+
+        if folder_type in FOLDER_JOINED_TYPES:
+            if folder is None:
+                folder = self.get_folder(mail_user, org_id, folder_type)
+            if folder is None:
+                raise ValueError(f"{folder_type} 폴더를 찾을 수 없습니다")
+
+            query = self.db.query(Mail, Sender, MailInFolder.is_read).join(
+                MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid
+            ).outerjoin(
+                Sender, and_(Sender.user_uuid == Mail.sender_uuid, Sender.org_id == org_id)
+            ).filter(
+                and_(
+                    MailInFolder.folder_uuid == folder.folder_uuid,
+                    Mail.org_id == org_id
+                )
+            )
+            order_column = Mail.created_at
+        elif folder_type in SENDER_OWNED_STATUSES:
+            query = self.db.query(Mail).filter(
+                and_(
+                    Mail.sender_uuid == mail_user.user_uuid,
+                    Mail.status == SENDER_OWNED_STATUSES[folder_type],
+                    Mail.org_id == org_id
+                )
+            )
+            order_column = Mail.sent_at if folder_type == FolderType.SENT.value else Mail.created_at
+        else:
+            raise ValueError(f"지원하지 않는 폴더 타입: {folder_type}")
+
+        if search:
+            query = query.filter(text_search_condition(self.db, search))
+
+        if status:
+            query = query.filter(Mail.status == getattr(status, "value", status))
+
+        if include_recipients:
+            query = query.options(selectinload(Mail.recipients))
+
+        # 검색/상태 필터가 없는 폴더 목록의 전체 개수는 폴더 카운터에서 읽음
+        known_total = None
+        if include_total and folder_type in FOLDER_JOINED_TYPES and not search and not status:
+            known_total = folder_counter_service.get_count(self.db, folder.folder_uuid).total
+
+        rows, total, has_next, next_cursor = self._fetch_rows(
+            query, order_column, page, limit, cursor, use_cursor, include_total, known_total
+        )
+
+        if folder_type in FOLDER_JOINED_TYPES:
+            entries = [(mail, sender, is_read) for mail, sender, is_read in rows]
+        else:
+            entries = [(mail, mail_user, None) for mail in rows]
+
+        return self._build_page(
+            entries, folder_type, mail_user, page, limit, total, has_next, next_cursor, include_recipients
+        )
+
+    def paginate_mails(
+        self,
+        query: Query,
+        mail_user: MailUser,
+        page: int = 1,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        use_cursor: bool = False,
+        include_total: bool = True
+    ) -> MailListPage:
+        """
+        임의의 Mail 쿼리(검색 등)를 페이지로 구성합니다.
+
+        발신자와 현재 사용자의 읽음 상태는 페이지 단위 IN 쿼리로 한 번에 조회합니다.
+
+        Args:
+            query: db.query(Mail) 기반 필터링된 쿼리
+            mail_user: 현재 메일 사용자
+            page: 페이지 번호 (오프셋 방식)
+            limit: 페이지당 항목 수
+            cursor: 이전 페이지의 next_cursor (지정 시 커서 방식)
+            use_cursor: 커서 방식 사용 여부 (첫 페이지 요청용)
+            include_total: 전체 개수 계산 여부
+
+        Returns:
+            MailListPage 결과
+
+        Raises:
+            ValueError: 잘못된 커서인 경우
+        """
+        rows, total, has_next, next_cursor = self._fetch_rows(
+            query, Mail.created_at, page, limit, cursor, use_cursor, include_total
+        )
+
+        senders: Dict[str, MailUser] = {}
+        read_flags: Dict[str, bool] = {}
+        if rows:
+            sender_uuids = {mail.sender_uuid for mail in rows}
+            senders = {
+                user.user_uuid: user
+                for user in self.db.query(MailUser).filter(MailUser.user_uuid.in_(sender_uuids)).all()
+            }
+            read_flags = dict(self.db.query(MailInFolder.mail_uuid, MailInFolder.is_read).filter(
+                MailInFolder.user_uuid == mail_user.user_uuid,
+                MailInFolder.mail_uuid.in_([mail.mail_uuid for mail in rows])
+            ).all())
+
+        entries = [(mail, senders.get(mail.sender_uuid), read_flags.get(mail.mail_uuid)) for mail in rows]
+        return self._build_page(entries, None, mail_user, page, limit, total, has_next, next_cursor, False)
+
+    def _fetch_rows(
+        self,
+        query: Query,
+        order_column: Any,
+        page: int,
+        limit: int,
+        cursor: Optional[str],
+        use_cursor: bool,
+        include_total: bool,
+        known_total: Optional[int] = None
+    ) -> Tuple[List[Any], Optional[int], bool, Optional[str]]:
+        """
+        정렬/페이지네이션을 적용하여 한 페이지의 행을 가져옵니다.
+
+        다음 페이지 존재 여부는 limit+1 행을 조회하여 판단하므로
+        전체 개수를 계산하지 않아도 has_next를 알 수 있습니다.
+        known_total 이 주어지면 (폴더 카운터 등) COUNT 쿼리 없이 그 값을 사용합니다.
+
+        Returns:
+            (행 목록, 전체 개수 또는 None, 다음 페이지 여부, 다음 커서)
+        """
+        if known_total is not None:
+            total = known_total
+        else:
+            total = query.order_by(None).count() if include_total else None
+        cursor_mode = use_cursor or bool(cursor)
+
+        if cursor_mode:
+            # 커서 방식은 (created_at, mail_uuid) 복합 인덱스를 타도록 정렬 키를 고정
+            if cursor:
+                cursor_created_at, cursor_mail_uuid = decode_cursor(cursor)
+                query = query.filter(
+                    tuple_(Mail.created_at, Mail.mail_uuid) < tuple_(cursor_created_at, cursor_mail_uuid)
+                )
+            query = query.order_by(desc(Mail.created_at), desc(Mail.mail_uuid))
+        else:
+            query = query.order_by(desc(order_column)).offset((page - 1) * limit)
+
+        rows = query.limit(limit + 1).all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if cursor_mode and has_next and rows:
+            last_mail = rows[-1] if isinstance(rows[-1], Mail) else rows[-1][0]
+            next_cursor = encode_cursor(last_mail.created_at, last_mail.mail_uuid)
+
+        return rows, total, has_next, next_cursor
+
+    def _build_page(
+        self,
+        entries: List[Tuple[Mail, Optional[MailUser], Optional[bool]]],
+        folder_type: Optional[str],
+        mail_user: MailUser,
+        page: int,
+        limit: int,
+        total: Optional[int],
+        has_next: bool,
+        next_cursor: Optional[str],
+        include_recipients: bool
+    ) -> MailListPage:
+        """(메일, 발신자, 읽음 상태) 목록에 집계 정보를 붙여 응답 페이지를 만듭니다."""
+        mail_uuids = [mail.mail_uuid for mail, _, _ in entries]
+        recipients_by_mail: Dict[str, List[MailRecipient]] = {}
+        if include_recipients:
+            recipients_by_mail = {mail.mail_uuid: list(mail.recipients) for mail, _, _ in entries}
+            recipient_counts = {uuid: len(items) for uuid, items in recipients_by_mail.items()}
+        else:
+            recipient_counts = self._count_by_mail(MailRecipient, mail_uuids)
+        attachment_counts = self._count_by_mail(MailAttachment, mail_uuids)
+
+        sender_cache: Dict[str, Optional[MailUserResponse]] = {}
+        mails: List[MailListResponse] = []
+        for mail, sender, is_read in entries:
+            if sender is not None and sender.user_uuid not in sender_cache:
+                sender_cache[sender.user_uuid] = _to_user_response(sender)
+            sender_info = sender_cache.get(sender.user_uuid) if sender is not None else None
+
+            if folder_type == FolderType.TRASH.value:
+                # 휴지통: 받은 메일만 읽음 상태를 가짐
+                read_flag = bool(is_read) if mail.sender_uuid != mail_user.user_uuid else None
+            elif folder_type in SENDER_OWNED_STATUSES:
+                read_flag = None
+            else:
+                read_flag = bool(is_read)
+
+            is_draft_folder = folder_type == FolderType.DRAFT.value
+            mails.append(MailListResponse(
+                mail_uuid=mail.mail_uuid,
+                subject=(mail.subject or "(제목 없음)") if is_draft_folder else mail.subject,
+                status=mail.status,
+                is_draft=True if is_draft_folder else mail.status == MailStatus.DRAFT.value,
+                priority=mail.priority or "normal",
+                sent_at=mail.sent_at,
+                created_at=mail.created_at,
+                sender=sender_info,
+                recipient_count=recipient_counts.get(mail.mail_uuid, 0),
+                attachment_count=attachment_counts.get(mail.mail_uuid, 0),
+                is_read=read_flag
+            ))
+
+        logger.debug(f"📋 메일 목록 구성 - 폴더: {folder_type}, 페이지: {page}, 항목 수: {len(mails)}, 전체: {total}")
+
+        return MailListPage(
+            mails=mails,
+            total=total,
+            page=page,
+            limit=limit,
+            has_next=has_next,
+            next_cursor=next_cursor,
+            recipients=recipients_by_mail,
+            rows=[mail for mail, _, _ in entries]
+        )
+
+    def _count_by_mail(self, model: Any, mail_uuids: List[str]) -> Dict[str, int]:
+        """
+        메일별 하위 행 개수를 한 번의 그룹 집계 쿼리로 계산합니다.
+
+        Args:
+            model: mail_uuid 컬럼을 가진 모델 (MailRecipient, MailAttachment)
+            mail_uuids: 대상 메일 UUID 목록
+
+        Returns:
+            {mail_uuid: 개수} 딕셔너리
+        """
+        if not mail_uuids:
+            return {}
+        rows = self.db.query(model.mail_uuid, func.count(model.id)).filter(
+            model.mail_uuid.in_(mail_uuids)
+        ).group_by(model.mail_uuid).all()
+        return {mail_uuid: count for mail_uuid, count in rows}
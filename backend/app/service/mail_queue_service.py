@@ -0,0 +1,319 @@
+"""
+외부 발송 메일 큐
+
+/send 요청은 메일을 queued 상태로 저장하고 큐에 작업만 등록한 뒤 바로 응답합니다.
+실제 SMTP 발송, 사용량 갱신, 임계값 알림은 별도 워커(app.tasks.mail_delivery)가 처리합니다.
+
+큐 백엔드
+- RedisMailQueue: 운영용. 워커별 처리 중 목록과 하트비트로 워커가 죽어도 작업을 잃지 않습니다.
+- InMemoryMailQueue: Redis 없이 테스트/로컬 개발에서 사용하는 동일 인터페이스의 대체 구현.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 키
+QUEUE_PREFIX = "mail:queue"
+READY_KEY = f"{QUEUE_PREFIX}:ready"
+DELAYED_KEY = f"{QUEUE_PREFIX}:delayed"
+DEAD_KEY = f"{QUEUE_PREFIX}:dead"
+PROCESSING_KEY_PREFIX = f"{QUEUE_PREFIX}:processing:"
+HEARTBEAT_KEY_PREFIX = f"{QUEUE_PREFIX}:worker:"
+
+# 예약 시간이 지난 재시도 작업을 ready 목록으로 원자적으로 옮기는 스크립트
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, payload in ipairs(due) do
+    redis.call('ZREM', KEYS[1], payload)
+    redis.call('LPUSH', KEYS[2], payload)
+end
+return #due
+"""
+
+
+@dataclass
+class MailJob:
+    """메일 발송 작업"""
+    mail_uuid: str
+    org_id: str
+    attempt: int = 0
+    job_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    enqueued_at: float = field(default_factory=time.time)
+    last_error: Optional[str] = None
+    # SMTP 가 이미 수락한 작업 (재시도에서는 발송하지 않고 sent 상태 기록만 수행)
+    delivered: bool = False
+
+    def to_json(self) -> str:
+        """큐 저장용 JSON 문자열로 변환합니다."""
+        return json.dumps(asdict(self), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "MailJob":
+        """큐에서 꺼낸 JSON 문자열을 작업으로 변환합니다."""
+        return cls(**json.loads(payload))
+
+
+def retry_delay_seconds(attempt: int) -> float:
+    """
+    재시도 대기 시간을 계산합니다. (지수 백오프)
+
+    Args:
+        attempt: 지금까지 실패한 횟수 (1부터)
+
+    Returns:
+        다음 시도까지 대기 시간 (초)
+    """
+    delay = settings.MAIL_QUEUE_RETRY_BASE_SECONDS * (2 ** max(attempt - 1, 0))
+    return float(min(delay, settings.MAIL_QUEUE_RETRY_MAX_SECONDS))
+
+
+class InMemoryMailQueue:
+    """
+    프로세스 내 메일 큐
+
+    Redis가 없는 테스트/로컬 환경용입니다. 프로세스가 종료되면 작업이 사라지므로
+    워커도 같은 프로세스에서 실행해야 합니다.
+    """
+
+    def __init__(self):
+        self._ready: Deque[str] = deque()
+        self._delayed: List[Tuple[float, str]] = []
+        self._processing: Dict[str, List[str]] = {}
+        self._heartbeats: Dict[str, float] = {}
+        self._dead: List[str] = []
+
+    async def enqueue(self, job: MailJob, delay: float = 0) -> None:
+        """작업을 등록합니다. (delay 초 후 처리)"""
+        if delay > 0:
+            heapq.heappush(self._delayed, (time.time() + delay, job.to_json()))
+        else:
+            self._ready.appendleft(job.to_json())
+
+    async def dequeue(self, worker_id: str, timeout: float = 1.0) -> Optional[MailJob]:
+        """작업을 꺼내 워커의 처리 중 목록으로 옮깁니다. (timeout 동안 대기)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._ready:
+                payload = self._ready.pop()
+                self._processing.setdefault(worker_id, []).append(payload)
+                return MailJob.from_json(payload)
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(min(0.05, max(deadline - time.monotonic(), 0)))
+
+    async def ack(self, worker_id: str, job: MailJob) -> None:
+        """처리 완료된 작업을 제거합니다."""
+        self._remove_processing(worker_id, job)
+
+    async def retry(self, worker_id: str, job: MailJob, delay: float) -> None:
+        """처리 중 작업을 제거하고 delay 초 후 재시도로 등록합니다."""
+        self._remove_processing(worker_id, job)
+        await self.enqueue(job, delay=delay)
+
+    async def dead_letter(self, worker_id: str, job: MailJob) -> None:
+        """재시도를 모두 소진한 작업을 dead 목록으로 옮깁니다."""
+        self._remove_processing(worker_id, job)
+        self._dead.append(job.to_json())
+
+    async def promote_due(self, limit: int = 100) -> int:
+        """대기 시간이 지난 재시도 작업을 ready 목록으로 옮깁니다."""
+        now = time.time()
+        promoted = 0
+        while self._delayed and self._delayed[0][0] <= now and promoted < limit:
+            _, payload = heapq.heappop(self._delayed)
+            self._ready.appendleft(payload)
+            promoted += 1
+        return promoted
+
+    async def heartbeat(self, worker_id: str) -> None:
+        """워커 생존 신호를 기록합니다."""
+        self._heartbeats[worker_id] = time.time()
+
+    async def unregister(self, worker_id: str) -> None:
+        """정상 종료한 워커를 제거하고 처리 중 작업을 되돌립니다."""
+        self._heartbeats.pop(worker_id, None)
+        for payload in self._processing.pop(worker_id, []):
+            self._ready.append(payload)
+
+    async def recover_orphaned(self) -> int:
+        """하트비트가 끊긴 워커의 처리 중 작업을 ready 목록으로 되돌립니다."""
+        expired_before = time.time() - settings.MAIL_QUEUE_HEARTBEAT_TTL_SECONDS
+        recovered = 0
+        for worker_id in list(self._processing):
+            if self._heartbeats.get(worker_id, 0) >= expired_before:
+                continue
+            for payload in self._processing.pop(worker_id):
+                self._ready.append(payload)
+                recovered += 1
+            self._heartbeats.pop(worker_id, None)
+        return recovered
+
+    async def stats(self) -> Dict[str, Any]:
+        """큐 깊이를 반환합니다."""
+        return {
+            "backend": "memory",
+            "ready": len(self._ready),
+            "delayed": len(self._delayed),
+            "processing": sum(len(items) for items in self._processing.values()),
+            "dead": len(self._dead),
+            "workers": len(self._heartbeats),
+        }
+
+    def _remove_processing(self, worker_id: str, job: MailJob):
+        """처리 중 목록에서 작업을 제거합니다."""
+        items = self._processing.get(worker_id, [])
+        for index, payload in enumerate(items):
+            if MailJob.from_json(payload).job_id == job.job_id:
+                del items[index]
+                return
+
+
+class RedisMailQueue:
+    """
+    Redis 기반 메일 큐
+
+    - ready 목록에서 LMOVE로 워커별 processing 목록에 옮겨 꺼냅니다.
+    - 재시도는 예약 시간을 점수로 하는 delayed ZSET에 저장합니다.
+    - 워커는 하트비트 키를 주기적으로 갱신하며, 하트비트가 만료된 워커의
+      processing 목록은 다른 워커가 ready로 되돌립니다.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        from ..utils.metrics import InstrumentedAsyncRedis
+
+        self._redis = InstrumentedAsyncRedis.from_url(redis_url or settings.REDIS_URL, decode_responses=True)
+        self._promote_script = self._redis.register_script(PROMOTE_DUE_SCRIPT)
+        # 작업 ID -> 원본 payload (LREM은 원본 문자열이 필요)
+        self._payloads: Dict[str, str] = {}
+
+    async def enqueue(self, job: MailJob, delay: float = 0) -> None:
+        """작업을 등록합니다. (delay 초 후 처리)"""
+        if delay > 0:
+            await self._redis.zadd(DELAYED_KEY, {job.to_json(): time.time() + delay})
+        else:
+            await self._redis.lpush(READY_KEY, job.to_json())
+
+    async def dequeue(self, worker_id: str, timeout: float = 1.0) -> Optional[MailJob]:
+        """작업을 꺼내 워커의 처리 중 목록으로 옮깁니다. (timeout 동안 대기)"""
+        payload = await self._redis.blmove(
+            READY_KEY, PROCESSING_KEY_PREFIX + worker_id, timeout, "RIGHT", "LEFT"
+        )
+        if payload is None:
+            return None
+        job = MailJob.from_json(payload)
+        self._payloads[job.job_id] = payload
+        return job
+
+    async def ack(self, worker_id: str, job: MailJob) -> None:
+        """처리 완료된 작업을 제거합니다."""
+        await self._remove_processing(worker_id, job)
+
+    async def retry(self, worker_id: str, job: MailJob, delay: float) -> None:
+        """처리 중 작업을 제거하고 delay 초 후 재시도로 등록합니다."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(PROCESSING_KEY_PREFIX + worker_id, 1, self._payloads.pop(job.job_id, job.to_json()))
+            pipe.zadd(DELAYED_KEY, {job.to_json(): time.time() + delay})
+            await pipe.execute()
+
+    async def dead_letter(self, worker_id: str, job: MailJob) -> None:
+        """재시도를 모두 소진한 작업을 dead 목록으로 옮깁니다."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(PROCESSING_KEY_PREFIX + worker_id, 1, self._payloads.pop(job.job_id, job.to_json()))
+            pipe.lpush(DEAD_KEY, job.to_json())
+            await pipe.execute()
+
+    async def promote_due(self, limit: int = 100) -> int:
+        """대기 시간이 지난 재시도 작업을 ready 목록으로 옮깁니다."""
+        return int(await self._promote_script(keys=[DELAYED_KEY, READY_KEY], args=[time.time(), limit]))
+
+    async def heartbeat(self, worker_id: str) -> None:
+        """워커 생존 신호를 기록합니다."""
+        await self._redis.set(
+            HEARTBEAT_KEY_PREFIX + worker_id, str(time.time()), ex=settings.MAIL_QUEUE_HEARTBEAT_TTL_SECONDS
+        )
+
+    async def unregister(self, worker_id: str) -> None:
+        """정상 종료한 워커를 제거하고 처리 중 작업을 되돌립니다."""
+        await self._requeue_processing(worker_id)
+        await self._redis.delete(HEARTBEAT_KEY_PREFIX + worker_id)
+
+    async def recover_orphaned(self) -> int:
+        """하트비트가 끊긴 워커의 처리 중 작업을 ready 목록으로 되돌립니다."""
+        recovered = 0
+        async for key in self._redis.scan_iter(match=PROCESSING_KEY_PREFIX + "*"):
+            worker_id = key[len(PROCESSING_KEY_PREFIX):]
+            if await self._redis.exists(HEARTBEAT_KEY_PREFIX + worker_id):
+                continue
+            recovered += await self._requeue_processing(worker_id)
+        if recovered:
+            logger.warning(f"♻️ 중단된 워커의 메일 작업 복구: {recovered}건")
+        return recovered
+
+    async def stats(self) -> Dict[str, Any]:
+        """큐 깊이를 반환합니다."""
+        processing = 0
+        async for key in self._redis.scan_iter(match=PROCESSING_KEY_PREFIX + "*"):
+            processing += await self._redis.llen(key)
+        workers = 0
+        async for _ in self._redis.scan_iter(match=HEARTBEAT_KEY_PREFIX + "*"):
+            workers += 1
+        return {
+            "backend": "redis",
+            "ready": await self._redis.llen(READY_KEY),
+            "delayed": await self._redis.zcard(DELAYED_KEY),
+            "processing": processing,
+            "dead": await self._redis.llen(DEAD_KEY),
+            "workers": workers,
+        }
+
+    async def _remove_processing(self, worker_id: str, job: MailJob):
+        """처리 중 목록에서 작업을 제거합니다."""
+        await self._redis.lrem(
+            PROCESSING_KEY_PREFIX + worker_id, 1, self._payloads.pop(job.job_id, job.to_json())
+        )
+
+    async def _requeue_processing(self, worker_id: str) -> int:
+        """워커의 처리 중 목록을 ready 목록 끝(가장 먼저 처리)으로 되돌립니다."""
+        moved = 0
+        while await self._redis.lmove(PROCESSING_KEY_PREFIX + worker_id, READY_KEY, "LEFT", "RIGHT"):
+            moved += 1
+        return moved
+
+
+_mail_queue = None
+
+
+def get_mail_queue():
+    """
+    설정된 백엔드의 전역 메일 큐를 반환합니다.
+
+    MAIL_QUEUE_BACKEND 미설정 시 테스트 환경은 memory, 그 외는 redis를 사용합니다.
+    """
+    global _mail_queue
+    if _mail_queue is None:
+        backend = settings.MAIL_QUEUE_BACKEND or ("memory" if settings.is_testing() else "redis")
+        if backend == "memory":
+            _mail_queue = InMemoryMailQueue()
+        elif backend == "redis":
+            _mail_queue = RedisMailQueue()
+        else:
+            raise ValueError(f"지원하지 않는 메일 큐 백엔드: {backend}")
+        logger.info(f"📮 메일 큐 초기화 - 백엔드: {backend}")
+    return _mail_queue
+
+
+def set_mail_queue(queue) -> None:
+    """전역 메일 큐를 교체합니다. (테스트/임베디드 워커용)"""
+    global _mail_queue
+    _mail_queue = queue
@@ -0,0 +1,212 @@
+"""
+메일 수신자 처리 서비스
+
+발송 경로(/send, /send-json, MailService.send_mail)가 공유하는 수신자 처리 단계입니다.
+수신자 수와 무관하게 고정된 수의 쿼리로 처리합니다.
+- 전체 주소를 IN 쿼리 한 번으로 조회
+- 조직에 없는 주소는 외부 MailUser를 다중 행 INSERT 한 번으로 생성
+- MailRecipient, 수신자 받은편지함 MailInFolder 행을 일괄 INSERT
+"""
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, insert
+from sqlalchemy.orm import Session
+
+from ..model.mail_model import FolderType, MailFolder, MailInFolder, MailRecipient, MailUser
+from ..schemas.mail_schema import RecipientType
+from . import folder_counter_service
+
+logger = logging.getLogger(__name__)
+
+# 외부 수신자용으로 생성한 MailUser 표시값
+EXTERNAL_PASSWORD_HASH = "external_user"
+
+
+@dataclass
+class ResolvedRecipient:
+    """MailUser로 확인된 수신자"""
+    email: str
+    recipient_type: str
+    user_uuid: str
+    is_external: bool
+
+
+def split_addresses(value: Optional[str]) -> List[str]:
+    """
+    쉼표로 구분된 주소 문자열을 목록으로 변환합니다.
+
+    Args:
+        value: "a@x.com, b@y.com" 형식 문자열
+
+    Returns:
+        공백을 제거한 주소 목록 (빈 항목 제외)
+    """
+    if not value:
+        return []
+    return [address.strip() for address in value.split(",") if address.strip()]
+
+
+class MailRecipientService:
+    """메일 수신자 일괄 처리 서비스"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def resolve(
+        self,
+        org_id: str,
+        to_emails: Optional[Iterable[str]] = None,
+        cc_emails: Optional[Iterable[str]] = None,
+        bcc_emails: Optional[Iterable[str]] = None
+    ) -> List[ResolvedRecipient]:
+        """
+        수신자 주소를 조직의 MailUser로 확인합니다.
+
+        조직에 없는 주소는 비활성 외부 MailUser로 한 번에 생성합니다.
+        같은 타입 안에서 중복된 주소는 한 번만 처리합니다.
+
+        Args:
+            org_id: 조직 ID
+            to_emails: 받는 사람 주소 목록
+            cc_emails: 참조 주소 목록
+            bcc_emails: 숨은참조 주소 목록
+
+        Returns:
+            입력 순서(TO, CC, BCC)를 유지한 수신자 목록
+        """
+        requested = []
+        seen = set()
+        for recipient_type, emails in (
+            (RecipientType.TO.value, to_emails),
+            (RecipientType.CC.value, cc_emails),
+            (RecipientType.BCC.value, bcc_emails),
+        ):
+            for email in emails or []:
+                email = email.strip()
+                if email and (recipient_type, email) not in seen:
+                    seen.add((recipient_type, email))
+                    requested.append((recipient_type, email))
+
+        if not requested:
+            return []
+
+        unique_emails = list(dict.fromkeys(email for _, email in requested))
+        users: Dict[str, tuple] = {}
+        for email, user_uuid, password_hash in self.db.query(
+            MailUser.email, MailUser.user_uuid, MailUser.password_hash
+        ).filter(
+            MailUser.org_id == org_id,
+            MailUser.email.in_(unique_emails)
+        ).all():
+            users.setdefault(email, (user_uuid, password_hash == EXTERNAL_PASSWORD_HASH))
+
+        missing = [email for email in unique_emails if email not in users]
+        if missing:
+            rows = []
+            for email in missing:
+                external_user_uuid = str(uuid.uuid4())
+                rows.append({
+                    "user_id": f"external_{external_user_uuid.replace('-', '')}",
+                    "user_uuid": external_user_uuid,
+                    "org_id": org_id,
+                    "email": email,
+                    "password_hash": EXTERNAL_PASSWORD_HASH,
+                    "is_active": False,
+                })
+                users[email] = (external_user_uuid, True)
+            self.db.execute(insert(MailUser), rows)
+            logger.info(f"👤 외부 수신자 일괄 생성 - 조직: {org_id}, 수: {len(rows)}")
+
+        return [
+            ResolvedRecipient(
+                email=email,
+                recipient_type=recipient_type,
+                user_uuid=users[email][0],
+                is_external=users[email][1]
+            )
+            for recipient_type, email in requested
+        ]
+
+    def add_recipients(self, mail_uuid: str, recipients: Sequence[ResolvedRecipient]) -> int:
+        """
+        MailRecipient 행을 일괄 INSERT 합니다.
+
+        Args:
+            mail_uuid: 메일 UUID (먼저 flush 되어 있어야 함)
+            recipients: resolve() 결과
+
+        Returns:
+            삽입한 행 수
+        """
+        if not recipients:
+            return 0
+        self.db.execute(insert(MailRecipient), [
+            {
+                "mail_uuid": mail_uuid,
+                "recipient_uuid": recipient.user_uuid,
+                "recipient_email": recipient.email,
+                "recipient_type": recipient.recipient_type,
+            }
+            for recipient in recipients
+        ])
+        return len(recipients)
+
+    def deliver_to_inboxes(self, mail_uuid: str, org_id: str, recipients: Sequence[ResolvedRecipient]) -> int:
+        """
+        조직 내부 수신자의 받은편지함에 메일을 일괄 할당합니다.
+
+        받은편지함이 없는 수신자(외부 사용자 등)와 이미 할당된 수신자는 건너뜁니다.
+
+        Args:
+            mail_uuid: 메일 UUID
+            org_id: 조직 ID
+            recipients: resolve() 결과
+
+        Returns:
+            새로 할당한 수신자 수
+        """
+        user_uuids = list(dict.fromkeys(
+            recipient.user_uuid for recipient in recipients if not recipient.is_external
+        ))
+        if not user_uuids:
+            return 0
+
+        inbox_by_user = dict(self.db.query(MailFolder.user_uuid, MailFolder.folder_uuid).filter(
+            and_(
+                MailFolder.org_id == org_id,
+                MailFolder.folder_type == FolderType.INBOX,
+                MailFolder.user_uuid.in_(user_uuids)
+            )
+        ).all())
+        if not inbox_by_user:
+            return 0
+
+        already_assigned = {
+            user_uuid for (user_uuid,) in self.db.query(MailInFolder.user_uuid).filter(
+                MailInFolder.mail_uuid == mail_uuid,
+                MailInFolder.folder_uuid.in_(list(inbox_by_user.values()))
+            ).all()
+        }
+
+        rows = [
+            {
+                "mail_uuid": mail_uuid,
+                "folder_uuid": inbox_by_user[user_uuid],
+                "user_uuid": user_uuid,
+                "is_read": False,
+            }
+            for user_uuid in user_uuids
+            if user_uuid in inbox_by_user and user_uuid not in already_assigned
+        ]
+        if rows:
+            self.db.execute(insert(MailInFolder), rows)
+            folder_counter_service.record_inserted(self.db, rows)
+
+        skipped = len(user_uuids) - len(inbox_by_user)
+        if skipped:
+            logger.warning(f"⚠️ 받은편지함이 없는 내부 수신자 {skipped}명 - 조직: {org_id}, 메일 ID: {mail_uuid}")
+        logger.info(f"📥 수신자 받은편지함 일괄 할당 - 조직: {org_id}, 메일 ID: {mail_uuid}, 수: {len(rows)}")
+        return len(rows)
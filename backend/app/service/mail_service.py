@@ -5,25 +5,28 @@ SaaS 다중 조직 지원을 위한 메일 관리 기능
 """
 import logging
 import uuid
-import smtplib
 import os
 import asyncio
 import traceback
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, select
 from sqlalchemy import text
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
 from fastapi import HTTPException
+import aiosmtplib
 
 from ..model import Mail, MailUser, MailRecipient, MailAttachment, MailFolder, MailInFolder, MailLog, User, Organization, OrganizationUsage
 from ..model.mail_model import generate_mail_uuid
 from ..schemas.mail_schema import MailCreate, MailSendRequest, RecipientType, MailStatus, MailPriority
 from ..config import settings
+from .attachment_blob_store import AttachmentBlobStore
+from .mail_list_service import MailListService
+from .mail_recipient_service import MailRecipientService
+from .raw_message_store import RawMessageStore
+from .usage_counter_service import usage_counter
+from ..utils.mime_composer import MimeComposer, compose_to_spool
+from ..utils.smtp_pool import smtp_pool_manager
 
 # Redis 락 관련 import (선택적)
 try:
@@ -45,6 +48,7 @@ class MailService:
     
     def __init__(self, db: Optional[Session] = None):
         self.db = db
+        self.raw_message_store = RawMessageStore()
         
         # config.py의 get_smtp_config() 사용
         from app.config import settings
@@ -61,7 +65,7 @@ class MailService:
         self.smtp_username = smtp_config["user"]
         self.smtp_password = smtp_config["password"]
         # Gmail SMTP는 기본적으로 TLS 사용
-        self.use_tls = self.smtp_server == "smtp.gmail.com" or os.getenv("SMTP_USE_TLS", "false").lower() == "true"
+        self.use_tls = smtp_config["use_tls"]
         
         # SMTP 설정 로깅
         logger.info(f"🔧 SMTP 설정 로드 - 서버: {self.smtp_server}:{self.smtp_port}, TLS: {self.use_tls}")
@@ -101,6 +105,7 @@ class MailService:
         Returns:
             발송 결과 딕셔너리
         """
+        reservation_id = None
         try:
             logger.info(f"📤 메일 발송 시작 - 조직 ID: {org_id}, 발송자 ID: {sender_uuid}, 수신자: {to_emails}, 제목: {subject}")
             
@@ -125,88 +130,48 @@ class MailService:
             if not sender_mail_user:
                 raise HTTPException(status_code=404, detail="메일 사용자를 찾을 수 없습니다.")
             
-            # 일일 메일 발송 제한 검증
-            await self._check_daily_email_limit(org_id, organization.max_emails_per_day, len(to_emails))
-            
             # 메일 ID 생성 (년월일_시분초_uuid[12] 형식)
             from ..model.mail_model import generate_mail_uuid
             mail_uuid = generate_mail_uuid()
             
+            # 일일 메일 발송 제한 검증 (메일 UUID 로 발송 수 예약)
+            await self._check_daily_email_limit(
+                org_id, organization.max_emails_per_day, len(to_emails), reservation_id=mail_uuid
+            )
+            reservation_id = mail_uuid
+            
             # 메일 레코드 생성
             mail = Mail(
                 mail_uuid=mail_uuid,
                 org_id=org_id,
                 sender_uuid=sender_mail_user.user_uuid,
-                sender_email=sender_mail_user.email,
                 subject=subject,
-                content=content,
+                body_text=content,
                 priority=priority.value,
                 status=MailStatus.SENT.value,
                 sent_at=datetime.now(timezone.utc),
                 created_at=datetime.now(timezone.utc)
             )
             self.db.add(mail)
+            self.db.flush()
             
-            # 수신자 정보 저장
-            all_recipients = []
-            
-            # TO 수신자
-            for email in to_emails:
-                # 이메일로 사용자 UUID 찾기
-                mail_user = self.db.query(MailUser).filter(
-                    MailUser.email == email,
-                    MailUser.org_id == org_id
-                ).first()
-                
-                if mail_user:
-                    recipient = MailRecipient(
-                        mail_uuid=mail_uuid,
-                        recipient_uuid=mail_user.user_uuid,
-                        recipient_type=RecipientType.TO.value
-                    )
-                    self.db.add(recipient)
-                all_recipients.append(email)
-            
-            # CC 수신자
-            if cc_emails:
-                for email in cc_emails:
-                    # 이메일로 사용자 UUID 찾기
-                    mail_user = self.db.query(MailUser).filter(
-                        MailUser.email == email,
-                        MailUser.org_id == org_id
-                    ).first()
-                    
-                    if mail_user:
-                        recipient = MailRecipient(
-                            mail_uuid=mail_uuid,
-                            recipient_uuid=mail_user.user_uuid,
-                            recipient_type=RecipientType.CC.value
-                        )
-                        self.db.add(recipient)
-                    all_recipients.append(email)
-            
-            # BCC 수신자
-            if bcc_emails:
-                for email in bcc_emails:
-                    # 이메일로 사용자 UUID 찾기
-                    mail_user = self.db.query(MailUser).filter(
-                        MailUser.email == email,
-                        MailUser.org_id == org_id
-                    ).first()
-                    
-                    if mail_user:
-                        recipient = MailRecipient(
-                            mail_uuid=mail_uuid,
-                            recipient_uuid=mail_user.user_uuid,
-                            recipient_type=RecipientType.BCC.value
-                        )
-                        self.db.add(recipient)
-                    all_recipients.append(email)
+            # 수신자 정보 저장 - 전체 주소 일괄 조회, 외부 사용자/수신자/받은편지함 행 일괄 삽입
+            recipient_service = MailRecipientService(self.db)
+            recipients = recipient_service.resolve(
+                org_id=org_id,
+                to_emails=to_emails,
+                cc_emails=cc_emails,
+                bcc_emails=bcc_emails
+            )
+            recipient_service.add_recipients(mail_uuid, recipients)
+            delivered = recipient_service.deliver_to_inboxes(mail_uuid, org_id, recipients)
+            all_recipients = [recipient.email for recipient in recipients]
             
             # 첨부파일 정보 저장
             if attachments:
                 for attachment in attachments:
                     mail_attachment = MailAttachment(
+                        attachment_uuid=str(uuid.uuid4()),
                         mail_uuid=mail_uuid,
                         filename=attachment["filename"],
                         file_path=attachment["file_path"],
@@ -221,7 +186,9 @@ class MailService:
                 all_recipients,
                 subject,
                 content,
-                attachments
+                attachments,
+                org_id=org_id,
+                mail=mail
             )
             
             # 메일 로그 기록
@@ -246,25 +213,27 @@ class MailService:
                 )
                 self.db.add(mail_in_folder)
             
-            # 조직 사용량 업데이트
-            logger.info(f"🔍 조직 사용량 업데이트 호출 직전 - 조직: {org_id}, 수신자 수: {len(all_recipients)}")
-            usage_update = await self._update_organization_usage(org_id, len(all_recipients))
-            logger.info(f"🔍 조직 사용량 업데이트 호출 완료 - 조직: {org_id}")
-
-            # 임계값 알림 확인 및 전송 (80%/90%/100%)
-            try:
-                if organization and usage_update:
-                    daily_limit = organization.max_emails_per_day or 0
-                    today_sent = usage_update.get('emails_sent_today') or 0
-                    increment = len(all_recipients)
-                    await self._notify_usage_thresholds(org_id, today_sent, increment, daily_limit)
-            except Exception as notify_err:
-                logger.error(f"⚠️ 임계값 알림 처리 중 오류 - 조직: {org_id}, 오류: {str(notify_err)}")
-            
+            daily_limit = organization.max_emails_per_day or 0
             self.db.commit()
+            # 커밋 이후에는 예약을 발송 수로 확정하므로 실패 처리에서 해제하지 않음
+            reservation_id = None
             
             logger.info(f"✅ 메일 발송 완료 - 메일 UUID: {mail_uuid}")
             
+            # 조직 사용량 업데이트 (커밋에 실패한 메일이 카운터에 더해지지 않도록 커밋 이후 반영)
+            try:
+                await self._record_received(org_id, delivered)
+                usage_update = await self._update_organization_usage(org_id, len(all_recipients), reservation_id=mail_uuid)
+                logger.info(f"🔍 조직 사용량 업데이트 호출 완료 - 조직: {org_id}")
+
+                # 임계값 알림 확인 및 전송 (80%/90%/100%)
+                if usage_update:
+                    today_sent = usage_update.get('emails_sent_today') or 0
+                    await self._notify_usage_thresholds(org_id, today_sent, len(all_recipients), daily_limit)
+            except Exception as usage_error:
+                # 사용량 업데이트 실패는 메일 발송 성공에 영향을 주지 않음
+                logger.error(f"⚠️ 조직 사용량 업데이트 중 오류 - 조직: {org_id}, 오류: {str(usage_error)}")
+            
             return {
                 "success": True,
                 "mail_uuid": mail_uuid,
@@ -273,8 +242,13 @@ class MailService:
                 "sent_at": mail.sent_at.isoformat()
             }
             
+        except HTTPException:
+            self.db.rollback()
+            await self._release_daily_email_reservation(org_id, reservation_id)
+            raise
         except Exception as e:
             self.db.rollback()
+            await self._release_daily_email_reservation(org_id, reservation_id)
             logger.error(f"❌ 메일 발송 실패: {str(e)}")
             raise HTTPException(status_code=500, detail=f"메일 발송 중 오류가 발생했습니다: {str(e)}")
     
@@ -284,88 +258,92 @@ class MailService:
         recipients: List[str],
         subject: str,
         content: str,
-        attachments: Optional[List[Dict[str, Any]]] = None
+        attachments: Optional[List[Dict[str, Any]]] = None,
+        org_id: Optional[str] = None,
+        mail: Optional[Mail] = None
     ):
         """
         SMTP를 통해 실제 메일을 발송합니다.
         
+        조직 릴레이의 SMTP 연결 풀을 사용합니다.
+        
         Args:
             sender_email: 발송자 이메일
             recipients: 수신자 이메일 목록
             subject: 메일 제목
             content: 메일 내용
             attachments: 첨부파일 목록
+            org_id: 조직 ID (SMTP 릴레이 선택용)
+            mail: 원문을 저장/재사용할 메일 (생략 시 임시 원문)
         """
         try:
             logger.info(f"🚀 _send_smtp_mail 메서드 호출됨")
             logger.info(f"🔍 SMTP 설정 확인 - 서버: {self.smtp_server}, 사용자: {self.smtp_username}")
             logger.info(f"🔍 발송자: {sender_email}, 수신자: {recipients}")
             
-            # Gmail SMTP 사용 시 발신자 주소 강제 변경
-            actual_sender = sender_email
-            if self.smtp_server == "smtp.gmail.com" and self.smtp_username:
-                logger.info(f"🔄 Gmail SMTP 감지 - 발신자 주소 변경: {sender_email} → {self.smtp_username}")
-                actual_sender = self.smtp_username
-            else:
-                logger.info(f"🔍 Gmail SMTP 아님 - 서버: {self.smtp_server}, 발신자 유지: {sender_email}")
-            
-            # MIME 메시지 생성
-            msg = MIMEMultipart()
-            msg['From'] = actual_sender
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = subject
-            
-            # 메일 본문 추가
-            msg.attach(MIMEText(content, 'html', 'utf-8'))
-            
-            # 첨부파일 추가
-            if attachments:
-                logger.info(f"📎 첨부파일 처리 시작 - 개수: {len(attachments)}")
-                for attachment in attachments:
-                    if os.path.exists(attachment["file_path"]):
-                        with open(attachment["file_path"], "rb") as f:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(f.read())
-                            encoders.encode_base64(part)
-                            
-                            # 파일명을 안전하게 인코딩
-                            filename = attachment["filename"]
-                            try:
-                                # ASCII로 인코딩 가능한지 확인
-                                filename.encode('ascii')
-                                part.add_header(
-                                    'Content-Disposition',
-                                    f'attachment; filename="{filename}"'
-                                )
-                            except UnicodeEncodeError:
-                                # ASCII로 인코딩할 수 없으면 RFC 2231 방식 사용
-                                import urllib.parse
-                                encoded_filename = urllib.parse.quote(filename, safe='')
-                                part.add_header(
-                                    'Content-Disposition',
-                                    f'attachment; filename*=UTF-8\'\'{encoded_filename}'
-                                )
-                            
-                            msg.attach(part)
-                        logger.info(f"📎 첨부파일 추가됨: {attachment['filename']}")
-                    else:
-                        logger.warning(f"⚠️ 첨부파일을 찾을 수 없음: {attachment['file_path']}")
-            
-            # SMTP 서버 연결 및 발송
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                
-                if self.smtp_username and self.smtp_password:
-                    server.login(self.smtp_username, self.smtp_password)
-                
-                server.send_message(msg)
+            await self._send_composed(
+                sender_email, recipients, subject,
+                body_html=content, attachments=attachments, org_id=org_id, mail=mail
+            )
                 
             logger.info(f"✅ SMTP 메일 발송 성공 - 수신자: {len(recipients)}명")
             
         except Exception as e:
             logger.error(f"❌ SMTP 메일 발송 실패: {str(e)}")
             raise
+
+    async def _send_composed(
+        self,
+        sender_email: str,
+        recipients: List[str],
+        subject: str,
+        body_text: Optional[str] = None,
+        body_html: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None,
+        org_id: Optional[str] = None,
+        mail: Optional[Mail] = None
+    ):
+        """
+        MIME 원문을 스트리밍 방식으로 작성하여 SMTP 연결 풀로 발송합니다.
+
+        mail 이 주어지면 원문을 메일별로 한 번만 작성해 저장하고 재시도/재발송에서 재사용합니다.
+        그렇지 않으면 (임계값 알림 등) SpooledTemporaryFile 에 작성한 임시 원문을 사용합니다.
+        첨부파일은 청크 단위로 인코딩되며 원문은 DATA 로 스트리밍되므로 전체를 메모리에 올리지 않습니다.
+        """
+        # Gmail SMTP 사용 시 발신자 주소를 SMTP 사용자로 강제 변경
+        actual_sender = sender_email
+        if self.smtp_server == "smtp.gmail.com" and self.smtp_username:
+            actual_sender = self.smtp_username
+            logger.info(f"📧 Gmail SMTP 사용으로 발신자 주소 변경: {sender_email} → {actual_sender}")
+
+        message_id = None
+        if mail is not None:
+            # 재시도 사이에 트랜잭션이 롤백되어도 같은 Message-ID 가 되도록 메일 UUID 로 생성
+            if not mail.message_id:
+                mail.message_id = f"<{mail.mail_uuid}@{actual_sender.rpartition('@')[2] or 'localhost'}>"
+            message_id = mail.message_id
+
+        def composer() -> MimeComposer:
+            if attachments:
+                logger.info(f"📎 첨부파일 인코딩 - 개수: {len(attachments)}")
+            return MimeComposer(
+                actual_sender, recipients, subject,
+                body_text=body_text, body_html=body_html,
+                attachments=attachments, message_id=message_id
+            )
+
+        # 원문 작성은 파일 입출력이므로 이벤트 루프 밖에서 수행
+        if mail is not None:
+            raw = await asyncio.to_thread(
+                self.raw_message_store.open_or_compose, mail.org_id, mail.mail_uuid, composer
+            )
+        else:
+            raw = await asyncio.to_thread(compose_to_spool, composer())
+        try:
+            # SMTP 연결 풀을 통해 발송 (연결/TLS/인증 재사용, 릴레이별 동시성 제한)
+            return await smtp_pool_manager.send_raw(raw, actual_sender, list(recipients), org_id=org_id)
+        finally:
+            raw.close()
     
     async def send_email_smtp(
         self,
@@ -375,7 +353,8 @@ class MailService:
         body_text: str,
         body_html: Optional[str] = None,
         org_id: Optional[str] = None,
-        attachments: Optional[List[Dict[str, Any]]] = None
+        attachments: Optional[List[Dict[str, Any]]] = None,
+        mail: Optional[Mail] = None
     ) -> Dict[str, Any]:
         """
         SMTP를 통해 이메일을 발송합니다. (비동기)
@@ -388,18 +367,11 @@ class MailService:
             body_html: HTML 본문 (선택사항)
             org_id: 조직 ID (선택사항)
             attachments: 첨부파일 목록 (선택사항)
+            mail: 원문을 저장/재사용할 메일 (재시도/예약 발송, 선택사항)
             
         Returns:
             발송 결과 딕셔너리
         """
-        import asyncio
-        import smtplib
-        from email.mime.text import MIMEText
-        from email.mime.multipart import MIMEMultipart
-        from email.mime.base import MIMEBase
-        from email import encoders
-        import urllib.parse
-        
         logger.info(f"🚀 send_email_smtp 메서드 호출됨 - 조직: {org_id}, 발송자: {sender_email}, 수신자: {len(recipient_emails)}명")
         logger.info(f"📧 SMTP 설정 - 서버: {self.smtp_server}:{self.smtp_port}, TLS: {self.use_tls}")
         
@@ -419,112 +391,19 @@ class MailService:
                     for key, value in attachment.items():
                         logger.debug(f"📤 첨부파일 {i+1} {key}: {value} (타입: {type(value)})")
         
-        def _send_smtp_sync():
-            """동기 SMTP 발송 함수"""
+        async def _send_smtp_async():
+            """SMTP 연결 풀을 통한 발송 함수"""
             try:
-                logger.info(f"🔍 _send_smtp_sync 내부 - SMTP 서버: {self.smtp_server}, 사용자: {self.smtp_username}")
-                
-                # Gmail SMTP 사용 시 발신자 주소를 SMTP 사용자로 강제 변경
-                actual_sender = sender_email
-                if self.smtp_server == "smtp.gmail.com" and self.smtp_username:
-                    actual_sender = self.smtp_username
-                    logger.info(f"📧 Gmail SMTP 사용으로 발신자 주소 변경: {sender_email} → {actual_sender}")
-                else:
-                    logger.info(f"🔍 Gmail SMTP 조건 불만족 - 서버: {self.smtp_server}, 사용자: {self.smtp_username}")
-                
-                logger.info(f"📤 SMTP 메일 발송 시작 - 발송자: {actual_sender}, 수신자: {len(recipient_emails)}명")
-                
-                # MIMEMultipart 메시지 생성
-                msg = MIMEMultipart()
-                msg['From'] = actual_sender
-                msg['To'] = ', '.join(recipient_emails)
-                msg['Subject'] = subject
-                
-                # 텍스트 본문 추가
-                msg.attach(MIMEText(body_text, 'plain', 'utf-8'))
+                logger.info(f"🔍 _send_smtp_async 내부 - SMTP 서버: {self.smtp_server}, 사용자: {self.smtp_username}")
                 
-                # HTML 본문 추가 (있는 경우)
-                if body_html:
-                    msg.attach(MIMEText(body_html, 'html', 'utf-8'))
-                
-                # 첨부파일 처리
-                if attachments:
-                    logger.info(f"📎 첨부파일 처리 시작 - 개수: {len(attachments)}")
-                    for i, attachment in enumerate(attachments):
-                        logger.info(f"📎 첨부파일 {i+1} 처리 중...")
-                        logger.debug(f"📎 첨부파일 정보: {attachment}")
-                        
-                        file_path = attachment.get('file_path')
-                        filename = attachment.get('filename')
-                        
-                        if file_path and os.path.exists(file_path):
-                            logger.info(f"📎 파일 존재 확인: {file_path}")
-                            try:
-                                with open(file_path, 'rb') as f:
-                                    logger.info(f"📎 파일 읽기 시작: {filename}")
-                                    file_data = f.read()
-                                    logger.info(f"📎 파일 읽기 완료 - 크기: {len(file_data)} bytes")
-                                
-                                part = MIMEBase('application', 'octet-stream')
-                                part.set_payload(file_data)
-                                encoders.encode_base64(part)
-                                
-                                # 파일명 인코딩 처리
-                                logger.info(f"📎 파일명 인코딩 시작: {filename}")
-                                try:
-                                    filename.encode('ascii')
-                                    part.add_header(
-                                        'Content-Disposition',
-                                        f'attachment; filename="{filename}"'
-                                    )
-                                    logger.info(f"📎 ASCII 헤더 추가 완료")
-                                except UnicodeEncodeError:
-                                    encoded_filename = urllib.parse.quote(filename)
-                                    part.add_header(
-                                        'Content-Disposition',
-                                        f"attachment; filename*=UTF-8''{encoded_filename}"
-                                    )
-                                    logger.info(f"📎 RFC 2231 헤더 추가 완료")
-                                
-                                msg.attach(part)
-                                logger.info(f"📎 첨부파일 추가됨: {filename}")
-                                
-                            except Exception as attach_error:
-                                logger.error(f"❌ 첨부파일 처리 중 오류: {str(attach_error)}")
-                                import traceback
-                                logger.error(f"❌ 상세 스택 트레이스: {traceback.format_exc()}")
-                                raise
-                        else:
-                            logger.warning(f"⚠️ 첨부파일을 찾을 수 없음: {file_path}")
-                else:
-                    logger.info("📎 첨부파일 없음")
-                
-                # SMTP 서버 연결 및 발송
-                logger.info(f"🔗 SMTP 서버 연결 시도 - 서버: {self.smtp_server}:{self.smtp_port}")
-                
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    logger.info("✅ SMTP 서버 연결 성공")
-                    
-                    # TLS 사용 시 STARTTLS
-                    if self.use_tls:
-                        logger.info("🔒 TLS 연결 시작")
-                        server.starttls()
-                        logger.info("✅ TLS 연결 완료")
-                    
-                    # 인증 정보가 있으면 로그인
-                    if self.smtp_username and self.smtp_password:
-                        logger.info(f"🔐 SMTP 인증 시도 - 사용자: {self.smtp_username}")
-                        server.login(self.smtp_username, self.smtp_password)
-                        logger.info("✅ SMTP 인증 성공")
-                    else:
-                        logger.info("📧 SMTP 인증 없이 발송 시도 (로컬 서버)")
-                    
-                    # 메일 발송
-                    logger.info("📤 메일 발송 시작")
-                    logger.debug(f"📤 메시지 타입: {type(msg)}")
-                    
-                    server.send_message(msg)
-                    logger.info("✅ 메일 발송 완료")
+                logger.info(f"📤 SMTP 메일 발송 시작 - 발송자: {sender_email}, 수신자: {len(recipient_emails)}명, 첨부파일: {len(attachments) if attachments else 0}개")
+                logger.info(f"🔗 SMTP 풀 발송 시도 - 서버: {self.smtp_server}:{self.smtp_port}")
+                await self._send_composed(
+                    sender_email, recipient_emails, subject,
+                    body_text=body_text, body_html=body_html,
+                    attachments=attachments, org_id=org_id, mail=mail
+                )
+                logger.info("✅ 메일 발송 완료")
                 
                 return {
                     "success": True,
@@ -533,7 +412,7 @@ class MailService:
                     "smtp_server": f"{self.smtp_server}:{self.smtp_port}"
                 }
                 
-            except smtplib.SMTPAuthenticationError as e:
+            except aiosmtplib.SMTPAuthenticationError as e:
                 error_msg = f"SMTP 인증 실패: {str(e)}"
                 logger.error(f"❌ {error_msg}")
                 return {
@@ -541,7 +420,7 @@ class MailService:
                     "error": error_msg,
                     "error_type": "authentication"
                 }
-            except smtplib.SMTPConnectError as e:
+            except (aiosmtplib.SMTPConnectError, aiosmtplib.SMTPServerDisconnected, ConnectionError) as e:
                 error_msg = f"SMTP 서버 연결 실패: {str(e)}"
                 logger.error(f"❌ {error_msg}")
                 return {
@@ -549,7 +428,7 @@ class MailService:
                     "error": error_msg,
                     "error_type": "connection"
                 }
-            except smtplib.SMTPException as e:
+            except aiosmtplib.SMTPException as e:
                 error_msg = f"SMTP 오류: {str(e)}"
                 logger.error(f"❌ {error_msg}")
                 return {
@@ -568,15 +447,16 @@ class MailService:
                     "error_type": "unknown"
                 }
         
-        # 동기 SMTP 코드를 비동기로 실행
         try:
-            result = await asyncio.to_thread(_send_smtp_sync)
+            result = await _send_smtp_async()
             
             # 메일 발송이 성공한 경우 조직 사용량 업데이트
             if result.get('success', False) and org_id and self.db:
                 logger.info(f"🔍 조직 사용량 업데이트 호출 (send_email_smtp) - 조직: {org_id}, 수신자 수: {len(recipient_emails)}")
                 try:
-                    usage_update = await self._update_organization_usage(org_id, len(recipient_emails))
+                    usage_update = await self._update_organization_usage(
+                        org_id, len(recipient_emails), reservation_id=mail.mail_uuid if mail else None
+                    )
                     logger.info(f"✅ 조직 사용량 업데이트 완료 (send_email_smtp) - 조직: {org_id}")
 
                     # 임계값 알림 확인 및 전송
@@ -649,99 +529,44 @@ class MailService:
             if not mail_user:
                 raise HTTPException(status_code=404, detail="메일 사용자를 찾을 수 없습니다.")
             
-            # 오프셋 계산
-            offset = (page - 1) * limit
-            
-            # 폴더별 쿼리 구성
-            if folder_type == "inbox":
-                # 받은 메일함
-                query = self.db.query(Mail).join(
-                    MailRecipient, Mail.mail_uuid == MailRecipient.mail_uuid
-                ).filter(
-                    Mail.org_id == org_id,
-                    MailRecipient.recipient_uuid == mail_user.user_uuid,
-                    Mail.status != MailStatus.TRASH.value
-                )
-            elif folder_type == "sent":
-                # 보낸 메일함
-                query = self.db.query(Mail).filter(
-                    Mail.org_id == org_id,
-                    Mail.sender_uuid == mail_user.user_uuid,
-                    Mail.status == MailStatus.SENT.value
-                )
-            elif folder_type == "drafts":
-                # 임시보관함
-                query = self.db.query(Mail).filter(
-                    Mail.org_id == org_id,
-                    Mail.sender_uuid == mail_user.user_uuid,
-                    Mail.status == MailStatus.DRAFT.value
-                )
-            elif folder_type == "trash":
-                # 휴지통 - 삭제된 메일만 조회
-                query = self.db.query(Mail).filter(
-                    Mail.org_id == org_id,
-                    Mail.status == MailStatus.TRASH.value,
-                    or_(
-                        Mail.sender_uuid == mail_user.user_uuid,
-                        Mail.mail_uuid.in_(
-                            self.db.query(MailRecipient.mail_uuid).filter(
-                                MailRecipient.recipient_uuid == mail_user.user_uuid
-                            )
-                        )
-                    )
-                )
-            else:
-                raise HTTPException(status_code=400, detail=f"지원하지 않는 폴더 타입: {folder_type}")
-            
-            # 검색 조건 추가
-            if search:
-                query = query.filter(
-                    or_(
-                        Mail.subject.ilike(f"%{search}%"),
-                        Mail.content.ilike(f"%{search}%"),
-                        Mail.sender_email.ilike(f"%{search}%")
-                    )
+            # 목록 엔진으로 페이지 구성 (수신자는 selectinload로 일괄 로드)
+            try:
+                list_page = MailListService(self.db).build_page(
+                    mail_user=mail_user,
+                    org_id=org_id,
+                    folder_type=folder_type,
+                    page=page,
+                    limit=limit,
+                    search=search,
+                    status=status,
+                    include_recipients=True
                 )
-            
-            # 상태 필터 추가
-            if status:
-                query = query.filter(Mail.status == status.value)
-            
-            # 정렬 및 페이지네이션
-            total_count = query.count()
-            mails = query.order_by(desc(Mail.created_at)).offset(offset).limit(limit).all()
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            total_count = list_page.total
             
             # 결과 포맷팅
             mail_list = []
-            for mail in mails:
-                # 수신자 정보 조회
-                recipients = self.db.query(MailRecipient).filter(
-                    MailRecipient.mail_uuid == mail.mail_uuid
-                ).all()
-                
-                # 첨부파일 정보 조회
-                attachments = self.db.query(MailAttachment).filter(
-                    MailAttachment.mail_uuid == mail.mail_uuid
-                ).all()
-                
+            for mail, item in zip(list_page.rows, list_page.mails):
+                body = mail.body_text or ""
                 mail_data = {
                     "mail_uuid": mail.mail_uuid,
-                    "sender_email": mail.sender_email,
+                    "sender_email": item.sender.email if item.sender else None,
                     "subject": mail.subject,
-                    "content": mail.content[:200] + "..." if len(mail.content) > 200 else mail.content,
+                    "content": body[:200] + "..." if len(body) > 200 else body,
                     "priority": mail.priority,
                     "status": mail.status,
                     "sent_at": mail.sent_at.isoformat() if mail.sent_at else None,
-                    "created_at": mail.created_at.isoformat(),
+                    "created_at": mail.created_at.isoformat() if mail.created_at else None,
+                    "is_read": item.is_read,
                     "recipients": [
                         {
                             "email": r.recipient_email,
-                            "type": r.recipient_type,
-                            "is_read": r.is_read
-                        } for r in recipients
+                            "type": r.recipient_type
+                        } for r in list_page.recipients.get(mail.mail_uuid, [])
                     ],
-                    "attachments_count": len(attachments),
-                    "has_attachments": len(attachments) > 0
+                    "attachments_count": item.attachment_count,
+                    "has_attachments": item.attachment_count > 0
                 }
                 mail_list.append(mail_data)
             
@@ -899,6 +724,7 @@ class MailService:
         Returns:
             삭제 성공 여부
         """
+        blob_store = AttachmentBlobStore(self.db)
         try:
             logger.info(f"🗑️ 메일 삭제 - 조직 ID: {org_id}, 사용자 UUID: {user_uuid}, 메일 UUID: {mail_uuid}, 영구삭제: {permanent}")
             
@@ -1000,6 +826,8 @@ class MailService:
                     ).all()
                     
                     for attachment_record in mail_attachment_records:
+                        # blob 참조 해제 (마지막 참조면 커밋 후 파일 삭제)
+                        blob_store.release(org_id, attachment_record.content_sha256)
                         self.db.delete(attachment_record)
                         logger.debug(f"🗑️ mail_attachments 레코드 삭제 - 메일 UUID: {mail_uuid}, 파일명: {attachment_record.filename}")
                     
@@ -1041,12 +869,16 @@ class MailService:
                     recipient_record.deleted_at = datetime.now(timezone.utc)
             
             self.db.commit()
+            await blob_store.after_commit()
+            if permanent and is_sender:
+                self.raw_message_store.delete(org_id, mail_uuid)
             
             logger.info(f"✅ 메일 삭제 완료 - 메일 UUID: {mail_uuid}")
             return True
             
         except Exception as e:
             self.db.rollback()
+            await blob_store.after_rollback()
             logger.error(f"❌ 메일 삭제 실패: {str(e)}")
             raise
 
@@ -1274,22 +1106,65 @@ class MailService:
         
         return folder
     
+    def _usage_seed(self, org_id: str):
+        """Redis 사용량 카운터가 없을 때 오늘의 organization_usage 값 (발송, 수신) 을 읽는 함수"""
+        async def load() -> Tuple[int, int]:
+            today = datetime.now(timezone.utc).date()
+            usage = self.db.execute(
+                select(OrganizationUsage.emails_sent_today, OrganizationUsage.emails_received_today).where(
+                    OrganizationUsage.org_id == org_id,
+                    func.date(OrganizationUsage.usage_date) == today
+                )
+            ).first()
+            return (usage[0] or 0, usage[1] or 0) if usage else (0, 0)
+        return load
+
     async def _update_organization_usage(
         self,
         org_id: str,
         email_count: int = 1,
-        max_retries: int = 3
+        max_retries: int = 3,
+        reservation_id: Optional[str] = None
     ):
         """
         조직의 메일 사용량을 원자적으로 업데이트합니다. (동시성 안전)
         
+        Redis 사용량 카운터에 더하고(발송 예약 해제 포함) organization_usage 에는 주기적으로 일괄 기록합니다.
+        Redis 를 사용할 수 없으면 organization_usage 에 직접 UPSERT 합니다.
+        
         Args:
             org_id: 조직 ID
             email_count: 발송된 메일 수 (기본값: 1)
             max_retries: 최대 재시도 횟수 (기본값: 3)
+            reservation_id: _check_daily_email_limit 에 전달한 예약 ID (메일 UUID)
         """
         logger.info(f"🔍 _update_organization_usage 호출됨 - 조직: {org_id}, 메일 수: {email_count}")
         
+        emails_sent_today = await usage_counter.commit_sent(
+            org_id, email_count, self._usage_seed(org_id), reservation_id=reservation_id
+        )
+        if emails_sent_today is not None:
+            logger.info(f"📊 조직 사용량 Redis 카운터 반영 - 조직: {org_id}, 오늘 발송: {emails_sent_today}")
+            return {
+                'emails_sent_today': emails_sent_today,
+                'total_emails_sent': None,
+            }
+        return await self._upsert_organization_usage(org_id, email_count, max_retries)
+    
+    async def _upsert_organization_usage(
+        self,
+        org_id: str,
+        email_count: int = 1,
+        max_retries: int = 3
+    ):
+        """
+        organization_usage 에 발송 수를 직접 UPSERT 합니다. (Redis 카운터를 사용할 수 없을 때)
+        
+        Args:
+            org_id: 조직 ID
+            email_count: 발송된 메일 수 (기본값: 1)
+            max_retries: 최대 재시도 횟수 (기본값: 3)
+        """
         for attempt in range(max_retries + 1):
             try:
                 # 오늘 날짜 (UTC 기준)
@@ -1336,6 +1211,8 @@ class MailService:
                 
                 # 트랜잭션 커밋
                 self.db.commit()
+                # Redis 복구 후 카운터에 더하도록 기록
+                usage_counter.record_fallback(org_id, "sent", email_count)
                 logger.info(f"✅ _update_organization_usage 완료 - 조직: {org_id}, 시도: {attempt + 1}")
                 return {
                     'emails_sent_today': emails_sent_today if row else None,
@@ -1617,32 +1494,101 @@ class MailService:
             logger.error(f"❌ 임계값 알림 발송 실패 - 조직: {org_id}, 오류: {str(e)}")
             pass
     
+    async def _record_received(self, org_id: str, count: int) -> None:
+        """
+        조직 내부 수신자의 받은편지함에 배달된 메일 수를 오늘 수신 수에 더합니다.
+        
+        받은편지함 배달을 커밋한 뒤에 호출합니다. (커밋에 실패한 메일이 수신 수에 더해지지 않도록)
+        Redis 를 사용할 수 없으면 organization_usage 에 직접 더하고 커밋합니다.
+        
+        Args:
+            org_id: 조직 ID
+            count: 배달된 수신자 수
+        """
+        if count <= 0:
+            return
+        received = await usage_counter.add_received(org_id, count, self._usage_seed(org_id))
+        if received is not None:
+            return
+        
+        try:
+            self.db.execute(text("""
+                INSERT INTO organization_usage (
+                    org_id, usage_date, current_users, current_storage_gb,
+                    emails_sent_today, emails_received_today,
+                    total_emails_sent, total_emails_received,
+                    created_at, updated_at
+                ) VALUES (
+                    :org_id, :usage_date, 0, 0,
+                    0, :count,
+                    0, :count,
+                    :now, :now
+                )
+                ON CONFLICT (org_id, usage_date)
+                DO UPDATE SET
+                    emails_received_today = organization_usage.emails_received_today + :count,
+                    total_emails_received = organization_usage.total_emails_received + :count,
+                    updated_at = :now
+            """), {
+                'org_id': org_id,
+                'usage_date': datetime.now(timezone.utc).date(),
+                'count': count,
+                'now': datetime.now(timezone.utc)
+            })
+            self.db.commit()
+            usage_counter.record_fallback(org_id, "received", count)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ 조직 수신 사용량 업데이트 실패 - 조직: {org_id}, 오류: {str(e)}")
+    
     async def _check_daily_email_limit(
         self,
         org_id: str,
         max_emails_per_day: int,
-        email_count: int
+        email_count: int,
+        reservation_id: Optional[str] = None
     ):
         """
         일일 메일 발송 제한을 검증합니다.
         
+        reservation_id 가 있으면 Redis 사용량 카운터에서 검사와 예약을 한 번에 처리하고,
+        발송 완료 시 _update_organization_usage 에 같은 ID 를 전달하여 예약을 확정합니다.
+        Redis 를 사용할 수 없으면 organization_usage 를 조회하여 검사합니다.
+        
         Args:
             org_id: 조직 ID
             max_emails_per_day: 일일 최대 발송 제한
             email_count: 발송하려는 메일 수
+            reservation_id: 예약 ID (메일 UUID)
             
         Raises:
             HTTPException: 발송 제한 초과 시
         """
         try:
+            if reservation_id and max_emails_per_day and max_emails_per_day > 0:
+                reservation = await usage_counter.reserve(
+                    org_id, reservation_id, email_count, max_emails_per_day, self._usage_seed(org_id)
+                )
+                if reservation is not None:
+                    if not reservation.allowed:
+                        logger.warning(f"⚠️ 일일 메일 발송 제한 초과 - 조직: {org_id}, 현재(예약 포함): {reservation.used}, 요청: {email_count}, 제한: {max_emails_per_day}")
+                        raise HTTPException(
+                            status_code=429,
+                            detail=f"일일 메일 발송 제한을 초과했습니다. (현재: {reservation.used}/{max_emails_per_day})"
+                        )
+                    logger.info(f"📊 메일 발송 수 예약 완료 - 조직: {org_id}, 예약 포함: {reservation.used}, 제한: {max_emails_per_day}")
+                    return
+            
             # 오늘 날짜 (UTC 기준)
             today = datetime.now(timezone.utc).date()
             
             # 오늘 발송된 메일 수 조회
-            usage = self.db.query(OrganizationUsage).filter(
-                OrganizationUsage.org_id == org_id,
-                func.date(OrganizationUsage.usage_date) == today
-            ).first()
+            usage = self.db.execute(
+                select(OrganizationUsage).where(
+                    OrganizationUsage.org_id == org_id,
+                    func.date(OrganizationUsage.usage_date) == today
+                )
+            ).scalars().first()
             
             current_sent = usage.emails_sent_today if usage else 0
             
@@ -1664,6 +1610,18 @@ class MailService:
             # 검증 실패 시 안전하게 발송 허용 (기본 동작 유지)
             pass
     
+    async def _release_daily_email_reservation(self, org_id: str, reservation_id: Optional[str]) -> None:
+        """
+        발송하지 못한 메일의 일일 발송 제한 예약을 해제합니다.
+        
+        _check_daily_email_limit 이후 발송/저장이 실패하면 호출하여, 예약이 만료될 때까지
+        조직의 발송 제한을 차지하지 않도록 합니다. (예약이 없으면 아무것도 하지 않음)
+        """
+        if not reservation_id:
+            return
+        await usage_counter.release(org_id, reservation_id)
+        logger.info(f"↩️ 메일 발송 수 예약 해제 - 조직: {org_id}, 예약: {reservation_id}")
+    
     async def import_mails_from_graph_api(
         self,
         org_id: str,
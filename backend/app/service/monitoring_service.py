@@ -6,30 +6,25 @@
 """
 
 import logging
-import psutil
-import redis
 from datetime import datetime, date, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import func, text, and_, or_
 
 from ..model.user_model import User, LoginLog
-from ..model.organization_model import Organization, OrganizationUsage
-from ..model.mail_model import (
-    Mail,
-    MailUser,
-    MailLog,
-    MailFolder,
-    MailInFolder,
-    FolderType,
+from ..model.organization_model import (
+    Organization, OrganizationUsage, OrganizationUsageRollup, OrganizationActivityHourly, OrganizationActivityDaily
 )
+from ..model.mail_model import MailUser, MailLog
 from ..schemas.monitoring_schema import (
     UsageResponse, UsageMetrics, DailyUsageStats, WeeklyUsageStats, MonthlyUsageStats,
-    AuditResponse, AuditLogEntry, AuditActionType,
+    AuditResponse, AuditLogEntry, AuditActionType, AuditSummaryResponse, AuditSummaryBucket,
     DashboardResponse, DashboardData, SystemHealthMetrics, OrganizationSummary,
-    UsageRequest, AuditRequest, DashboardRequest
+    UsageRequest, AuditRequest, AuditSummaryRequest, DashboardRequest
 )
 from ..config import settings
+from ..utils.metrics import performance_summary
+from ..utils.system_health import sample_host, system_health_sampler
 
 logger = logging.getLogger(__name__)
 
@@ -39,19 +34,6 @@ class MonitoringService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.redis_client = None
-        try:
-            self.redis_client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
-                decode_responses=True
-            )
-            # Redis 연결 테스트
-            self.redis_client.ping()
-        except Exception as e:
-            logger.warning(f"⚠️ Redis 연결 실패: {str(e)}")
-            self.redis_client = None
 
     def get_usage_statistics(self, org_id: str, request: UsageRequest) -> UsageResponse:
         """
@@ -231,6 +213,113 @@ class MonitoringService:
             logger.error(f"❌ 감사 로그 조회 오류 - 조직: {org_id}, 오류: {str(e)}")
             raise
 
+    def get_audit_summary(self, org_id: str, request: AuditSummaryRequest) -> AuditSummaryResponse:
+        """
+        조직의 메일/로그인 활동을 일별 또는 시간별로 요약합니다.
+
+        원본 로그 대신 활동 로그 집계(organization_activity_daily/hourly)를 조회하므로
+        로그가 쌓여도 조회 비용은 기간 길이에만 비례합니다. (집계 주기만큼 지연)
+
+        Args:
+            org_id: 조직 ID
+            request: 감사 요약 요청 (기본: 일별 최근 30일, 시간별 오늘)
+        """
+        logger.info(f"📋 감사 요약 조회 시작 - 조직: {org_id}, 단위: {request.granularity}")
+
+        end_date = request.end_date or datetime.utcnow().date()
+        default_days = 0 if request.granularity == "hour" else 30
+        start_date = request.start_date or end_date - timedelta(days=default_days)
+        if start_date > end_date:
+            raise ValueError("시작일이 종료일보다 늦습니다.")
+
+        buckets: Dict[datetime, AuditSummaryBucket] = {}
+        totals: Dict[str, int] = {}
+
+        if request.granularity == "hour":
+            start_dt = datetime.combine(start_date, datetime.min.time())
+            end_dt = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
+            rows = (
+                self.db.query(
+                    OrganizationActivityHourly.hour_start,
+                    OrganizationActivityHourly.source,
+                    OrganizationActivityHourly.action,
+                    OrganizationActivityHourly.event_count,
+                )
+                .filter(
+                    OrganizationActivityHourly.org_id == org_id,
+                    OrganizationActivityHourly.hour_start >= start_dt,
+                    OrganizationActivityHourly.hour_start < end_dt,
+                )
+                .all()
+            )
+        else:
+            rows = (
+                self.db.query(
+                    OrganizationActivityDaily.activity_date,
+                    OrganizationActivityDaily.source,
+                    OrganizationActivityDaily.action,
+                    OrganizationActivityDaily.event_count,
+                )
+                .filter(
+                    OrganizationActivityDaily.org_id == org_id,
+                    OrganizationActivityDaily.activity_date >= start_date,
+                    OrganizationActivityDaily.activity_date <= end_date,
+                )
+                .all()
+            )
+
+        for bucket_value, source, action, count in rows:
+            bucket_start = bucket_value
+            if not isinstance(bucket_start, datetime):
+                bucket_start = datetime.combine(bucket_start, datetime.min.time())
+            bucket = buckets.setdefault(bucket_start, AuditSummaryBucket(bucket_start=bucket_start))
+            if source == "user":
+                bucket.active_users = count
+                continue
+            if source == "login":
+                key = "login_success" if action == "success" else "login_failed"
+                setattr(bucket, key, getattr(bucket, key) + count)
+            else:
+                key = action
+                bucket.mail_actions[action] = bucket.mail_actions.get(action, 0) + count
+            totals[key] = totals.get(key, 0) + count
+
+        logger.info(f"✅ 감사 요약 조회 완료 - 조직: {org_id}, 구간: {len(buckets)}개")
+
+        return AuditSummaryResponse(
+            granularity=request.granularity,
+            start_date=start_date,
+            end_date=end_date,
+            totals=totals,
+            buckets=[buckets[key] for key in sorted(buckets)],
+        )
+
+    def _get_today_usage(self, org_id: str) -> Optional[OrganizationUsage]:
+        """오늘(UTC) 사용량 행 (메일 발송/수신 시 Redis 카운터에서 주기적으로 기록)"""
+        return (
+            self.db.query(OrganizationUsage)
+            .filter(
+                OrganizationUsage.org_id == org_id,
+                func.date(OrganizationUsage.usage_date) == datetime.utcnow().date(),
+            )
+            .first()
+        )
+
+    def _get_active_users(self, org_id: str, start_date: date, end_date: date) -> Dict[date, int]:
+        """활동 로그 집계의 일별 활성 사용자 수 (로그인 성공 또는 메일 작업을 한 사용자)"""
+        rows = (
+            self.db.query(OrganizationActivityDaily.activity_date, OrganizationActivityDaily.event_count)
+            .filter(
+                OrganizationActivityDaily.org_id == org_id,
+                OrganizationActivityDaily.source == "user",
+                OrganizationActivityDaily.action == "active",
+                OrganizationActivityDaily.activity_date >= start_date,
+                OrganizationActivityDaily.activity_date <= end_date,
+            )
+            .all()
+        )
+        return {activity_date: count for activity_date, count in rows}
+
     def get_dashboard_data(self, org_id: str, request: DashboardRequest) -> DashboardResponse:
         """
         조직별 대시보드 데이터를 조회합니다.
@@ -302,38 +391,10 @@ class MonitoringService:
     def _get_current_metrics(self, org_id: str, organization: Organization) -> UsageMetrics:
         """스키마에 맞춘 현재 사용량 메트릭을 계산합니다."""
         try:
-            today = date.today()
-
-            # 오늘 발송 메일 수 (status=SENT, sent_at 날짜 기준)
-            emails_sent_today = (
-                self.db.query(func.count(Mail.mail_uuid))
-                .filter(
-                    and_(
-                        Mail.org_id == org_id,
-                        func.date(Mail.sent_at) == today,
-                        Mail.status == 'sent',
-                    )
-                )
-                .scalar()
-                or 0
-            )
-
-            # 오늘 수신 메일 수 (조직 내 INBOX 폴더에 할당된 메일, created_at 날짜 기준)
-            emails_received_today = (
-                self.db.query(func.count(func.distinct(Mail.mail_uuid)))
-                .join(MailInFolder, Mail.mail_uuid == MailInFolder.mail_uuid)
-                .join(MailFolder, MailInFolder.folder_uuid == MailFolder.folder_uuid)
-                .filter(
-                    and_(
-                        Mail.org_id == org_id,
-                        MailFolder.org_id == org_id,
-                        MailFolder.folder_type == FolderType.INBOX,
-                        func.date(Mail.created_at) == today,
-                    )
-                )
-                .scalar()
-                or 0
-            )
+            # 오늘 발송/수신 메일 수 (메일 발송/수신 시 누적되는 오늘 사용량 행)
+            today_usage = self._get_today_usage(org_id)
+            emails_sent_today = (today_usage.emails_sent_today or 0) if today_usage else 0
+            emails_received_today = (today_usage.emails_received_today or 0) if today_usage else 0
 
             # 저장 공간(GB)
             storage_used_mb = (
@@ -424,14 +485,17 @@ class MonitoringService:
                 .all()
             )
 
+            active_users = self._get_active_users(org_id, start_date, end_date)
+
             daily_stats: List[DailyUsageStats] = []
             for usage in usage_data:
+                usage_date = usage.usage_date.date()
                 daily_stats.append(
                     DailyUsageStats(
-                        date=usage.usage_date.date(),
+                        date=usage_date,
                         emails_sent=usage.emails_sent_today or 0,
                         emails_received=usage.emails_received_today or 0,
-                        active_users=usage.current_users or 0,
+                        active_users=active_users.get(usage_date, 0),
                         storage_used_gb=float(usage.current_storage_gb or 0),
                     )
                 )
@@ -442,50 +506,85 @@ class MonitoringService:
             logger.error(f"❌ 일일 통계 조회 오류: {str(e)}")
             return []
 
+    def _get_rollups(self, org_id: str, period_type: str, start_date: Optional[date],
+                     end_date: Optional[date], default_days: int) -> List[OrganizationUsageRollup]:
+        """기간 범위와 겹치는 주간/월간 집계 행을 조회합니다 (일일 사용량 리셋 작업이 미리 집계)."""
+        if not end_date:
+            end_date = date.today()
+        if not start_date:
+            start_date = end_date - timedelta(days=default_days)
+
+        return (
+            self.db.query(OrganizationUsageRollup)
+            .filter(
+                OrganizationUsageRollup.org_id == org_id,
+                OrganizationUsageRollup.period_type == period_type,
+                OrganizationUsageRollup.period_end >= start_date,
+                OrganizationUsageRollup.period_start <= end_date,
+            )
+            .order_by(OrganizationUsageRollup.period_start)
+            .all()
+        )
+
+    @staticmethod
+    def _avg_daily_users(rollup: OrganizationUsageRollup) -> float:
+        if not rollup.days_counted:
+            return 0.0
+        return round(rollup.user_days / rollup.days_counted, 2)
+
     def _get_weekly_stats(self, org_id: str, start_date: Optional[date], end_date: Optional[date]) -> List[WeeklyUsageStats]:
-        """주간 통계를 조회합니다."""
-        # 간단한 구현 - 실제로는 더 복잡한 집계 로직 필요
-        return []
+        """주간 통계를 조회합니다 (기본: 최근 12주)."""
+        try:
+            return [
+                WeeklyUsageStats(
+                    week_start=rollup.period_start,
+                    week_end=rollup.period_end,
+                    total_emails_sent=rollup.emails_sent,
+                    total_emails_received=rollup.emails_received,
+                    avg_daily_active_users=self._avg_daily_users(rollup),
+                    peak_storage_used_gb=float(rollup.peak_storage_gb),
+                )
+                for rollup in self._get_rollups(org_id, "week", start_date, end_date, default_days=12 * 7)
+            ]
+
+        except Exception as e:
+            logger.error(f"❌ 주간 통계 조회 오류: {str(e)}")
+            return []
 
     def _get_monthly_stats(self, org_id: str, start_date: Optional[date], end_date: Optional[date]) -> List[MonthlyUsageStats]:
-        """월간 통계를 조회합니다."""
-        # 간단한 구현 - 실제로는 더 복잡한 집계 로직 필요
-        return []
+        """월간 통계를 조회합니다 (기본: 최근 12개월)."""
+        try:
+            return [
+                MonthlyUsageStats(
+                    year=rollup.period_start.year,
+                    month=rollup.period_start.month,
+                    total_emails_sent=rollup.emails_sent,
+                    total_emails_received=rollup.emails_received,
+                    avg_daily_active_users=self._avg_daily_users(rollup),
+                    peak_storage_used_gb=float(rollup.peak_storage_gb),
+                )
+                for rollup in self._get_rollups(org_id, "month", start_date, end_date, default_days=365)
+            ]
+
+        except Exception as e:
+            logger.error(f"❌ 월간 통계 조회 오류: {str(e)}")
+            return []
 
     def _get_system_health(self) -> SystemHealthMetrics:
-        """시스템 건강 상태를 조회합니다 (스키마 필드에 정확히 맞춤)."""
+        """시스템 건강 상태를 조회합니다 (백그라운드 수집기의 최근 샘플, 스키마 필드에 정확히 맞춤)."""
         try:
-            # CPU 사용률 (%)
-            cpu_usage = psutil.cpu_percent(interval=1)
-
-            # 메모리 사용률 (%)
-            memory = psutil.virtual_memory()
-            memory_usage = memory.percent
-
-            # 디스크 사용률 (%)
-            disk = psutil.disk_usage('/')
-            disk_usage = (disk.used / disk.total) * 100
-
-            # 활성 연결 수 (DB + Redis 등 합산, 실제 구현 시 교체)
-            database_connections = 10  # TODO: 실제 연결 수로 교체
-            redis_connections = 0
-            if self.redis_client:
-                try:
-                    info = self.redis_client.info()
-                    redis_connections = int(info.get('connected_clients', 0))
-                except Exception:
-                    pass
-            active_connections = int(database_connections) + int(redis_connections)
-
-            # 메일 큐 크기 (실제 구현 시 큐 시스템 조회)
-            mail_queue_size = 0
+            snapshot = system_health_sampler.latest()
+            if snapshot is None:
+                # 수집 전(시작 직후/테스트)에는 대기 없는 즉시 측정값 사용 (Redis/메일 큐 제외)
+                snapshot = sample_host()
+                snapshot["active_connections"] = snapshot["db_connections"]
 
             return SystemHealthMetrics(
-                cpu_usage_percent=round(cpu_usage, 2),
-                memory_usage_percent=round(memory_usage, 2),
-                disk_usage_percent=round(disk_usage, 2),
-                active_connections=active_connections,
-                email_queue_size=mail_queue_size,
+                cpu_usage_percent=snapshot["cpu_usage_percent"],
+                memory_usage_percent=snapshot["memory_usage_percent"],
+                disk_usage_percent=snapshot["disk_usage_percent"],
+                active_connections=snapshot["active_connections"],
+                email_queue_size=snapshot.get("email_queue_size", 0),
             )
         except Exception as e:
             logger.error(f"❌ 시스템 건강 상태 조회 오류: {str(e)}")
@@ -507,22 +606,11 @@ class MonitoringService:
             # 총 사용자 수
             total_users = self.db.query(func.count(User.user_uuid)).filter(User.org_id == org_id).scalar() or 0
 
-            # 오늘 활성 사용자 수 (오늘 날짜 기준 로그인 기록 보유)
-            today_start = datetime.combine(date.today(), datetime.min.time())
-            active_users_today = (
-                self.db.query(func.count(User.user_uuid))
-                .filter(and_(User.org_id == org_id, User.last_login_at >= today_start))
-                .scalar()
-                or 0
-            )
-
-            # 오늘 발송 메일 수
-            emails_sent_today = (
-                self.db.query(func.count(Mail.mail_id))
-                .filter(and_(Mail.org_id == org_id, func.date(Mail.sent_at) == date.today()))
-                .scalar()
-                or 0
-            )
+            # 오늘 활성 사용자 수 (활동 로그 집계 기준) 및 발송 메일 수 (오늘 사용량 행 기준)
+            today = datetime.utcnow().date()
+            active_users_today = self._get_active_users(org_id, today, today).get(today, 0)
+            today_usage = self._get_today_usage(org_id)
+            emails_sent_today = (today_usage.emails_sent_today or 0) if today_usage else 0
 
             # 저장 공간 사용률 (%)
             storage_used_mb = (
@@ -563,18 +651,24 @@ class MonitoringService:
                 MailLog.org_id == org_id
             ).order_by(MailLog.created_at.desc()).limit(limit).all()
             
+            # 사용자 이메일은 한 번에 조회
+            user_uuids = {log.user_uuid for log in logs if log.user_uuid}
+            emails = {}
+            if user_uuids:
+                emails = dict(
+                    self.db.query(User.user_uuid, User.email).filter(User.user_uuid.in_(user_uuids)).all()
+                )
+
             activities = []
             for log in logs:
-                user = self.db.query(User).filter(User.user_uuid == log.user_id).first()
-                
                 activity = {
                     "id": log.id,
                     "org_id": log.org_id,
-                    "user_id": log.user_id,
-                    "user_email": user.email if user else None,
+                    "user_id": log.user_uuid,
+                    "user_email": emails.get(log.user_uuid),
                     "action": log.action if log.action else "api_access",
-                    "resource_type": log.resource_type,
-                    "resource_id": log.resource_id,
+                    "resource_type": "mail",
+                    "resource_id": log.mail_uuid,
                     "details": {},
                     "ip_address": None,
                     "user_agent": None,
@@ -619,10 +713,9 @@ class MonitoringService:
         return alerts
 
     def _get_performance_metrics(self, org_id: str) -> Dict[str, float]:
-        """성능 메트릭을 조회합니다 (키-값 딕셔너리)."""
-        # 간단한 구현 - 실제로는 더 복잡한 메트릭 수집 필요
-        return {
-            "response_time_ms": 150.0,
-            "throughput": 100.0,
-            "error_rate": 0.1,
-        }
\ No newline at end of file
+        """성능 메트릭을 조회합니다 (/metrics 와 같은 요청/DB 풀/Redis 메트릭, 전체 서버 기준)."""
+        try:
+            return performance_summary()
+        except Exception as e:
+            logger.error(f"❌ 성능 메트릭 조회 오류: {str(e)}")
+            return {}
\ No newline at end of file
@@ -18,6 +18,8 @@ from ..schemas.organization_schema import (
     OrganizationSettings as OrganizationSettingsSchema, OrganizationStats
 )
 from ..service.auth_service import get_password_hash
+from ..service.attachment_blob_store import AttachmentBlobStore
+from ..middleware.tenant_middleware import invalidate_organization_cache
 from ..config import settings
 from ..database import get_db
 
@@ -559,6 +561,7 @@ class OrganizationService:
             org.updated_at = datetime.now(timezone.utc)
             
             self.db.commit()
+            await invalidate_organization_cache(org_id)
             
             logger.info(f"✅ 조직 수정 완료: {org.name} (ID: {org.org_id})")
             
@@ -685,6 +688,7 @@ class OrganizationService:
                     new_db.close()
                 
                 # 하드 삭제 완료 - 기존 세션 commit 하지 않음
+                await invalidate_organization_cache(org_uuid)
                 logger.info(f"✅ 조직 삭제 완료: {org_name}")
                 return True
                 
@@ -697,6 +701,7 @@ class OrganizationService:
                 
                 # 소프트 삭제만 기존 세션에서 commit
                 self.db.commit()
+                await invalidate_organization_cache(org_id)
             
             logger.info(f"✅ 조직 삭제 완료: {org.name}")
             return True
@@ -756,6 +761,9 @@ class OrganizationService:
                 func.sum(MailUser.storage_used_mb).label('total_used')
             ).scalar() or 0
             
+            # 첨부파일 중복 제거 통계 (blob 저장소 기준)
+            dedup = AttachmentBlobStore(self.db).dedup_stats(org_id)
+            
             return OrganizationStats(
                 org_id=org_id,
                 total_users=total_users,
@@ -764,7 +772,11 @@ class OrganizationService:
                 storage_used_mb=int(storage_used),
                 storage_limit_mb=org.max_storage_gb * 1024,
                 storage_usage_percent=round((storage_used / (org.max_storage_gb * 1024)) * 100, 2) if org.max_storage_gb > 0 else 0,
-                user_usage_percent=round((total_users / org.max_users) * 100, 2) if org.max_users > 0 else 0
+                user_usage_percent=round((total_users / org.max_users) * 100, 2) if org.max_users > 0 else 0,
+                attachment_logical_bytes=dedup["logical_bytes"],
+                attachment_stored_bytes=dedup["stored_bytes"],
+                attachment_bytes_saved=dedup["bytes_saved"],
+                attachment_dedup_ratio=dedup["dedup_ratio"]
             )
             
         except Exception as e:
@@ -1062,6 +1074,7 @@ class OrganizationService:
             org.updated_at = datetime.now(timezone.utc)
             
             self.db.commit()
+            await invalidate_organization_cache(org_id)
             
             logger.info(f"✅ 조직 설정 수정 완료: {org_id}")
             
@@ -0,0 +1,127 @@
+"""
+인증 주체(principal) 캐시
+
+get_current_user / get_current_mail_user 가 요청마다 실행하던 User, Organization,
+MailUser 조회 결과를 프로세스 내 LRU + TTL 캐시에 보관합니다.
+
+- 키: ("token", sub, org_id, jti) -> User 컬럼 스냅샷 (조직 활성 상태 확인 완료)
+      ("mail_user", user_uuid, org_id) -> MailUser 컬럼 스냅샷
+- 캐시 적중 시 스냅샷을 요청 세션에 merge(load=False)로 붙여 쿼리 없이 영속 객체를 돌려줍니다.
+  (엔드포인트에서 수정 후 commit 해도 기존과 동일하게 동작)
+- 무효화: User/MailUser 변경(비활성화, 역할 변경, 비밀번호 변경 등)이 commit 되면
+  해당 사용자의 항목을, 조직 캐시 무효화 메시지를 받으면 해당 조직의 항목을 모든 워커에서 삭제합니다.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..config import settings
+from ..model.mail_model import MailUser
+from ..model.user_model import User
+from ..utils.cache_invalidation import cache_invalidation_bus
+from ..utils.local_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_NAME = "principal"
+TENANT_CACHE_NAME = "tenant"
+# 세션별로 commit 시 무효화할 사용자 UUID를 모아두는 session.info 키
+_PENDING_KEY = "principal_cache_pending_invalidations"
+
+principal_cache = LRUTTLCache(
+    PRINCIPAL_CACHE_NAME,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+@dataclass(frozen=True)
+class CachedRow:
+    """ORM 객체의 컬럼 값 스냅샷"""
+    user_uuid: str
+    org_id: str
+    columns: Dict[str, Any]
+
+    @classmethod
+    def capture(cls, instance) -> "CachedRow":
+        """로드된 ORM 객체의 컬럼 값을 복사합니다."""
+        columns = {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+        return cls(user_uuid=columns["user_uuid"], org_id=columns["org_id"], columns=columns)
+
+    def attach(self, db: Session, model: Type):
+        """스냅샷을 db 세션의 영속 객체로 만듭니다. (쿼리 없음)"""
+        instance = model(**self.columns)
+        make_transient_to_detached(instance)
+        return db.merge(instance, load=False)
+
+
+def token_key(user_uuid: str, org_id: str, jti: Optional[str]) -> tuple:
+    """토큰 기준 캐시 키"""
+    return ("token", user_uuid, org_id, jti)
+
+
+def mail_user_key(user_uuid: str, org_id: str) -> tuple:
+    """메일 사용자 캐시 키"""
+    return ("mail_user", user_uuid, org_id)
+
+
+def get_cached(db: Session, key: tuple, model: Type):
+    """캐시된 스냅샷이 있으면 db 세션에 붙여 반환합니다."""
+    row = principal_cache.get(key)
+    if row is None:
+        return None
+    return row.attach(db, model)
+
+
+def store(key: tuple, instance) -> None:
+    """ORM 객체의 스냅샷을 캐시에 저장합니다."""
+    principal_cache.set(key, CachedRow.capture(instance))
+
+
+def _evict_user(payload: Dict[str, Any]) -> None:
+    """사용자 UUID의 모든 항목 삭제"""
+    user_uuid = payload.get("user_uuid")
+    principal_cache.delete_where(lambda key, row: row.user_uuid == user_uuid)
+
+
+def _evict_organization(payload: Dict[str, Any]) -> None:
+    """조직의 모든 항목 삭제 (조직 비활성화/삭제 시)"""
+    org_id = payload.get("org_id")
+    principal_cache.delete_where(lambda key, row: row.org_id == org_id)
+
+
+def invalidate_user(user_uuid: str) -> None:
+    """사용자의 캐시 항목을 모든 워커에서 무효화합니다."""
+    cache_invalidation_bus.publish_nowait(PRINCIPAL_CACHE_NAME, user_uuid=user_uuid)
+    logger.debug(f"🗑️ 인증 주체 캐시 무효화: {user_uuid}")
+
+
+cache_invalidation_bus.register(PRINCIPAL_CACHE_NAME, _evict_user)
+# 조직 정보 캐시 무효화(조직 수정/삭제) 시 해당 조직 사용자도 함께 무효화
+cache_invalidation_bus.register(TENANT_CACHE_NAME, _evict_organization)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session: Session, flush_context) -> None:
+    """flush 된 User/MailUser 변경을 모아둡니다. (commit 후 무효화)"""
+    for instance in list(session.dirty) + list(session.deleted):
+        if isinstance(instance, (User, MailUser)) and instance.user_uuid:
+            session.info.setdefault(_PENDING_KEY, set()).add(instance.user_uuid)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session: Session) -> None:
+    """commit 된 사용자 변경을 캐시에 반영합니다."""
+    pending: Set[str] = session.info.pop(_PENDING_KEY, set())
+    for user_uuid in pending:
+        invalidate_user(user_uuid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_principals(session: Session) -> None:
+    """롤백된 변경은 무효화하지 않습니다."""
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,94 @@
+"""
+발송 메일 원문(RFC 5322) 저장소
+
+메일 한 건의 MIME 원문을 <MAIL_RAW_MESSAGE_DIR>/<조직 ID>/<메일 UUID>.eml 에 한 번만 작성하고,
+발송 재시도·예약 재발송·백업 내보내기에서 다시 인코딩하지 않고 그대로 재사용합니다.
+- 경로가 메일 UUID 로 정해지므로 DB 트랜잭션이 롤백되어도 다음 재시도에서 원문을 찾을 수 있음
+- 임시 파일에 작성한 뒤 os.replace 로 교체하여 작성 중인 원문이 읽히지 않음
+"""
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Callable, Optional
+
+from ..config import settings
+from ..utils.mime_composer import MimeComposer
+
+logger = logging.getLogger(__name__)
+
+
+class RawMessageStore:
+    """메일별 원문 파일 저장소"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.MAIL_RAW_MESSAGE_DIR
+
+    def path(self, org_id: str, mail_uuid: str) -> str:
+        """메일 원문 파일 경로"""
+        return os.path.join(self.root, org_id, f"{mail_uuid}.eml")
+
+    def exists(self, org_id: str, mail_uuid: str) -> bool:
+        return os.path.exists(self.path(org_id, mail_uuid))
+
+    def save(self, org_id: str, mail_uuid: str, composer: MimeComposer) -> str:
+        """
+        원문을 작성하여 저장하고 경로를 반환합니다.
+
+        Args:
+            org_id: 조직 ID
+            mail_uuid: 메일 UUID
+            composer: 메시지 작성기
+
+        Returns:
+            원문 파일 경로
+        """
+        path = self.path(org_id, mail_uuid)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{mail_uuid}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as target:
+                size = composer.write_to(target)
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        logger.info(f"📝 메일 원문 저장 - 메일: {mail_uuid}, 크기: {size} bytes")
+        return path
+
+    def open_or_compose(self, org_id: str, mail_uuid: str,
+                        composer_factory: Callable[[], MimeComposer]) -> BinaryIO:
+        """
+        저장된 원문을 열고, 없으면 작성하여 저장한 뒤 엽니다.
+
+        Args:
+            org_id: 조직 ID
+            mail_uuid: 메일 UUID
+            composer_factory: 원문이 없을 때만 호출되는 작성기 생성 함수
+
+        Returns:
+            읽기 모드 바이너리 파일 (호출자가 닫음)
+        """
+        path = self.path(org_id, mail_uuid)
+        try:
+            raw = open(path, "rb")
+            logger.info(f"♻️ 저장된 메일 원문 재사용 - 메일: {mail_uuid}")
+            return raw
+        except FileNotFoundError:
+            pass
+        return open(self.save(org_id, mail_uuid, composer_factory()), "rb")
+
+    def delete(self, org_id: str, mail_uuid: str) -> None:
+        """메일 원문을 삭제합니다. (없으면 무시)"""
+        path = self.path(org_id, mail_uuid)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"⚠️ 메일 원문 삭제 실패 - 경로: {path}, 오류: {str(e)}")
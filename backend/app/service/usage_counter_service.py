@@ -0,0 +1,453 @@
+"""
+조직 일일 사용량 카운터 (Redis + write-behind)
+
+메일 발송마다 organization_usage 의 (org_id, usage_date) 한 행을 UPSERT 하고 commit 하면
+대형 조직에서는 그 행이 잠금 경합 지점이 됩니다. 이 모듈은 오늘의 발송/수신 수를 Redis 에 두고
+주기적으로 organization_usage 에 일괄 기록합니다.
+
+- 카운터: usage:{org_id}:{UTC 날짜} 해시 (sent, received, 예약 합계 reserved, 예약별 r:{예약 ID})
+- 발송 제한: reserve 가 발송 수 + 예약 합계(reserved)로 제한을 검사하고 예약을 추가 (Lua, 왕복 1회)
+  commit_sent/release 가 예약을 지우고 reserved 에서 뺌. 완료되지 않은 예약은 만료 시각이 지나면
+  다음 reserve 가 reserved 에서 빼고 지움 (진행 중인 예약 수와 무관하게 발송당 비용이 일정)
+- 카운터가 없으면 (자정 이후 첫 요청, Redis 재시작) organization_usage 의 값으로 채운 뒤 다시 실행
+- 기록: 변경된 카운터 키를 usage:dirty 집합에 모으고 flush 가 SPOP 으로 가져가 절대값으로 UPSERT
+  (GREATEST 로 기록하므로 같은 값을 여러 번 기록해도 결과가 같음)
+- 장애 복구: 기록 실패 시 키를 usage:dirty 에 되돌리고, mark_all_dirty 가 남아 있는 카운터 키를
+  주기적으로 다시 등록하여 기록 도중 워커가 종료되어도 다음 기록에서 반영
+- Redis 장애 시 각 메서드는 None 을 반환하며 호출자는 기존 DB UPSERT 방식으로 대체
+  호출자가 record_fallback 으로 DB 에 직접 더한 수를 알려 주면, Redis 복구 후 첫 호출에서
+  남아 있는 카운터에 더함 (복구 후 발송 제한 검사와 기록이 장애 동안의 발송을 빠뜨리지 않도록)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "usage"
+DIRTY_KEY = f"{KEY_PREFIX}:dirty"
+
+# 카운터 생성 시 DB 값을 읽어오는 함수: () -> (오늘 발송 수, 오늘 수신 수)
+SeedLoader = Callable[[], Awaitable[Tuple[int, int]]]
+
+# KEYS[1]: 카운터 해시, KEYS[2]: 예약 ZSET (점수 = 만료 시각)
+# ARGV[1]: 현재 시각, ARGV[2]: 예약 만료 시각, ARGV[3]: 예약 ID, ARGV[4]: 예약 수, ARGV[5]: 일일 제한(0 = 무제한), ARGV[6]: TTL
+# 반환: {허용 1 / 거부 0 / 카운터 없음 -1, 발송 수 + 예약 합계}
+RESERVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {-1, 0}
+end
+local reserved = tonumber(redis.call('HGET', KEYS[1], 'reserved') or '0')
+for _, expired in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])) do
+    reserved = reserved - tonumber(redis.call('HGET', KEYS[1], 'r:' .. expired) or '0')
+    redis.call('HDEL', KEYS[1], 'r:' .. expired)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+if reserved < 0 then
+    reserved = 0
+end
+local used = tonumber(redis.call('HGET', KEYS[1], 'sent') or '0') + reserved
+local count = tonumber(ARGV[4])
+local limit = tonumber(ARGV[5])
+if limit > 0 and used + count > limit then
+    redis.call('HSET', KEYS[1], 'reserved', reserved)
+    return {0, used}
+end
+-- 같은 예약 ID 로 다시 예약하면 이전 예약을 대체
+local previous = tonumber(redis.call('HGET', KEYS[1], 'r:' .. ARGV[3]) or '0')
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+redis.call('HSET', KEYS[1], 'r:' .. ARGV[3], count, 'reserved', reserved - previous + count)
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+return {1, used + count}
+"""
+
+# 예약 하나를 지우고 예약 합계에서 뺌 (INCREMENT_SCRIPT, RELEASE_SCRIPT 공통)
+_DROP_RESERVATION = """
+if ARGV[3] ~= '' then
+    redis.call('ZREM', KEYS[2], ARGV[3])
+    local reserved = redis.call('HGET', KEYS[1], 'r:' .. ARGV[3])
+    if reserved then
+        redis.call('HDEL', KEYS[1], 'r:' .. ARGV[3])
+        redis.call('HINCRBY', KEYS[1], 'reserved', -tonumber(reserved))
+    end
+end
+"""
+
+# KEYS[1]: 카운터 해시, KEYS[2]: 예약 ZSET, KEYS[3]: dirty 집합
+# ARGV[1]: 필드(sent/received), ARGV[2]: 증가량, ARGV[3]: 예약 ID('' 이면 없음), ARGV[4]: TTL
+# 반환: 증가 후 값 (카운터 없음 -1)
+INCREMENT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+""" + _DROP_RESERVATION + """
+local value = redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('SADD', KEYS[3], KEYS[1])
+return value
+"""
+
+# KEYS[1]: 카운터 해시, KEYS[2]: 예약 ZSET, ARGV[3]: 예약 ID (ARGV[1], ARGV[2] 는 사용하지 않음)
+RELEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+""" + _DROP_RESERVATION + """
+return 1
+"""
+
+# KEYS[1]: 카운터 해시, ARGV[1]: 발송 수, ARGV[2]: 수신 수, ARGV[3]: TTL
+# 다른 워커가 먼저 만들었으면 그대로 둠
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('HSET', KEYS[1], 'sent', ARGV[1], 'received', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return 1
+"""
+
+# KEYS[1]: 카운터 해시, KEYS[2]: dirty 집합, ARGV[1]: 장애 동안 DB 에 더한 발송 수, ARGV[2]: 수신 수
+# 카운터가 없으면 다음 생성 때 DB 값(장애 동안 더한 수 포함)으로 채워지므로 그대로 둠
+MERGE_FALLBACK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], 'sent', ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'received', ARGV[2])
+redis.call('SADD', KEYS[2], KEYS[1])
+return 1
+"""
+
+
+def counter_key(org_id: str, day: date) -> str:
+    return f"{KEY_PREFIX}:{org_id}:{day.isoformat()}"
+
+
+def reservation_key(org_id: str, day: date) -> str:
+    return f"{counter_key(org_id, day)}:reservations"
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+@dataclass
+class QuotaReservation:
+    """발송 제한 예약 결과"""
+    allowed: bool
+    used: int  # 오늘 발송 수 + 진행 중인 예약 합계 (허용 시 이번 예약 포함)
+
+
+@dataclass
+class UsageSnapshot:
+    """organization_usage 에 기록할 조직의 하루 사용량"""
+    org_id: str
+    usage_date: date
+    sent: int
+    received: int
+
+
+class UsageCounter:
+    """Redis(redis.asyncio) 기반 조직 일일 사용량 카운터"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        retry_seconds: Optional[float] = None,
+        reservation_ttl: Optional[int] = None
+    ):
+        """
+        사용량 카운터 초기화
+
+        Args:
+            redis_url: Redis URL (생략 시 settings.REDIS_URL)
+            timeout: Redis 명령 타임아웃 (초)
+            retry_seconds: Redis 장애 후 DB 방식을 사용하는 시간 (초)
+            reservation_ttl: 완료되지 않은 발송 예약이 풀리기까지의 시간 (초)
+        """
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.timeout = timeout if timeout is not None else settings.USAGE_COUNTER_REDIS_TIMEOUT_SECONDS
+        self.retry_seconds = retry_seconds if retry_seconds is not None else settings.USAGE_COUNTER_REDIS_RETRY_SECONDS
+        self.reservation_ttl = reservation_ttl or settings.USAGE_RESERVATION_TTL_SECONDS
+        # 카운터는 이틀 보관 (자정 직후 전날 카운터 기록용)
+        self.key_ttl = 2 * 24 * 3600
+        self._client = None
+        self._client_loop_id: Optional[int] = None
+        self._scripts = {}
+        self._redis_disabled_until = 0.0
+        # Redis 장애 동안 호출자가 organization_usage 에 직접 더한 수: 카운터 키 -> [발송 수, 수신 수]
+        self._fallback_deltas: Dict[str, List[int]] = {}
+
+    def _get_client(self):
+        """현재 이벤트 루프용 Redis 클라이언트를 반환합니다."""
+        loop_id = id(asyncio.get_running_loop())
+        if self._client is None or self._client_loop_id != loop_id:
+            from ..utils.metrics import InstrumentedAsyncRedis
+
+            # redis.asyncio 연결은 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 새로 생성
+            self._client = InstrumentedAsyncRedis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout
+            )
+            self._client_loop_id = loop_id
+            self._scripts = {
+                "reserve": self._client.register_script(RESERVE_SCRIPT),
+                "increment": self._client.register_script(INCREMENT_SCRIPT),
+                "release": self._client.register_script(RELEASE_SCRIPT),
+                "seed": self._client.register_script(SEED_SCRIPT),
+                "merge_fallback": self._client.register_script(MERGE_FALLBACK_SCRIPT),
+            }
+        return self._client
+
+    @property
+    def redis_available(self) -> bool:
+        """Redis 사용 가능 여부 (장애 후 재시도 대기 중이면 False)"""
+        return time.monotonic() >= self._redis_disabled_until
+
+    def _disable(self, error: Exception):
+        self._redis_disabled_until = time.monotonic() + self.retry_seconds
+        logger.warning(f"⚠️ Redis 사용량 카운터 실패 - {self.retry_seconds}초간 DB 방식 사용: {str(error)}")
+
+    async def _run(self, name: str, keys: List[str], args: List, seed_key: str, seed: SeedLoader):
+        """스크립트를 실행하고, 카운터가 없다는 응답(-1)이면 DB 값으로 채운 뒤 한 번 더 실행합니다."""
+        self._get_client()
+        await self._merge_fallback()
+        reply = await self._scripts[name](keys=keys, args=args)
+        if (reply[0] if isinstance(reply, list) else reply) != -1:
+            return reply
+        sent, received = await seed()
+        await self._scripts["seed"](keys=[seed_key], args=[int(sent), int(received), self.key_ttl])
+        logger.info(f"🌱 사용량 카운터 생성 - 키: {seed_key}, 발송: {sent}, 수신: {received}")
+        return await self._scripts[name](keys=keys, args=args)
+
+    async def reserve(self, org_id: str, reservation_id: str, count: int, limit: int,
+                      seed: SeedLoader) -> Optional[QuotaReservation]:
+        """
+        일일 발송 제한을 검사하고 허용되면 count 만큼 예약합니다.
+
+        Args:
+            org_id: 조직 ID
+            reservation_id: 예약 ID (메일 UUID, commit_sent 에 같은 값 전달)
+            count: 발송하려는 메일 수
+            limit: 일일 최대 발송 수 (0 = 무제한)
+            seed: 카운터가 없을 때 DB 값을 읽는 함수
+
+        Returns:
+            예약 결과 (Redis 사용 불가 시 None)
+        """
+        if not self.redis_available:
+            return None
+        day = _today()
+        now = time.time()
+        keys = [counter_key(org_id, day), reservation_key(org_id, day)]
+        args = [now, now + self.reservation_ttl, reservation_id, int(count), int(limit or 0), self.key_ttl]
+        try:
+            reply = await self._run("reserve", keys, args, keys[0], seed)
+        except Exception as e:
+            self._disable(e)
+            return None
+        return QuotaReservation(allowed=int(reply[0]) == 1, used=int(reply[1]))
+
+    async def _increment(self, org_id: str, field: str, count: int, reservation_id: Optional[str],
+                         seed: SeedLoader) -> Optional[int]:
+        if not self.redis_available:
+            return None
+        day = _today()
+        keys = [counter_key(org_id, day), reservation_key(org_id, day), DIRTY_KEY]
+        args = [field, int(count), reservation_id or "", self.key_ttl]
+        try:
+            return int(await self._run("increment", keys, args, keys[0], seed))
+        except Exception as e:
+            self._disable(e)
+            return None
+
+    async def commit_sent(self, org_id: str, count: int, seed: SeedLoader,
+                          reservation_id: Optional[str] = None) -> Optional[int]:
+        """
+        발송 완료 수를 더하고 예약을 지웁니다.
+
+        Returns:
+            오늘 발송 수 (Redis 사용 불가 시 None)
+        """
+        return await self._increment(org_id, "sent", count, reservation_id, seed)
+
+    async def add_received(self, org_id: str, count: int, seed: SeedLoader) -> Optional[int]:
+        """
+        수신 수를 더합니다.
+
+        Returns:
+            오늘 수신 수 (Redis 사용 불가 시 None)
+        """
+        return await self._increment(org_id, "received", count, None, seed)
+
+    async def release(self, org_id: str, reservation_id: str) -> None:
+        """발송하지 않은 예약을 지웁니다. (실패해도 만료 시각에 풀림)"""
+        if not self.redis_available:
+            return
+        day = _today()
+        try:
+            self._get_client()
+            await self._scripts["release"](
+                keys=[counter_key(org_id, day), reservation_key(org_id, day)], args=["", "", reservation_id]
+            )
+        except Exception as e:
+            self._disable(e)
+
+    def record_fallback(self, org_id: str, field: str, count: int) -> None:
+        """
+        Redis 를 사용할 수 없어 organization_usage 에 직접 더한 수를 기록합니다.
+
+        DB 커밋 후에 호출합니다. Redis 복구 후 첫 reserve/commit_sent/add_received 에서
+        남아 있는 카운터에 더하므로, 복구 전 값으로 발송 제한을 검사하거나 기록하지 않습니다.
+
+        Args:
+            org_id: 조직 ID
+            field: sent / received
+            count: 더한 수
+        """
+        delta = self._fallback_deltas.setdefault(counter_key(org_id, _today()), [0, 0])
+        delta[0 if field == "sent" else 1] += int(count)
+
+    async def _merge_fallback(self) -> None:
+        """장애 동안 DB 에 직접 더한 수를 카운터에 더합니다. (실패하면 다음 호출에서 다시 시도)"""
+        if not self._fallback_deltas:
+            return
+        pending, self._fallback_deltas = self._fallback_deltas, {}
+        try:
+            for key in list(pending):
+                sent, received = pending[key]
+                await self._scripts["merge_fallback"](keys=[key, DIRTY_KEY], args=[sent, received])
+                del pending[key]
+        except Exception:
+            for key, (sent, received) in pending.items():
+                delta = self._fallback_deltas.setdefault(key, [0, 0])
+                delta[0] += sent
+                delta[1] += received
+            raise
+        logger.info("🔁 Redis 장애 동안의 사용량을 카운터에 반영")
+
+    async def flush(self, writer: Callable[[List[UsageSnapshot]], Awaitable[None]],
+                    batch_size: Optional[int] = None) -> int:
+        """
+        변경된 카운터를 batch_size 개씩 가져와 writer 로 기록합니다.
+
+        writer 가 실패하면 가져온 키를 dirty 집합에 되돌리고 예외를 다시 발생시킵니다.
+
+        Returns:
+            기록한 카운터 수
+        """
+        batch_size = batch_size or settings.USAGE_FLUSH_BATCH_SIZE
+        client = self._get_client()
+        flushed = 0
+        while True:
+            keys = await client.spop(DIRTY_KEY, batch_size)
+            if not keys:
+                return flushed
+            async with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.hmget(key, "sent", "received")
+                values = await pipe.execute()
+
+            snapshots = []
+            for key, (sent, received) in zip(keys, values):
+                if sent is None and received is None:
+                    continue
+                _, org_id, day = key.split(":", 2)
+                snapshots.append(UsageSnapshot(org_id, date.fromisoformat(day), int(sent or 0), int(received or 0)))
+            try:
+                if snapshots:
+                    await writer(snapshots)
+            except Exception:
+                await client.sadd(DIRTY_KEY, *keys)
+                raise
+            flushed += len(snapshots)
+            if len(keys) < batch_size:
+                return flushed
+
+    async def mark_all_dirty(self) -> int:
+        """
+        오늘과 어제의 모든 카운터 키를 dirty 집합에 다시 등록합니다.
+
+        기록 도중 워커가 종료되어 dirty 에서 빠진 키도 다음 flush 에서 기록됩니다.
+
+        Returns:
+            등록한 키 수
+        """
+        client = self._get_client()
+        marked = 0
+        today = _today()
+        for day in (today - timedelta(days=1), today):
+            batch = []
+            async for key in client.scan_iter(match=f"{KEY_PREFIX}:*:{day.isoformat()}", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    marked += await client.sadd(DIRTY_KEY, *batch)
+                    batch = []
+            if batch:
+                marked += await client.sadd(DIRTY_KEY, *batch)
+        return marked
+
+    async def close(self):
+        """Redis 연결을 닫습니다."""
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+            self._client_loop_id = None
+
+
+def write_usage_snapshots(db: Session, snapshots: Sequence[UsageSnapshot]) -> None:
+    """
+    Redis 카운터 값을 organization_usage 에 절대값으로 UPSERT 합니다.
+
+    오늘 발송/수신 수는 기존 값보다 클 때만 올리고, 누적 수에는 올라간 만큼만 더하므로
+    같은 스냅샷을 여러 번 기록해도 결과가 같습니다.
+    """
+    greatest = "GREATEST" if db.get_bind().dialect.name == "postgresql" else "MAX"
+    upsert_sql = text(f"""
+        INSERT INTO organization_usage (
+            org_id, usage_date, current_users, current_storage_gb,
+            emails_sent_today, emails_received_today,
+            total_emails_sent, total_emails_received,
+            created_at, updated_at
+        ) VALUES (
+            :org_id, :usage_date, 0, 0,
+            :sent, :received,
+            :sent, :received,
+            :now, :now
+        )
+        ON CONFLICT (org_id, usage_date)
+        DO UPDATE SET
+            emails_sent_today = {greatest}(organization_usage.emails_sent_today, excluded.emails_sent_today),
+            emails_received_today = {greatest}(organization_usage.emails_received_today, excluded.emails_received_today),
+            total_emails_sent = organization_usage.total_emails_sent
+                + {greatest}(excluded.emails_sent_today - organization_usage.emails_sent_today, 0),
+            total_emails_received = organization_usage.total_emails_received
+                + {greatest}(excluded.emails_received_today - organization_usage.emails_received_today, 0),
+            updated_at = excluded.updated_at
+    """)
+    now = datetime.now(timezone.utc)
+    # 조직 순서로 기록하여 다른 워커의 기록과 잠금 순서를 맞춤
+    rows = sorted(snapshots, key=lambda snapshot: (snapshot.org_id, snapshot.usage_date))
+    db.execute(upsert_sql, [
+        {"org_id": s.org_id, "usage_date": s.usage_date, "sent": s.sent, "received": s.received, "now": now}
+        for s in rows
+    ])
+    db.commit()
+
+
+usage_counter = UsageCounter()
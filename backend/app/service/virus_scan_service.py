@@ -1,25 +1,59 @@
 """
 바이러스 검사 서비스 모듈
 
-ClamAV를 사용하여 첨부파일의 바이러스 검사를 수행합니다.
+ClamAV(clamd INSTREAM 연결 풀)를 사용하여 첨부파일의 바이러스 검사를 수행합니다.
+- 검사 결과는 (엔진 시그니처 버전, SHA-256) 기준으로 워커별 LRU 와 Redis 에 캐시
+  (시그니처 DB 가 갱신되면 키가 바뀌어 이전 결과는 자연히 사용되지 않음)
+- 파일은 청크 단위로 한 번만 읽어 해시와 휴리스틱 검사를 함께 수행
+- clamd 검사는 비동기 연결 풀로, 휴리스틱 검사는 크기 제한 스레드 풀에서 실행되어 이벤트 루프를 막지 않음
+- 업로드 중인 첨부파일은 open_upload_scan() 으로 디스크에 쓰는 동시에 clamd 로 스트리밍 검사
 """
 
 import os
+import asyncio
+import json
 import logging
 import hashlib
 import time
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from datetime import datetime
 
-try:
-    import pyclamd
-    CLAMAV_AVAILABLE = True
-except ImportError:
-    CLAMAV_AVAILABLE = False
-    pyclamd = None
+from ..config import settings
+from ..utils.clamd_pool import (
+    ClamdConnectionError, ClamdError, ClamdPoolManager, ClamdSizeLimitError, ClamdStream, clamd_pool_manager
+)
+from ..utils.latency_histogram import LatencyHistogram
+from ..utils.local_cache import LRUTTLCache
 
 logger = logging.getLogger(__name__)
 
+# 휴리스틱 검사 규칙 버전 (패턴을 바꾸면 올려서 기존 캐시 결과를 무효화)
+HEURISTIC_SIGNATURE = "heuristic-1"
+
+# EICAR 테스트 패턴
+EICAR_PATTERNS = [
+    b"X5O!P%@AP[4\PZX54(P^)7CC)7$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*",
+    b"EICAR-STANDARD-ANTIVIRUS-TEST-FILE"
+]
+
+# 의심스러운 API 패턴 (2개 이상 발견 시 감염으로 판정)
+SUSPICIOUS_PATTERNS = [
+    b"CreateRemoteThread",
+    b"VirtualAllocEx",
+    b"WriteProcessMemory",
+    b"SetWindowsHookEx"
+]
+
+# 청크 경계에 걸친 패턴을 찾기 위해 다음 청크 앞에 붙여 검사하는 길이
+_PATTERN_OVERLAP = max(len(pattern) for pattern in EICAR_PATTERNS + SUSPICIOUS_PATTERNS) - 1
+
+# Redis 장애 후 다시 시도하기까지 로컬 캐시만 사용하는 시간 (초)
+_REDIS_RETRY_SECONDS = 5.0
+
+scan_latency = LatencyHistogram("virus_scan.scan")
+cache_hit_latency = LatencyHistogram("virus_scan.cache_hit")
+
 
 class VirusScanResult:
     """바이러스 검사 결과를 담는 클래스"""
@@ -73,191 +107,458 @@ class VirusScanResult:
         }
 
 
+class ScanVerdictCache:
+    """(엔진 시그니처, SHA-256) 기준 검사 결과 캐시 - 워커별 LRU 뒤에 Redis"""
+
+    def __init__(self,
+                 name: str = "virus_scan_verdict",
+                 redis_url: Optional[str] = None,
+                 timeout: Optional[float] = None,
+                 redis_ttl_seconds: Optional[int] = None):
+        """
+        검사 결과 캐시 초기화
+
+        Args:
+            name: 로컬 캐시 이름 (모니터링 통계 키)
+            redis_url: Redis URL (생략 시 settings.REDIS_URL)
+            timeout: Redis 명령 타임아웃 (초)
+            redis_ttl_seconds: Redis 항목 유효 시간 (초)
+        """
+        self.local = LRUTTLCache(
+            name,
+            max_size=settings.VIRUS_SCAN_CACHE_MAX_SIZE,
+            ttl_seconds=settings.VIRUS_SCAN_CACHE_TTL_SECONDS
+        )
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.timeout = timeout if timeout is not None else settings.VIRUS_SCAN_REDIS_TIMEOUT_SECONDS
+        self.redis_ttl_seconds = redis_ttl_seconds or settings.VIRUS_SCAN_REDIS_TTL_SECONDS
+        self._client = None
+        self._client_loop_id: Optional[int] = None
+        self._redis_disabled_until = 0.0
+        self.lookups = 0
+        self.local_hits = 0
+        self.redis_hits = 0
+
+    @staticmethod
+    def key(signature: str, sha256: str) -> str:
+        """Redis 키"""
+        return f"virus_scan:verdict:{signature}:{sha256}"
+
+    def _get_client(self):
+        """현재 이벤트 루프용 Redis 클라이언트를 반환합니다."""
+        loop_id = id(asyncio.get_running_loop())
+        if self._client is None or self._client_loop_id != loop_id:
+            from ..utils.metrics import InstrumentedAsyncRedis
+
+            # redis.asyncio 연결은 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 새로 생성
+            self._client = InstrumentedAsyncRedis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout
+            )
+            self._client_loop_id = loop_id
+        return self._client
+
+    @property
+    def redis_available(self) -> bool:
+        """Redis 사용 가능 여부 (장애 후 재시도 대기 중이면 False)"""
+        return time.monotonic() >= self._redis_disabled_until
+
+    def _redis_failed(self, error: Exception) -> None:
+        self._redis_disabled_until = time.monotonic() + _REDIS_RETRY_SECONDS
+        logger.warning(f"⚠️ 바이러스 검사 결과 Redis 캐시 실패 - {_REDIS_RETRY_SECONDS}초간 로컬 캐시만 사용: {str(error)}")
+
+    def get_local(self, signature: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """워커별 캐시만 조회합니다. (동기 코드용)"""
+        self.lookups += 1
+        verdict = self.local.get((signature, sha256))
+        if verdict is not None:
+            self.local_hits += 1
+        return verdict
+
+    async def get(self, signature: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """워커별 캐시, Redis 순으로 조회합니다. (Redis 적중 시 워커별 캐시에 채움)"""
+        verdict = self.get_local(signature, sha256)
+        if verdict is not None or not self.redis_available:
+            return verdict
+        try:
+            raw = await self._get_client().get(self.key(signature, sha256))
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if raw is None:
+            return None
+        verdict = json.loads(raw)
+        self.redis_hits += 1
+        self.local.set((signature, sha256), verdict)
+        return verdict
+
+    def set_local(self, signature: str, sha256: str, verdict: Dict[str, Any]) -> None:
+        """워커별 캐시에 저장합니다."""
+        self.local.set((signature, sha256), verdict)
+
+    async def set(self, signature: str, sha256: str, verdict: Dict[str, Any]) -> None:
+        """워커별 캐시와 Redis 에 저장합니다."""
+        self.set_local(signature, sha256, verdict)
+        if not self.redis_available:
+            return
+        try:
+            await self._get_client().set(
+                self.key(signature, sha256),
+                json.dumps(verdict, ensure_ascii=False),
+                ex=self.redis_ttl_seconds
+            )
+        except Exception as e:
+            self._redis_failed(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """조회 수와 적중률(워커별 캐시 + Redis)을 반환합니다."""
+        hits = self.local_hits + self.redis_hits
+        return {
+            "lookups": self.lookups,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "hit_ratio": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "redis_available": self.redis_available,
+            "local": self.local.stats(),
+        }
+
+    async def close(self):
+        """현재 이벤트 루프에서 만든 Redis 연결을 닫습니다."""
+        if self._client is not None and self._client_loop_id == id(asyncio.get_running_loop()):
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+            self._client_loop_id = None
+
+
+# 전역 검사 결과 캐시 (워커 내 모든 VirusScanService 가 공유)
+scan_verdict_cache = ScanVerdictCache()
+
+
+class UploadScan:
+    """
+    업로드 중인 첨부파일의 clamd 스트리밍 검사 (VirusScanService.open_upload_scan)
+
+    clamd 오류는 업로드를 막지 않습니다. (검사 결과 없이 끝나며 이후 요청 시 다시 검사)
+    """
+
+    def __init__(self, service: "VirusScanService", stream: ClamdStream, signature: str):
+        self._service = service
+        self._stream: Optional[ClamdStream] = stream
+        self._signature = signature
+
+    async def write(self, chunk: bytes) -> None:
+        """디스크에 쓰는 청크를 clamd 로도 보냅니다."""
+        if self._stream is None:
+            return
+        try:
+            await self._stream.write(chunk)
+        except ClamdError as e:
+            logger.warning(f"⚠️ 업로드 중 바이러스 검사 중단 - 업로드는 계속합니다: {str(e)}")
+            self._service._clamav_failed(e)
+            self._stream = None
+
+    async def finish(self, file_path: str, sha256: str) -> Optional[VirusScanResult]:
+        """
+        검사 결과를 받아 검사 결과 캐시에 저장합니다.
+
+        Returns:
+            검사 결과 (검사가 중단되었으면 None)
+        """
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return None
+        try:
+            scan_result = await stream.finish()
+        except ClamdError as e:
+            logger.warning(f"⚠️ 업로드 중 바이러스 검사 실패 - 파일: {file_path}, 오류: {str(e)}")
+            self._service._clamav_failed(e)
+            return None
+        result = VirusScanResult(
+            file_path=file_path,
+            is_infected=scan_result.infected,
+            virus_name=scan_result.virus_name,
+            engine="clamav",
+            file_hash=sha256
+        )
+        await self._service.verdict_cache.set(self._signature, sha256, VirusScanService._to_verdict(result))
+        return result
+
+    async def abort(self) -> None:
+        """검사를 중단합니다. (업로드 실패 시)"""
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            await stream.abort()
+
+
 class VirusScanService:
     """바이러스 검사 서비스 클래스"""
     
     def __init__(self, 
-                 clamav_host: str = "localhost",
-                 clamav_port: int = 3310,
-                 enable_fallback: bool = True):
+                 clamav_host: Optional[str] = None,
+                 clamav_port: Optional[int] = None,
+                 enable_fallback: bool = True,
+                 max_workers: Optional[int] = None,
+                 verdict_cache: Optional[ScanVerdictCache] = None,
+                 clamd_pools: Optional[ClamdPoolManager] = None):
         """
         바이러스 검사 서비스 초기화
         
         Args:
-            clamav_host: ClamAV 데몬 호스트
-            clamav_port: ClamAV 데몬 포트
+            clamav_host: ClamAV 데몬 호스트 (생략 시 settings.CLAMAV_HOST)
+            clamav_port: ClamAV 데몬 포트 (생략 시 settings.CLAMAV_PORT)
             enable_fallback: ClamAV 사용 불가 시 휴리스틱 검사 사용 여부
+            max_workers: 동시에 실행할 휴리스틱 검사 수 (생략 시 settings.VIRUS_SCAN_MAX_WORKERS)
+            verdict_cache: 검사 결과 캐시 (생략 시 전역 캐시)
+            clamd_pools: clamd 연결 풀 관리자 (생략 시 호스트/포트에 맞는 관리자)
         """
-        self.clamav_host = clamav_host
-        self.clamav_port = clamav_port
+        self.clamav_host = clamav_host or settings.CLAMAV_HOST
+        self.clamav_port = clamav_port or settings.CLAMAV_PORT
         self.enable_fallback = enable_fallback
-        self._clamav_client = None
+        self.max_workers = max_workers or settings.VIRUS_SCAN_MAX_WORKERS
+        self.verdict_cache = verdict_cache or scan_verdict_cache
+        if clamd_pools is None:
+            same_daemon = (self.clamav_host, self.clamav_port) == (settings.CLAMAV_HOST, settings.CLAMAV_PORT)
+            clamd_pools = clamd_pool_manager if same_daemon else ClamdPoolManager(host=self.clamav_host, port=self.clamav_port)
+        self.clamd_pools = clamd_pools
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="virus-scan")
+        # clamd 연결 상태 (연결 실패 후 CLAMAV_RETRY_SECONDS 동안은 휴리스틱 검사만 사용)
         self._clamav_available = False
-        
-        # ClamAV 연결 시도
-        self._initialize_clamav()
+        self._clamav_retry_at = 0.0
+        # ClamAV 시그니처 버전 (주기적으로 재조회)
+        self._clamav_signature: Optional[str] = None
+        self._clamav_signature_expires_at = 0.0
     
-    def _initialize_clamav(self) -> None:
-        """ClamAV 데몬 연결 초기화"""
-        if not CLAMAV_AVAILABLE:
-            logger.warning("🦠 pyclamd 모듈이 설치되지 않았습니다. 휴리스틱 검사만 사용됩니다.")
-            return
-        
+    async def _clamav_ready(self) -> bool:
+        """clamd 사용 가능 여부 (처음 또는 재시도 시각이 지나면 PING 으로 확인)"""
+        if self._clamav_available:
+            return True
+        if time.monotonic() < self._clamav_retry_at:
+            return False
         try:
-            # TCP 연결 시도
-            self._clamav_client = pyclamd.ClamdNetworkSocket(
-                host=self.clamav_host, 
-                port=self.clamav_port
-            )
-            
-            # 연결 테스트
-            if self._clamav_client.ping():
-                self._clamav_available = True
-                version = self._clamav_client.version()
-                logger.info(f"✅ ClamAV 연결 성공 - {version}")
-            else:
-                logger.warning(f"⚠️ ClamAV 데몬에 연결할 수 없습니다 ({self.clamav_host}:{self.clamav_port})")
-                
-        except Exception as e:
-            logger.warning(f"⚠️ ClamAV 초기화 실패: {str(e)}")
-            
-            # Unix 소켓 연결 시도 (Linux/macOS)
-            try:
-                self._clamav_client = pyclamd.ClamdUnixSocket()
-                if self._clamav_client.ping():
-                    self._clamav_available = True
-                    logger.info("✅ ClamAV Unix 소켓 연결 성공")
-                else:
-                    logger.warning("⚠️ ClamAV Unix 소켓 연결 실패")
-            except Exception as unix_e:
-                logger.warning(f"⚠️ ClamAV Unix 소켓 연결 실패: {str(unix_e)}")
+            available = await self.clamd_pools.get_pool().ping()
+        except ClamdError as e:
+            logger.warning(f"⚠️ ClamAV 연결 실패 - {settings.CLAMAV_RETRY_SECONDS}초간 휴리스틱 검사만 사용: {str(e)}")
+            available = False
+        if available:
+            self._clamav_available = True
+            logger.info(f"✅ ClamAV 연결 성공 - {self.clamd_pools.get_pool().address}")
+        else:
+            self._clamav_retry_at = time.monotonic() + settings.CLAMAV_RETRY_SECONDS
+        return available
     
-    def scan_file(self, file_path: str) -> VirusScanResult:
+    def _clamav_failed(self, error: ClamdError) -> None:
+        """clamd 통신 실패 시 재시도 시각까지 사용하지 않습니다. (오류 응답, 크기 제한 초과는 해당 검사만 실패)"""
+        if isinstance(error, ClamdConnectionError):
+            self._clamav_available = False
+            self._clamav_retry_at = time.monotonic() + settings.CLAMAV_RETRY_SECONDS
+    
+    async def engine_signature(self) -> Optional[str]:
         """
-        파일 바이러스 검사 수행
+        현재 기본 검사 엔진의 시그니처 버전 (캐시 키에 사용)
+
+        ClamAV 는 "엔진 버전/DB 버전" 을 주기적으로 재조회하며,
+        조회할 수 없으면 None 을 반환하여 캐시를 사용하지 않습니다.
+        """
+        if not await self._clamav_ready():
+            return HEURISTIC_SIGNATURE if self.enable_fallback else None
+        now = time.monotonic()
+        if self._clamav_signature is None or now >= self._clamav_signature_expires_at:
+            try:
+                version = await self.clamd_pools.get_pool().version()
+            except ClamdError as e:
+                logger.warning(f"⚠️ ClamAV 시그니처 버전 조회 실패: {str(e)}")
+                self._clamav_failed(e)
+                return None
+            # 예: "ClamAV 1.0.1/26950/Tue Jun 13 07:23:53 2023" -> "ClamAV-1.0.1/26950"
+            self._clamav_signature = "/".join(version.split("/")[:2]).replace(" ", "-")
+            self._clamav_signature_expires_at = now + settings.VIRUS_SCAN_SIGNATURE_REFRESH_SECONDS
+        return self._clamav_signature
+
+    def _result_signature(self, result: VirusScanResult) -> Optional[str]:
+        """검사 결과를 만든 엔진의 시그니처 (오류 결과는 캐시하지 않음)"""
+        if result.error_message or not result.file_hash:
+            return None
+        if result.engine == "clamav":
+            return self._clamav_signature
+        if result.engine == "heuristic":
+            return HEURISTIC_SIGNATURE
+        return None
+
+    @staticmethod
+    def _to_verdict(result: VirusScanResult) -> Dict[str, Any]:
+        return {"is_infected": result.is_infected, "virus_name": result.virus_name, "engine": result.engine}
+
+    @staticmethod
+    def _from_verdict(file_path: str, file_hash: str, verdict: Dict[str, Any], start_time: float) -> VirusScanResult:
+        elapsed = time.monotonic() - start_time
+        cache_hit_latency.observe(elapsed)
+        return VirusScanResult(
+            file_path=file_path,
+            is_infected=verdict["is_infected"],
+            virus_name=verdict.get("virus_name"),
+            engine=verdict["engine"],
+            file_hash=file_hash,
+            scan_time=elapsed
+        )
+
+    async def scan_file_async(self, file_path: str, file_hash: Optional[str] = None) -> VirusScanResult:
+        """
+        파일 바이러스 검사 수행 (워커별 캐시 + Redis 사용)
+        
+        해시를 모르면 캐시를 조회하지 않고 검사하면서 해시를 계산합니다. (파일을 한 번만 읽음)
         
         Args:
             file_path: 검사할 파일 경로
+            file_hash: 이미 알고 있는 파일 SHA-256 (캐시 적중 시 파일을 읽지 않음)
             
         Returns:
             VirusScanResult: 검사 결과
         """
-        start_time = time.time()
-        
-        if not os.path.exists(file_path):
+        loop = asyncio.get_running_loop()
+        start_time = time.monotonic()
+        if not await loop.run_in_executor(self._executor, os.path.exists, file_path):
             return VirusScanResult(
                 file_path=file_path,
                 error_message="파일이 존재하지 않습니다",
                 engine="error",
-                scan_time=time.time() - start_time
+                scan_time=time.monotonic() - start_time
             )
         
-        # 파일 해시 계산
-        file_hash = self._calculate_file_hash(file_path)
+        signature = await self.engine_signature()
+        if signature and file_hash:
+            verdict = await self.verdict_cache.get(signature, file_hash)
+            if verdict is not None:
+                return self._from_verdict(file_path, file_hash, verdict, start_time)
         
-        # ClamAV 검사 시도
-        if self._clamav_available and self._clamav_client:
-            try:
-                result = self._scan_with_clamav(file_path)
-                result.file_hash = file_hash
-                result.scan_time = time.time() - start_time
+        result = await self._scan_uncached(file_path, file_hash)
+        result_signature = self._result_signature(result)
+        if result_signature:
+            await self.verdict_cache.set(result_signature, result.file_hash, self._to_verdict(result))
+        return result
+
+    async def _scan_uncached(self, file_path: str, file_hash: Optional[str]) -> VirusScanResult:
+        """검사 엔진으로 파일을 검사합니다. (ClamAV -> 휴리스틱 폴백)"""
+        start_time = time.monotonic()
+        try:
+            # ClamAV 검사 시도
+            if await self._clamav_ready():
+                try:
+                    result = await self._scan_with_clamav(file_path)
+                    result.scan_time = time.monotonic() - start_time
+                    return result
+                except ClamdError as e:
+                    if isinstance(e, ClamdSizeLimitError):
+                        logger.warning(f"⚠️ ClamAV 검사 크기 제한 초과 - 파일: {file_path}, {str(e)}")
+                    else:
+                        logger.error(f"❌ ClamAV 검사 실패: {str(e)}")
+                    self._clamav_failed(e)
+                    if not self.enable_fallback:
+                        return VirusScanResult(
+                            file_path=file_path,
+                            error_message=f"ClamAV 검사 실패: {str(e)}",
+                            engine="clamav_error",
+                            file_hash=file_hash,
+                            scan_time=time.monotonic() - start_time
+                        )
+            
+            # 휴리스틱 검사 (폴백) - 해시도 함께 계산
+            if self.enable_fallback:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._executor, self._scan_with_heuristic, file_path)
+                result.file_hash = result.file_hash or file_hash
+                result.scan_time = time.monotonic() - start_time
                 return result
-            except Exception as e:
-                logger.error(f"❌ ClamAV 검사 실패: {str(e)}")
-                if not self.enable_fallback:
-                    return VirusScanResult(
-                        file_path=file_path,
-                        error_message=f"ClamAV 검사 실패: {str(e)}",
-                        engine="clamav_error",
-                        file_hash=file_hash,
-                        scan_time=time.time() - start_time
-                    )
-        
-        # 휴리스틱 검사 (폴백)
-        if self.enable_fallback:
-            result = self._scan_with_heuristic(file_path)
-            result.file_hash = file_hash
-            result.scan_time = time.time() - start_time
-            return result
-        
+            
+            return VirusScanResult(
+                file_path=file_path,
+                error_message="바이러스 검사 엔진을 사용할 수 없습니다",
+                engine="unavailable",
+                file_hash=file_hash,
+                scan_time=time.monotonic() - start_time
+            )
+        finally:
+            scan_latency.observe(time.monotonic() - start_time)
+    
+    async def _scan_with_clamav(self, file_path: str) -> VirusScanResult:
+        """clamd INSTREAM 으로 파일 검사 (clamd 와 파일시스템을 공유하지 않아도 됨, 해시도 함께 계산)"""
+        scan_result, file_hash = await self.clamd_pools.get_pool().scan_file(file_path)
         return VirusScanResult(
             file_path=file_path,
-            error_message="바이러스 검사 엔진을 사용할 수 없습니다",
-            engine="unavailable",
-            file_hash=file_hash,
-            scan_time=time.time() - start_time
+            is_infected=scan_result.infected,
+            virus_name=scan_result.virus_name,
+            engine="clamav",
+            file_hash=file_hash
         )
     
-    def _scan_with_clamav(self, file_path: str) -> VirusScanResult:
-        """ClamAV를 사용한 파일 검사"""
+    async def open_upload_scan(self) -> Optional[UploadScan]:
+        """
+        업로드 중인 첨부파일의 스트리밍 검사를 시작합니다.
+        
+        Returns:
+            UploadScan (clamd 를 사용할 수 없으면 None - 이후 검사 요청 시 검사)
+        """
+        signature = await self.engine_signature()
+        if not signature or signature == HEURISTIC_SIGNATURE:
+            return None
         try:
-            scan_result = self._clamav_client.scan_file(file_path)
-            
-            if scan_result is None:
-                # 깨끗한 파일
-                return VirusScanResult(
-                    file_path=file_path,
-                    is_infected=False,
-                    engine="clamav"
-                )
-            else:
-                # 바이러스 발견
-                virus_name = scan_result.get(file_path, "Unknown virus")
-                if isinstance(virus_name, tuple):
-                    virus_name = virus_name[1] if len(virus_name) > 1 else virus_name[0]
-                
-                return VirusScanResult(
-                    file_path=file_path,
-                    is_infected=True,
-                    virus_name=virus_name,
-                    engine="clamav"
-                )
-                
-        except Exception as e:
-            raise Exception(f"ClamAV 검사 중 오류: {str(e)}")
+            stream = await self.clamd_pools.get_pool().open_stream()
+        except ClamdError as e:
+            logger.warning(f"⚠️ 업로드 스트리밍 검사 시작 실패: {str(e)}")
+            self._clamav_failed(e)
+            return None
+        return UploadScan(self, stream, signature)
     
     def _scan_with_heuristic(self, file_path: str) -> VirusScanResult:
-        """휴리스틱 바이러스 검사 (EICAR 테스트 패턴 탐지)"""
+        """휴리스틱 바이러스 검사 (EICAR 테스트 패턴 탐지) - 청크 단위로 한 번 읽으며 해시도 계산"""
         try:
+            digest = hashlib.sha256()
+            eicar_found = False
+            suspicious_found = set()
+            tail = b""
             with open(file_path, "rb") as f:
-                content = f.read()
+                while chunk := f.read(settings.ATTACHMENT_UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    if eicar_found:
+                        continue
+                    # 이전 청크 끝부분을 붙여 경계에 걸친 패턴도 탐지
+                    window = tail + chunk
+                    if any(pattern in window for pattern in EICAR_PATTERNS):
+                        eicar_found = True
+                        continue
+                    suspicious_found.update(pattern for pattern in SUSPICIOUS_PATTERNS if pattern in window)
+                    tail = window[-_PATTERN_OVERLAP:]
+            file_hash = digest.hexdigest()
             
             # EICAR 테스트 패턴 탐지
-            eicar_patterns = [
-                b"X5O!P%@AP[4\PZX54(P^)7CC)7$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*",
-                b"EICAR-STANDARD-ANTIVIRUS-TEST-FILE"
-            ]
-            
-            for pattern in eicar_patterns:
-                if pattern in content:
-                    return VirusScanResult(
-                        file_path=file_path,
-                        is_infected=True,
-                        virus_name="EICAR-Test-File",
-                        engine="heuristic"
-                    )
+            if eicar_found:
+                return VirusScanResult(
+                    file_path=file_path,
+                    is_infected=True,
+                    virus_name="EICAR-Test-File",
+                    engine="heuristic",
+                    file_hash=file_hash
+                )
             
             # 추가 휴리스틱 검사 (의심스러운 패턴)
-            suspicious_patterns = [
-                b"CreateRemoteThread",
-                b"VirtualAllocEx",
-                b"WriteProcessMemory",
-                b"SetWindowsHookEx"
-            ]
-            
-            suspicious_count = sum(1 for pattern in suspicious_patterns if pattern in content)
-            if suspicious_count >= 2:
+            if len(suspicious_found) >= 2:
                 return VirusScanResult(
                     file_path=file_path,
                     is_infected=True,
                     virus_name="Heuristic.Suspicious.Behavior",
-                    engine="heuristic"
+                    engine="heuristic",
+                    file_hash=file_hash
                 )
             
             return VirusScanResult(
                 file_path=file_path,
                 is_infected=False,
-                engine="heuristic"
+                engine="heuristic",
+                file_hash=file_hash
             )
             
         except Exception as e:
@@ -268,73 +569,145 @@ class VirusScanService:
             )
     
     def _calculate_file_hash(self, file_path: str) -> str:
-        """파일의 SHA256 해시 계산"""
+        """파일의 SHA256 해시 계산 (청크 단위)"""
         try:
+            digest = hashlib.sha256()
             with open(file_path, "rb") as f:
-                return hashlib.sha256(f.read()).hexdigest()
+                while chunk := f.read(settings.ATTACHMENT_UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+            return digest.hexdigest()
         except Exception:
             return ""
     
+    def _run_sync(self, coro):
+        """이벤트 루프 밖(스크립트 등)에서 비동기 검사를 실행합니다."""
+        async def run():
+            try:
+                return await coro
+            finally:
+                await self.clamd_pools.close_pool()
+                await self.verdict_cache.close()
+        return asyncio.run(run())
+    
+    def scan_file(self, file_path: str, file_hash: Optional[str] = None) -> VirusScanResult:
+        """
+        파일 바이러스 검사 수행 (동기 - 이벤트 루프 밖에서만 사용)
+        
+        Args:
+            file_path: 검사할 파일 경로
+            file_hash: 이미 알고 있는 파일 SHA-256
+            
+        Returns:
+            VirusScanResult: 검사 결과
+        """
+        return self._run_sync(self.scan_file_async(file_path, file_hash))
+    
     def scan_multiple_files(self, file_paths: List[str]) -> List[VirusScanResult]:
         """
-        여러 파일 일괄 검사
+        여러 파일 일괄 검사 (동기 - 이벤트 루프 밖에서만 사용, 병렬 실행)
         
         Args:
             file_paths: 검사할 파일 경로 목록
             
         Returns:
-            List[VirusScanResult]: 검사 결과 목록
+            List[VirusScanResult]: 검사 결과 목록 (입력 순서)
+        """
+        return self._run_sync(self.scan_files([(file_path, None) for file_path in file_paths]))
+    
+    async def scan_files(self, files: Sequence[Tuple[str, Optional[str]]]) -> List[VirusScanResult]:
         """
-        results = []
-        for file_path in file_paths:
-            result = self.scan_file(file_path)
-            results.append(result)
+        여러 파일을 병렬로 검사합니다. (같은 해시의 파일은 한 번만 검사)
+        
+        동시 검사 수는 clamd 연결 풀과 휴리스틱 스레드 풀 크기로 제한됩니다.
+        
+        Args:
+            files: (파일 경로, 알고 있는 SHA-256 또는 None) 목록
             
-            # 감염된 파일 발견 시 로깅
-            if result.is_infected:
-                logger.warning(f"🦠 바이러스 발견 - 파일: {file_path}, 바이러스: {result.virus_name}")
+        Returns:
+            List[VirusScanResult]: 검사 결과 목록 (입력 순서)
+        """
+        inflight: Dict[str, asyncio.Future] = {}
+        
+        async def scan_one(file_path: str, file_hash: Optional[str]) -> VirusScanResult:
+            if not file_hash:
+                return await self.scan_file_async(file_path)
+            future = inflight.get(file_hash)
+            if future is None:
+                future = inflight[file_hash] = asyncio.ensure_future(self.scan_file_async(file_path, file_hash))
+            result = await future
+            if result.file_path == file_path:
+                return result
+            return VirusScanResult(
+                file_path=file_path,
+                is_infected=result.is_infected,
+                virus_name=result.virus_name,
+                engine=result.engine,
+                scan_time=result.scan_time,
+                file_hash=result.file_hash,
+                error_message=result.error_message
+            )
         
-        return results
+        results = await asyncio.gather(*(scan_one(file_path, file_hash) for file_path, file_hash in files))
+        for result in results:
+            if result.is_infected:
+                logger.warning(f"🦠 바이러스 발견 - 파일: {result.file_path}, 바이러스: {result.virus_name}")
+        return list(results)
     
-    def get_engine_info(self) -> Dict[str, Any]:
+    def get_scan_stats(self) -> Dict[str, Any]:
+        """검사 결과 캐시 적중률, 검사 지연 시간 히스토그램과 clamd 연결 풀 메트릭을 반환합니다."""
+        return {
+            "max_workers": self.max_workers,
+            "clamav_available": self._clamav_available,
+            "engine_signature": self._clamav_signature if self._clamav_available else HEURISTIC_SIGNATURE,
+            "cache": self.verdict_cache.stats(),
+            "latency": {
+                "scan": scan_latency.stats(),
+                "cache_hit": cache_hit_latency.stats(),
+            },
+            "clamd_pools": self.clamd_pools.metrics(),
+        }
+    
+    async def get_engine_info(self) -> Dict[str, Any]:
         """바이러스 검사 엔진 정보 반환"""
+        pool = self.clamd_pools.get_pool()
         info = {
-            "clamav_available": self._clamav_available,
+            "clamav_available": await self._clamav_ready(),
             "fallback_enabled": self.enable_fallback,
             "host": self.clamav_host,
-            "port": self.clamav_port
+            "port": self.clamav_port,
+            "address": pool.address
         }
         
-        if self._clamav_available and self._clamav_client:
+        if info["clamav_available"]:
             try:
-                info["clamav_version"] = self._clamav_client.version()
-                info["database_version"] = self._clamav_client.stats()
-            except Exception as e:
+                info["clamav_version"] = await pool.version()
+            except ClamdError as e:
                 info["clamav_error"] = str(e)
         
         return info
     
-    def update_virus_database(self) -> bool:
+    async def update_virus_database(self) -> bool:
         """
         바이러스 데이터베이스 업데이트
         
         Returns:
             bool: 업데이트 성공 여부
         """
-        if not self._clamav_available:
+        if not await self._clamav_ready():
             logger.warning("⚠️ ClamAV가 사용 불가능하여 데이터베이스를 업데이트할 수 없습니다")
             return False
         
         try:
             # ClamAV 데이터베이스 업데이트는 일반적으로 freshclam 명령으로 수행
-            # 여기서는 연결 상태만 확인
-            if self._clamav_client.ping():
+            # 여기서는 연결 상태만 확인하고, 시그니처 버전을 다시 조회하도록 함
+            if await self.clamd_pools.get_pool().ping():
+                self._clamav_signature_expires_at = 0.0
                 logger.info("✅ ClamAV 데이터베이스 연결 확인 완료")
                 return True
             else:
                 logger.error("❌ ClamAV 데이터베이스 연결 실패")
                 return False
-        except Exception as e:
+        except ClamdError as e:
             logger.error(f"❌ ClamAV 데이터베이스 업데이트 확인 실패: {str(e)}")
             return False
 
@@ -0,0 +1,295 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+
+from ..config import settings
+from ..database.user import get_db_session
+from ..model.organization_model import ActivityRollupCheckpoint, ActivityRollupGap
+
+logger = logging.getLogger(__name__)
+
+# 원본 로그별 이벤트 조회 (id 범위 내 행을 org_id, created_at, action, user_uuid 로 정규화)
+# 로그인 로그에는 조직이 없으므로 사용자 UUID → 사용자 ID → 이메일 순으로 조직을 찾고, 찾지 못한 행은 제외합니다.
+ACTIVITY_SOURCES: Dict[str, Tuple[str, str]] = {
+    "mail": (
+        "mail_logs",
+        """
+        SELECT l.id, l.org_id, l.created_at, LOWER(l.action) AS action, l.user_uuid
+        FROM mail_logs l
+        WHERE l.id > :low AND l.id <= :high
+        """,
+    ),
+    "login": (
+        "login_logs",
+        """
+        SELECT l.id,
+               COALESCE(
+                   (SELECT u.org_id FROM users u WHERE u.user_uuid = l.user_uuid),
+                   (SELECT u.org_id FROM users u WHERE u.user_id = l.user_id),
+                   (SELECT MIN(u.org_id) FROM users u WHERE u.email = l.user_id)
+               ) AS org_id,
+               l.created_at,
+               LOWER(l.login_status) AS action,
+               CASE WHEN l.login_status = 'success' THEN l.user_uuid END AS user_uuid
+        FROM login_logs l
+        WHERE l.id > :low AND l.id <= :high
+        """,
+    ),
+}
+
+
+def _bucket_expressions(db: Session) -> Tuple[str, str]:
+    """created_at 을 UTC 시간/일 구간으로 자르는 SQL 식을 반환합니다."""
+    if db.get_bind().dialect.name == "postgresql":
+        return (
+            "date_trunc('hour', e.created_at AT TIME ZONE 'UTC')",
+            "CAST(e.created_at AT TIME ZONE 'UTC' AS DATE)",
+        )
+    return "strftime('%Y-%m-%d %H:00:00', e.created_at)", "DATE(e.created_at)"
+
+
+def _get_checkpoint(db: Session, source: str) -> ActivityRollupCheckpoint:
+    """집계 진행 위치를 잠금과 함께 조회합니다. (없으면 0 으로 생성)"""
+    checkpoint = (
+        db.query(ActivityRollupCheckpoint)
+        .filter(ActivityRollupCheckpoint.source == source)
+        .with_for_update()
+        .first()
+    )
+    if checkpoint is None:
+        checkpoint = ActivityRollupCheckpoint(source=source, last_id=0)
+        db.add(checkpoint)
+        db.flush()
+    return checkpoint
+
+
+def _settled_high(db: Session, table: str, low: int, cutoff: datetime) -> int:
+    """
+    cutoff 이전에 생성되어 커밋이 끝났다고 볼 수 있는 연속된 마지막 ID 를 반환합니다.
+
+    cutoff 이후 생성된 첫 행 바로 앞까지만 집계하여 진행 중인 트랜잭션의 빈 ID 를 줄입니다.
+    그래도 더 늦게 커밋되는 행은 _record_gaps 로 기록한 빈 구간에서 반영됩니다.
+    """
+    first_recent = db.execute(
+        text(f"SELECT MIN(id) FROM {table} WHERE id > :low AND created_at > :cutoff"),
+        {"low": low, "cutoff": cutoff}
+    ).scalar()
+    if first_recent is not None:
+        return int(first_recent) - 1
+    return int(db.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar() or 0)
+
+
+def _missing_ranges(db: Session, table: str, low: int, high: int) -> List[Tuple[int, int]]:
+    """(low, high] 범위에서 행이 없는 ID 구간 [start, end] 목록을 반환합니다."""
+    params = {"low": low, "high": high}
+    first_id, last_id = db.execute(
+        text(f"SELECT MIN(id), MAX(id) FROM {table} WHERE id > :low AND id <= :high"),
+        params
+    ).one()
+    if first_id is None:
+        return [(low + 1, high)] if high > low else []
+
+    ranges = [(low + 1, int(first_id) - 1)] if first_id > low + 1 else []
+    ranges += [
+        (int(start), int(end)) for start, end in db.execute(
+            text(
+                f"""
+                SELECT id + 1, next_id - 1 FROM (
+                    SELECT id, LEAD(id) OVER (ORDER BY id) AS next_id
+                    FROM {table}
+                    WHERE id > :low AND id <= :high
+                ) t
+                WHERE next_id > id + 1
+                ORDER BY id
+                """
+            ),
+            params
+        )
+    ]
+    if last_id < high:
+        ranges.append((int(last_id) + 1, high))
+    return ranges
+
+
+def _record_gaps(db: Session, source: str, low: int, high: int, now: datetime) -> None:
+    """집계한 (low, high] 범위의 빈 ID 구간을 늦은 커밋 대기 구간으로 기록합니다."""
+    table, _ = ACTIVITY_SOURCES[source]
+    for start, end in _missing_ranges(db, table, low, high):
+        db.add(ActivityRollupGap(source=source, start_id=start, end_id=end, detected_at=now))
+
+
+def _as_utc(value: datetime) -> datetime:
+    """시간대 정보가 없는 값(SQLite)을 UTC 로 간주합니다."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _fold_late_commits(db: Session, source: str, now: datetime) -> int:
+    """
+    기록해 둔 빈 ID 구간에 늦게 커밋된 로그를 집계에 더하고 구간을 줄입니다.
+
+    빈 구간의 행은 아직 집계된 적이 없으므로 구간 전체를 그대로 집계하고, 여전히 비어 있는
+    부분만 남깁니다. ACTIVITY_ROLLUP_GAP_TIMEOUT_SECONDS 가 지난 구간은 롤백된 ID 로 보고 지웁니다.
+
+    Returns:
+        새로 반영한 로그 수
+    """
+    table, _ = ACTIVITY_SOURCES[source]
+    expires_before = now - timedelta(seconds=settings.ACTIVITY_ROLLUP_GAP_TIMEOUT_SECONDS)
+    folded = 0
+
+    gaps = (
+        db.query(ActivityRollupGap)
+        .filter(ActivityRollupGap.source == source)
+        .order_by(ActivityRollupGap.start_id)
+        .all()
+    )
+    for gap in gaps:
+        low, high = int(gap.start_id) - 1, int(gap.end_id)
+        missing = _missing_ranges(db, table, low, high)
+        if missing != [(gap.start_id, gap.end_id)]:
+            _fold_range(db, source, low, high)
+            folded += (high - low) - sum(end - start + 1 for start, end in missing)
+            db.delete(gap)
+            db.flush()
+            for start, end in missing:
+                db.add(ActivityRollupGap(source=source, start_id=start, end_id=end, detected_at=gap.detected_at))
+        elif _as_utc(gap.detected_at) < expires_before:
+            db.delete(gap)
+    db.flush()
+    return folded
+
+
+def _fold_range(db: Session, source: str, low: int, high: int) -> None:
+    """(low, high] 범위의 로그를 시간별/일별 집계와 사용자별 활동 일자에 더합니다."""
+    _, events_sql = ACTIVITY_SOURCES[source]
+    hour_expr, day_expr = _bucket_expressions(db)
+    params = {"source": source, "low": low, "high": high, "now": datetime.now(timezone.utc)}
+
+    db.execute(
+        text(
+            f"""
+            INSERT INTO organization_activity_hourly (org_id, hour_start, source, action, event_count, updated_at)
+            SELECT e.org_id, {hour_expr}, :source, e.action, COUNT(*), :now
+            FROM ({events_sql}) e
+            WHERE e.org_id IS NOT NULL
+            GROUP BY e.org_id, {hour_expr}, e.action
+            ON CONFLICT (org_id, hour_start, source, action)
+            DO UPDATE SET
+                event_count = organization_activity_hourly.event_count + excluded.event_count,
+                updated_at = excluded.updated_at
+            """
+        ),
+        params
+    )
+    db.execute(
+        text(
+            f"""
+            INSERT INTO organization_activity_daily (org_id, activity_date, source, action, event_count, updated_at)
+            SELECT e.org_id, {day_expr}, :source, e.action, COUNT(*), :now
+            FROM ({events_sql}) e
+            WHERE e.org_id IS NOT NULL
+            GROUP BY e.org_id, {day_expr}, e.action
+            ON CONFLICT (org_id, activity_date, source, action)
+            DO UPDATE SET
+                event_count = organization_activity_daily.event_count + excluded.event_count,
+                updated_at = excluded.updated_at
+            """
+        ),
+        params
+    )
+    db.execute(
+        text(
+            f"""
+            INSERT INTO organization_active_user_days (org_id, activity_date, user_uuid)
+            SELECT DISTINCT e.org_id, {day_expr}, e.user_uuid
+            FROM ({events_sql}) e
+            WHERE e.org_id IS NOT NULL AND e.user_uuid IS NOT NULL
+            ON CONFLICT (org_id, activity_date, user_uuid) DO NOTHING
+            """
+        ),
+        params
+    )
+
+    # 범위에 포함된 날짜의 일별 활성 사용자 수를 사용자별 활동 일자에서 다시 계산
+    first_day, last_day = db.execute(
+        text(f"SELECT MIN({day_expr}), MAX({day_expr}) FROM ({events_sql}) e"),
+        params
+    ).one()
+    if first_day is not None:
+        db.execute(
+            text(
+                """
+                INSERT INTO organization_activity_daily (org_id, activity_date, source, action, event_count, updated_at)
+                SELECT org_id, activity_date, 'user', 'active', COUNT(*), :now
+                FROM organization_active_user_days
+                WHERE activity_date >= :first_day AND activity_date <= :last_day
+                GROUP BY org_id, activity_date
+                ON CONFLICT (org_id, activity_date, source, action)
+                DO UPDATE SET
+                    event_count = excluded.event_count,
+                    updated_at = excluded.updated_at
+                """
+            ),
+            {"first_day": first_day, "last_day": last_day, "now": params["now"]}
+        )
+
+
+def fold_activity_logs(db: Session, source: str, now: Optional[datetime] = None,
+                       batch_size: Optional[int] = None) -> int:
+    """
+    진행 위치 이후에 쌓인 로그를 배치 단위로 집계 테이블에 반영하고 배치마다 커밋합니다.
+
+    집계와 진행 위치, 빈 ID 구간 갱신이 같은 트랜잭션에서 커밋되므로 중간에 실패해도 두 번 더해지지 않습니다.
+    더 큰 ID 보다 늦게 커밋된 로그는 진행 위치를 지난 뒤에도 빈 구간을 통해 반영됩니다.
+
+    Returns:
+        반영한 로그 수 (진행 위치가 이동한 양 + 늦게 커밋되어 반영한 로그 수)
+    """
+    table, _ = ACTIVITY_SOURCES[source]
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or settings.ACTIVITY_ROLLUP_BATCH_SIZE
+    cutoff = now - timedelta(seconds=settings.ACTIVITY_ROLLUP_SETTLE_SECONDS)
+
+    _get_checkpoint(db, source)  # 같은 원본 로그를 집계하는 다른 실행과 순서를 맞추기 위한 잠금
+    advanced = _fold_late_commits(db, source, now)
+    db.commit()
+
+    while True:
+        checkpoint = _get_checkpoint(db, source)
+        low = int(checkpoint.last_id or 0)
+        high = min(_settled_high(db, table, low, cutoff), low + batch_size)
+        if high <= low:
+            db.commit()
+            return advanced
+
+        _fold_range(db, source, low, high)
+        _record_gaps(db, source, low, high, now)
+        checkpoint.last_id = high
+        db.commit()
+        advanced += high - low
+
+
+def rollup_activity_logs() -> None:
+    """
+    메일 로그와 로그인 로그를 조직별 시간별/일별 활동 집계에 주기적으로 반영합니다.
+
+    모니터링 대시보드, 사용량 통계, 감사 요약은 원본 로그 대신 이 집계를 조회합니다.
+    """
+    try:
+        with get_db_session() as db:  # type: Session
+            result = {source: fold_activity_logs(db, source) for source in ACTIVITY_SOURCES}
+
+        if any(result.values()):
+            logger.info(f"📊 활동 로그 집계 완료 - 메일 로그: {result['mail']}, 로그인 로그: {result['login']}")
+
+    except Exception as e:
+        logger.error(f"❌ 활동 로그 집계 작업 실패: {str(e)}")
+        logger.exception(e)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rollup_activity_logs()
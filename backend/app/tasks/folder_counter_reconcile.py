@@ -0,0 +1,34 @@
+import logging
+
+from ..database.user import get_db_session
+from ..service.folder_counter_service import reconcile_folder_counters
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_folder_counter_table() -> None:
+    """
+    매일 새벽 폴더 카운터(folder_counters)를 mail_in_folders 기준으로 보정합니다.
+
+    폴더 카운터는 메일 수신/이동/삭제와 같은 트랜잭션에서 증감되지만,
+    직접 실행한 SQL 이나 과거 데이터로 어긋난 값이 있으면 실제 값으로 맞춥니다.
+    """
+    try:
+        logger.info("🔧 폴더 카운터 보정 작업 시작")
+
+        with get_db_session() as db:
+            result = reconcile_folder_counters(db)
+
+        logger.info(
+            f"✅ 폴더 카운터 보정 완료 - 검사: {result['checked']}개, "
+            f"보정: {result['corrected']}개, 고아 카운터 삭제: {result['orphaned']}개"
+        )
+
+    except Exception as e:
+        logger.error(f"❌ 폴더 카운터 보정 작업 실패: {str(e)}")
+        logger.exception(e)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    reconcile_folder_counter_table()
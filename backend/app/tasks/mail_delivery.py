@@ -0,0 +1,366 @@
+"""
+메일 발송 워커
+
+큐(app.service.mail_queue_service)에 등록된 queued 메일을 SMTP로 발송합니다.
+- 발송 전: queued → sending 으로 원자적으로 선점 (같은 메일을 두 워커가 동시에 보내지 않음)
+- 성공: Mail.status = sent, sent_at 기록, MailLog SEND
+  (SMTP 수락 직후 별도의 짧은 트랜잭션으로 기록하고, 기록이 실패하면 작업에 delivered 표시를 남겨
+  재시도에서는 다시 발송하지 않고 기록만 수행)
+- 실패: 지수 백오프로 재시도 (MailLog SEND_RETRY), 최대 시도 초과 시 failed (MailLog SEND_FAILED)
+
+실행:
+    python -m app.tasks.mail_delivery --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import socket
+import uuid
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database.user import SessionLocal
+from ..model.mail_model import Mail, MailAttachment, MailLog, MailRecipient, MailUser
+from ..schemas.mail_schema import MailStatus
+from ..service.mail_queue_service import MailJob, get_mail_queue, retry_delay_seconds
+from ..service.usage_counter_service import usage_counter
+
+logger = logging.getLogger(__name__)
+
+# (db, mail, sender, recipient_emails, attachments) -> 발송 결과 딕셔너리
+DeliverFunc = Callable[[Session, Mail, MailUser, list, list], Awaitable[Dict[str, Any]]]
+
+
+async def deliver_via_smtp(
+    db: Session,
+    mail: Mail,
+    sender: MailUser,
+    recipient_emails: list,
+    attachments: list
+) -> Dict[str, Any]:
+    """
+    MailService.send_email_smtp로 메일을 발송합니다.
+
+    사용량 UPSERT와 임계값 알림은 send_email_smtp 내부에서 함께 처리됩니다.
+    MIME 원문은 첫 시도에서 한 번만 작성되어 저장되고 재시도에서는 그대로 재사용됩니다.
+    """
+    from ..service.mail_service import MailService
+
+    return await MailService(db).send_email_smtp(
+        sender_email=sender.email,
+        recipient_emails=recipient_emails,
+        subject=mail.subject or "(제목 없음)",
+        body_text=mail.body_text or "",
+        body_html=mail.body_html,
+        org_id=mail.org_id,
+        attachments=attachments or None,
+        mail=mail
+    )
+
+
+class MailClaimedError(Exception):
+    """다른 워커가 sending 으로 선점하여 발송 중인 메일"""
+
+
+class MailDeliveryWorker:
+    """메일 발송 워커"""
+
+    def __init__(
+        self,
+        queue=None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        deliver: DeliverFunc = deliver_via_smtp,
+        worker_id: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ):
+        """
+        메일 발송 워커 초기화
+
+        Args:
+            queue: 메일 큐 (생략 시 전역 큐)
+            session_factory: DB 세션 팩토리
+            deliver: 실제 발송 함수
+            worker_id: 워커 ID (생략 시 호스트명 기반 생성)
+            max_attempts: 최대 시도 횟수 (생략 시 설정값)
+        """
+        self.queue = queue or get_mail_queue()
+        self.session_factory = session_factory
+        self.deliver = deliver
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.max_attempts = max_attempts or settings.MAIL_QUEUE_MAX_ATTEMPTS
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """현재 작업을 마친 뒤 종료하도록 요청합니다."""
+        self._stopping.set()
+
+    async def run(self):
+        """종료 요청이 있을 때까지 큐를 처리합니다."""
+        logger.info(f"📮 메일 발송 워커 시작 - ID: {self.worker_id}")
+        await self.queue.heartbeat(self.worker_id)
+        await self.queue.recover_orphaned()
+        try:
+            while not self._stopping.is_set():
+                await self.queue.heartbeat(self.worker_id)
+                await self.queue.promote_due()
+                await self.process_one(timeout=settings.MAIL_QUEUE_POLL_SECONDS)
+        finally:
+            await self.queue.unregister(self.worker_id)
+            logger.info(f"🛑 메일 발송 워커 종료 - ID: {self.worker_id}")
+
+    async def process_one(self, timeout: float = 1.0) -> Optional[bool]:
+        """
+        작업 하나를 꺼내 처리합니다.
+
+        Returns:
+            True: 발송 성공, False: 실패(재시도 또는 최종 실패), None: 처리할 작업 없음
+        """
+        job = await self.queue.dequeue(self.worker_id, timeout=timeout)
+        if job is None:
+            return None
+
+        # 발송이 하트비트 TTL 보다 오래 걸려도 다른 워커가 작업을 복구하지 않도록 생존 신호 유지
+        keep_alive = asyncio.create_task(self._keep_alive())
+        try:
+            delivered = await self._deliver_job(job)
+        except MailClaimedError:
+            # 다른 워커가 발송 중: 선점이 풀릴 즈음 다시 확인 (발송 완료 시 그때 폐기)
+            await self.queue.retry(self.worker_id, job, settings.MAIL_QUEUE_SENDING_LEASE_SECONDS)
+            return False
+        except Exception as e:
+            logger.error(f"❌ 메일 발송 작업 오류 - 메일: {job.mail_uuid}, 시도: {job.attempt + 1}, 오류: {str(e)}")
+            await self._handle_failure(job, str(e))
+            return False
+        finally:
+            keep_alive.cancel()
+            with suppress(asyncio.CancelledError):
+                await keep_alive
+
+        await self.queue.ack(self.worker_id, job)
+        return delivered
+
+    async def _keep_alive(self):
+        """작업 처리 중 하트비트 TTL 의 1/3 간격으로 생존 신호를 갱신합니다."""
+        interval = settings.MAIL_QUEUE_HEARTBEAT_TTL_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.heartbeat(self.worker_id)
+            except Exception as e:
+                logger.warning(f"⚠️ 메일 발송 워커 하트비트 갱신 실패 - ID: {self.worker_id}, 오류: {str(e)}")
+
+    def _claim(self, db: Session, job: MailJob) -> bool:
+        """
+        queued 메일을 sending 으로 바꿔 선점합니다. (UPDATE 한 번으로 검사와 변경을 함께 수행)
+
+        중단된 워커가 sending 으로 남긴 메일은 MAIL_QUEUE_SENDING_LEASE_SECONDS 가 지나면 다시 선점할 수 있습니다.
+        """
+        now = datetime.now(timezone.utc)
+        lease_expired_before = now - timedelta(seconds=settings.MAIL_QUEUE_SENDING_LEASE_SECONDS)
+        claimed = db.query(Mail).filter(
+            Mail.mail_uuid == job.mail_uuid,
+            Mail.org_id == job.org_id,
+            or_(
+                Mail.status == MailStatus.QUEUED.value,
+                and_(Mail.status == MailStatus.SENDING.value, Mail.updated_at < lease_expired_before)
+            )
+        ).update({Mail.status: MailStatus.SENDING.value, Mail.updated_at: now}, synchronize_session=False)
+        db.commit()
+        return claimed == 1
+
+    async def _deliver_job(self, job: MailJob) -> bool:
+        """메일을 발송하고 상태를 갱신합니다. 발송 실패 시 예외를 발생시킵니다."""
+        if job.delivered:
+            # 이전 시도에서 SMTP 가 이미 수락: 다시 보내지 않고 sent 상태만 기록
+            return await self._mark_sent(job)
+
+        db = self.session_factory()
+        try:
+            claimed = self._claim(db, job)
+            mail = db.query(Mail).filter(
+                Mail.mail_uuid == job.mail_uuid,
+                Mail.org_id == job.org_id
+            ).first()
+            if not mail:
+                logger.warning(f"⚠️ 발송 대상 메일 없음 - 작업 폐기: {job.mail_uuid}")
+                return False
+            if not claimed:
+                if mail.status == MailStatus.SENDING.value:
+                    raise MailClaimedError(job.mail_uuid)
+                # 중복 등록/복구된 작업: 이미 처리된 메일은 다시 보내지 않음
+                logger.info(f"ℹ️ 이미 처리된 메일 - 상태: {mail.status}, 메일: {job.mail_uuid}")
+                return mail.status == MailStatus.SENT.value
+
+            sender = db.query(MailUser).filter(MailUser.user_uuid == mail.sender_uuid).first()
+            if not sender:
+                raise RuntimeError("발신자 정보를 찾을 수 없습니다")
+
+            recipient_emails = [
+                email for (email,) in db.query(MailRecipient.recipient_email).filter(
+                    MailRecipient.mail_uuid == mail.mail_uuid
+                ).all()
+            ]
+            attachments = [
+                {
+                    "filename": attachment.filename,
+                    "file_path": attachment.file_path,
+                    "file_size": attachment.file_size,
+                    "content_type": attachment.content_type
+                }
+                for attachment in db.query(MailAttachment).filter(MailAttachment.mail_uuid == mail.mail_uuid).all()
+                if attachment.file_path
+            ]
+
+            result = await self.deliver(db, mail, sender, recipient_emails, attachments)
+            if not result.get("success", False):
+                raise RuntimeError(result.get("error") or "알 수 없는 SMTP 오류")
+            # 이후 기록이 실패해도 재시도에서 다시 발송하지 않도록 먼저 표시
+            job.delivered = True
+            # 발송 함수가 남긴 변경(원문 경로 등)은 sent 기록과 분리하여 먼저 반영
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        return await self._mark_sent(job)
+
+    async def _mark_sent(self, job: MailJob) -> bool:
+        """
+        SMTP 가 수락한 메일을 sent 로 기록합니다.
+
+        짧은 트랜잭션으로 상태와 MailLog SEND 만 기록하며, 실패하면 MAIL_QUEUE_MARK_SENT_ATTEMPTS 번까지
+        기록만 다시 시도합니다. 모두 실패하면 예외를 발생시키고, 작업은 delivered 표시와 함께 재시도로 등록됩니다.
+        """
+        for attempt in range(settings.MAIL_QUEUE_MARK_SENT_ATTEMPTS):
+            db = self.session_factory()
+            try:
+                mail = db.query(Mail).filter(
+                    Mail.mail_uuid == job.mail_uuid,
+                    Mail.org_id == job.org_id
+                ).first()
+                if not mail:
+                    logger.warning(f"⚠️ 발송 완료 기록 대상 메일 없음 - 작업 폐기: {job.mail_uuid}")
+                    return False
+                if mail.status == MailStatus.SENT.value:
+                    return True
+                recipient_count = db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).count()
+                now = datetime.now(timezone.utc)
+                mail.status = MailStatus.SENT.value
+                mail.sent_at = now
+                mail.updated_at = now
+                db.add(MailLog(
+                    mail_uuid=mail.mail_uuid,
+                    user_uuid=mail.sender_uuid,
+                    org_id=mail.org_id,
+                    action="SEND",
+                    details=f"메일 발송 완료 - 수신자: {recipient_count}명, 시도: {job.attempt + 1}회"
+                ))
+                db.commit()
+                logger.info(f"✅ 큐 메일 발송 성공 - 조직: {job.org_id}, 메일: {job.mail_uuid}, 시도: {job.attempt + 1}회")
+                return True
+            except Exception as e:
+                db.rollback()
+                if attempt + 1 >= settings.MAIL_QUEUE_MARK_SENT_ATTEMPTS:
+                    raise
+                logger.warning(f"⚠️ 발송 완료 상태 기록 실패 - 재시도: {job.mail_uuid}, 오류: {str(e)}")
+                await asyncio.sleep(0.1 * (2 ** attempt))
+            finally:
+                db.close()
+        return False
+
+    async def _handle_failure(self, job: MailJob, error: str):
+        """실패한 작업을 재시도로 등록하거나 최종 실패 처리합니다."""
+        job.attempt += 1
+        job.last_error = error
+        final = job.attempt >= self.max_attempts
+
+        if job.delivered:
+            # SMTP 는 이미 수락: 메일 상태를 되돌리지 않고 sent 기록만 다시 시도 (사용량도 그대로 둠)
+            if final:
+                await self.queue.dead_letter(self.worker_id, job)
+                logger.error(f"❌ 발송 완료 상태 기록 최종 실패 - 메일: {job.mail_uuid}, 시도: {job.attempt}회")
+            else:
+                await self.queue.retry(self.worker_id, job, retry_delay_seconds(job.attempt))
+            return
+
+        db = self.session_factory()
+        try:
+            mail = db.query(Mail).filter(
+                Mail.mail_uuid == job.mail_uuid,
+                Mail.org_id == job.org_id
+            ).first()
+            if mail:
+                if final:
+                    mail.status = MailStatus.FAILED.value
+                    details = f"SMTP 발송 최종 실패 ({job.attempt}회 시도): {error}"
+                else:
+                    # 재시도 작업이 다시 선점할 수 있도록 queued 로 되돌림
+                    if mail.status == MailStatus.SENDING.value:
+                        mail.status = MailStatus.QUEUED.value
+                    details = f"SMTP 발송 실패 ({job.attempt}회), {retry_delay_seconds(job.attempt):.0f}초 후 재시도: {error}"
+                db.add(MailLog(
+                    mail_uuid=mail.mail_uuid,
+                    user_uuid=mail.sender_uuid,
+                    org_id=mail.org_id,
+                    action="SEND_FAILED" if final else "SEND_RETRY",
+                    details=details
+                ))
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ 발송 실패 상태 기록 오류 - 메일: {job.mail_uuid}, 오류: {str(e)}")
+        finally:
+            db.close()
+
+        if final:
+            await self.queue.dead_letter(self.worker_id, job)
+            # 보내지 못한 메일은 일일 발송 제한 예약을 돌려줌
+            await usage_counter.release(job.org_id, job.mail_uuid)
+            logger.error(f"❌ 메일 발송 최종 실패 - 메일: {job.mail_uuid}, 시도: {job.attempt}회")
+        else:
+            await self.queue.retry(self.worker_id, job, retry_delay_seconds(job.attempt))
+
+
+async def run_mail_workers(concurrency: int = 1, queue=None):
+    """
+    메일 발송 워커를 concurrency 개 실행합니다. (SIGINT/SIGTERM 시 정상 종료)
+
+    Args:
+        concurrency: 동시 실행 워커 수
+        queue: 메일 큐 (생략 시 전역 큐)
+    """
+    workers = [MailDeliveryWorker(queue=queue) for _ in range(concurrency)]
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, lambda: [worker.stop() for worker in workers])
+        except (NotImplementedError, RuntimeError):
+            # Windows 등 시그널 핸들러 미지원 환경
+            pass
+
+    await asyncio.gather(*(worker.run() for worker in workers))
+
+
+def main():
+    """워커 프로세스 진입점"""
+    parser = argparse.ArgumentParser(description="SkyBoot Mail 발송 워커")
+    parser.add_argument("--concurrency", type=int, default=settings.MAIL_QUEUE_WORKER_CONCURRENCY, help="워커 수")
+    args = parser.parse_args()
+
+    from ..logging_config import setup_logging
+    setup_logging()
+    asyncio.run(run_mail_workers(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
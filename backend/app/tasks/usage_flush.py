@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import List
+
+from ..database.user import get_db_session
+from ..service.usage_counter_service import UsageSnapshot, usage_counter, write_usage_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+def _write_snapshots(snapshots: List[UsageSnapshot]) -> None:
+    with get_db_session() as db:
+        write_usage_snapshots(db, snapshots)
+
+
+async def _write_snapshots_async(snapshots: List[UsageSnapshot]) -> None:
+    # 동기 DB 세션을 사용하므로 이벤트 루프를 막지 않도록 스레드에서 기록
+    await asyncio.to_thread(_write_snapshots, snapshots)
+
+
+async def flush_usage_counters() -> None:
+    """
+    변경된 Redis 사용량 카운터를 organization_usage 에 일괄 기록합니다.
+
+    메일 발송/수신 시에는 Redis 카운터만 증가시키고, 이 작업이 주기적으로
+    조직별 오늘 발송/수신 수를 한 번의 배치 UPSERT 로 기록합니다.
+    """
+    if not usage_counter.redis_available:
+        return
+    try:
+        flushed = await usage_counter.flush(_write_snapshots_async)
+        if flushed:
+            logger.info(f"📊 조직 사용량 카운터 기록 완료 - {flushed}개")
+    except Exception as e:
+        logger.error(f"❌ 조직 사용량 카운터 기록 실패: {str(e)}")
+
+
+async def reconcile_usage_counters() -> None:
+    """
+    오늘과 어제의 모든 사용량 카운터를 다시 기록합니다.
+
+    기록 도중 프로세스가 종료되어 dirty 집합에서 빠진 카운터도 organization_usage 에 반영되며,
+    기록은 절대값 기준이므로 여러 번 실행해도 결과가 같습니다.
+    """
+    if not usage_counter.redis_available:
+        return
+    try:
+        marked = await usage_counter.mark_all_dirty()
+        logger.info(f"🔧 조직 사용량 카운터 보정 - 재기록 대상: {marked}개")
+    except Exception as e:
+        logger.error(f"❌ 조직 사용량 카운터 보정 실패: {str(e)}")
+        return
+    await flush_usage_counters()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(reconcile_usage_counters())
@@ -1,6 +1,7 @@
 import logging
-from datetime import datetime, timezone
-from typing import List
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Tuple
 
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -9,68 +10,144 @@ from ..database.user import get_db_session
 
 logger = logging.getLogger(__name__)
 
+ROLLUP_PERIODS = ("week", "month")
+
+
+def period_bounds(period_type: str, day: date) -> Tuple[date, date]:
+    """day 가 속한 주(월요일 시작) 또는 월의 시작일과 종료일을 반환합니다."""
+    if period_type == "week":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    start = day.replace(day=1)
+    return start, start.replace(day=monthrange(day.year, day.month)[1])
+
+
+def _create_today_rows(db: Session, today: date, now: datetime) -> int:
+    """활성 조직 전체의 오늘 사용량 행을 한 번의 INSERT ... SELECT 로 생성합니다. (존재 시 무시)"""
+    result = db.execute(
+        text(
+            """
+            INSERT INTO organization_usage (
+                org_id, usage_date,
+                current_users, current_storage_gb,
+                emails_sent_today, emails_received_today,
+                total_emails_sent, total_emails_received,
+                created_at, updated_at
+            )
+            SELECT org_id, :usage_date,
+                   0, 0,
+                   0, 0,
+                   0, 0,
+                   :now, :now
+            FROM organizations
+            WHERE is_active = TRUE
+            ON CONFLICT (org_id, usage_date) DO NOTHING
+            """
+        ),
+        {'usage_date': today, 'now': now}
+    )
+    return result.rowcount or 0
+
+
+def _rollup_period(db: Session, period_type: str, period_start: date, period_end: date,
+                   through: date, now: datetime) -> int:
+    """
+    period_start ~ through 의 일일 사용량을 다시 합산하여 기간 집계를 교체합니다.
+
+    누적이 아니라 매번 기간 전체를 다시 계산하므로 같은 날 다시 실행해도 결과가 같고,
+    집계 이후 늦게 기록된 사용량(Redis 카운터 기록, 카운터 보정 작업)도 다음 실행에서 반영됩니다.
+    작업이 며칠 실행되지 않았어도 다음 실행에서 빠진 날이 함께 반영됩니다.
+    """
+    result = db.execute(
+        text(
+            """
+            INSERT INTO organization_usage_rollups (
+                org_id, period_type, period_start, period_end,
+                emails_sent, emails_received, user_days, days_counted,
+                peak_storage_gb, rolled_through,
+                created_at, updated_at
+            )
+            SELECT u.org_id, :period_type, :period_start, :period_end,
+                   SUM(COALESCE(u.emails_sent_today, 0)),
+                   SUM(COALESCE(u.emails_received_today, 0)),
+                   SUM(COALESCE(u.current_users, 0)),
+                   COUNT(*),
+                   MAX(COALESCE(u.current_storage_gb, 0)),
+                   :through,
+                   :now, :now
+            FROM organization_usage u
+            WHERE DATE(u.usage_date) >= :period_start
+              AND DATE(u.usage_date) <= :through
+            GROUP BY u.org_id
+            ON CONFLICT (org_id, period_type, period_start)
+            DO UPDATE SET
+                emails_sent = excluded.emails_sent,
+                emails_received = excluded.emails_received,
+                user_days = excluded.user_days,
+                days_counted = excluded.days_counted,
+                peak_storage_gb = excluded.peak_storage_gb,
+                rolled_through = excluded.rolled_through,
+                updated_at = excluded.updated_at
+            """
+        ),
+        {
+            'period_type': period_type,
+            'period_start': period_start,
+            'period_end': period_end,
+            'through': through,
+            'now': now,
+        }
+    )
+    return result.rowcount or 0
+
+
+def rollover_daily_usage(db: Session, today: date) -> Dict[str, int]:
+    """
+    오늘 사용량 행을 생성하고 어제까지의 사용량을 주간/월간 집계에 반영한 뒤 커밋합니다.
+
+    어제가 속한 기간과 그 직전 기간을 함께 다시 집계하여 기간 경계에서 실행이 누락된 날과
+    직전 기간 마지막 날 이후에 늦게 기록된 사용량도 반영합니다.
+    조직 수와 관계없이 기간별 한 문장으로 처리합니다.
+
+    Returns:
+        {"created": 생성된 오늘 행 수, "week": 갱신된 주간 집계 수, "month": 갱신된 월간 집계 수}
+    """
+    now = datetime.now(timezone.utc)
+    yesterday = today - timedelta(days=1)
+    result = {"created": _create_today_rows(db, today, now)}
+
+    for period_type in ROLLUP_PERIODS:
+        current_start, current_end = period_bounds(period_type, yesterday)
+        previous_start, previous_end = period_bounds(period_type, current_start - timedelta(days=1))
+        result[period_type] = (
+            _rollup_period(db, period_type, previous_start, previous_end, previous_end, now)
+            + _rollup_period(db, period_type, current_start, current_end, yesterday, now)
+        )
+
+    db.commit()
+    return result
+
 
 def reset_daily_email_usage() -> None:
     """
-    매일 자정에 조직별 일일 발송 수(`emails_sent_today`)를 0으로 초기화합니다.
+    매일 자정에 조직별 일일 발송 수(`emails_sent_today`)를 0으로 초기화하고 전날 사용량을 집계합니다.
 
-    조직별로 금일(`usage_date = today`) 레코드를 0 값으로 생성합니다.
-    이미 존재하면 변경하지 않습니다. (ON CONFLICT DO NOTHING)
+    활성 조직 전체의 금일(`usage_date = today`) 레코드를 0 값으로 생성하고 (이미 존재하면 변경하지 않음),
+    어제까지의 사용량으로 organization_usage_rollups 의 주간/월간 집계를 다시 계산합니다.
     """
     try:
         logger.info("🕛 일일 사용량 리셋 작업 시작")
 
         today = datetime.now(timezone.utc).date()
-        now = datetime.now(timezone.utc)
 
         with get_db_session() as db:  # type: Session
-            # 활성 조직 목록 조회
-            org_rows: List[tuple] = db.execute(
-                text("""
-                    SELECT org_id FROM organizations
-                    WHERE is_active = TRUE
-                """)
-            ).fetchall()
-
-            org_ids = [row[0] for row in org_rows]
-            logger.info(f"🏢 활성 조직 수: {len(org_ids)}")
-
-            if not org_ids:
-                logger.info("ℹ️ 활성 조직이 없어 리셋 작업을 건너뜁니다")
-                return
-
-            # 오늘 날짜 기준으로 기본 사용량 행을 삽입 (존재 시 무시)
-            upsert_sql = text(
-                """
-                INSERT INTO organization_usage (
-                    org_id, usage_date,
-                    current_users, current_storage_gb,
-                    emails_sent_today, emails_received_today,
-                    total_emails_sent, total_emails_received,
-                    created_at, updated_at
-                ) VALUES (
-                    :org_id, :usage_date,
-                    0, 0,
-                    0, 0,
-                    0, 0,
-                    :now, :now
-                )
-                ON CONFLICT (org_id, usage_date) DO NOTHING
-                """
-            )
-
-            inserted = 0
-            for org_id in org_ids:
-                db.execute(upsert_sql, {
-                    'org_id': org_id,
-                    'usage_date': today,
-                    'now': now
-                })
-                inserted += 1
+            result = rollover_daily_usage(db, today)
 
-            db.commit()
-            logger.info(f"✅ 일일 사용량 리셋 완료 - 생성된 레코드 시도: {inserted}")
+        logger.info(
+            f"✅ 일일 사용량 리셋 완료 - 생성된 레코드: {result['created']}, "
+            f"주간 집계: {result['week']}, 월간 집계: {result['month']}"
+        )
 
     except Exception as e:
         logger.error(f"❌ 일일 사용량 리셋 작업 실패: {str(e)}")
-        logger.exception(e)
\ No newline at end of file
+        logger.exception(e)
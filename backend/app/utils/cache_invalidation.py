@@ -0,0 +1,207 @@
+"""
+Redis pub/sub 기반 캐시 무효화 버스
+
+워커 프로세스마다 가진 로컬 캐시(app.utils.local_cache)를 함께 무효화합니다.
+- publish(): 로컬 핸들러를 즉시 실행하고 Redis 채널로 다른 워커에 알립니다.
+- publish_nowait(): 동기 코드(ORM 이벤트, 스레드풀 엔드포인트)용. 전파는 기다리지 않습니다.
+- start(): 채널을 구독하는 백그라운드 태스크를 시작합니다. (애플리케이션 lifespan)
+
+Redis를 사용할 수 없으면 로컬 무효화만 수행되며, 다른 워커는 TTL 만료로 갱신됩니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# 전파 실패 후 Redis 발행을 다시 시도하기까지의 시간 (초)
+BROADCAST_RETRY_SECONDS = 5.0
+
+# (payload) -> None
+InvalidationHandler = Callable[[Dict[str, Any]], None]
+
+
+class CacheInvalidationBus:
+    """캐시 무효화 메시지 버스"""
+
+    def __init__(self, redis_url: Optional[str] = None, channel: Optional[str] = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.channel = channel or settings.CACHE_INVALIDATION_CHANNEL
+        # 자신이 보낸 메시지는 이미 로컬에서 처리했으므로 구독 시 건너뜀
+        self.instance_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, List[InvalidationHandler]] = {}
+        self._client = None
+        self._client_loop_id: Optional[int] = None
+        self._sync_client = None
+        self._listener: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+        # 전파 실패 후 재시도 전까지 Redis 발행을 건너뜀 (요청 지연 방지)
+        self._broadcast_disabled_until = 0.0
+        self.published = 0
+        self.received = 0
+
+    def register(self, cache_name: str, handler: InvalidationHandler) -> None:
+        """캐시 이름에 대한 무효화 핸들러를 등록합니다."""
+        self._handlers.setdefault(cache_name, []).append(handler)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        """메시지를 캐시 이름에 등록된 핸들러에 전달합니다."""
+        for handler in self._handlers.get(message.get("cache"), []):
+            try:
+                handler(message.get("payload") or {})
+            except Exception as e:
+                logger.error(f"❌ 캐시 무효화 처리 오류 - 캐시: {message.get('cache')}, 오류: {str(e)}")
+
+    def _get_client(self):
+        """현재 이벤트 루프용 Redis 클라이언트를 반환합니다."""
+        loop_id = id(asyncio.get_running_loop())
+        if self._client is None or self._client_loop_id != loop_id:
+            from .metrics import InstrumentedAsyncRedis
+
+            self._client = InstrumentedAsyncRedis.from_url(
+                self.redis_url, decode_responses=True, socket_connect_timeout=1, socket_timeout=1
+            )
+            self._client_loop_id = loop_id
+        return self._client
+
+    def _message(self, cache_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """무효화 메시지를 만들고 로컬 핸들러를 실행합니다."""
+        message = {"cache": cache_name, "payload": payload, "origin": self.instance_id}
+        self._dispatch(message)
+        return message
+
+    def _broadcast_failed(self, cache_name: str, error: Exception) -> None:
+        """전파 실패를 기록하고 잠시 Redis 발행을 중단합니다."""
+        self._broadcast_disabled_until = time.monotonic() + BROADCAST_RETRY_SECONDS
+        logger.warning(f"⚠️ 캐시 무효화 전파 실패 (다른 워커는 TTL 만료로 갱신) - 캐시: {cache_name}, 오류: {str(error)}")
+
+    async def _broadcast(self, message: Dict[str, Any]) -> None:
+        """다른 워커에 무효화 메시지를 발행합니다."""
+        if time.monotonic() < self._broadcast_disabled_until:
+            return
+        try:
+            await self._get_client().publish(self.channel, json.dumps(message, ensure_ascii=False))
+            self.published += 1
+        except Exception as e:
+            self._broadcast_failed(message["cache"], e)
+
+    def _broadcast_sync(self, message: Dict[str, Any]) -> None:
+        """이벤트 루프 밖(스레드풀)에서 동기 Redis 클라이언트로 발행합니다."""
+        if time.monotonic() < self._broadcast_disabled_until:
+            return
+        try:
+            if self._sync_client is None:
+                from .metrics import InstrumentedRedis
+
+                self._sync_client = InstrumentedRedis.from_url(
+                    self.redis_url, decode_responses=True, socket_connect_timeout=1, socket_timeout=1
+                )
+            self._sync_client.publish(self.channel, json.dumps(message, ensure_ascii=False))
+            self.published += 1
+        except Exception as e:
+            self._broadcast_failed(message["cache"], e)
+
+    async def publish(self, cache_name: str, **payload: Any) -> None:
+        """
+        로컬 캐시를 무효화하고 다른 워커에 무효화 메시지를 보냅니다.
+
+        Args:
+            cache_name: 캐시 이름
+            **payload: 핸들러에 전달할 값 (예: org_id)
+        """
+        await self._broadcast(self._message(cache_name, payload))
+
+    def publish_nowait(self, cache_name: str, **payload: Any) -> None:
+        """
+        로컬 캐시를 즉시 무효화하고, 다른 워커로의 전파는 기다리지 않습니다.
+
+        이벤트 루프 안에서는 전파 태스크를 예약하고, 밖에서는 동기 클라이언트로 발행합니다.
+        """
+        message = self._message(cache_name, payload)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._broadcast_sync(message)
+            return
+        task = loop.create_task(self._broadcast(message))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def start(self) -> None:
+        """구독 태스크를 시작합니다."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+            logger.info(f"📡 캐시 무효화 구독 시작 - 채널: {self.channel}")
+
+    async def stop(self) -> None:
+        """구독 태스크를 종료하고 연결을 닫습니다."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+            self._client_loop_id = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    async def _listen(self) -> None:
+        """채널을 구독하고 다른 워커의 메시지를 처리합니다. 연결이 끊기면 재연결합니다."""
+        retry_delay = 1.0
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                retry_delay = 1.0
+                async for raw in pubsub.listen():
+                    if raw.get("type") != "message":
+                        continue
+                    try:
+                        message = json.loads(raw["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    if message.get("origin") == self.instance_id:
+                        continue
+                    self.received += 1
+                    self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ 캐시 무효화 구독 끊김 - {retry_delay:.0f}초 후 재연결: {str(e)}")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """버스 상태를 반환합니다."""
+        return {
+            "channel": self.channel,
+            "listening": self._listener is not None and not self._listener.done(),
+            "published": self.published,
+            "received": self.received,
+        }
+
+
+# 전역 캐시 무효화 버스
+cache_invalidation_bus = CacheInvalidationBus()
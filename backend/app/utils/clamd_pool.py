@@ -0,0 +1,551 @@
+"""
+비동기 clamd 연결 풀 (INSTREAM)
+
+pyclamd 의 scan_file(path) 는 clamd 가 같은 파일시스템을 봐야 하고, 호출마다 소켓을 열며 워커를 막습니다.
+clamd 연결을 IDSESSION 으로 유지하면서 파일 내용을 INSTREAM 으로 직접 보냅니다.
+
+- 동시 연결 수 제한 (세마포어, 대기도 타임아웃), 유휴 연결 재사용 (clamd IdleTimeout 보다 짧은 유휴 시간 초과 시 교체)
+- clamd StreamMaxLength 를 넘는 데이터는 보내기 전에 ClamdSizeLimitError (clamd 가 연결을 끊어 장애로 보이지 않도록)
+- 모든 소켓 읽기/쓰기에 연결별 타임아웃 (VIRUS_SCAN_TIMEOUT_SECONDS)
+- 재사용한 연결이 끊겨 있으면 새 연결로 1회 재시도 (다시 보낼 수 있는 요청만)
+- open_stream(): 업로드 중인 청크를 받는 즉시 clamd 로 보내는 스트리밍 검사
+- 풀 메트릭 (생성/재사용/재연결/실패/대기 시간/검사 수)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import aiofiles
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# INSTREAM 종료 표시 (길이 0 청크)
+_END_OF_STREAM = struct.pack("!L", 0)
+
+# 연결을 버리고 (재사용 연결이었다면) 새 연결로 재시도해야 하는 오류
+RECONNECT_ERRORS = (
+    ConnectionError,
+    asyncio.IncompleteReadError,
+)
+
+
+class ClamdError(Exception):
+    """clamd 오류 응답 (크기 제한 초과 등)"""
+
+
+class ClamdConnectionError(ClamdError):
+    """clamd 연결/통신 실패 (타임아웃 포함)"""
+
+
+class ClamdSizeLimitError(ClamdError):
+    """검사할 데이터가 clamd StreamMaxLength 를 넘음 (해당 검사만 실패, clamd 는 정상)"""
+
+
+@dataclass
+class ClamdScanResult:
+    """INSTREAM 검사 결과"""
+    infected: bool
+    virus_name: Optional[str]
+    reply: str
+
+
+def parse_scan_reply(reply: str) -> ClamdScanResult:
+    """
+    INSTREAM 응답을 해석합니다.
+
+    "stream: OK" -> 안전, "stream: <바이러스 이름> FOUND" -> 감염, 그 외(... ERROR 등) -> ClamdError
+    """
+    body = reply[len("stream: "):] if reply.startswith("stream: ") else reply
+    if body == "OK":
+        return ClamdScanResult(infected=False, virus_name=None, reply=reply)
+    if body.endswith(" FOUND"):
+        return ClamdScanResult(infected=True, virus_name=body[:-len(" FOUND")], reply=reply)
+    raise ClamdError(f"clamd 오류 응답: {reply}")
+
+
+@dataclass
+class _PooledConnection:
+    """풀에서 관리하는 clamd 세션 연결"""
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    created_at: float
+    last_used_at: float
+    next_request_id: int = 1
+    requests: int = 0
+
+
+class ClamdStream:
+    """
+    청크를 받는 즉시 clamd 로 보내는 INSTREAM 검사
+
+    ClamdConnectionPool.open_stream() 으로 만들며, finish() 또는 abort() 로 연결을 반납해야 합니다.
+    이미 보낸 청크는 다시 보낼 수 없으므로 실패 시 재시도하지 않습니다.
+    """
+
+    def __init__(self, pool: "ClamdConnectionPool", connection: _PooledConnection, request_id: int):
+        self._pool = pool
+        self._connection = connection
+        self._request_id = request_id
+        self._done = False
+        self.bytes_sent = 0
+
+    async def write(self, chunk: bytes) -> None:
+        """청크 하나를 보냅니다. (StreamMaxLength 를 넘으면 보내지 않고 검사를 중단)"""
+        if not chunk:
+            return
+        if self.bytes_sent + len(chunk) > self._pool.max_stream_bytes:
+            await self.abort()
+            raise self._pool._size_limit_error(self.bytes_sent + len(chunk))
+        try:
+            await self._pool._write(self._connection, struct.pack("!L", len(chunk)) + chunk)
+        except BaseException as e:
+            await self.abort()
+            raise self._pool._as_clamd_error(e) from e
+        self.bytes_sent += len(chunk)
+
+    async def finish(self) -> ClamdScanResult:
+        """스트림을 끝내고 검사 결과를 받습니다."""
+        try:
+            await self._pool._write(self._connection, _END_OF_STREAM)
+            reply = await self._pool._read_reply(self._connection, self._request_id)
+        except BaseException as e:
+            await self.abort()
+            raise self._pool._as_clamd_error(e) from e
+        self._done = True
+        self._pool._leave()
+        return self._pool._scan_result(self._pool._complete(self._connection, reply))
+
+    async def abort(self) -> None:
+        """검사를 중단하고 연결을 버립니다. (세션 상태를 알 수 없으므로 재사용하지 않음)"""
+        if self._done:
+            return
+        self._done = True
+        self._pool._discard(self._connection)
+        self._pool._leave()
+
+    async def __aenter__(self) -> "ClamdStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.abort()
+
+
+class ClamdConnectionPool:
+    """
+    단일 clamd 에 대한 연결 풀
+
+    동일한 이벤트 루프 안에서만 사용합니다. (ClamdPoolManager가 루프별로 풀을 관리)
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 3310,
+        unix_socket: Optional[str] = None,
+        max_connections: int = 4,
+        idle_timeout: float = 20.0,
+        timeout: float = 30.0,
+        chunk_size: Optional[int] = None,
+        max_stream_bytes: Optional[int] = None
+    ):
+        """
+        clamd 연결 풀 초기화
+
+        Args:
+            host: clamd 호스트 (unix_socket 이 없을 때)
+            port: clamd 포트
+            unix_socket: clamd Unix 소켓 경로 (있으면 TCP 대신 사용)
+            max_connections: 최대 동시 연결 수
+            idle_timeout: 유휴 연결 유지 시간 (초, clamd IdleTimeout 보다 짧게)
+            timeout: 연결/읽기/쓰기 타임아웃 (초)
+            chunk_size: 파일 검사 시 INSTREAM 청크 크기 (기본: ATTACHMENT_UPLOAD_CHUNK_SIZE)
+            max_stream_bytes: INSTREAM 으로 보낼 최대 크기 (기본: CLAMAV_STREAM_MAX_LENGTH_MB)
+        """
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.chunk_size = chunk_size or settings.ATTACHMENT_UPLOAD_CHUNK_SIZE
+        self.max_stream_bytes = max_stream_bytes or settings.CLAMAV_STREAM_MAX_LENGTH_MB * 1024 * 1024
+
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use = 0
+        self._closed = False
+
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "reconnects": 0,
+            "expired": 0,
+            "scans": 0,
+            "infected": 0,
+            "failures": 0,
+            "wait_count": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    @property
+    def address(self) -> str:
+        """clamd 주소 문자열"""
+        return self.unix_socket or f"{self.host}:{self.port}"
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    async def ping(self) -> bool:
+        """clamd 가 응답하는지 확인합니다."""
+        return await self._request(lambda connection: self._send_command(connection, "PING")) == "PONG"
+
+    async def version(self) -> str:
+        """clamd 엔진/시그니처 버전 문자열 (예: "ClamAV 1.0.1/26950/Tue Jun 13 07:23:53 2023")"""
+        return await self._request(lambda connection: self._send_command(connection, "VERSION"))
+
+    async def scan_bytes(self, data: bytes) -> ClamdScanResult:
+        """메모리의 데이터를 검사합니다."""
+        if len(data) > self.max_stream_bytes:
+            raise self._size_limit_error(len(data))
+
+        async def send(connection: _PooledConnection) -> int:
+            request_id = await self._send_command(connection, "INSTREAM")
+            for offset in range(0, len(data), self.chunk_size):
+                chunk = data[offset:offset + self.chunk_size]
+                await self._write(connection, struct.pack("!L", len(chunk)) + chunk)
+            await self._write(connection, _END_OF_STREAM)
+            return request_id
+
+        return self._scan_result(await self._request(send))
+
+    async def scan_file(self, file_path: str) -> Tuple[ClamdScanResult, str]:
+        """
+        파일을 청크 단위로 한 번 읽으며 INSTREAM 으로 보내고 SHA-256 도 계산합니다.
+
+        Returns:
+            (검사 결과, 파일 SHA-256 hex)
+        """
+        file_size = os.path.getsize(file_path)
+        if file_size > self.max_stream_bytes:
+            raise self._size_limit_error(file_size)
+        digest_holder: List[Any] = []
+
+        async def send(connection: _PooledConnection) -> int:
+            # 재시도 시 처음부터 다시 읽으므로 해시도 새로 계산
+            digest = hashlib.sha256()
+            digest_holder[:] = [digest]
+            async with aiofiles.open(file_path, "rb") as f:
+                request_id = await self._send_command(connection, "INSTREAM")
+                while chunk := await f.read(self.chunk_size):
+                    digest.update(chunk)
+                    await self._write(connection, struct.pack("!L", len(chunk)) + chunk)
+            await self._write(connection, _END_OF_STREAM)
+            return request_id
+
+        reply = await self._request(send)
+        return self._scan_result(reply), digest_holder[0].hexdigest()
+
+    async def open_stream(self) -> ClamdStream:
+        """
+        청크를 받는 대로 보내는 INSTREAM 검사를 시작합니다.
+
+        재사용 연결은 PING 으로 살아 있는지 먼저 확인합니다. (스트림은 재시도할 수 없음)
+        """
+        await self._enter()
+        try:
+            for attempt in range(2):
+                connection, reused = await self._acquire()
+                try:
+                    if reused:
+                        request_id = await self._send_command(connection, "PING")
+                        await self._read_reply(connection, request_id)
+                    request_id = await self._send_command(connection, "INSTREAM")
+                    return ClamdStream(self, connection, request_id)
+                except RECONNECT_ERRORS as e:
+                    self._discard(connection)
+                    if reused and attempt == 0:
+                        self._stats["reconnects"] += 1
+                        continue
+                    raise self._as_clamd_error(e) from e
+                except BaseException as e:
+                    self._discard(connection)
+                    raise self._as_clamd_error(e) from e
+        except BaseException:
+            self._leave()
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        """풀 메트릭을 반환합니다."""
+        wait_count = self._stats["wait_count"]
+        return {
+            "address": self.address,
+            "max_connections": self.max_connections,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "created": self._stats["created"],
+            "reused": self._stats["reused"],
+            "reconnects": self._stats["reconnects"],
+            "expired": self._stats["expired"],
+            "scans": self._stats["scans"],
+            "infected": self._stats["infected"],
+            "failures": self._stats["failures"],
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / wait_count, 3) if wait_count else 0.0,
+            "max_wait_ms": round(self._stats["max_wait_ms"], 3),
+        }
+
+    async def close(self):
+        """모든 유휴 연결의 세션을 END 로 종료합니다."""
+        self._closed = True
+        while self._idle:
+            connection = self._idle.pop()
+            try:
+                connection.writer.write(b"zEND\0")
+                await asyncio.wait_for(connection.writer.drain(), self.timeout)
+            except Exception:
+                pass
+            self._discard(connection)
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+
+    async def _enter(self):
+        """동시 연결 수 제한 슬롯을 얻습니다."""
+        if self._closed:
+            raise ClamdError(f"닫힌 clamd 연결 풀입니다: {self.address}")
+        wait_started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._record_wait((time.perf_counter() - wait_started) * 1000)
+            raise ClamdError(f"clamd 연결 풀 대기 시간 초과 ({self.address}, {self.timeout}초)")
+        self._record_wait((time.perf_counter() - wait_started) * 1000)
+        self._in_use += 1
+
+    def _leave(self):
+        """슬롯을 반납합니다."""
+        self._in_use -= 1
+        self._semaphore.release()
+
+    async def _request(self, send: Callable[[_PooledConnection], Awaitable[int]]) -> str:
+        """
+        연결 하나로 요청을 보내고 응답을 받습니다.
+
+        재사용한 연결이 끊겨 있으면 새 연결로 한 번 재시도합니다.
+        """
+        await self._enter()
+        try:
+            for attempt in range(2):
+                connection, reused = await self._acquire()
+                try:
+                    request_id = await send(connection)
+                    reply = await self._read_reply(connection, request_id)
+                except RECONNECT_ERRORS as e:
+                    self._discard(connection)
+                    if reused and attempt == 0:
+                        self._stats["reconnects"] += 1
+                        logger.warning(f"🔄 clamd 연결 끊김 - 재연결 후 재시도: {self.address}, 오류: {str(e)}")
+                        continue
+                    raise self._as_clamd_error(e) from e
+                except BaseException as e:
+                    # 요청 도중 실패한 세션은 상태를 알 수 없으므로 버림
+                    self._discard(connection)
+                    if isinstance(e, (OSError, asyncio.TimeoutError)) and not isinstance(e, FileNotFoundError):
+                        raise self._as_clamd_error(e) from e
+                    raise
+                return self._complete(connection, reply)
+        finally:
+            self._leave()
+
+    def _complete(self, connection: _PooledConnection, reply: str) -> str:
+        """응답을 받은 연결을 반납합니다. (오류 응답이면 clamd 가 세션을 닫으므로 버림)"""
+        connection.last_used_at = time.monotonic()
+        connection.requests += 1
+        if reply.endswith("ERROR"):
+            self._stats["failures"] += 1
+            self._discard(connection)
+        else:
+            self._release(connection)
+        return reply
+
+    def _scan_result(self, reply: str) -> ClamdScanResult:
+        """INSTREAM 응답을 해석하고 검사 통계를 기록합니다."""
+        result = parse_scan_reply(reply)
+        self._stats["scans"] += 1
+        if result.infected:
+            self._stats["infected"] += 1
+        return result
+
+    def _size_limit_error(self, size: int) -> ClamdSizeLimitError:
+        """StreamMaxLength 초과 오류 (연결을 쓰지 않았으므로 실패 통계에 넣지 않음)"""
+        return ClamdSizeLimitError(
+            f"clamd 검사 크기 제한 초과 ({size} bytes > {self.max_stream_bytes} bytes)"
+        )
+
+    def _as_clamd_error(self, error: BaseException) -> BaseException:
+        """통신 오류를 ClamdConnectionError 로 바꿉니다. (취소 등은 그대로)"""
+        if isinstance(error, ClamdError) or not isinstance(error, Exception):
+            return error
+        self._stats["failures"] += 1
+        if isinstance(error, asyncio.TimeoutError):
+            return ClamdConnectionError(f"clamd 응답 시간 초과 ({self.address}, {self.timeout}초)")
+        return ClamdConnectionError(f"clamd 통신 실패 ({self.address}): {str(error) or type(error).__name__}")
+
+    async def _acquire(self) -> Tuple[_PooledConnection, bool]:
+        """유휴 연결을 꺼내거나 새 연결을 만듭니다. (연결, 재사용 여부)"""
+        now = time.monotonic()
+        while self._idle:
+            connection = self._idle.pop()
+            if connection.writer.is_closing() or now - connection.last_used_at > self.idle_timeout:
+                self._stats["expired"] += 1
+                self._discard(connection)
+                continue
+            self._stats["reused"] += 1
+            return connection, True
+
+        return await self._connect(), False
+
+    async def _connect(self) -> _PooledConnection:
+        """새 연결을 열고 IDSESSION 을 시작합니다."""
+        try:
+            if self.unix_socket:
+                opening = asyncio.open_unix_connection(self.unix_socket)
+            else:
+                opening = asyncio.open_connection(self.host, self.port)
+            reader, writer = await asyncio.wait_for(opening, self.timeout)
+            writer.write(b"zIDSESSION\0")
+            await asyncio.wait_for(writer.drain(), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise self._as_clamd_error(e) from e
+
+        self._stats["created"] += 1
+        logger.info(f"🔗 clamd 풀 연결 생성 - 주소: {self.address}")
+        now = time.monotonic()
+        return _PooledConnection(reader=reader, writer=writer, created_at=now, last_used_at=now)
+
+    async def _write(self, connection: _PooledConnection, data: bytes) -> None:
+        connection.writer.write(data)
+        await asyncio.wait_for(connection.writer.drain(), self.timeout)
+
+    async def _send_command(self, connection: _PooledConnection, command: str) -> int:
+        """세션 명령을 보내고 요청 ID 를 반환합니다."""
+        request_id = connection.next_request_id
+        connection.next_request_id += 1
+        await self._write(connection, f"z{command}\0".encode())
+        return request_id
+
+    async def _read_reply(self, connection: _PooledConnection, request_id: int) -> str:
+        """NUL 로 끝나는 응답을 읽고 세션 요청 ID 접두어("<id>: ")를 제거합니다."""
+        data = await asyncio.wait_for(connection.reader.readuntil(b"\0"), self.timeout)
+        reply = data[:-1].decode("utf-8", errors="replace").strip()
+        prefix = f"{request_id}: "
+        return reply[len(prefix):] if reply.startswith(prefix) else reply
+
+    def _release(self, connection: _PooledConnection):
+        """요청을 마친 연결을 풀에 반납합니다."""
+        if self._closed or connection.writer.is_closing():
+            self._discard(connection)
+            return
+        self._idle.append(connection)
+
+    def _discard(self, connection: _PooledConnection):
+        """연결을 닫고 버립니다."""
+        try:
+            connection.writer.close()
+        except Exception:
+            pass
+
+    def _record_wait(self, wait_ms: float):
+        """연결 대기 시간을 기록합니다."""
+        self._stats["wait_count"] += 1
+        self._stats["total_wait_ms"] += wait_ms
+        self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+
+
+class ClamdPoolManager:
+    """
+    이벤트 루프별 clamd 연결 풀 관리자
+
+    풀은 이벤트 루프에 묶이므로 루프가 바뀌면 새 풀을 만듭니다.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        unix_socket: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        관리자 초기화 (생략한 값은 settings 사용)
+
+        Args:
+            host: clamd 호스트
+            port: clamd 포트
+            unix_socket: clamd Unix 소켓 경로
+            max_connections: 최대 동시 연결 수
+            idle_timeout: 유휴 연결 유지 시간 (초)
+            timeout: 연결/읽기/쓰기 타임아웃 (초)
+        """
+        self.host = host or settings.CLAMAV_HOST
+        self.port = port or settings.CLAMAV_PORT
+        self.unix_socket = unix_socket if unix_socket is not None else settings.CLAMAV_UNIX_SOCKET
+        self.max_connections = max_connections or settings.CLAMAV_POOL_MAX_CONNECTIONS
+        self.idle_timeout = idle_timeout or settings.CLAMAV_POOL_IDLE_TIMEOUT_SECONDS
+        self.timeout = timeout or settings.VIRUS_SCAN_TIMEOUT_SECONDS
+        self._pools: Dict[int, ClamdConnectionPool] = {}
+
+    def get_pool(self) -> ClamdConnectionPool:
+        """현재 이벤트 루프의 풀을 반환합니다."""
+        loop_id = id(asyncio.get_running_loop())
+        pool = self._pools.get(loop_id)
+        if pool is None:
+            # 종료된 이벤트 루프의 풀은 정리
+            for stale_key in [k for k in self._pools if k != loop_id]:
+                self._pools.pop(stale_key, None)
+
+            pool = ClamdConnectionPool(
+                host=self.host,
+                port=self.port,
+                unix_socket=self.unix_socket,
+                max_connections=self.max_connections,
+                idle_timeout=self.idle_timeout,
+                timeout=self.timeout
+            )
+            self._pools[loop_id] = pool
+            logger.info(f"🧰 clamd 연결 풀 생성 - 주소: {pool.address}, 최대 연결: {pool.max_connections}")
+        return pool
+
+    async def close_pool(self):
+        """현재 이벤트 루프의 풀을 닫습니다."""
+        pool = self._pools.pop(id(asyncio.get_running_loop()), None)
+        if pool is not None:
+            await pool.close()
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """모든 풀의 메트릭을 반환합니다."""
+        return [pool.metrics() for pool in self._pools.values()]
+
+    async def close_all(self):
+        """모든 풀의 연결을 종료합니다."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.close()
+
+
+# 전역 clamd 풀 관리자
+clamd_pool_manager = ClamdPoolManager()
@@ -0,0 +1,296 @@
+"""
+클러스터 안전 스케줄러 (APScheduler + Redis 리더 임대)
+
+uvicorn 워커마다, 노드마다 AsyncIOScheduler 가 같은 작업을 등록하므로
+작업마다 Redis 임대(lease)를 가진 한 인스턴스만 실행하도록 합니다.
+
+- 임대: scheduler:lease:{job_id} = 인스턴스 ID (SET NX PX). 보유자는 주기적으로 갱신
+- 실행 시점에 임대를 확인/획득하여 보유한 인스턴스만 실행, 나머지는 건너뜀
+- 종료 시 실행 중인 작업을 잠시 기다린 뒤 보유한 임대를 해제하여 다른 인스턴스가 즉시 이어받음
+- 실행 이력: scheduler:history:{job_id} 리스트 (최근 N건, 모든 인스턴스 공용)
+- Redis 를 사용할 수 없으면 로컬에서 실행 (등록된 작업은 중복 실행되어도 결과가 같은 작업만 사용)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "scheduler"
+
+# KEYS[1]: 임대 키, ARGV[1]: 인스턴스 ID, ARGV[2]: 임대 시간(ms)
+# 보유 중이면 연장, 비어 있으면 획득. 보유(획득) 시 1, 다른 인스턴스가 보유 중이면 0
+ACQUIRE_SCRIPT = """
+local owner = redis.call('GET', KEYS[1])
+if owner == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if not owner then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# KEYS[1]: 임대 키, ARGV[1]: 인스턴스 ID (자신이 보유한 임대만 해제)
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def lease_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:lease:{job_id}"
+
+
+def history_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:history:{job_id}"
+
+
+class ClusterScheduler:
+    """리더 임대를 가진 인스턴스만 작업을 실행하는 스케줄러"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        lease_seconds: Optional[int] = None,
+        renew_seconds: Optional[int] = None,
+        history_size: Optional[int] = None,
+        timezone_name: str = "Asia/Seoul"
+    ):
+        """
+        Args:
+            redis_url: Redis URL (생략 시 settings.REDIS_URL)
+            lease_seconds: 임대 유효 시간 (갱신되지 않으면 이 시간 후 다른 인스턴스가 획득)
+            renew_seconds: 임대 갱신 주기
+            history_size: 작업별로 보관할 실행 이력 수
+            timezone_name: 스케줄러 시간대
+        """
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.lease_seconds = lease_seconds or settings.SCHEDULER_LEASE_SECONDS
+        self.renew_seconds = renew_seconds or settings.SCHEDULER_LEASE_RENEW_SECONDS
+        self.history_size = history_size or settings.SCHEDULER_HISTORY_SIZE
+        self.instance_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.scheduler = AsyncIOScheduler(timezone=timezone_name)
+        self._jobs: Dict[str, Callable[[], Any]] = {}
+        self._held: Set[str] = set()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._local_history: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._renewer: Optional[asyncio.Task] = None
+        self._client = None
+        self._client_loop_id: Optional[int] = None
+        self._scripts = {}
+        # 마지막 Redis 호출 성공 여부 (장애 중에는 경고를 한 번만 남기고 이력은 로컬에서 조회)
+        self._redis_ok = True
+
+    def _get_client(self):
+        """현재 이벤트 루프용 Redis 클라이언트를 반환합니다."""
+        loop_id = id(asyncio.get_running_loop())
+        if self._client is None or self._client_loop_id != loop_id:
+            from .metrics import InstrumentedAsyncRedis
+
+            self._client = InstrumentedAsyncRedis.from_url(
+                self.redis_url, decode_responses=True, socket_connect_timeout=1, socket_timeout=1
+            )
+            self._client_loop_id = loop_id
+            self._scripts = {
+                "acquire": self._client.register_script(ACQUIRE_SCRIPT),
+                "release": self._client.register_script(RELEASE_SCRIPT),
+            }
+        return self._client
+
+    def add_job(self, func: Callable[[], Any], trigger, id: str, **kwargs) -> None:
+        """
+        작업을 등록합니다. 실행 시점에 임대를 가진 인스턴스만 func 를 실행합니다.
+
+        Args:
+            func: 실행할 함수 (동기 함수는 스레드에서 실행)
+            trigger: APScheduler 트리거
+            id: 작업 ID (임대/이력 키로 사용)
+            **kwargs: AsyncIOScheduler.add_job 인자 (max_instances, coalesce, next_run_time 등)
+        """
+        self._jobs[id] = func
+        self._local_history.setdefault(id, deque(maxlen=self.history_size))
+        self.scheduler.add_job(self._run_job, trigger, args=[id], id=id, replace_existing=True, **kwargs)
+
+    async def _acquire(self, job_id: str) -> Optional[bool]:
+        """임대를 획득/연장합니다. Redis 를 사용할 수 없으면 None"""
+        try:
+            self._get_client()
+            acquired = bool(await self._scripts["acquire"](
+                keys=[lease_key(job_id)], args=[self.instance_id, self.lease_seconds * 1000]
+            ))
+        except Exception as e:
+            if self._redis_ok:
+                logger.warning(f"⚠️ 스케줄러 임대 확인 실패 (Redis 복구 전까지 로컬 실행) - 작업: {job_id}, 오류: {str(e)}")
+            self._redis_ok = False
+            return None
+        self._redis_ok = True
+        if acquired:
+            if job_id not in self._held:
+                logger.info(f"👑 스케줄러 작업 리더 획득 - 작업: {job_id}, 인스턴스: {self.instance_id}")
+            self._held.add(job_id)
+        else:
+            self._held.discard(job_id)
+        return acquired
+
+    async def _release(self, job_id: str) -> None:
+        try:
+            self._get_client()
+            await self._scripts["release"](keys=[lease_key(job_id)], args=[self.instance_id])
+            logger.info(f"🤝 스케줄러 작업 리더 해제 - 작업: {job_id}, 인스턴스: {self.instance_id}")
+        except Exception as e:
+            logger.warning(f"⚠️ 스케줄러 임대 해제 실패 (만료 시 이양) - 작업: {job_id}, 오류: {str(e)}")
+        self._held.discard(job_id)
+
+    async def _renew_leases(self) -> None:
+        """모든 작업의 임대를 주기적으로 갱신하거나, 리더가 없으면 획득합니다."""
+        while True:
+            for job_id in list(self._jobs):
+                await self._acquire(job_id)
+            await asyncio.sleep(self.renew_seconds)
+
+    async def _run_job(self, job_id: str) -> None:
+        acquired = await self._acquire(job_id)
+        if acquired is False:
+            logger.debug(f"⏭️ 다른 인스턴스가 리더인 작업 건너뜀 - 작업: {job_id}")
+            return
+        if acquired is None:
+            logger.info(f"🔄 Redis 를 사용할 수 없어 로컬에서 작업 실행 - 작업: {job_id}")
+
+        func = self._jobs[job_id]
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        error = None
+        self._running[job_id] = asyncio.current_task()
+        try:
+            if asyncio.iscoroutinefunction(func):
+                await func()
+            else:
+                await asyncio.to_thread(func)
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ 스케줄러 작업 실패 - 작업: {job_id}, 오류: {error}")
+        finally:
+            self._running.pop(job_id, None)
+        await self._record(job_id, {
+            "job_id": job_id,
+            "instance": self.instance_id,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "status": "failed" if error else "success",
+            "error": error,
+        })
+
+    async def _record(self, job_id: str, entry: Dict[str, Any]) -> None:
+        """실행 이력을 로컬과 Redis(공용)에 기록합니다."""
+        self._local_history[job_id].appendleft(entry)
+        if not self._redis_ok:
+            return
+        try:
+            client = self._get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.lpush(history_key(job_id), json.dumps(entry, ensure_ascii=False))
+                pipe.ltrim(history_key(job_id), 0, self.history_size - 1)
+                await pipe.execute()
+        except Exception:
+            pass
+
+    def start(self) -> None:
+        """스케줄러와 임대 갱신 태스크를 시작합니다. (이벤트 루프 안에서 호출)"""
+        self.scheduler.start()
+        self._renewer = asyncio.create_task(self._renew_leases())
+        logger.info(f"✅ 클러스터 스케줄러 시작 - 인스턴스: {self.instance_id}, 작업: {', '.join(self._jobs)}")
+
+    async def shutdown(self, grace_seconds: Optional[float] = None) -> None:
+        """
+        스케줄러를 종료하고 보유한 임대를 해제합니다.
+
+        실행 중인 작업은 grace_seconds 동안 기다린 뒤 임대를 해제하여,
+        다른 인스턴스가 만료를 기다리지 않고 다음 갱신 주기에 리더를 이어받습니다.
+        """
+        grace_seconds = settings.SCHEDULER_SHUTDOWN_GRACE_SECONDS if grace_seconds is None else grace_seconds
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        if self._renewer is not None:
+            self._renewer.cancel()
+            try:
+                await self._renewer
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._renewer = None
+        running = [task for task in self._running.values() if task is not None and not task.done()]
+        if running:
+            await asyncio.wait(running, timeout=grace_seconds)
+        for job_id in list(self._held):
+            await self._release(job_id)
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+            self._client_loop_id = None
+        logger.info(f"✅ 클러스터 스케줄러 종료 - 인스턴스: {self.instance_id}")
+
+    def _job_stats(self, job_id: str, job, leader: Optional[str], history: List[Dict[str, Any]]) -> Dict[str, Any]:
+        next_run_time = getattr(job, "next_run_time", None)
+        return {
+            "job_id": job_id,
+            "trigger": str(job.trigger) if job else None,
+            # 스케줄러 시작 전(대기 중인 작업)에는 next_run_time 이 없음
+            "next_run_time": next_run_time.isoformat() if next_run_time else None,
+            "leader": leader,
+            "is_leader": job_id in self._held,
+            "running": job_id in self._running,
+            "history": history,
+        }
+
+    async def stats(self, history_limit: int = 10) -> Dict[str, Any]:
+        """
+        작업별 다음 실행 시각, 현재 리더, 최근 실행 이력을 반환합니다.
+
+        이력은 Redis(모든 인스턴스 공용)에서 읽고, 사용할 수 없으면 이 인스턴스의 이력을 반환합니다.
+        """
+        jobs: List[Dict[str, Any]] = []
+        for job_id in self._jobs:
+            job = self.scheduler.get_job(job_id)
+            leader = None
+            history = list(self._local_history[job_id])[:history_limit]
+            if not self._redis_ok:
+                jobs.append(self._job_stats(job_id, job, leader, history))
+                continue
+            try:
+                client = self._get_client()
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.get(lease_key(job_id))
+                    pipe.lrange(history_key(job_id), 0, history_limit - 1)
+                    leader, raw_history = await pipe.execute()
+                history = [json.loads(item) for item in raw_history]
+            except Exception:
+                pass
+            jobs.append(self._job_stats(job_id, job, leader, history))
+        return {
+            "instance": self.instance_id,
+            "running": self.scheduler.running,
+            "lease_seconds": self.lease_seconds,
+            "jobs": jobs,
+        }
+
+
+cluster_scheduler = ClusterScheduler()
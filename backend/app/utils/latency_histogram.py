@@ -0,0 +1,91 @@
+"""
+프로세스 내 지연 시간 히스토그램
+
+고정 버킷(초) 단위로 관측값 수를 세는 스레드 안전 히스토그램입니다.
+생성된 히스토그램은 이름으로 등록되어 모니터링 API에서 조회할 수 있습니다.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+# 기본 버킷 상한 (초) - 마지막 버킷(+Inf)은 자동으로 추가
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 히스토그램 이름 -> 히스토그램 (모니터링용)
+_histogram_registry: Dict[str, "LatencyHistogram"] = {}
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램"""
+
+    def __init__(self, name: str, buckets: Optional[Sequence[float]] = None):
+        """
+        히스토그램 초기화
+
+        Args:
+            name: 히스토그램 이름 (모니터링 통계 키)
+            buckets: 버킷 상한 목록 (초, 오름차순)
+        """
+        self.name = name
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        # 버킷별 관측 수 (마지막 칸은 +Inf)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+        _histogram_registry[name] = self
+
+    def observe(self, seconds: float) -> None:
+        """관측값(초)을 기록합니다."""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """버킷 상한 기준 근사 분위수 (관측값이 없으면 None, +Inf 버킷이면 마지막 상한)"""
+        with self._lock:
+            if not self._count:
+                return None
+            rank = q * self._count
+            cumulative = 0
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                if cumulative >= rank:
+                    return bound
+            return self.buckets[-1]
+
+    def stats(self) -> Dict[str, Any]:
+        """누적 버킷 카운트와 합계/평균/근사 분위수를 반환합니다."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = 0
+        buckets: Dict[str, int] = {}
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "name": self.name,
+            "count": count,
+            "sum": round(total, 6),
+            "avg": round(total / count, 6) if count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+    def reset(self) -> None:
+        """관측값을 모두 지웁니다."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+
+def get_histogram_stats() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 히스토그램의 통계를 반환합니다."""
+    return {name: histogram.stats() for name, histogram in _histogram_registry.items()}
@@ -0,0 +1,117 @@
+"""
+프로세스 내 LRU + TTL 캐시
+
+크기 상한(LRU 제거)과 항목별 만료 시간을 가진 스레드 안전 캐시입니다.
+생성된 캐시는 이름으로 등록되어 모니터링 API에서 적중/미스 통계를 조회할 수 있습니다.
+다른 워커의 캐시 무효화는 app.utils.cache_invalidation 을 사용합니다.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 캐시 이름 -> 캐시 (모니터링용)
+_cache_registry: Dict[str, "LRUTTLCache"] = {}
+
+
+class LRUTTLCache:
+    """크기 제한 LRU + TTL 캐시"""
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        """
+        캐시 초기화
+
+        Args:
+            name: 캐시 이름 (모니터링 통계 키)
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            ttl_seconds: 항목 만료 시간 (초)
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # 키 -> (만료 시각(monotonic), 값)
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        _cache_registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """값을 조회합니다. 없거나 만료되었으면 None을 반환합니다."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            if item[0] <= time.monotonic():
+                del self._items[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """값을 저장합니다. (ttl_seconds 생략 시 캐시 기본 TTL)"""
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """항목을 삭제합니다."""
+        with self._lock:
+            if self._items.pop(key, None) is None:
+                return False
+            self.invalidations += 1
+            return True
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """predicate(키, 값)가 참인 항목을 모두 삭제하고 삭제 수를 반환합니다."""
+        with self._lock:
+            keys: List[Hashable] = [key for key, (_, value) in self._items.items() if predicate(key, value)]
+            for key in keys:
+                del self._items[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """모든 항목을 삭제합니다. (통계는 유지)"""
+        with self._lock:
+            self.invalidations += len(self._items)
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 통계를 반환합니다."""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 캐시의 통계를 반환합니다."""
+    return {name: cache.stats() for name, cache in _cache_registry.items()}
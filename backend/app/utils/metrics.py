@@ -0,0 +1,228 @@
+"""
+Prometheus 메트릭
+
+HTTP 요청(경로 템플릿/메서드/상태별 지연 시간, 처리 중 요청 수), DB 연결 풀 대기 시간,
+Redis 명령 지연 시간을 prometheus_client 로 기록하고 /metrics 로 노출합니다.
+
+여러 워커 프로세스로 실행할 때는 PROMETHEUS_MULTIPROC_DIR (또는 METRICS_MULTIPROC_DIR 설정)을
+지정하면 프로세스별 파일에 기록하고 조회 시 합산합니다. 디렉터리는 서버 시작 전에 비워야 합니다.
+대시보드 성능 메트릭도 같은 레지스트리에서 계산합니다.
+"""
+
+import os
+import time
+from typing import Dict, Optional
+
+from ..config import settings
+
+# prometheus_client 는 import 시점의 환경 변수로 멀티프로세스 모드를 결정하므로 먼저 설정
+if settings.METRICS_MULTIPROC_DIR and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.METRICS_MULTIPROC_DIR
+
+import redis
+import redis.asyncio as aioredis
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .latency_histogram import DEFAULT_BUCKETS
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (경로 템플릿/메서드/상태별)",
+    ["method", "route", "status"], buckets=DEFAULT_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수",
+    ["method"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "DB 연결 풀에서 연결을 얻기까지 대기한 시간",
+    ["pool"], buckets=DEFAULT_BUCKETS
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "Redis 명령 왕복 시간 (파이프라인 제외)",
+    ["command"], buckets=DEFAULT_BUCKETS
+)
+
+# 처리량 계산용 직전 조회 상태 (at: 시각, count: 누적 요청 수, rate: 계산한 처리량)
+_throughput_state: Dict[str, float] = {}
+# 이보다 짧은 간격의 재조회는 직전 처리량을 그대로 반환
+THROUGHPUT_MIN_INTERVAL_SECONDS = 1.0
+
+
+def _route_label(request: Request) -> str:
+    """경로 변수 대신 라우트 템플릿을 라벨로 사용합니다. (매칭되지 않은 요청은 unmatched)"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def metrics_middleware(request: Request, call_next):
+    """요청별 처리 시간과 처리 중 요청 수를 기록하는 미들웨어"""
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(request.method)
+    in_progress.inc()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_DURATION.labels(request.method, _route_label(request), str(status_code)).observe(
+            time.perf_counter() - started
+        )
+        in_progress.dec()
+
+
+class TimedQueuePool(QueuePool):
+    """연결을 얻기까지의 대기 시간(풀 고갈 시 대기 포함)을 기록하는 QueuePool"""
+
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - started)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """비동기 엔진용 TimedQueuePool"""
+
+    metrics_label = "async"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - started)
+
+
+class InstrumentedRedis(redis.Redis):
+    """명령별 왕복 시간을 기록하는 Redis 클라이언트 (Lua 스크립트는 EVALSHA 로 기록)"""
+
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels(str(args[0]).upper()).observe(time.perf_counter() - started)
+
+
+class InstrumentedAsyncRedis(aioredis.Redis):
+    """명령별 왕복 시간을 기록하는 redis.asyncio 클라이언트"""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels(str(args[0]).upper()).observe(time.perf_counter() - started)
+
+
+def _registry():
+    """멀티프로세스 모드면 모든 워커 파일을 합산하는 레지스트리를, 아니면 기본 레지스트리를 반환합니다."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> bytes:
+    """Prometheus 텍스트 형식의 메트릭을 반환합니다."""
+    return generate_latest(_registry())
+
+
+def metrics_response() -> Response:
+    """/metrics 응답 (Prometheus 텍스트 형식 Content-Type)"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead() -> None:
+    """종료하는 워커의 처리 중 요청 수(livesum) 파일을 정리합니다. (멀티프로세스 모드에서만)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def _quantile(buckets: Dict[float, float], count: float, q: float) -> Optional[float]:
+    """누적 버킷 카운트에서 버킷 상한 기준 근사 분위수를 구합니다."""
+    if not count:
+        return None
+    rank = q * count
+    for bound in sorted(buckets):
+        if buckets[bound] >= rank:
+            return bound if bound != float("inf") else max(DEFAULT_BUCKETS)
+    return max(DEFAULT_BUCKETS)
+
+
+def _throughput(http_count: float) -> float:
+    """
+    직전 조회 이후 늘어난 요청 수를 경과 시간으로 나눈 초당 요청 수
+
+    누적 카운트는 종료된 워커 파일까지 합산되므로 프로세스 가동 시간으로 나누지 않고
+    조회 간 증가분으로 계산합니다. 첫 조회(기준점)와 카운트가 줄어든 경우(메트릭 디렉터리 초기화)는 0 입니다.
+    """
+    now = time.monotonic()
+    last = _throughput_state
+    if last and http_count >= last["count"]:
+        elapsed = now - last["at"]
+        if elapsed < THROUGHPUT_MIN_INTERVAL_SECONDS:
+            return last["rate"]
+        rate = (http_count - last["count"]) / elapsed
+    else:
+        rate = 0.0
+    _throughput_state.update(at=now, count=http_count, rate=rate)
+    return rate
+
+
+def performance_summary() -> Dict[str, float]:
+    """
+    대시보드용 성능 요약 (모든 워커 합산, 프로세스 시작 이후 누적)
+
+    Returns:
+        response_time_ms, p95_response_time_ms, throughput(직전 조회 이후 초당 요청 수), error_rate(5xx 비율 %),
+        requests_in_progress, db_pool_wait_ms, redis_latency_ms
+    """
+    http_count = http_sum = http_errors = 0.0
+    http_buckets: Dict[float, float] = {}
+    totals = {"db_pool_checkout_wait_seconds": [0.0, 0.0], "redis_command_duration_seconds": [0.0, 0.0]}
+    in_progress = 0.0
+
+    for family in _registry().collect():
+        if family.name == "http_request_duration_seconds":
+            for sample in family.samples:
+                if sample.name.endswith("_count"):
+                    http_count += sample.value
+                    if sample.labels.get("status", "").startswith("5"):
+                        http_errors += sample.value
+                elif sample.name.endswith("_sum"):
+                    http_sum += sample.value
+                elif sample.name.endswith("_bucket"):
+                    bound = float(sample.labels["le"])
+                    http_buckets[bound] = http_buckets.get(bound, 0.0) + sample.value
+        elif family.name in totals:
+            for sample in family.samples:
+                if sample.name.endswith("_count"):
+                    totals[family.name][0] += sample.value
+                elif sample.name.endswith("_sum"):
+                    totals[family.name][1] += sample.value
+        elif family.name == "http_requests_in_progress":
+            in_progress += sum(sample.value for sample in family.samples)
+
+    def _avg_ms(count: float, total: float) -> float:
+        return round(total / count * 1000, 2) if count else 0.0
+
+    p95 = _quantile(http_buckets, http_count, 0.95)
+    return {
+        "response_time_ms": _avg_ms(http_count, http_sum),
+        "p95_response_time_ms": round(p95 * 1000, 2) if p95 is not None else 0.0,
+        "throughput": round(_throughput(http_count), 2),
+        "error_rate": round(http_errors / http_count * 100, 2) if http_count else 0.0,
+        "requests_in_progress": in_progress,
+        "db_pool_wait_ms": _avg_ms(*totals["db_pool_checkout_wait_seconds"]),
+        "redis_latency_ms": _avg_ms(*totals["redis_command_duration_seconds"]),
+    }
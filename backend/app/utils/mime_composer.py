@@ -0,0 +1,188 @@
+"""
+스트리밍 MIME 메시지 작성기
+
+email.mime 으로 메시지를 만들면 첨부파일 전체를 읽어 base64 문자열로 바꾼 뒤
+as_bytes() 로 한 번 더 직렬화하므로 첨부 크기의 여러 배가 메모리에 올라갑니다.
+이 모듈은 RFC 5322 메시지를 파일 객체에 순서대로 기록하며, 첨부파일은
+청크 단위로 읽어 base64 로 인코딩하므로 메모리 사용량이 첨부 크기와 무관합니다.
+
+- 모든 줄은 CRLF 로 끝나며 base64 줄은 76자 (SMTP DATA 로 그대로 전송 가능)
+- 텍스트/HTML 본문이 함께 있으면 multipart/alternative 로 묶음
+"""
+
+import base64
+import os
+import tempfile
+import urllib.parse
+import uuid
+from email.header import Header
+from email.utils import formatdate, make_msgid
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence
+
+from ..config import settings
+
+# 57 bytes 가 base64 한 줄(76자)이 되므로 읽기 단위는 57의 배수
+BASE64_READ_SIZE = 57 * 1024
+CRLF = b"\r\n"
+
+
+def _encode_header(value: str) -> str:
+    """ASCII 가 아닌 헤더 값은 RFC 2047 로 인코딩합니다."""
+    try:
+        value.encode("ascii")
+        return value
+    except UnicodeEncodeError:
+        return Header(value, "utf-8").encode(linesep="\r\n")
+
+
+def _content_disposition(filename: str) -> str:
+    """첨부파일 Content-Disposition (ASCII 가 아니면 RFC 2231 방식)"""
+    try:
+        filename.encode("ascii")
+        escaped = filename.replace("\\", "\\\\").replace('"', '\\"')
+        return f'attachment; filename="{escaped}"'
+    except UnicodeEncodeError:
+        return f"attachment; filename*=UTF-8''{urllib.parse.quote(filename, safe='')}"
+
+
+def _new_boundary() -> str:
+    return f"=_skyboot_{uuid.uuid4().hex}"
+
+
+class MimeComposer:
+    """
+    파일 객체에 MIME 메시지를 기록하는 작성기
+
+    사용 예:
+        composer = MimeComposer(sender, recipients, subject, body_text, body_html, attachments)
+        with open(path, "wb") as target:
+            size = composer.write_to(target)
+    """
+
+    def __init__(
+        self,
+        sender: str,
+        recipients: Sequence[str],
+        subject: str,
+        body_text: Optional[str] = None,
+        body_html: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None,
+        message_id: Optional[str] = None,
+        extra_headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        MIME 작성기 초기화
+
+        Args:
+            sender: From 헤더
+            recipients: To 헤더 주소 목록
+            subject: 제목
+            body_text: 텍스트 본문
+            body_html: HTML 본문
+            attachments: 첨부파일 목록 (file_path, filename, content_type)
+            message_id: Message-ID (생략 시 생성)
+            extra_headers: 추가 헤더 (In-Reply-To, References 등)
+        """
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.subject = subject
+        self.body_text = body_text
+        self.body_html = body_html
+        self.attachments = attachments or []
+        self.message_id = message_id or make_msgid(domain=sender.rpartition("@")[2] or None)
+        self.extra_headers = extra_headers or {}
+
+    def write_to(self, target: BinaryIO) -> int:
+        """
+        메시지를 target 에 기록합니다.
+
+        Returns:
+            기록한 바이트 수
+        """
+        start = target.tell()
+        boundary = _new_boundary()
+
+        self._write_headers(target, [
+            ("From", _encode_header(self.sender)),
+            ("To", ", ".join(self.recipients)),
+            ("Subject", _encode_header(self.subject or "")),
+            ("Date", formatdate(localtime=False, usegmt=True)),
+            ("Message-ID", self.message_id),
+            *((name, _encode_header(value)) for name, value in self.extra_headers.items() if value),
+            ("MIME-Version", "1.0"),
+            ("Content-Type", f'multipart/mixed; boundary="{boundary}"'),
+        ])
+        target.write(b"This is a multi-part message in MIME format." + CRLF)
+
+        target.write(b"--" + boundary.encode() + CRLF)
+        self._write_body(target)
+
+        for attachment in self.attachments:
+            file_path = attachment.get("file_path")
+            if not file_path or not os.path.exists(file_path):
+                continue
+            target.write(b"--" + boundary.encode() + CRLF)
+            self._write_attachment(target, attachment)
+
+        target.write(b"--" + boundary.encode() + b"--" + CRLF)
+        return target.tell() - start
+
+    def _write_body(self, target: BinaryIO):
+        """텍스트/HTML 본문 (둘 다 있으면 multipart/alternative)"""
+        parts = [(subtype, content) for subtype, content in (("plain", self.body_text), ("html", self.body_html)) if content]
+        if not parts:
+            parts = [("plain", "")]
+        if len(parts) == 1:
+            self._write_text_part(target, *parts[0])
+            return
+
+        boundary = _new_boundary()
+        self._write_headers(target, [("Content-Type", f'multipart/alternative; boundary="{boundary}"')])
+        for subtype, content in parts:
+            target.write(b"--" + boundary.encode() + CRLF)
+            self._write_text_part(target, subtype, content)
+        target.write(b"--" + boundary.encode() + b"--" + CRLF)
+
+    def _write_text_part(self, target: BinaryIO, subtype: str, content: str):
+        self._write_headers(target, [
+            ("Content-Type", f'text/{subtype}; charset="utf-8"'),
+            ("Content-Transfer-Encoding", "base64"),
+        ])
+        target.write(base64.encodebytes(content.encode("utf-8")).replace(b"\n", CRLF))
+
+    def _write_attachment(self, target: BinaryIO, attachment: Dict[str, Any]):
+        """첨부파일을 청크 단위로 읽어 base64 로 기록합니다."""
+        filename = attachment.get("filename") or os.path.basename(attachment["file_path"])
+        self._write_headers(target, [
+            ("Content-Type", attachment.get("content_type") or "application/octet-stream"),
+            ("Content-Transfer-Encoding", "base64"),
+            ("Content-Disposition", _content_disposition(filename)),
+        ])
+        with open(attachment["file_path"], "rb") as source:
+            while True:
+                chunk = source.read(BASE64_READ_SIZE)
+                if not chunk:
+                    break
+                target.write(base64.encodebytes(chunk).replace(b"\n", CRLF))
+
+    @staticmethod
+    def _write_headers(target: BinaryIO, headers: Sequence[tuple]):
+        for name, value in headers:
+            target.write(f"{name}: {value}".encode("ascii", "replace") + CRLF)
+        target.write(CRLF)
+
+
+def compose_to_spool(composer: MimeComposer, max_memory: Optional[int] = None) -> BinaryIO:
+    """
+    메시지를 SpooledTemporaryFile 에 작성하고 처음 위치로 되돌려 반환합니다.
+
+    MAIL_RAW_SPOOL_MAX_BYTES 보다 큰 메시지는 자동으로 디스크 임시 파일로 넘어갑니다.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory or settings.MAIL_RAW_SPOOL_MAX_BYTES)
+    try:
+        composer.write_to(spool)
+        spool.seek(0)
+    except Exception:
+        spool.close()
+        raise
+    return spool
@@ -0,0 +1,256 @@
+"""
+비동기 슬라이딩 윈도우 속도 제한기
+
+요청 하나에 적용되는 모든 제한(IP, 사용자, 조직, 엔드포인트)을
+Lua 스크립트 한 번(Redis 왕복 1회)으로 원자적으로 검사하고 증가시킵니다.
+
+- 슬라이딩 윈도우 카운터: 현재 분 카운터 + 직전 분 카운터 x 남은 비율로 요청 수를 추정합니다.
+  키 형식은 rate_limit:{scope}:{identifier}:{분 번호} 로 기존 상태 조회/리셋 API와 호환됩니다.
+- 제한 초과 시 어떤 카운터도 증가시키지 않습니다.
+- Redis 장애 시 프로세스 내 토큰 버킷으로 대체하고, 일정 시간 후 Redis를 다시 시도합니다.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rate_limit"
+# RateLimitService.default_limits 가 분당 요청 수 기준이므로 윈도우는 60초로 고정
+WINDOW_SECONDS = 60
+
+# KEYS[2i-1]: 스코프 i의 현재 윈도우 카운터, KEYS[2i]: 직전 윈도우 카운터
+# ARGV[1]: 현재 윈도우 경과 비율(0~1), ARGV[2]: 카운터 TTL(초), ARGV[2+i]: 스코프 i 제한
+# 반환: {허용 여부(1/0), 스코프별 추정 요청 수...}
+SLIDING_WINDOW_SCRIPT = """
+local weight = 1 - tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local scopes = #KEYS / 2
+local allowed = 1
+local estimates = {}
+for i = 1, scopes do
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    estimates[i] = math.floor(previous * weight) + current
+    if estimates[i] >= tonumber(ARGV[2 + i]) then
+        allowed = 0
+    end
+end
+if allowed == 1 then
+    for i = 1, scopes do
+        redis.call('INCR', KEYS[2 * i - 1])
+        redis.call('EXPIRE', KEYS[2 * i - 1], ttl)
+        estimates[i] = estimates[i] + 1
+    end
+end
+local result = {allowed}
+for i = 1, scopes do
+    result[i + 1] = estimates[i]
+end
+return result
+"""
+
+
+@dataclass
+class RateLimitRule:
+    """요청에 적용할 제한 하나"""
+    scope: str          # ip, user, organization, endpoint
+    identifier: str
+    limit: int          # 윈도우(분)당 허용 요청 수
+
+    @property
+    def key(self) -> str:
+        """윈도우 번호를 제외한 Redis 키 접두사"""
+        return f"{KEY_PREFIX}:{self.scope}:{self.identifier}"
+
+
+@dataclass
+class RateLimitResult:
+    """속도 제한 검사 결과 (가장 여유가 적은 스코프 기준)"""
+    allowed: bool
+    limit: int = 0
+    remaining: int = 0
+    reset_time: int = 0
+    retry_after: int = 0
+    scope: Optional[str] = None
+    backend: str = "none"
+
+
+def _summarize(rules: Sequence[RateLimitRule], counts: Sequence[float], allowed: bool,
+               reset_time: int, retry_after: int, backend: str) -> RateLimitResult:
+    """스코프별 사용량 중 남은 요청 수가 가장 적은 스코프로 결과를 만듭니다."""
+    index = min(range(len(rules)), key=lambda i: rules[i].limit - counts[i])
+    rule = rules[index]
+    return RateLimitResult(
+        allowed=allowed,
+        limit=rule.limit,
+        remaining=max(0, int(rule.limit - counts[index])),
+        reset_time=reset_time,
+        retry_after=retry_after if not allowed else 0,
+        scope=rule.scope,
+        backend=backend
+    )
+
+
+class TokenBucketLimiter:
+    """
+    프로세스 내 토큰 버킷 (Redis 장애 시 대체용)
+
+    스코프별로 limit 크기의 버킷을 두고 윈도우 동안 limit 개의 토큰을 균등하게 채웁니다.
+    프로세스마다 따로 계산되므로 워커가 여러 개면 전체 허용량은 워커 수만큼 늘어납니다.
+    """
+
+    def __init__(self, window_seconds: int = WINDOW_SECONDS, max_keys: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        # 키 -> [남은 토큰, 마지막 갱신 시각] (오래 사용하지 않은 키부터 제거)
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def hit(self, rules: Sequence[RateLimitRule], now: Optional[float] = None) -> RateLimitResult:
+        """모든 스코프에 토큰이 있으면 하나씩 소비합니다. 하나라도 없으면 아무것도 소비하지 않습니다."""
+        if not rules:
+            return RateLimitResult(allowed=True, backend="local")
+        now = time.monotonic() if now is None else now
+
+        buckets = []
+        for rule in rules:
+            bucket = self._buckets.get(rule.key)
+            if bucket is None:
+                bucket = [float(rule.limit), now]
+                self._buckets[rule.key] = bucket
+            else:
+                self._buckets.move_to_end(rule.key)
+                rate = rule.limit / self.window_seconds
+                bucket[0] = min(float(rule.limit), bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            buckets.append(bucket)
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        allowed = all(bucket[0] >= 1 for bucket in buckets)
+        if allowed:
+            for bucket in buckets:
+                bucket[0] -= 1
+
+        used = [rule.limit - bucket[0] for rule, bucket in zip(rules, buckets)]
+        index = min(range(len(rules)), key=lambda i: buckets[i][0])
+        rate = rules[index].limit / self.window_seconds
+        refill_seconds = (rules[index].limit - buckets[index][0]) / rate
+        retry_after = math.ceil(max(0.0, 1 - buckets[index][0]) / rate)
+        return _summarize(
+            rules, used, allowed,
+            reset_time=int(time.time() + refill_seconds),
+            retry_after=max(1, retry_after),
+            backend="local"
+        )
+
+    def clear(self):
+        """모든 버킷을 비웁니다."""
+        self._buckets.clear()
+
+
+class SlidingWindowRateLimiter:
+    """Redis(redis.asyncio) 기반 슬라이딩 윈도우 속도 제한기"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        retry_seconds: Optional[float] = None,
+        fallback: Optional[TokenBucketLimiter] = None
+    ):
+        """
+        속도 제한기 초기화
+
+        Args:
+            redis_url: Redis URL (생략 시 settings.REDIS_URL)
+            timeout: Redis 명령 타임아웃 (초)
+            retry_seconds: Redis 장애 후 재시도까지 대체 제한기를 사용하는 시간 (초)
+            fallback: Redis 장애 시 사용할 토큰 버킷
+        """
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.timeout = timeout if timeout is not None else settings.RATE_LIMIT_REDIS_TIMEOUT_SECONDS
+        self.retry_seconds = retry_seconds if retry_seconds is not None else settings.RATE_LIMIT_REDIS_RETRY_SECONDS
+        self.fallback = fallback or TokenBucketLimiter(max_keys=settings.RATE_LIMIT_FALLBACK_MAX_KEYS)
+        self._client = None
+        self._client_loop_id: Optional[int] = None
+        self._script = None
+        self._redis_disabled_until = 0.0
+
+    def _get_script(self):
+        """현재 이벤트 루프용 Redis 클라이언트와 등록된 스크립트를 반환합니다."""
+        loop_id = id(asyncio.get_running_loop())
+        if self._client is None or self._client_loop_id != loop_id:
+            from .metrics import InstrumentedAsyncRedis
+
+            # redis.asyncio 연결은 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 새로 생성
+            self._client = InstrumentedAsyncRedis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout
+            )
+            self._client_loop_id = loop_id
+            self._script = self._client.register_script(SLIDING_WINDOW_SCRIPT)
+        return self._script
+
+    @property
+    def redis_available(self) -> bool:
+        """Redis 사용 가능 여부 (장애 후 재시도 대기 중이면 False)"""
+        return time.monotonic() >= self._redis_disabled_until
+
+    async def hit(self, rules: Sequence[RateLimitRule]) -> RateLimitResult:
+        """
+        모든 제한을 한 번에 검사하고, 허용되면 모든 카운터를 증가시킵니다.
+
+        Args:
+            rules: 요청에 적용할 제한 목록
+
+        Returns:
+            검사 결과 (Redis 장애 시 토큰 버킷 결과)
+        """
+        if not rules:
+            return RateLimitResult(allowed=True)
+        if not self.redis_available:
+            return self.fallback.hit(rules)
+
+        now = time.time()
+        window_index = int(now // WINDOW_SECONDS)
+        keys = []
+        for rule in rules:
+            keys.append(f"{rule.key}:{window_index}")
+            keys.append(f"{rule.key}:{window_index - 1}")
+        args = [(now % WINDOW_SECONDS) / WINDOW_SECONDS, WINDOW_SECONDS * 2] + [rule.limit for rule in rules]
+
+        try:
+            reply = await self._get_script()(keys=keys, args=args)
+        except Exception as e:
+            self._redis_disabled_until = time.monotonic() + self.retry_seconds
+            logger.warning(f"⚠️ Redis 속도 제한 실패 - {self.retry_seconds}초간 로컬 토큰 버킷 사용: {str(e)}")
+            return self.fallback.hit(rules)
+
+        reset_time = (window_index + 1) * WINDOW_SECONDS
+        return _summarize(
+            rules, [int(count) for count in reply[1:]], bool(int(reply[0])),
+            reset_time=reset_time,
+            retry_after=max(1, reset_time - int(now)),
+            backend="redis"
+        )
+
+    async def close(self):
+        """Redis 연결을 닫습니다."""
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+            self._client_loop_id = None
@@ -0,0 +1,531 @@
+"""
+비동기 SMTP 연결 풀
+
+메일마다 smtplib.SMTP 연결을 새로 열고 STARTTLS/LOGIN을 반복하지 않도록
+릴레이(get_smtp_config(org_id))별로 aiosmtplib 연결을 유지하고 재사용합니다.
+
+- 릴레이별 동시 연결 수 제한 (세마포어)
+- 유휴 연결 재사용, 유휴 시간/연결당 발송 수 초과 시 교체
+- 서버 연결 끊김 시 새 연결로 1회 재시도
+- 저장된 원문(RFC 5322)을 메모리에 올리지 않고 DATA 로 스트리밍 발송 (send_raw)
+  (aiosmtplib 내부 API 는 _RawDataStream 에만 두고, 확인하지 않은 버전이면 sendmail 로 발송)
+- 풀 메트릭 (생성/재사용/재연결/실패/대기 시간)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.message import Message
+from typing import Any, Awaitable, BinaryIO, Callable, Deque, Dict, List, Optional, Tuple
+
+import aiosmtplib
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# 연결을 버리고 새 연결로 재시도해야 하는 오류
+RECONNECT_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPTimeoutError,
+    ConnectionError,
+    asyncio.TimeoutError,
+)
+
+# 암시적 TLS(SMTPS) 포트
+IMPLICIT_TLS_PORT = 465
+
+# 저장된 원문을 DATA 로 보낼 때 읽기 단위
+RAW_SEND_CHUNK_SIZE = 64 * 1024
+
+# DATA 스트리밍에 쓰는 aiosmtplib 프로토콜 내부 API 를 확인한 메이저 버전
+# requirements.txt 의 aiosmtplib 고정 버전(현재 3.0.1)과 맞춰야 하며, 버전을 올릴 때는
+# _RawDataStream 이 쓰는 내부 API 를 확인하고 test_smtp_pool 을 통과시킨 뒤 여기에 추가합니다.
+RAW_STREAM_AIOSMTPLIB_MAJOR_VERSIONS = ("3",)
+
+
+class _RawDataStream:
+    """
+    DATA 단계에서 원문을 청크 단위로 쓰기 위한 aiosmtplib 프로토콜 어댑터
+
+    aiosmtplib 공개 API 는 DATA 본문을 bytes 하나로만 받으므로, 스트리밍에 필요한
+    SMTPProtocol.write/_drain_helper/read_response 사용을 이 클래스 안에 모아 둡니다.
+    supported() 가 False 이면 send_raw 는 공개 API(sendmail) 로 원문을 한 번에 보냅니다.
+    """
+
+    def __init__(self, protocol: Any, timeout: float):
+        self._protocol = protocol
+        self._timeout = timeout
+
+    @staticmethod
+    def supported(client: aiosmtplib.SMTP) -> bool:
+        """설치된 aiosmtplib 버전과 프로토콜 객체가 스트리밍에 필요한 API 를 제공하는지 확인합니다."""
+        major = str(getattr(aiosmtplib, "__version__", "")).split(".")[0]
+        if major not in RAW_STREAM_AIOSMTPLIB_MAJOR_VERSIONS:
+            return False
+        protocol = client.protocol
+        return protocol is None or all(
+            callable(getattr(protocol, name, None)) for name in ("write", "_drain_helper", "read_response")
+        )
+
+    async def write(self, block: bytes):
+        """블록을 쓰고 흐름 제어(FlowControlMixin)로 전송 버퍼가 비워질 때까지 기다립니다."""
+        self._protocol.write(block)
+        await asyncio.wait_for(self._protocol._drain_helper(), timeout=self._timeout)
+
+    async def finish(self) -> Any:
+        """종료 줄(".")을 보내고 DATA 응답을 읽습니다."""
+        self._protocol.write(b".\r\n")
+        return await self._protocol.read_response(timeout=self._timeout)
+
+
+@dataclass
+class _PooledConnection:
+    """풀에서 관리하는 SMTP 연결"""
+    client: aiosmtplib.SMTP
+    created_at: float
+    last_used_at: float
+    messages_sent: int = 0
+
+
+class SMTPConnectionPool:
+    """
+    단일 SMTP 릴레이에 대한 연결 풀
+
+    동일한 이벤트 루프 안에서만 사용합니다. (SMTPPoolManager가 루프별로 풀을 관리)
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        max_connections: int = 5,
+        idle_timeout: float = 60.0,
+        max_messages_per_connection: int = 100,
+        timeout: float = 30.0
+    ):
+        """
+        SMTP 연결 풀 초기화
+
+        Args:
+            host: SMTP 서버 호스트
+            port: SMTP 서버 포트
+            username: SMTP 인증 사용자 (없으면 인증 생략)
+            password: SMTP 인증 비밀번호
+            use_tls: TLS 사용 여부 (465 포트는 암시적 TLS, 그 외는 STARTTLS)
+            max_connections: 릴레이별 최대 동시 연결 수
+            idle_timeout: 유휴 연결 유지 시간 (초)
+            max_messages_per_connection: 연결당 최대 발송 수 (초과 시 연결 교체)
+            timeout: 연결/명령 타임아웃 (초)
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use = 0
+        self._closed = False
+        # 원문 스트리밍 지원 여부 (첫 send_raw 에서 한 번 확인)
+        self._raw_stream_supported: Optional[bool] = None
+
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "reconnects": 0,
+            "expired": 0,
+            "sent": 0,
+            "failures": 0,
+            "wait_count": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    @property
+    def relay(self) -> str:
+        """릴레이 식별 문자열"""
+        return f"{self.host}:{self.port}"
+
+    async def send_message(
+        self,
+        message: Message,
+        sender: Optional[str] = None,
+        recipients: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        풀의 연결로 메시지를 발송합니다.
+
+        연결이 끊겨 있으면 새 연결로 한 번 재시도합니다.
+
+        Args:
+            message: 발송할 MIME 메시지
+            sender: 봉투 발신자 (생략 시 From 헤더)
+            recipients: 봉투 수신자 (생략 시 To/Cc/Bcc 헤더)
+
+        Returns:
+            aiosmtplib send_message 결과 (수신자별 오류, 서버 응답)
+        """
+        async def transmit(client: aiosmtplib.SMTP):
+            return await client.send_message(message, sender=sender, recipients=recipients)
+
+        return await self._send(transmit)
+
+    async def send_raw(
+        self,
+        raw: BinaryIO,
+        sender: str,
+        recipients: List[str]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        이미 작성된 RFC 5322 원문을 DATA 로 스트리밍하여 발송합니다.
+
+        원문 전체를 메모리에 올리지 않고 청크 단위로 읽어 점 문자 보호(dot-stuffing) 후
+        전송하며, 전송 버퍼가 차면 소켓이 비워질 때까지 기다립니다.
+        원문은 항상 파일 처음부터 읽으므로 재연결 후 재시도에도 같은 파일을 그대로 씁니다.
+
+        Args:
+            raw: CRLF 줄바꿈 원문을 읽을 바이너리 파일 (seek 가능)
+            sender: 봉투 발신자
+            recipients: 봉투 수신자
+
+        Returns:
+            (수신자별 거부 응답, DATA 응답 메시지)
+        """
+        size = raw.seek(0, os.SEEK_END)
+
+        async def transmit(client: aiosmtplib.SMTP):
+            raw.seek(0)
+            return await self._transmit_raw(client, raw, size, sender, recipients)
+
+        return await self._send(transmit)
+
+    async def _send(self, transmit: Callable[[aiosmtplib.SMTP], Awaitable[Any]]) -> Any:
+        """연결을 빌려 transmit 을 실행합니다. (연결 끊김 시 새 연결로 1회 재시도)"""
+        if self._closed:
+            raise RuntimeError(f"닫힌 SMTP 연결 풀입니다: {self.relay}")
+
+        wait_started = time.perf_counter()
+        await self._semaphore.acquire()
+        self._record_wait((time.perf_counter() - wait_started) * 1000)
+        self._in_use += 1
+        try:
+            for attempt in range(2):
+                connection = await self._acquire()
+                try:
+                    response = await transmit(connection.client)
+                except RECONNECT_ERRORS as e:
+                    self._discard(connection)
+                    if attempt == 0:
+                        self._stats["reconnects"] += 1
+                        logger.warning(f"🔄 SMTP 연결 끊김 - 재연결 후 재시도: {self.relay}, 오류: {str(e)}")
+                        continue
+                    self._stats["failures"] += 1
+                    raise
+                except aiosmtplib.SMTPException:
+                    self._stats["failures"] += 1
+                    await self._reset_or_discard(connection)
+                    raise
+
+                connection.messages_sent += 1
+                connection.last_used_at = time.monotonic()
+                self._stats["sent"] += 1
+                self._release(connection)
+                return response
+        finally:
+            self._in_use -= 1
+            self._semaphore.release()
+
+    async def _transmit_raw(
+        self,
+        client: aiosmtplib.SMTP,
+        raw: BinaryIO,
+        size: int,
+        sender: str,
+        recipients: List[str]
+    ) -> Tuple[Dict[str, Any], str]:
+        """MAIL/RCPT 후 DATA 단계에서 원문을 청크 단위로 전송합니다."""
+        if client.is_ehlo_or_helo_needed:
+            try:
+                await client.ehlo()
+            except aiosmtplib.SMTPHeloError:
+                await client.helo()
+        options = [f"SIZE={size}"] if client.supports_extension("size") else []
+
+        if self._raw_stream_supported is None:
+            self._raw_stream_supported = _RawDataStream.supported(client)
+            if not self._raw_stream_supported:
+                logger.warning(
+                    f"⚠️ aiosmtplib {aiosmtplib.__version__} 은 원문 스트리밍 미지원 - 원문 전체를 읽어 발송: {self.relay}"
+                )
+        if not self._raw_stream_supported:
+            return await client.sendmail(sender, recipients, raw.read(), mail_options=options)
+
+        await client.mail(sender, options=options)
+
+        refused: Dict[str, Any] = {}
+        for recipient in recipients:
+            try:
+                await client.rcpt(recipient)
+            except aiosmtplib.SMTPRecipientRefused as e:
+                refused[recipient] = (e.code, e.message)
+        if len(refused) == len(recipients):
+            raise aiosmtplib.SMTPRecipientsRefused(
+                [aiosmtplib.SMTPRecipientRefused(code, message, recipient) for recipient, (code, message) in refused.items()]
+            )
+
+        response = await client.execute_command(b"DATA")
+        if response.code != 354:
+            raise aiosmtplib.SMTPDataError(response.code, response.message)
+
+        if client.protocol is None:
+            raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+        stream = _RawDataStream(client.protocol, self.timeout)
+        # 줄 시작의 "." 을 ".." 로 바꾸기 위해 마지막 줄바꿈 이후의 조각은 다음 청크와 합쳐 처리
+        pending = b""
+        while True:
+            chunk = raw.read(RAW_SEND_CHUNK_SIZE)
+            if not chunk:
+                break
+            data = pending + chunk
+            cut = data.rfind(b"\n") + 1
+            if not cut:
+                pending = data
+                continue
+            pending = data[cut:]
+            block = data[:cut].replace(b"\n.", b"\n..")
+            if block.startswith(b"."):
+                block = b"." + block
+            await stream.write(block)
+
+        if pending:
+            if pending.startswith(b"."):
+                pending = b"." + pending
+            await stream.write(pending + b"\r\n")
+        response = await stream.finish()
+        if response.code != 250:
+            raise aiosmtplib.SMTPDataError(response.code, response.message)
+        return refused, response.message
+
+    async def _acquire(self) -> _PooledConnection:
+        """유휴 연결을 꺼내거나 새 연결을 만듭니다."""
+        now = time.monotonic()
+        while self._idle:
+            connection = self._idle.pop()
+            if (
+                not connection.client.is_connected
+                or now - connection.last_used_at > self.idle_timeout
+            ):
+                self._stats["expired"] += 1
+                self._discard(connection)
+                continue
+            self._stats["reused"] += 1
+            return connection
+
+        return await self._connect()
+
+    async def _connect(self) -> _PooledConnection:
+        """새 SMTP 연결을 열고 TLS/인증을 수행합니다."""
+        implicit_tls = self.use_tls and self.port == IMPLICIT_TLS_PORT
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            use_tls=implicit_tls,
+            start_tls=self.use_tls and not implicit_tls,
+            timeout=self.timeout
+        )
+        try:
+            await client.connect()
+            if self.username and self.password:
+                await client.login(self.username, self.password)
+        except Exception:
+            self._stats["failures"] += 1
+            client.close()
+            raise
+
+        self._stats["created"] += 1
+        logger.info(f"🔗 SMTP 풀 연결 생성 - 릴레이: {self.relay}, TLS: {self.use_tls}")
+        now = time.monotonic()
+        return _PooledConnection(client=client, created_at=now, last_used_at=now)
+
+    def _release(self, connection: _PooledConnection):
+        """발송을 마친 연결을 풀에 반납합니다."""
+        if (
+            self._closed
+            or connection.messages_sent >= self.max_messages_per_connection
+            or not connection.client.is_connected
+        ):
+            self._discard(connection)
+            return
+        self._idle.append(connection)
+
+    async def _reset_or_discard(self, connection: _PooledConnection):
+        """서버가 거부한 트랜잭션 이후 RSET으로 연결을 재사용 가능한 상태로 되돌립니다."""
+        try:
+            await connection.client.rset()
+        except Exception:
+            self._discard(connection)
+            return
+        connection.last_used_at = time.monotonic()
+        self._release(connection)
+
+    def _discard(self, connection: _PooledConnection):
+        """연결을 닫고 버립니다."""
+        try:
+            connection.client.close()
+        except Exception:
+            pass
+
+    def _record_wait(self, wait_ms: float):
+        """연결 대기 시간을 기록합니다."""
+        self._stats["wait_count"] += 1
+        self._stats["total_wait_ms"] += wait_ms
+        self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+
+    async def close(self):
+        """모든 유휴 연결을 QUIT으로 종료합니다."""
+        self._closed = True
+        while self._idle:
+            connection = self._idle.pop()
+            try:
+                await connection.client.quit()
+            except Exception:
+                self._discard(connection)
+
+    def metrics(self) -> Dict[str, Any]:
+        """풀 메트릭을 반환합니다."""
+        wait_count = self._stats["wait_count"]
+        return {
+            "relay": self.relay,
+            "max_connections": self.max_connections,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "created": self._stats["created"],
+            "reused": self._stats["reused"],
+            "reconnects": self._stats["reconnects"],
+            "expired": self._stats["expired"],
+            "sent": self._stats["sent"],
+            "failures": self._stats["failures"],
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / wait_count, 3) if wait_count else 0.0,
+            "max_wait_ms": round(self._stats["max_wait_ms"], 3),
+        }
+
+
+class SMTPPoolManager:
+    """
+    릴레이별 SMTP 연결 풀 관리자
+
+    get_smtp_config(org_id)가 반환하는 (호스트, 포트, 사용자, TLS) 조합마다 하나의 풀을 유지합니다.
+    풀은 이벤트 루프에 묶이므로 루프가 바뀌면 새 풀을 만듭니다.
+    """
+
+    def __init__(self):
+        self._pools: Dict[Tuple[Any, ...], SMTPConnectionPool] = {}
+
+    def get_pool(self, org_id: Optional[str] = None) -> SMTPConnectionPool:
+        """
+        조직의 SMTP 설정에 해당하는 풀을 반환합니다.
+
+        Args:
+            org_id: 조직 ID
+
+        Returns:
+            SMTP 연결 풀
+        """
+        smtp_config = settings.get_smtp_config(org_id)
+        loop = asyncio.get_running_loop()
+        key = (
+            id(loop),
+            smtp_config["host"],
+            smtp_config["port"],
+            smtp_config.get("user"),
+            smtp_config.get("use_tls", False),
+        )
+        pool = self._pools.get(key)
+        if pool is None:
+            # 종료된 이벤트 루프의 풀은 정리
+            for stale_key in [k for k in self._pools if k[0] != id(loop)]:
+                self._pools.pop(stale_key, None)
+
+            pool = SMTPConnectionPool(
+                host=smtp_config["host"],
+                port=smtp_config["port"],
+                username=smtp_config.get("user"),
+                password=smtp_config.get("password"),
+                use_tls=smtp_config.get("use_tls", False),
+                max_connections=settings.SMTP_POOL_MAX_CONNECTIONS,
+                idle_timeout=settings.SMTP_POOL_IDLE_TIMEOUT_SECONDS,
+                max_messages_per_connection=settings.SMTP_POOL_MAX_MESSAGES_PER_CONNECTION,
+                timeout=settings.SMTP_TIMEOUT_SECONDS
+            )
+            self._pools[key] = pool
+            logger.info(f"🧰 SMTP 연결 풀 생성 - 릴레이: {pool.relay}, 최대 연결: {pool.max_connections}")
+        return pool
+
+    async def send_message(
+        self,
+        message: Message,
+        org_id: Optional[str] = None,
+        sender: Optional[str] = None,
+        recipients: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        조직의 릴레이 풀로 메시지를 발송합니다.
+
+        Args:
+            message: 발송할 MIME 메시지
+            org_id: 조직 ID
+            sender: 봉투 발신자
+            recipients: 봉투 수신자
+
+        Returns:
+            aiosmtplib send_message 결과
+        """
+        return await self.get_pool(org_id).send_message(message, sender=sender, recipients=recipients)
+
+    async def send_raw(
+        self,
+        raw: BinaryIO,
+        sender: str,
+        recipients: List[str],
+        org_id: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        조직의 릴레이 풀로 저장된 원문을 스트리밍 발송합니다.
+
+        Args:
+            raw: 원문 바이너리 파일
+            sender: 봉투 발신자
+            recipients: 봉투 수신자
+            org_id: 조직 ID
+
+        Returns:
+            (수신자별 거부 응답, DATA 응답 메시지)
+        """
+        return await self.get_pool(org_id).send_raw(raw, sender, recipients)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """모든 풀의 메트릭을 반환합니다."""
+        return [pool.metrics() for pool in self._pools.values()]
+
+    async def close_all(self):
+        """모든 풀의 연결을 종료합니다."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.close()
+
+
+# 전역 SMTP 풀 관리자
+smtp_pool_manager = SMTPPoolManager()
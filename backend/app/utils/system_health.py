@@ -0,0 +1,181 @@
+"""
+시스템 상태 백그라운드 수집기
+
+워커 프로세스마다 일정 주기로 CPU/메모리/디스크, DB 연결 풀 상태, Redis 접속 클라이언트 수,
+메일 발송 큐 깊이를 수집하여 링 버퍼에 보관합니다.
+- 대시보드/헬스 체크는 요청 중에 측정하지 않고 latest() 의 최근 값을 바로 반환합니다.
+- history() 로 최근 샘플 시계열을 조회할 수 있습니다.
+- start()/stop(): 애플리케이션 lifespan 에서 수집 태스크를 시작/종료합니다.
+
+CPU 사용률은 직전 샘플 이후 구간의 값(psutil.cpu_percent(interval=None))이므로 요청을 막지 않습니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+import psutil
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_stats(engine) -> Optional[Dict[str, int]]:
+    """SQLAlchemy 연결 풀 상태 (QueuePool 계열이 아니면 None)"""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+def sample_host() -> Dict[str, Any]:
+    """CPU/메모리/디스크 사용률과 DB 연결 풀 상태를 측정합니다. (대기 없이 즉시 반환)"""
+    from ..database.user import async_engine, engine
+
+    disk = psutil.disk_usage(settings.SYSTEM_HEALTH_DISK_PATH)
+    pools = {"sync": _pool_stats(engine), "async": _pool_stats(async_engine.sync_engine)}
+    return {
+        "cpu_usage_percent": round(psutil.cpu_percent(interval=None), 2),
+        "memory_usage_percent": round(psutil.virtual_memory().percent, 2),
+        "disk_usage_percent": round(disk.used / disk.total * 100, 2) if disk.total else 0.0,
+        "db_pools": pools,
+        "db_connections": sum(pool["checked_out"] for pool in pools.values() if pool),
+    }
+
+
+class SystemHealthSampler:
+    """시스템 상태 주기 수집기 (워커 프로세스별)"""
+
+    def __init__(self, interval_seconds: Optional[float] = None, history_size: Optional[int] = None,
+                 redis_url: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        수집기 초기화
+
+        Args:
+            interval_seconds: 수집 주기 (초)
+            history_size: 보관할 샘플 수 (링 버퍼 크기)
+            redis_url: 접속 클라이언트 수를 조회할 Redis URL
+            timeout: Redis/큐 조회 제한 시간 (초)
+        """
+        self.interval_seconds = interval_seconds or settings.SYSTEM_HEALTH_SAMPLE_INTERVAL_SECONDS
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.timeout = timeout or settings.SYSTEM_HEALTH_SAMPLE_TIMEOUT_SECONDS
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=history_size or settings.SYSTEM_HEALTH_HISTORY_SIZE)
+        self._task: Optional[asyncio.Task] = None
+        self._client = None
+        self._client_loop_id: Optional[int] = None
+        self.failures = 0
+
+    def _get_client(self):
+        """현재 이벤트 루프용 Redis 클라이언트를 반환합니다."""
+        loop_id = id(asyncio.get_running_loop())
+        if self._client is None or self._client_loop_id != loop_id:
+            from .metrics import InstrumentedAsyncRedis
+
+            # redis.asyncio 연결은 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 새로 생성
+            self._client = InstrumentedAsyncRedis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout
+            )
+            self._client_loop_id = loop_id
+        return self._client
+
+    async def _redis_clients(self) -> Optional[int]:
+        """Redis 접속 클라이언트 수 (조회 실패 시 None)"""
+        try:
+            info = await asyncio.wait_for(self._get_client().info("clients"), self.timeout)
+            return int(info.get("connected_clients", 0))
+        except Exception:
+            return None
+
+    async def _mail_queue(self) -> Optional[Dict[str, Any]]:
+        """메일 발송 큐 깊이 (조회 실패 시 None)"""
+        try:
+            from ..service.mail_queue_service import get_mail_queue
+
+            return await asyncio.wait_for(get_mail_queue().stats(), self.timeout)
+        except Exception:
+            return None
+
+    async def sample(self) -> Dict[str, Any]:
+        """한 번 수집하여 링 버퍼에 추가하고 샘플을 반환합니다."""
+        started = time.perf_counter()
+        host = await asyncio.to_thread(sample_host)
+        redis_clients, mail_queue = await asyncio.gather(self._redis_clients(), self._mail_queue())
+
+        queue_size = 0
+        if mail_queue:
+            queue_size = sum(int(mail_queue.get(key, 0)) for key in ("ready", "delayed", "processing"))
+
+        snapshot = {
+            "sampled_at": datetime.now(timezone.utc).isoformat(),
+            **host,
+            "redis_connected_clients": redis_clients,
+            "mail_queue": mail_queue,
+            "email_queue_size": queue_size,
+            "active_connections": host["db_connections"] + (redis_clients or 0),
+            "sample_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        self._history.append(snapshot)
+        return snapshot
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """가장 최근 샘플 (아직 수집 전이면 None)"""
+        return self._history[-1] if self._history else None
+
+    def history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """최근 샘플 목록 (오래된 순)"""
+        samples = list(self._history)
+        return samples[-limit:] if limit else samples
+
+    async def _run(self) -> None:
+        """주기적으로 수집합니다. 수집 실패는 기록만 하고 다음 주기에 다시 시도합니다."""
+        while True:
+            try:
+                await self.sample()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"⚠️ 시스템 상태 수집 실패: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def start(self) -> None:
+        """수집 태스크를 시작합니다."""
+        if self._task is None or self._task.done():
+            # 첫 cpu_percent(interval=None) 호출은 기준점만 잡으므로 미리 호출
+            psutil.cpu_percent(interval=None)
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🩺 시스템 상태 수집 시작 - 주기: {self.interval_seconds}초")
+
+    async def stop(self) -> None:
+        """수집 태스크를 종료하고 연결을 닫습니다."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+            self._client_loop_id = None
+
+
+# 전역 시스템 상태 수집기
+system_health_sampler = SystemHealthSampler()
@@ -0,0 +1,137 @@
+"""
+비동기 DB 세션 처리량 비교 스크립트
+
+async 핸들러에서 같은 쿼리를 다음 방식으로 실행할 때 동시 요청 처리량을 비교합니다.
+- 동기 Session: psycopg2 호출이 이벤트 루프를 막아 워커의 모든 요청이 직렬화됨 (기존 방식)
+- AsyncSession: asyncpg 로 대기 중 다른 요청을 처리 (get_async_db)
+
+각 요청은 SELECT pg_sleep(--delay) 로 느린 쿼리를 흉내냅니다.
+(SQLite에서는 pg_sleep 이 없으므로 SELECT 1 을 실행하며 차이가 작게 나타납니다.)
+
+사용 예:
+    python async_db_benchmark.py --requests 2000 --concurrency 200 --delay 0.02
+
+주의: settings.DATABASE_URL 의 데이터베이스에 접속하며 데이터는 변경하지 않습니다.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+from typing import List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.user import async_engine, engine, get_async_db, get_db
+
+
+class AsyncDBBenchmark:
+    """동기/비동기 DB 세션 처리량 비교 클래스"""
+
+    def __init__(self, requests: int, concurrency: int, delay: float):
+        self.requests = requests
+        self.concurrency = concurrency
+        if engine.dialect.name == "postgresql":
+            self.query = text("SELECT pg_sleep(:delay)").bindparams(delay=delay)
+        else:
+            print("ℹ️ PostgreSQL 이 아니므로 pg_sleep 대신 SELECT 1 을 실행합니다.")
+            self.query = text("SELECT 1")
+        self.throughput = {}
+        self.app = self._build_app()
+
+    def _build_app(self) -> FastAPI:
+        """같은 쿼리를 동기/비동기 세션으로 실행하는 두 엔드포인트"""
+        app = FastAPI()
+        query = self.query
+
+        @app.get("/sync")
+        async def sync_session_endpoint(db: Session = Depends(get_db)):
+            db.execute(query)
+            return {"ok": True}
+
+        @app.get("/async")
+        async def async_session_endpoint(db: AsyncSession = Depends(get_async_db)):
+            await db.execute(query)
+            return {"ok": True}
+
+        return app
+
+    async def measure(self, name: str, path: str) -> List[float]:
+        """path 로 요청을 concurrency 개씩 동시에 보내며 요청별 지연 시간(초)을 반환합니다."""
+        print(f"⏱️ {name} 측정 ({self.requests}회, 동시 {self.concurrency})")
+        durations: List[float] = []
+        semaphore = asyncio.Semaphore(self.concurrency)
+        transport = httpx.ASGITransport(app=self.app)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def one():
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    durations.append(time.perf_counter() - started)
+
+            await client.get(path)  # 워밍업 (연결 풀 생성)
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(self.requests)))
+            elapsed = time.perf_counter() - started
+
+        self.throughput[name] = self.requests / elapsed
+        print(f"   처리량: {self.throughput[name]:,.0f} req/s")
+        return durations
+
+    def analyze_performance(self, method_name: str, durations: List[float]):
+        """성능 분석"""
+        if not durations:
+            print(f"❌ {method_name}: 측정 데이터 없음")
+            return
+        ordered = sorted(durations)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(f"\n📊 {method_name} 성능 분석:")
+        print(f"   총 실행 횟수: {len(durations)}")
+        print(f"   평균 시간: {statistics.mean(durations) * 1000:.3f}ms")
+        print(f"   중간값: {statistics.median(durations) * 1000:.3f}ms")
+        print(f"   p99: {p99 * 1000:.3f}ms")
+        print(f"   최대 시간: {max(durations) * 1000:.3f}ms")
+
+    async def run(self):
+        """전체 비교 실행"""
+        results = {}
+        for name, path in (("동기 Session (기존)", "/sync"), ("AsyncSession", "/async")):
+            results[name] = await self.measure(name, path)
+
+        for name, durations in results.items():
+            self.analyze_performance(name, durations)
+
+        print("\n🔍 처리량 비교:")
+        baseline = self.throughput["동기 Session (기존)"]
+        for name, value in self.throughput.items():
+            print(f"   {name}: {value:,.0f} req/s ({value / baseline:.1f}x)")
+
+        await async_engine.dispose()
+        engine.dispose()
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="동기/비동기 DB 세션 처리량 비교")
+    parser.add_argument("--requests", type=int, default=2000, help="방식별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=200, help="동시 요청 수")
+    parser.add_argument("--delay", type=float, default=0.02, help="요청당 쿼리 시간 (초, PostgreSQL pg_sleep)")
+    args = parser.parse_args()
+
+    benchmark = AsyncDBBenchmark(args.requests, args.concurrency, args.delay)
+    asyncio.run(benchmark.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+요청당 로깅 비용 비교 스크립트
+
+요청 하나가 남기는 로그(요청/응답 로그, 테넌트 미들웨어, 라우터 INFO/DEBUG)를 같은 순서로 기록할 때
+요청 처리 스레드가 로깅에 쓰는 시간을 비교합니다.
+- 기존 방식: 루트 DEBUG + 콘솔/파일 핸들러에 동기 기록 (텍스트 형식)
+- 큐 방식: setup_logging() 의 QueueHandler/QueueListener + structlog JSON (출력은 리스너 스레드)
+
+사용 예:
+    python logging_benchmark.py --requests 20000 --disk-latency-ms 0.2
+
+--disk-latency-ms 는 파일 기록마다 지연을 넣어 느린 디스크를 흉내냅니다.
+콘솔 출력은 os.devnull 로 보냅니다.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import logging_config
+from app.logging_config import setup_logging, shutdown_logging
+
+request_logger = logging.getLogger("main")
+tenant_logger = logging.getLogger("app.middleware.tenant_middleware")
+router_logger = logging.getLogger("app.router.mail_core_router")
+
+
+def _simulated_request(i: int) -> None:
+    """요청 하나가 남기는 로그를 흉내냅니다."""
+    path = "/api/v1/mail/send"
+    request_logger.info(f"📥 POST {path} - IP: 10.0.0.{i % 250}")
+    tenant_logger.debug(f"🔍 테넌트 미들웨어 요청 처리 시작 - 경로: {path}, 메서드: POST")
+    tenant_logger.info(f"🏢 테넌트 식별 완료 - org_code: org{i % 20}, org_id: {i % 20}")
+    router_logger.info(f"📤 메일 발송 시작 - 조직: {i % 20}, 사용자: user{i}@example.org, 수신자: a@example.org")
+    router_logger.debug(f"🔍 첨부파일 정보 - 타입: {type(None)}, 값: None")
+    router_logger.info(f"📮 메일 발송 대기열 등록 - 조직: {i % 20}, 메일 ID: mail_{i}, 수신자 수: 1, 첨부파일 수: 0")
+    request_logger.info(f"📤 POST {path} - Status: 200 - Time: 0.012s")
+
+
+def _add_disk_latency(handler: logging.Handler, latency_ms: float) -> None:
+    """파일 핸들러 기록마다 지연을 추가합니다."""
+    if latency_ms <= 0:
+        return
+    emit = handler.emit
+
+    def slow_emit(record):
+        time.sleep(latency_ms / 1000)
+        emit(record)
+
+    handler.emit = slow_emit
+
+
+def _setup_legacy(log_dir: str, console, latency_ms: float) -> Callable[[], None]:
+    """기존 setup_logging() 과 같은 동기 핸들러 구성"""
+    root = logging.getLogger()
+    root.handlers = []
+    root.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+    console_handler = logging.StreamHandler(console)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+    file_handler = logging.FileHandler(os.path.join(log_dir, "legacy.log"), encoding="utf-8")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+    _add_disk_latency(file_handler, latency_ms)
+    root.addHandler(console_handler)
+    root.addHandler(file_handler)
+
+    def teardown():
+        root.handlers = []
+        file_handler.close()
+    return teardown
+
+
+def _setup_queue(log_dir: str, console, latency_ms: float) -> Callable[[], None]:
+    """큐 기반 structlog JSON 파이프라인"""
+    setup_logging(log_dir=log_dir, console_stream=console)
+    for handler in logging_config._listener.handlers:
+        if isinstance(handler, logging.FileHandler):
+            _add_disk_latency(handler, latency_ms)
+    return shutdown_logging
+
+
+def _measure(requests: int, setup: Callable, latency_ms: float) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w", encoding="utf-8") as console:
+        teardown = setup(log_dir, console, latency_ms)
+        # 준비 운동
+        for i in range(100):
+            _simulated_request(i)
+
+        durations: List[float] = []
+        started = time.perf_counter()
+        for i in range(requests):
+            t0 = time.perf_counter()
+            _simulated_request(i)
+            durations.append(time.perf_counter() - t0)
+        request_elapsed = time.perf_counter() - started
+
+        # 큐 방식은 남은 로그를 모두 기록할 때까지의 시간도 측정
+        drain_started = time.perf_counter()
+        teardown()
+        drain_elapsed = time.perf_counter() - drain_started
+
+    durations.sort()
+    return {
+        "mean_us": statistics.fmean(durations) * 1e6,
+        "p50_us": durations[len(durations) // 2] * 1e6,
+        "p99_us": durations[int(len(durations) * 0.99) - 1] * 1e6,
+        "request_total_s": request_elapsed,
+        "drain_s": drain_elapsed,
+    }
+
+
+def _print(name: str, result: Dict[str, float]) -> None:
+    print(f"{name:<10} 요청당 평균 {result['mean_us']:8.1f}µs  p50 {result['p50_us']:8.1f}µs  "
+          f"p99 {result['p99_us']:8.1f}µs  요청 처리 {result['request_total_s']:.2f}s  "
+          f"남은 로그 기록 {result['drain_s']:.2f}s")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="요청당 로깅 비용 비교")
+    parser.add_argument("--requests", type=int, default=20000, help="방식별 요청 수")
+    parser.add_argument("--disk-latency-ms", type=float, default=0.0, help="파일 기록마다 추가할 지연 (ms)")
+    args = parser.parse_args()
+
+    print(f"📊 요청 {args.requests}개, 요청당 로그 7줄 (INFO 5, DEBUG 2), 디스크 지연 {args.disk_latency_ms}ms")
+    _print("기존 방식", _measure(args.requests, _setup_legacy, args.disk_latency_ms))
+    _print("큐 방식", _measure(args.requests, _setup_queue, args.disk_latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import time
 import logging
 import platform
 import asyncio
+from datetime import datetime, timezone
 
 # 라우터 임포트
 from app.router.auth_router import router as auth_router
@@ -39,13 +40,18 @@ from app.router.test_csv_router import router as test_csv_router
 # 데이터베이스 및 설정
 from app.database.user import engine, Base
 from app.config import settings
-from app.logging_config import setup_logging, get_logger
+from app.logging_config import setup_logging, shutdown_logging, get_logger
 
 # 미들웨어
 from app.middleware.tenant_middleware import TenantMiddleware
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from app.tasks.usage_reset import reset_daily_email_usage
+from app.tasks.folder_counter_reconcile import reconcile_folder_counter_table
+from app.tasks.usage_flush import flush_usage_counters, reconcile_usage_counters
+from app.tasks.activity_rollup import rollup_activity_logs
+from app.utils.cluster_scheduler import cluster_scheduler
+from app.utils.system_health import system_health_sampler
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -54,20 +60,76 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 SkyBoot Mail SaaS 애플리케이션 시작")
 
     # APScheduler 초기화 및 자정 리셋 잡 등록 (테스트 환경에서는 비활성화)
+    # 모든 워커/노드가 같은 작업을 등록하고, 작업별 Redis 임대를 가진 인스턴스만 실행
     scheduler = None
     if not settings.is_testing():
         logger.info("🗓️ APScheduler 초기화")
-        scheduler = AsyncIOScheduler(timezone="Asia/Seoul")
+        scheduler = cluster_scheduler
         scheduler.add_job(
             reset_daily_email_usage,
             CronTrigger(hour=0, minute=0),
             id="reset_daily_email_usage",
-            replace_existing=True
+            max_instances=1,
+            coalesce=True
+        )
+        scheduler.add_job(
+            reconcile_folder_counter_table,
+            CronTrigger.from_crontab(settings.FOLDER_COUNTER_RECONCILE_CRON, timezone="Asia/Seoul"),
+            id="reconcile_folder_counters",
+            max_instances=1,
+            coalesce=True
+        )
+        scheduler.add_job(
+            flush_usage_counters,
+            IntervalTrigger(seconds=settings.USAGE_FLUSH_INTERVAL_SECONDS),
+            id="flush_usage_counters",
+            max_instances=1,
+            coalesce=True
+        )
+        # 시작 직후 한 번 실행하여 이전 프로세스가 기록하지 못한 카운터를 반영
+        scheduler.add_job(
+            reconcile_usage_counters,
+            IntervalTrigger(seconds=settings.USAGE_RECONCILE_INTERVAL_SECONDS),
+            id="reconcile_usage_counters",
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(timezone.utc)
+        )
+        scheduler.add_job(
+            rollup_activity_logs,
+            IntervalTrigger(seconds=settings.ACTIVITY_ROLLUP_INTERVAL_SECONDS),
+            id="rollup_activity_logs",
+            max_instances=1,
+            coalesce=True
         )
         scheduler.start()
-        logger.info("✅ APScheduler 시작 및 자정 리셋 잡 등록 완료")
+        logger.info("✅ APScheduler 시작 및 자정 리셋/폴더 카운터 보정/사용량 기록/활동 로그 집계 잡 등록 완료")
     else:
         logger.info("🧪 테스트 환경 - APScheduler 비활성화")
+
+    # 다른 워커의 캐시 무효화 메시지 구독 (조직 정보 등 로컬 캐시)
+    if not settings.is_testing():
+        from app.utils.cache_invalidation import cache_invalidation_bus
+        await cache_invalidation_bus.start()
+
+    # 시스템 상태 백그라운드 수집 (대시보드/헬스 체크는 최근 샘플을 바로 반환)
+    if not settings.is_testing():
+        await system_health_sampler.start()
+
+    # API 프로세스 내 메일 발송 워커 (memory 큐는 같은 프로세스에서만 소비 가능)
+    mail_workers = []
+    mail_worker_tasks = []
+    if not settings.is_testing():
+        from app.tasks.mail_delivery import MailDeliveryWorker
+        inprocess_workers = settings.MAIL_QUEUE_INPROCESS_WORKERS
+        if not inprocess_workers and settings.MAIL_QUEUE_BACKEND == "memory":
+            inprocess_workers = 1
+        for _ in range(inprocess_workers):
+            worker = MailDeliveryWorker()
+            mail_workers.append(worker)
+            mail_worker_tasks.append(asyncio.create_task(worker.run()))
+        if mail_workers:
+            logger.info(f"📮 프로세스 내 메일 발송 워커 시작 - {len(mail_workers)}개")
     
     # 데이터베이스 테이블 생성 (필요시 수동으로 실행)
     # logger.info("🗄️ 데이터베이스 테이블 생성 시작")
@@ -100,13 +162,78 @@ async def lifespan(app: FastAPI):
     try:
         if scheduler:
             logger.info("🛑 APScheduler 종료 시도")
-            scheduler.shutdown(wait=False)
+            await scheduler.shutdown()
             logger.info("✅ APScheduler 종료 완료")
         else:
             logger.info("🧪 테스트 환경 - APScheduler 종료 스킵")
     except Exception:
         logger.warning("⚠️ APScheduler 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
 
+    try:
+        for worker in mail_workers:
+            worker.stop()
+        if mail_worker_tasks:
+            await asyncio.wait(mail_worker_tasks, timeout=settings.MAIL_QUEUE_POLL_SECONDS + 5)
+            logger.info("✅ 프로세스 내 메일 발송 워커 종료 완료")
+    except Exception:
+        logger.warning("⚠️ 메일 발송 워커 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        from app.utils.smtp_pool import smtp_pool_manager
+        await smtp_pool_manager.close_all()
+        logger.info("✅ SMTP 연결 풀 종료 완료")
+    except Exception:
+        logger.warning("⚠️ SMTP 연결 풀 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        from app.utils.clamd_pool import clamd_pool_manager
+        await clamd_pool_manager.close_all()
+        logger.info("✅ clamd 연결 풀 종료 완료")
+    except Exception:
+        logger.warning("⚠️ clamd 연결 풀 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        await system_health_sampler.stop()
+    except Exception:
+        logger.warning("⚠️ 시스템 상태 수집 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        from app.utils.cache_invalidation import cache_invalidation_bus
+        await cache_invalidation_bus.stop()
+    except Exception:
+        logger.warning("⚠️ 캐시 무효화 구독 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        if scheduler:
+            # 마지막 사용량 카운터 기록 후 연결 종료
+            await flush_usage_counters()
+        from app.service.usage_counter_service import usage_counter
+        await usage_counter.close()
+    except Exception:
+        logger.warning("⚠️ 사용량 카운터 기록/종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        from app.middleware.rate_limit_middleware import rate_limit_service
+        await rate_limit_service.limiter.close()
+    except Exception:
+        logger.warning("⚠️ 속도 제한 Redis 연결 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        from app.database.user import async_engine
+        await async_engine.dispose()
+        logger.info("✅ 비동기 DB 연결 풀 종료 완료")
+    except Exception:
+        logger.warning("⚠️ 비동기 DB 연결 풀 종료 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    try:
+        from app.utils.metrics import mark_process_dead
+        mark_process_dead()
+    except Exception:
+        logger.warning("⚠️ 메트릭 파일 정리 중 문제가 발생했지만 서버 종료를 계속 진행합니다")
+
+    # 큐에 남은 로그를 모두 기록한 뒤 로그 리스너 종료 (마지막에 실행)
+    shutdown_logging()
+
 # 로깅 시스템 초기화
 setup_logging()
 logger = get_logger(__name__)
@@ -146,14 +273,14 @@ logger.info("🌐 CORS 미들웨어 설정 완료")
 app.add_middleware(TenantMiddleware)
 logger.info("🏢 테넌트 미들웨어 설정 완료")
 
-# 속도 제한 미들웨어 추가 (함수형) - Redis 연결 성공으로 활성화
+# 속도 제한 미들웨어 추가 (함수형) - Redis 장애 시 프로세스 내 토큰 버킷으로 대체
 from app.middleware.rate_limit_middleware import rate_limit_middleware
 
 @app.middleware("http")
 async def rate_limit_middleware_wrapper(request: Request, call_next):
     return await rate_limit_middleware(request, call_next)
 
-logger.info("🚦 속도 제한 미들웨어 활성화 완료 (Redis 연결 성공)")
+logger.info("🚦 속도 제한 미들웨어 활성화 완료")
 
 # 요청 로깅 미들웨어 (성능 테스트를 위해 임시 비활성화)
 @app.middleware("http")
@@ -181,6 +308,16 @@ async def log_requests(request: Request, call_next):
         logger.error(f"❌ {request.method} {request.url.path} - Error: {str(e)} - Time: {process_time:.3f}s")
         raise
 
+# 요청 메트릭 미들웨어 (가장 바깥에서 경로 템플릿/메서드/상태별 처리 시간 기록)
+from app.utils.metrics import metrics_middleware, metrics_response
+
+if settings.METRICS_ENABLED:
+    @app.middleware("http")
+    async def metrics_middleware_wrapper(request: Request, call_next):
+        return await metrics_middleware(request, call_next)
+
+    logger.info("📈 요청 메트릭 미들웨어 활성화 완료")
+
 # 전역 예외 처리기
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -521,7 +658,28 @@ async def health_check():
 
 @app.get("/health/detailed", summary="상세 헬스체크", description="데이터베이스 연결 등 상세 시스템 상태 확인")
 async def detailed_health_check():
-    return {"status": "ok", "database": "connected"}
+    """백그라운드 수집기의 최근 샘플로 응답합니다. (요청 중에 측정하지 않음)"""
+    snapshot = system_health_sampler.latest()
+    if snapshot is None:
+        return {"status": "ok", "database": "connected", "system": None}
+    return {
+        "status": "ok",
+        "database": "connected",
+        "redis": "connected" if snapshot["redis_connected_clients"] is not None else "disconnected",
+        "system": {
+            key: snapshot[key] for key in (
+                "sampled_at", "cpu_usage_percent", "memory_usage_percent", "disk_usage_percent",
+                "db_connections", "email_queue_size"
+            )
+        }
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 메트릭 (멀티프로세스 모드에서는 모든 워커 합산)"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return metrics_response()
 
 @app.get("/info", summary="시스템 정보", description="시스템 설정 및 환경 정보")
 async def system_info():
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+기존 첨부파일을 조직별 blob 저장소(ATTACHMENT_BLOB_DIR)로 이전하는 스크립트
+
+alembic 마이그레이션(add_attachment_blobs)으로 attachment_blobs 테이블을 만든 뒤 실행합니다.
+배치마다 커밋하므로 중단되면 다시 실행하여 남은 첨부파일부터 이어서 처리할 수 있습니다.
+
+사용 예:
+    python migrate_attachment_blobs.py --batch-size 200
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database.user import SessionLocal
+from app.service.attachment_blob_store import AttachmentBlobStore
+
+
+async def migrate_attachment_blobs(batch_size: int):
+    """첨부파일을 blob 저장소로 이전하고 결과를 출력합니다."""
+    db = SessionLocal()
+    try:
+        print('📦 첨부파일 blob 저장소 이전을 시작합니다...')
+        counts = await AttachmentBlobStore(db).migrate_legacy_attachments(batch_size=batch_size)
+        print(f"✅ 이전 완료 - 이전: {counts['migrated']}건, 기존 blob 재사용: {counts['deduplicated']}건, 파일 없음: {counts['missing']}건")
+    except Exception as e:
+        print(f'❌ 오류: {e}')
+    finally:
+        db.close()
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="기존 첨부파일을 blob 저장소로 이전")
+    parser.add_argument("--batch-size", type=int, default=200, help="배치당 첨부파일 수")
+    args = parser.parse_args()
+    asyncio.run(migrate_attachment_blobs(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+메일 발송 MIME 작성 최대 메모리 비교 스크립트
+
+첨부파일 N개(기본 10 × 10MB)가 있는 메일 한 건을 로컬 SMTP 수신 서버로 보낼 때
+Python 힙 최대 사용량(tracemalloc)과 소요 시간을 비교합니다.
+- 기존 방식: MIMEMultipart + f.read() + encode_base64 후 send_message (메시지 전체를 직렬화)
+- 스트리밍 방식: MimeComposer 로 첨부파일을 청크 단위 base64 인코딩 → 임시 원문 → send_raw 로 DATA 스트리밍
+
+사용 예:
+    python mime_benchmark.py --attachments 10 --size-mb 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Awaitable, Callable, Dict, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.mime_composer import MimeComposer, compose_to_spool
+from app.utils.smtp_pool import SMTPConnectionPool
+
+SENDER = "bench@example.com"
+RECIPIENTS = ["receiver@example.com"]
+
+
+class SinkSMTPServer:
+    """DATA 내용을 버리는 로컬 SMTP 수신 서버"""
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        writer.write(b"220 sink ESMTP\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.strip().upper()
+                if command.startswith((b"EHLO", b"HELO")):
+                    writer.write(b"250-sink\r\n250 SIZE\r\n")
+                elif command == b"DATA":
+                    writer.write(b"354 go ahead\r\n")
+                    await writer.drain()
+                    while await reader.readline() not in (b".\r\n", b""):
+                        pass
+                    writer.write(b"250 OK\r\n")
+                elif command == b"QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def legacy_message(attachments: List[Dict[str, str]]) -> MIMEMultipart:
+    """기존 send_email_smtp 와 같은 방식의 메시지"""
+    msg = MIMEMultipart()
+    msg["From"] = SENDER
+    msg["To"] = ", ".join(RECIPIENTS)
+    msg["Subject"] = "benchmark"
+    msg.attach(MIMEText("본문", "plain", "utf-8"))
+    for attachment in attachments:
+        with open(attachment["file_path"], "rb") as f:
+            part = MIMEBase("application", "octet-stream")
+            part.set_payload(f.read())
+        encoders.encode_base64(part)
+        part.add_header("Content-Disposition", f'attachment; filename="{attachment["filename"]}"')
+        msg.attach(part)
+    return msg
+
+
+async def measure(name: str, send: Callable[[], Awaitable[None]]):
+    """send 1회의 tracemalloc 최대 메모리와 소요 시간을 출력합니다."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    await send()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {name:<10} 최대 메모리: {peak / (1024 * 1024):8.1f} MB   소요 시간: {elapsed:6.2f}초")
+
+
+async def run(attachment_count: int, size_mb: int):
+    with tempfile.TemporaryDirectory() as directory:
+        attachments = []
+        for index in range(attachment_count):
+            path = os.path.join(directory, f"attachment-{index}.bin")
+            with open(path, "wb") as f:
+                for _ in range(size_mb):
+                    f.write(os.urandom(1024 * 1024))
+            attachments.append({"file_path": path, "filename": f"attachment-{index}.bin"})
+
+        server = SinkSMTPServer()
+        await server.start()
+        pool = SMTPConnectionPool("127.0.0.1", server.port)
+        try:
+            async def send_legacy():
+                await pool.send_message(legacy_message(attachments))
+
+            async def send_streaming():
+                composer = MimeComposer(SENDER, RECIPIENTS, "benchmark", body_text="본문", attachments=attachments)
+                raw = await asyncio.to_thread(compose_to_spool, composer)
+                try:
+                    await pool.send_raw(raw, SENDER, RECIPIENTS)
+                finally:
+                    raw.close()
+
+            print(f"📊 첨부파일 {attachment_count}개 × {size_mb}MB 메일 1건 발송")
+            await measure("기존 방식", send_legacy)
+            await measure("스트리밍", send_streaming)
+        finally:
+            await pool.close()
+            await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIME 작성 최대 메모리 비교")
+    parser.add_argument("--attachments", type=int, default=10, help="첨부파일 수")
+    parser.add_argument("--size-mb", type=int, default=10, help="첨부파일 하나의 크기 (MB)")
+    args = parser.parse_args()
+    asyncio.run(run(args.attachments, args.size_mb))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 """
 조직 사용량 업데이트 성능 비교 스크립트
 
-기존 방식 vs 새로운 UPSERT 방식의 성능을 비교합니다.
+PostgreSQL UPSERT, Redis 락, Redis 카운터 + 일괄 기록(write-behind) 방식의 성능을 비교합니다.
+동시 실행 테스트는 작업마다 별도 스레드/DB 세션을 사용하여 같은 조직 행에 동시에 쓰는 상황을 재현합니다.
 """
 
 import asyncio
 import time
 import statistics
-from typing import List
+from typing import Dict, List
 import sys
 import os
 
@@ -15,7 +16,15 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.database.mail import get_db
+from app.database.user import get_db_session
 from app.service.mail_service import MailService
+from app.service.usage_counter_service import UsageCounter, write_usage_snapshots
+
+STRATEGIES = {
+    "upsert": "UPSERT 방식",
+    "redis_lock": "Redis 락 방식",
+    "redis_counter": "Redis 카운터 + 일괄 기록",
+}
 
 
 class PerformanceComparator:
@@ -25,6 +34,16 @@ class PerformanceComparator:
         self.db = next(get_db())
         self.mail_service = MailService(self.db)
         self.test_org_id = "test_org_performance"
+        self.usage_counter = UsageCounter()
+    
+    async def _seed_from_db(self):
+        return 0, 0
+    
+    async def _write_snapshots(self, snapshots):
+        def write():
+            with get_db_session() as db:
+                write_usage_snapshots(db, snapshots)
+        await asyncio.to_thread(write)
     
     async def test_upsert_method(self, iterations: int = 100) -> List[float]:
         """새로운 UPSERT 방식 테스트"""
@@ -36,7 +55,7 @@ class PerformanceComparator:
             start_time = time.time()
             
             try:
-                await self.mail_service._update_organization_usage(
+                await self.mail_service._upsert_organization_usage(
                     org_id=self.test_org_id,
                     email_count=1
                 )
@@ -80,40 +99,93 @@ class PerformanceComparator:
         
         return durations
     
-    async def test_concurrent_upsert(self, concurrent_tasks: int = 10, iterations_per_task: int = 10) -> List[float]:
-        """동시 UPSERT 테스트"""
-        print(f"⚡ 동시 UPSERT 테스트 시작 ({concurrent_tasks}개 작업, 각 {iterations_per_task}회)")
-        
-        async def single_task(task_id: int) -> List[float]:
-            task_durations = []
-            for i in range(iterations_per_task):
-                start_time = time.time()
+    async def test_redis_counter_method(self, iterations: int = 100) -> List[float]:
+        """Redis 카운터 + 일괄 기록 방식 테스트 (발송 시에는 Redis 만 갱신)"""
+        print(f"🧮 Redis 카운터 방식 테스트 시작 ({iterations}회)")
+        
+        durations = []
+        
+        for i in range(iterations):
+            start_time = time.time()
+            
+            try:
+                value = await self.usage_counter.commit_sent(self.test_org_id, 1, self._seed_from_db)
+                if value is None:
+                    print("❌ Redis 카운터를 사용할 수 없습니다.")
+                    break
                 
-                try:
-                    await self.mail_service._update_organization_usage(
-                        org_id=f"{self.test_org_id}_{task_id}",
-                        email_count=1
-                    )
-                    
-                    end_time = time.time()
-                    duration = end_time - start_time
-                    task_durations.append(duration)
+                end_time = time.time()
+                duration = end_time - start_time
+                durations.append(duration)
+                
+                if (i + 1) % 20 == 0:
+                    print(f"   진행률: {i + 1}/{iterations} ({duration:.4f}초)")
                     
-                except Exception as e:
-                    print(f"❌ 동시 UPSERT 오류 (작업 {task_id}, 반복 {i + 1}): {str(e)}")
-            
-            return task_durations
+            except Exception as e:
+                print(f"❌ Redis 카운터 테스트 오류 (반복 {i + 1}): {str(e)}")
+        
+        await self.measure_flush()
+        return durations
+    
+    async def measure_flush(self):
+        """누적된 Redis 카운터를 organization_usage 에 기록하는 시간 측정"""
+        if not self.usage_counter.redis_available:
+            return
+        start_time = time.time()
+        flushed = await self.usage_counter.flush(self._write_snapshots)
+        print(f"   일괄 기록: 카운터 {flushed}개, {time.time() - start_time:.4f}초")
+    
+    def _run_concurrent_worker(self, strategy: str, iterations: int) -> List[float]:
+        """별도 스레드/이벤트 루프/DB 세션에서 한 작업을 실행합니다."""
+        async def worker() -> List[float]:
+            db = next(get_db())
+            service = MailService(db)
+            counter = UsageCounter()
+            durations = []
+            try:
+                for i in range(iterations):
+                    start_time = time.time()
+                    try:
+                        if strategy == "upsert":
+                            await service._upsert_organization_usage(org_id=self.test_org_id, email_count=1)
+                        elif strategy == "redis_lock":
+                            await service._update_organization_usage_with_redis_lock(org_id=self.test_org_id, email_count=1)
+                        else:
+                            if await counter.commit_sent(self.test_org_id, 1, self._seed_from_db) is None:
+                                raise RuntimeError("Redis 카운터를 사용할 수 없습니다.")
+                        durations.append(time.time() - start_time)
+                    except Exception as e:
+                        print(f"❌ 동시 {STRATEGIES[strategy]} 오류 (반복 {i + 1}): {str(e)}")
+            finally:
+                await counter.close()
+                db.close()
+            return durations
         
-        # 동시 작업 실행
-        tasks = [single_task(task_id) for task_id in range(concurrent_tasks)]
-        results = await asyncio.gather(*tasks)
+        return asyncio.run(worker())
+    
+    async def test_concurrent_strategy(self, strategy: str, concurrent_tasks: int = 10,
+                                       iterations_per_task: int = 10) -> Dict[str, object]:
+        """같은 조직에 대한 동시 업데이트 테스트"""
+        print(f"⚡ 동시 {STRATEGIES[strategy]} 테스트 시작 ({concurrent_tasks}개 작업, 각 {iterations_per_task}회)")
+        
+        start_time = time.time()
+        results = await asyncio.gather(*[
+            asyncio.to_thread(self._run_concurrent_worker, strategy, iterations_per_task)
+            for _ in range(concurrent_tasks)
+        ])
+        elapsed = time.time() - start_time
+        if strategy == "redis_counter":
+            await self.measure_flush()
         
         # 모든 결과 합치기
         all_durations = []
         for task_durations in results:
             all_durations.extend(task_durations)
         
-        return all_durations
+        return {
+            "durations": all_durations,
+            "throughput": len(all_durations) / elapsed if elapsed > 0 else 0.0,
+        }
     
     def analyze_performance(self, method_name: str, durations: List[float]):
         """성능 분석"""
@@ -181,12 +253,28 @@ class PerformanceComparator:
         redis_durations = await self.test_redis_lock_method(100)
         self.analyze_performance("Redis 락 방식", redis_durations)
         
-        # 3. 동시 실행 테스트
-        concurrent_durations = await self.test_concurrent_upsert(10, 10)
-        self.analyze_performance("동시 UPSERT (10개 작업)", concurrent_durations)
+        # 3. Redis 카운터 방식 테스트
+        counter_durations = await self.test_redis_counter_method(100)
+        self.analyze_performance("Redis 카운터 방식", counter_durations)
         
         # 4. 방식 간 비교
         self.compare_methods(upsert_durations, redis_durations)
+        if counter_durations:
+            print(f"   Redis 카운터 방식 평균: {statistics.mean(counter_durations):.4f}초")
+        
+        # 5. 같은 조직에 대한 동시 실행 테스트
+        print(f"\n⚡ 동시 실행 비교 (같은 조직 행)")
+        concurrent_results = {}
+        for strategy, name in STRATEGIES.items():
+            result = await self.test_concurrent_strategy(strategy, 10, 10)
+            concurrent_results[strategy] = result
+            self.analyze_performance(f"동시 {name} (10개 작업)", result["durations"])
+        
+        print(f"\n🔍 동시 실행 처리량:")
+        for strategy, result in concurrent_results.items():
+            durations = result["durations"]
+            p95 = sorted(durations)[int(len(durations) * 0.95) - 1] if durations else 0.0
+            print(f"   {STRATEGIES[strategy]}: {result['throughput']:.1f}건/초, p95 {p95:.4f}초")
         
         print("\n" + "=" * 60)
         print("✅ 성능 테스트 완료")
@@ -203,6 +291,7 @@ class PerformanceComparator:
             else:
                 print("   - PostgreSQL UPSERT 방식을 기본으로 사용")
                 print("   - Redis 락은 특별한 경우에만 사용")
+        print("   - Redis 사용 가능 시 발송 경로는 Redis 카운터 방식 사용 (DB 행 잠금 없음, 주기적 일괄 기록)")
         
         print("   - 정기적인 성능 모니터링 필요")
         print("   - 실제 운영 환경에서의 추가 테스트 권장")
@@ -0,0 +1,173 @@
+"""
+속도 제한 미들웨어 오버헤드 비교 스크립트
+
+같은 요청을 다음 방식으로 처리할 때 요청당 추가 지연 시간을 비교합니다.
+- 제한 없음: call_next만 호출 (기준선)
+- 기존 방식: 동기 redis.Redis로 GET / INCR / EXPIRE 3회 왕복 (IP만 제한)
+- Redis Lua: redis.asyncio + 슬라이딩 윈도우 스크립트 1회 왕복 (IP/사용자/조직/엔드포인트)
+- 로컬 토큰 버킷: Redis 장애 시 대체 경로
+
+사용 예:
+    python rate_limit_benchmark.py --requests 5000 --concurrency 50
+
+주의: 기존 방식과 Redis Lua 측정에는 settings.REDIS_URL 의 Redis가 필요하며,
+      벤치마크 전용 키(rate_limit:*:bench-*)를 생성합니다.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from jose import jwt
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.middleware.rate_limit_middleware import rate_limit_middleware, rate_limit_service
+from app.utils.rate_limiter import RateLimitRule, SlidingWindowRateLimiter
+
+# 측정 중 429가 나지 않도록 충분히 큰 제한
+BENCH_LIMIT = 10 ** 9
+
+
+async def _call_next(request: Request) -> Response:
+    """실제 엔드포인트 대신 빈 응답을 돌려주는 핸들러"""
+    return Response(status_code=200)
+
+
+class RateLimitBenchmark:
+    """속도 제한 미들웨어 오버헤드 비교 클래스"""
+
+    def __init__(self, requests: int, concurrency: int):
+        self.requests = requests
+        self.concurrency = concurrency
+        self.run_id = uuid.uuid4().hex[:8]
+        self.token = jwt.encode(
+            {"sub": f"bench-user-{self.run_id}", "org_id": f"bench-org-{self.run_id}"},
+            settings.SECRET_KEY, algorithm="HS256"
+        )
+        for name in rate_limit_service.default_limits:
+            rate_limit_service.default_limits[name] = BENCH_LIMIT
+        for path in rate_limit_service.endpoint_limits:
+            rate_limit_service.endpoint_limits[path] = BENCH_LIMIT
+
+    def _request(self, index: int) -> Request:
+        """벤치마크 요청 (IP 100개에 분산, 로그인 경로로 4개 스코프 모두 적용)"""
+        return Request({
+            "type": "http", "method": "POST", "path": f"{settings.API_V1_PREFIX}/auth/login",
+            "query_string": b"", "scheme": "http", "server": ("bench", 80),
+            "client": (f"bench-{self.run_id}-{index % 100}", 40000),
+            "headers": [(b"authorization", f"Bearer {self.token}".encode()), (b"user-agent", b"bench")],
+        })
+
+    async def measure(self, name: str, handler: Callable[[Request], Awaitable[Response]]) -> List[float]:
+        """handler 로 요청을 concurrency 개씩 동시에 처리하며 요청별 지연 시간(초)을 반환합니다."""
+        print(f"⏱️ {name} 측정 ({self.requests}회, 동시 {self.concurrency})")
+        durations: List[float] = []
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(index: int):
+            async with semaphore:
+                started = time.perf_counter()
+                await handler(self._request(index))
+                durations.append(time.perf_counter() - started)
+
+        await handler(self._request(0))  # 워밍업 (연결/스크립트 로드)
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(self.requests)))
+        elapsed = time.perf_counter() - started
+        print(f"   처리량: {self.requests / elapsed:,.0f} req/s")
+        return durations
+
+    def legacy_handler(self):
+        """기존 미들웨어 방식: 동기 Redis GET/INCR/EXPIRE (이벤트 루프 블로킹)"""
+        import redis
+
+        client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        client.ping()
+
+        async def handler(request: Request) -> Response:
+            key = f"rate_limit:ip:{request.client.host}:{int(time.time()) // 60}"
+            int(client.get(key) or 0)
+            response = await _call_next(request)
+            client.incr(key)
+            client.expire(key, 120)
+            return response
+
+        return handler
+
+    def analyze_performance(self, method_name: str, durations: List[float]):
+        """성능 분석"""
+        if not durations:
+            print(f"❌ {method_name}: 측정 데이터 없음")
+            return
+        ordered = sorted(durations)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(f"\n📊 {method_name} 성능 분석:")
+        print(f"   총 실행 횟수: {len(durations)}")
+        print(f"   평균 시간: {statistics.mean(durations) * 1000:.3f}ms")
+        print(f"   중간값: {statistics.median(durations) * 1000:.3f}ms")
+        print(f"   p99: {p99 * 1000:.3f}ms")
+        print(f"   최대 시간: {max(durations) * 1000:.3f}ms")
+
+    async def run(self, skip_redis: bool = False):
+        """전체 비교 실행"""
+        results = {"제한 없음": await self.measure("제한 없음", _call_next)}
+
+        if not skip_redis:
+            try:
+                results["기존 방식 (동기 3회 왕복)"] = await self.measure(
+                    "기존 방식 (동기 3회 왕복)", self.legacy_handler()
+                )
+            except Exception as e:
+                print(f"⚠️ 기존 방식 측정 생략 (Redis 연결 불가): {str(e)}")
+
+            rate_limit_service.limiter = SlidingWindowRateLimiter()
+            durations = await self.measure(
+                "Redis Lua (비동기 1회 왕복)", lambda request: rate_limit_middleware(request, _call_next)
+            )
+            if rate_limit_service.limiter.redis_available:
+                results["Redis Lua (비동기 1회 왕복)"] = durations
+            else:
+                print("⚠️ Redis Lua 측정 생략 (Redis 연결 불가, 토큰 버킷으로 대체됨)")
+            await rate_limit_service.limiter.close()
+
+        # 접속 불가 주소로 한 번 실패시켜 재시도 간격 동안 토큰 버킷 경로만 측정
+        rate_limit_service.limiter = SlidingWindowRateLimiter(redis_url="redis://127.0.0.1:1/0", retry_seconds=3600)
+        await rate_limit_service.limiter.hit([RateLimitRule("ip", f"bench-{self.run_id}", BENCH_LIMIT)])
+        results["로컬 토큰 버킷"] = await self.measure(
+            "로컬 토큰 버킷", lambda request: rate_limit_middleware(request, _call_next)
+        )
+
+        for name, durations in results.items():
+            self.analyze_performance(name, durations)
+
+        baseline = statistics.median(results["제한 없음"])
+        print("\n🔍 요청당 중간값 오버헤드 (제한 없음 대비):")
+        for name, durations in results.items():
+            if name != "제한 없음":
+                print(f"   {name}: +{(statistics.median(durations) - baseline) * 1000:.3f}ms")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="속도 제한 미들웨어 오버헤드 비교")
+    parser.add_argument("--requests", type=int, default=5000, help="방식별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+    parser.add_argument("--skip-redis", action="store_true", help="Redis 사용 방식 측정 생략")
+    args = parser.parse_args()
+
+    benchmark = RateLimitBenchmark(args.requests, args.concurrency)
+    asyncio.run(benchmark.run(skip_redis=args.skip_redis))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+메일 검색 성능 비교 스크립트
+
+요청마다 to_tsvector를 계산하던 기존 검색 쿼리와
+search_vector(GIN) + 트라이그램 인덱스를 사용하는 검색 쿼리의 지연 시간을 비교합니다.
+
+사용 예:
+    python search_benchmark.py --mails 1000000 --term 회의
+    python search_benchmark.py --skip-seed --term 보고서 --iterations 50
+
+주의: PostgreSQL 전용이며, 벤치마크 전용 조직(bench_search_org)에 데이터를 생성합니다.
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+from typing import List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app.database.user import engine
+
+BENCH_ORG_ID = "bench_search_org"
+BENCH_USER_UUID = "bench-search-user-0000-000000000000"
+
+# 기존 방식: 매 행마다 tsvector 계산 + ILIKE 두 번 (순차 스캔)
+LEGACY_SEARCH_SQL = """
+    SELECT mail_uuid FROM mails
+    WHERE org_id = :org_id
+      AND (
+        to_tsvector('simple', concat(coalesce(subject, ''), ' ', coalesce(body_text, '')))
+            @@ plainto_tsquery('simple', :term)
+        OR subject ILIKE :pattern
+        OR body_text ILIKE :pattern
+      )
+    ORDER BY created_at DESC
+    LIMIT 20
+"""
+
+# 새 방식: 저장된 search_vector(GIN) + 트라이그램 인덱스를 타는 ILIKE
+INDEXED_SEARCH_SQL = """
+    SELECT mail_uuid FROM mails
+    WHERE org_id = :org_id
+      AND (
+        search_vector @@ plainto_tsquery('simple', :term)
+        OR subject ILIKE :pattern
+        OR body_text ILIKE :pattern
+      )
+    ORDER BY created_at DESC
+    LIMIT 20
+"""
+
+SUGGESTION_SQL = """
+    SELECT DISTINCT subject FROM mails
+    WHERE org_id = :org_id AND subject ILIKE :pattern
+    LIMIT 5
+"""
+
+
+class SearchBenchmark:
+    """검색 성능 비교 클래스"""
+
+    def __init__(self, term: str):
+        self.term = term
+        self.params = {"org_id": BENCH_ORG_ID, "term": term, "pattern": f"%{term}%"}
+
+    def seed(self, mail_count: int, batch_size: int = 100000):
+        """벤치마크 조직과 mail_count 개의 메일을 generate_series로 생성합니다."""
+        print(f"🌱 벤치마크 데이터 생성 시작 ({mail_count:,}건)")
+        with engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO organizations (org_id, org_code, name, subdomain, admin_email, is_active)
+                VALUES (:org_id, :org_id, 'Search Benchmark', :org_id, 'bench@skyboot.mail', true)
+                ON CONFLICT (org_id) DO NOTHING
+            """), {"org_id": BENCH_ORG_ID})
+            conn.execute(text("""
+                INSERT INTO mail_users (user_id, user_uuid, org_id, email, password_hash)
+                VALUES ('bench_search_user', :user_uuid, :org_id, 'bench@skyboot.mail', 'x')
+                ON CONFLICT (user_id) DO NOTHING
+            """), {"org_id": BENCH_ORG_ID, "user_uuid": BENCH_USER_UUID})
+
+        words = "ARRAY['회의','보고서','일정','견적','계약','휴가','점검','공지','report','invoice','meeting','budget']"
+        for start in range(0, mail_count, batch_size):
+            end = min(start + batch_size, mail_count)
+            started = time.time()
+            with engine.begin() as conn:
+                conn.execute(text(f"""
+                    INSERT INTO mails (mail_uuid, org_id, sender_uuid, subject, body_text, status, priority, created_at)
+                    SELECT 'bench_' || g,
+                           :org_id,
+                           :user_uuid,
+                           ({words})[1 + g % 12] || ' 메일 ' || g,
+                           repeat(({words})[1 + (g / 7) % 12] || ' 본문 내용 ', 20) || g,
+                           'sent', 'normal',
+                           now() - (g || ' seconds')::interval
+                    FROM generate_series(:start, :end - 1) AS g
+                    ON CONFLICT (mail_uuid) DO NOTHING
+                """), {"org_id": BENCH_ORG_ID, "user_uuid": BENCH_USER_UUID, "start": start, "end": end})
+            print(f"   진행률: {end:,}/{mail_count:,} ({time.time() - started:.1f}초)")
+
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE mails"))
+
+    def measure(self, name: str, sql: str, iterations: int) -> List[float]:
+        """쿼리를 iterations 회 실행하여 지연 시간(초) 목록을 반환합니다."""
+        print(f"⏱️ {name} 측정 ({iterations}회)")
+        durations = []
+        with engine.connect() as conn:
+            conn.execute(text(sql), self.params).fetchall()  # 워밍업
+            for _ in range(iterations):
+                started = time.perf_counter()
+                conn.execute(text(sql), self.params).fetchall()
+                durations.append(time.perf_counter() - started)
+        return durations
+
+    def explain(self, name: str, sql: str):
+        """실행 계획의 주요 노드를 출력합니다."""
+        with engine.connect() as conn:
+            plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), self.params).fetchall()
+        print(f"\n🧭 {name} 실행 계획:")
+        for row in plan:
+            line = row[0]
+            if "Scan" in line or "Execution Time" in line:
+                print(f"   {line.strip()}")
+
+    def analyze_performance(self, method_name: str, durations: List[float]):
+        """성능 분석"""
+        if not durations:
+            print(f"❌ {method_name}: 측정 데이터 없음")
+            return
+        ordered = sorted(durations)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"\n📊 {method_name} 성능 분석:")
+        print(f"   총 실행 횟수: {len(durations)}")
+        print(f"   평균 시간: {statistics.mean(durations) * 1000:.2f}ms")
+        print(f"   중간값: {statistics.median(durations) * 1000:.2f}ms")
+        print(f"   p95: {p95 * 1000:.2f}ms")
+        print(f"   최대 시간: {max(durations) * 1000:.2f}ms")
+
+    def cleanup(self):
+        """벤치마크 데이터를 삭제합니다."""
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM mails WHERE org_id = :org_id"), {"org_id": BENCH_ORG_ID})
+            conn.execute(text("DELETE FROM mail_users WHERE org_id = :org_id"), {"org_id": BENCH_ORG_ID})
+            conn.execute(text("DELETE FROM organizations WHERE org_id = :org_id"), {"org_id": BENCH_ORG_ID})
+        print("🧹 벤치마크 데이터 삭제 완료")
+
+    def run(self, iterations: int):
+        """전체 비교 실행"""
+        legacy = self.measure("기존 검색 (to_tsvector 계산)", LEGACY_SEARCH_SQL, iterations)
+        indexed = self.measure("인덱스 검색 (search_vector + trigram)", INDEXED_SEARCH_SQL, iterations)
+        suggestions = self.measure("자동완성 (subject trigram)", SUGGESTION_SQL, iterations)
+
+        self.analyze_performance("기존 검색", legacy)
+        self.analyze_performance("인덱스 검색", indexed)
+        self.analyze_performance("자동완성", suggestions)
+
+        self.explain("기존 검색", LEGACY_SEARCH_SQL)
+        self.explain("인덱스 검색", INDEXED_SEARCH_SQL)
+
+        if legacy and indexed:
+            speedup = statistics.median(legacy) / max(statistics.median(indexed), 1e-9)
+            print(f"\n🔍 중간값 기준 인덱스 검색이 {speedup:.1f}배 빠름")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="메일 검색 성능 비교")
+    parser.add_argument("--mails", type=int, default=1000000, help="생성할 메일 수 (조직당)")
+    parser.add_argument("--term", default="회의", help="검색어")
+    parser.add_argument("--iterations", type=int, default=20, help="측정 반복 횟수")
+    parser.add_argument("--skip-seed", action="store_true", help="데이터 생성 생략")
+    parser.add_argument("--cleanup", action="store_true", help="종료 후 벤치마크 데이터 삭제")
+    args = parser.parse_args()
+
+    benchmark = SearchBenchmark(args.term)
+    try:
+        if not args.skip_seed:
+            benchmark.seed(args.mails)
+        benchmark.run(args.iterations)
+    finally:
+        if args.cleanup:
+            benchmark.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ import sys
 from typing import Generator, AsyncGenerator
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 import uuid
@@ -18,7 +20,7 @@ import uuid
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import app
-from app.database.user import Base, get_db
+from app.database.user import Base, get_db, get_async_db, to_async_database_url
 from app.config import settings
 from app.model.user_model import User
 from app.model.organization_model import Organization
@@ -31,6 +33,10 @@ TEST_DATABASE_URL = "sqlite:///./test_skyboot_mail.db"
 test_engine = create_engine(TEST_DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+# 비동기 핸들러용 엔진 (같은 SQLite 파일 사용)
+test_async_engine = create_async_engine(to_async_database_url(TEST_DATABASE_URL), echo=False)
+TestAsyncSessionLocal = async_sessionmaker(test_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 @pytest.fixture(scope="session")
 def event_loop():
     """이벤트 루프 픽스처 - 세션 스코프로 설정"""
@@ -74,6 +80,45 @@ def db_session(setup_test_database) -> Generator[Session, None, None]:
         session.rollback()
         session.close()
 
+@pytest.fixture
+def memory_session_factory() -> Generator[sessionmaker, None, None]:
+    """인메모리 SQLite 세션 팩토리 - 테스트마다 빈 스키마로 새로 생성 (모든 세션이 한 연결 공유)"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine, autoflush=False)
+    finally:
+        engine.dispose()
+
+@pytest.fixture
+def memory_db(memory_session_factory) -> Generator[Session, None, None]:
+    """인메모리 SQLite 세션 픽스처"""
+    session = memory_session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def run_with_memory_async_db():
+    """coro_factory(session_factory, engine) 를 인메모리 aiosqlite 엔진에서 실행하는 함수를 반환"""
+    def _run(coro_factory):
+        async def main():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            try:
+                return await coro_factory(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), engine)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+    return _run
+
 @pytest.fixture
 def override_get_db(db_session):
     """데이터베이스 의존성 오버라이드"""
@@ -83,7 +128,12 @@ def override_get_db(db_session):
         finally:
             pass
     
+    async def _override_get_async_db():
+        async with TestAsyncSessionLocal() as async_db:
+            yield async_db
+    
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db
     yield
     app.dependency_overrides.clear()
 
@@ -226,6 +276,20 @@ def clean_database(db_session):
         print(f"⚠️ 데이터베이스 정리 중 오류: {e}")
         db_session.rollback()
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """각 테스트 전 로컬 속도 제한 버킷 초기화 (Redis 없는 환경에서 테스트 간 요청 수 누적 방지)"""
+    from app.middleware.rate_limit_middleware import rate_limit_service
+    rate_limit_service.limiter.fallback.clear()
+    yield
+
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    """각 테스트 전 인증 주체 캐시 초기화 (원시 SQL로 정리된 사용자가 캐시에 남지 않도록)"""
+    from app.service.principal_cache import principal_cache
+    principal_cache.clear()
+    yield
+
 # 테스트 마커 정의
 pytest.mark.unit = pytest.mark.unit
 pytest.mark.integration = pytest.mark.integration
@@ -0,0 +1,181 @@
+"""
+활동 로그 집계 테스트
+
+mail_logs/login_logs 가 진행 위치 이후 범위만 시간별/일별 집계에 한 번씩 더해지는지,
+최근(정착 전) 로그는 다음 실행으로 미뤄지는지, 늦게 커밋된 작은 ID 의 로그도 반영되는지,
+감사 요약이 집계를 읽는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from app.model import (
+    ActivityRollupCheckpoint, ActivityRollupGap, LoginLog, Mail, MailLog, MailUser, Organization,
+    OrganizationActivityDaily, OrganizationActivityHourly, User
+)
+from app.schemas.monitoring_schema import AuditSummaryRequest
+from app.service.monitoring_service import MonitoringService
+from app.tasks.activity_rollup import fold_activity_logs
+
+NOW = datetime(2025, 11, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _seed(db):
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="활동 집계 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    users = []
+    for name in ("alice", "bob"):
+        user = User(user_id=f"{name}_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                    email=f"{name}@example.org", username=name, hashed_password="x")
+        db.add(user)
+        db.add(MailUser(user_id=user.user_id, user_uuid=user.user_uuid, org_id=org_id,
+                        email=user.email, password_hash="x"))
+        users.append(user)
+    mail = Mail(mail_uuid=f"mail_{uuid.uuid4().hex[:12]}", org_id=org_id, sender_uuid=users[0].user_uuid,
+                subject="제목", status="sent")
+    db.add(mail)
+    db.commit()
+    return org_id, users, mail
+
+
+def _mail_log(db, org_id, user, mail, action, created_at, log_id=None):
+    db.add(MailLog(id=log_id, mail_uuid=mail.mail_uuid, user_uuid=user.user_uuid, org_id=org_id,
+                   action=action, created_at=created_at))
+    db.commit()
+
+
+def _login_log(db, user, status, created_at):
+    db.add(LoginLog(user_uuid=user.user_uuid if status == "success" else None,
+                    user_id=user.user_id if status == "success" else user.email,
+                    login_status=status, created_at=created_at))
+    db.commit()
+
+
+def _daily(db, org_id):
+    return {
+        (row.activity_date, row.source, row.action): row.event_count
+        for row in db.query(OrganizationActivityDaily).filter(OrganizationActivityDaily.org_id == org_id)
+    }
+
+
+def test_folds_logs_once_and_incrementally(memory_db):
+    """진행 위치 이후 로그만 더하고, 다시 실행해도 두 번 더하지 않음"""
+    db = memory_db
+    org_id, (alice, bob), mail = _seed(db)
+    _mail_log(db, org_id, alice, mail, "SEND", datetime(2025, 11, 9, 9, 10, tzinfo=timezone.utc))
+    _mail_log(db, org_id, alice, mail, "send", datetime(2025, 11, 9, 9, 40, tzinfo=timezone.utc))
+    _mail_log(db, org_id, bob, mail, "read", datetime(2025, 11, 10, 8, 0, tzinfo=timezone.utc))
+    _login_log(db, alice, "success", datetime(2025, 11, 10, 7, 0, tzinfo=timezone.utc))
+    _login_log(db, bob, "failed", datetime(2025, 11, 10, 7, 5, tzinfo=timezone.utc))
+
+    assert fold_activity_logs(db, "mail", now=NOW, batch_size=2) == 3
+    assert fold_activity_logs(db, "login", now=NOW) == 2
+    assert fold_activity_logs(db, "mail", now=NOW) == 0
+
+    daily = _daily(db, org_id)
+    assert daily[(date(2025, 11, 9), "mail", "send")] == 2
+    assert daily[(date(2025, 11, 10), "mail", "read")] == 1
+    assert daily[(date(2025, 11, 10), "login", "success")] == 1
+    assert daily[(date(2025, 11, 10), "login", "failed")] == 1
+    assert daily[(date(2025, 11, 9), "user", "active")] == 1
+    assert daily[(date(2025, 11, 10), "user", "active")] == 2
+
+    hourly = db.query(OrganizationActivityHourly).filter(OrganizationActivityHourly.action == "send").one()
+    assert hourly.hour_start == datetime(2025, 11, 9, 9, 0)
+    assert hourly.event_count == 2
+
+    # 새 로그만 더해지고, 이미 활성인 사용자는 다시 세지 않음
+    _mail_log(db, org_id, alice, mail, "read", datetime(2025, 11, 10, 9, 0, tzinfo=timezone.utc))
+    assert fold_activity_logs(db, "mail", now=NOW) == 1
+    daily = _daily(db, org_id)
+    assert daily[(date(2025, 11, 10), "mail", "read")] == 2
+    assert daily[(date(2025, 11, 10), "user", "active")] == 2
+    assert db.get(ActivityRollupCheckpoint, "mail").last_id == 4
+
+
+def test_recent_logs_wait_for_next_run(memory_db):
+    """정착 시간 이내의 최근 로그와 그 뒤의 로그는 다음 실행에서 반영"""
+    db = memory_db
+    org_id, (alice, _), mail = _seed(db)
+    _mail_log(db, org_id, alice, mail, "send", datetime(2025, 11, 10, 11, 0, tzinfo=timezone.utc))
+    _mail_log(db, org_id, alice, mail, "send", datetime(2025, 11, 10, 11, 59, 59, tzinfo=timezone.utc))
+    _mail_log(db, org_id, alice, mail, "read", datetime(2025, 11, 10, 11, 30, tzinfo=timezone.utc))
+
+    assert fold_activity_logs(db, "mail", now=NOW) == 1
+    assert fold_activity_logs(db, "mail", now=datetime(2025, 11, 10, 12, 5, tzinfo=timezone.utc)) == 2
+    assert _daily(db, org_id)[(date(2025, 11, 10), "mail", "send")] == 2
+
+
+def test_late_commit_of_lower_id_is_folded(memory_db):
+    """더 큰 ID 보다 늦게 커밋된 로그도 빈 구간으로 추적하여 한 번만 반영"""
+    db = memory_db
+    org_id, (alice, _), mail = _seed(db)
+    created_at = datetime(2025, 11, 10, 9, 0, tzinfo=timezone.utc)
+    _mail_log(db, org_id, alice, mail, "send", created_at, log_id=1)
+    _mail_log(db, org_id, alice, mail, "send", created_at, log_id=3)
+
+    assert fold_activity_logs(db, "mail", now=NOW) == 3
+    assert _daily(db, org_id)[(date(2025, 11, 10), "mail", "send")] == 2
+    assert [(gap.start_id, gap.end_id) for gap in db.query(ActivityRollupGap)] == [(2, 2)]
+
+    # ID 2 를 가진 트랜잭션이 진행 위치를 지난 뒤에 커밋
+    _mail_log(db, org_id, alice, mail, "send", created_at, log_id=2)
+    assert fold_activity_logs(db, "mail", now=NOW) == 1
+    assert fold_activity_logs(db, "mail", now=NOW) == 0
+    assert _daily(db, org_id)[(date(2025, 11, 10), "mail", "send")] == 3
+    assert db.query(ActivityRollupGap).count() == 0
+
+
+def test_unfilled_gaps_expire(memory_db):
+    """채워지지 않은 빈 구간(롤백된 ID)은 추적 시간이 지나면 삭제"""
+    db = memory_db
+    org_id, (alice, _), mail = _seed(db)
+    created_at = datetime(2025, 11, 10, 9, 0, tzinfo=timezone.utc)
+    _mail_log(db, org_id, alice, mail, "send", created_at, log_id=1)
+    _mail_log(db, org_id, alice, mail, "send", created_at, log_id=5)
+
+    fold_activity_logs(db, "mail", now=NOW)
+    assert [(gap.start_id, gap.end_id) for gap in db.query(ActivityRollupGap)] == [(2, 4)]
+
+    # 구간 가운데 ID 만 늦게 커밋되면 남은 부분만 계속 추적
+    _mail_log(db, org_id, alice, mail, "read", created_at, log_id=3)
+    assert fold_activity_logs(db, "mail", now=NOW) == 1
+    assert [(gap.start_id, gap.end_id) for gap in db.query(ActivityRollupGap).order_by(ActivityRollupGap.start_id)] == [
+        (2, 2), (4, 4)
+    ]
+
+    assert fold_activity_logs(db, "mail", now=NOW + timedelta(hours=2)) == 0
+    assert db.query(ActivityRollupGap).count() == 0
+
+
+def test_audit_summary_reads_rollups(memory_db):
+    """감사 요약이 일별/시간별 집계로 구간과 합계를 구성"""
+    db = memory_db
+    org_id, (alice, bob), mail = _seed(db)
+    _mail_log(db, org_id, alice, mail, "send", datetime(2025, 11, 9, 9, 10, tzinfo=timezone.utc))
+    _mail_log(db, org_id, bob, mail, "read", datetime(2025, 11, 10, 8, 0, tzinfo=timezone.utc))
+    _login_log(db, bob, "failed", datetime(2025, 11, 10, 8, 5, tzinfo=timezone.utc))
+    fold_activity_logs(db, "mail", now=NOW)
+    fold_activity_logs(db, "login", now=NOW)
+
+    service = MonitoringService(db)
+    daily = service.get_audit_summary(org_id, AuditSummaryRequest(
+        start_date=date(2025, 11, 1), end_date=date(2025, 11, 10)
+    ))
+    assert daily.totals == {"send": 1, "read": 1, "login_failed": 1}
+    assert [bucket.bucket_start.date() for bucket in daily.buckets] == [date(2025, 11, 9), date(2025, 11, 10)]
+    assert daily.buckets[1].login_failed == 1
+    assert daily.buckets[1].active_users == 1
+
+    hourly = service.get_audit_summary(org_id, AuditSummaryRequest(
+        start_date=date(2025, 11, 10), end_date=date(2025, 11, 10), granularity="hour"
+    ))
+    assert [bucket.bucket_start for bucket in hourly.buckets] == [datetime(2025, 11, 10, 8, 0)]
+    assert hourly.buckets[0].mail_actions == {"read": 1}
+    assert hourly.buckets[0].active_users is None
@@ -0,0 +1,144 @@
+"""
+비동기 데이터베이스 계층 테스트
+
+AsyncSession 기반 인증 의존성,
+run_sync 로 실행하는 목록 엔진이 동기 경로와 같은 결과를 내는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+from app.database.user import to_async_database_url
+from app.model import Organization, User, MailUser, Mail, MailFolder, MailInFolder
+from app.model.mail_model import FolderType
+from app.service.auth_service import AuthService, get_current_user_async, get_current_mail_user_async
+from app.service.mail_list_service import MailListService
+
+
+class StatementCounter:
+    """실행된 SQL 문 개수를 세는 컨텍스트 매니저"""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+async def _seed(session_factory):
+    """조직, 사용자, 메일 사용자, 받은편지함 메일 1건을 만들고 (org_id, user_uuid)를 반환합니다."""
+    org_id = str(uuid.uuid4())
+    user_uuid = str(uuid.uuid4())
+    folder_uuid = str(uuid.uuid4())
+    async with session_factory() as db:
+        db.add(Organization(
+            org_id=org_id, org_code=f"org{org_id[:8]}", name="비동기 테스트 조직",
+            subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+        ))
+        db.add(User(user_id=f"user_{org_id[:8]}", user_uuid=user_uuid, org_id=org_id,
+                    email="user@example.org", username="user", hashed_password="x", role="user"))
+        db.add(MailUser(user_id=f"user_{org_id[:8]}", user_uuid=user_uuid, org_id=org_id,
+                        email="user@example.org", password_hash="x"))
+        db.add(MailFolder(folder_uuid=folder_uuid, user_uuid=user_uuid, org_id=org_id,
+                          name="받은편지함", folder_type=FolderType.INBOX, is_system=True))
+        db.add(Mail(mail_uuid="mail_async_1", org_id=org_id, sender_uuid=user_uuid,
+                    subject="비동기 메일", body_text="본문", status="sent"))
+        db.add(MailInFolder(mail_uuid="mail_async_1", folder_uuid=folder_uuid, user_uuid=user_uuid))
+        await db.commit()
+    return org_id, user_uuid
+
+
+class TestAsyncDatabase:
+    """비동기 데이터베이스 계층 테스트"""
+
+    @pytest.mark.parametrize("url, expected", [
+        ("postgresql://u:p@db:5432/mail", "postgresql+asyncpg://u:p@db:5432/mail"),
+        ("postgresql+psycopg2://u:p@db/mail", "postgresql+asyncpg://u:p@db/mail"),
+        ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+        ("postgresql+asyncpg://u:p@db/mail", "postgresql+asyncpg://u:p@db/mail"),
+    ])
+    def test_async_database_url(self, url, expected):
+        """동기 URL의 드라이버를 비동기 드라이버로 변환"""
+        assert to_async_database_url(url) == expected
+
+    def test_auth_dependencies_use_cache_after_first_request(self, run_with_memory_async_db):
+        """첫 요청은 사용자+조직 1회, 메일 사용자 1회 조회하고 다음 요청은 쿼리 없음"""
+        async def scenario(session_factory, engine):
+            org_id, user_uuid = await _seed(session_factory)
+            token = AuthService.create_access_token({"sub": user_uuid, "org_id": org_id})
+            credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+            counts = []
+            for _ in range(2):
+                async with session_factory() as db:
+                    with StatementCounter(engine) as counter:
+                        user = await get_current_user_async(credentials=credentials, db=db)
+                        mail_user = await get_current_mail_user_async(
+                            current_user=user, current_org_id=org_id, db=db
+                        )
+                    counts.append(counter.count)
+            return counts, mail_user.email
+
+        counts, email = run_with_memory_async_db(scenario)
+        assert counts == [2, 0]
+        assert email == "user@example.org"
+
+    def test_inactive_organization_rejected(self, run_with_memory_async_db):
+        """비활성 조직의 토큰은 403"""
+        async def scenario(session_factory, engine):
+            org_id, user_uuid = await _seed(session_factory)
+            async with session_factory() as db:
+                organization = await db.get(Organization, org_id)
+                organization.is_active = False
+                await db.commit()
+            token = AuthService.create_access_token({"sub": user_uuid, "org_id": org_id})
+            async with session_factory() as db:
+                await get_current_user_async(
+                    credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db=db
+                )
+
+        with pytest.raises(HTTPException) as exc_info:
+            run_with_memory_async_db(scenario)
+        assert exc_info.value.status_code == 403
+
+    def test_missing_mail_user_keeps_mail_route_message(self, run_with_memory_async_db):
+        """조직에 메일 사용자가 없으면 기존 메일 라우터와 같은 404 메시지"""
+        async def scenario(session_factory, engine):
+            org_id, user_uuid = await _seed(session_factory)
+            async with session_factory() as db:
+                user = await db.get(User, f"user_{org_id[:8]}")
+                await get_current_mail_user_async(current_user=user, current_org_id=str(uuid.uuid4()), db=db)
+
+        with pytest.raises(HTTPException) as exc_info:
+            run_with_memory_async_db(scenario)
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.detail == "조직 내에서 메일 사용자를 찾을 수 없습니다"
+
+    def test_mail_list_service_through_run_sync(self, run_with_memory_async_db):
+        """동기 목록 엔진을 run_sync 로 비동기 연결에서 실행"""
+        async def scenario(session_factory, engine):
+            org_id, user_uuid = await _seed(session_factory)
+            async with session_factory() as db:
+                mail_user = await db.get(MailUser, f"user_{org_id[:8]}")
+                return await db.run_sync(lambda session: MailListService(session).build_page(
+                    mail_user=mail_user, org_id=org_id, folder_type="inbox"
+                ))
+
+        list_page = run_with_memory_async_db(scenario)
+        assert list_page.total == 1
+        assert [mail.subject for mail in list_page.mails] == ["비동기 메일"]
@@ -0,0 +1,134 @@
+"""
+첨부파일 blob 저장소 테스트
+
+같은 내용의 첨부파일 1회 저장/참조 카운트, 영구 삭제 시 참조 해제,
+롤백 시 파일 복원, 기존 첨부파일 이전과 중복 제거 통계를 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import hashlib
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.model import Organization, Mail, MailAttachment, AttachmentBlob
+from app.service.attachment_blob_store import AttachmentBlobStore
+
+
+@pytest.fixture
+def db(memory_db):
+    memory_db.add(Organization(
+        org_id="org_blob", org_code="orgblob", name="blob 테스트 조직",
+        subdomain="orgblob", admin_email="admin@example.org"
+    ))
+    memory_db.commit()
+    return memory_db
+
+
+def _write(directory, data: bytes) -> str:
+    path = os.path.join(str(directory), f"{uuid.uuid4()}.bin")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _adopt(store: AttachmentBlobStore, path: str, data: bytes) -> str:
+    return asyncio.run(store.adopt("org_blob", path, hashlib.sha256(data).hexdigest(), len(data)))
+
+
+class TestAttachmentBlobStore:
+    """첨부파일 blob 저장소 테스트"""
+
+    def test_same_content_stored_once(self, db, tmp_path):
+        """같은 내용은 blob 하나를 참조하고 중복 업로드 파일은 커밋 후 삭제"""
+        store = AttachmentBlobStore(db, root=str(tmp_path / "blobs"))
+        data = b"quarterly report" * 100
+        first, second = _write(tmp_path, data), _write(tmp_path, data)
+
+        blob_paths = {_adopt(store, first, data), _adopt(store, second, data)}
+        db.commit()
+        asyncio.run(store.after_commit())
+
+        blob = db.execute(select(AttachmentBlob)).scalar_one()
+        assert blob.ref_count == 2
+        assert blob_paths == {blob.file_path}
+        assert not os.path.exists(first) and not os.path.exists(second)
+        with open(blob.file_path, "rb") as f:
+            assert f.read() == data
+
+        stats = store.dedup_stats("org_blob")
+        assert stats == {
+            "logical_bytes": len(data) * 2,
+            "stored_bytes": len(data),
+            "bytes_saved": len(data),
+            "dedup_ratio": 2.0,
+        }
+
+    def test_release_deletes_blob_after_last_reference(self, db, tmp_path):
+        """마지막 참조 해제 시 행 삭제 후 커밋 이후 파일 삭제"""
+        store = AttachmentBlobStore(db, root=str(tmp_path / "blobs"))
+        data = b"contract"
+        sha256 = hashlib.sha256(data).hexdigest()
+        blob_path = _adopt(store, _write(tmp_path, data), data)
+        _adopt(store, _write(tmp_path, data), data)
+        db.commit()
+        asyncio.run(store.after_commit())
+
+        assert store.release("org_blob", sha256) is True
+        db.commit()
+        asyncio.run(store.after_commit())
+        assert os.path.exists(blob_path)
+
+        assert store.release("org_blob", sha256) is True
+        assert os.path.exists(blob_path)
+        db.commit()
+        asyncio.run(store.after_commit())
+        assert not os.path.exists(blob_path)
+        assert db.execute(select(AttachmentBlob)).first() is None
+        assert store.release("org_blob", sha256) is False
+        assert store.release("org_blob", None) is False
+
+    def test_rollback_restores_source_file(self, db, tmp_path):
+        """트랜잭션 롤백 시 새 blob 으로 옮긴 파일을 원래 위치로 되돌림"""
+        store = AttachmentBlobStore(db, root=str(tmp_path / "blobs"))
+        data = b"draft"
+        source = _write(tmp_path, data)
+        blob_path = _adopt(store, source, data)
+        assert not os.path.exists(source)
+
+        db.rollback()
+        asyncio.run(store.after_rollback())
+
+        assert os.path.exists(source) and not os.path.exists(blob_path)
+        assert db.execute(select(AttachmentBlob)).first() is None
+
+    def test_migrate_legacy_attachments(self, db, tmp_path):
+        """기존 UUID 경로 첨부파일을 blob 으로 이전하고 중복 파일 삭제"""
+        data = b"legacy attachment"
+        db.add(Mail(mail_uuid="mail_legacy", org_id="org_blob", sender_uuid="sender", subject="이전", status="sent"))
+        legacy_paths = [_write(tmp_path, data), _write(tmp_path, data), str(tmp_path / "missing.bin")]
+        for i, path in enumerate(legacy_paths):
+            db.add(MailAttachment(
+                attachment_uuid=f"att_{i}", mail_uuid="mail_legacy", filename=f"file{i}.bin",
+                file_path=path, file_size=0
+            ))
+        db.commit()
+
+        store = AttachmentBlobStore(db, root=str(tmp_path / "blobs"))
+        counts = asyncio.run(store.migrate_legacy_attachments(batch_size=2))
+
+        assert counts == {"migrated": 2, "deduplicated": 1, "missing": 1}
+        blob = db.execute(select(AttachmentBlob)).scalar_one()
+        attachments = db.execute(select(MailAttachment).order_by(MailAttachment.id)).scalars().all()
+        assert [a.file_path for a in attachments[:2]] == [blob.file_path, blob.file_path]
+        assert {a.content_sha256 for a in attachments[:2]} == {hashlib.sha256(data).hexdigest()}
+        assert attachments[0].file_size == len(data)
+        assert blob.ref_count == 2
+        assert not any(os.path.exists(path) for path in legacy_paths)
+
+        # 다시 실행해도 이미 이전된 첨부파일은 건너뜀
+        assert asyncio.run(store.migrate_legacy_attachments())["migrated"] == 0
@@ -0,0 +1,83 @@
+"""
+첨부파일 업로드 스트리밍 테스트
+
+청크 단위 저장, SHA-256/크기 계산, 제한 초과 시 조기 중단과 임시 파일 정리를 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.service.attachment_upload_service import discard_stored, store_upload
+
+CHUNK = 1024
+
+
+def _limits(max_attachment_bytes: int, max_mail_bytes: int) -> dict:
+    return {
+        "max_attachment_bytes": max_attachment_bytes,
+        "max_mail_bytes": max_mail_bytes,
+        "max_attachment_mb": max_attachment_bytes // (1024 * 1024),
+        "max_mail_mb": max_mail_bytes // (1024 * 1024),
+    }
+
+
+def _upload(data: bytes, filename: str = "report.pdf") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+class TestAttachmentUpload:
+    """첨부파일 업로드 스트리밍 테스트"""
+
+    def test_stores_file_with_size_and_hash(self, tmp_path):
+        """여러 청크로 나누어 저장하고 크기/SHA-256 을 같은 패스에서 계산"""
+        data = os.urandom(CHUNK * 5 + 17)
+        stored = asyncio.run(store_upload(_upload(data), str(tmp_path), _limits(10 ** 6, 10 ** 6), chunk_size=CHUNK))
+
+        assert stored.file_size == len(data)
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert stored.file_path.endswith(".pdf")
+        with open(stored.file_path, "rb") as f:
+            assert f.read() == data
+        assert os.listdir(tmp_path) == [os.path.basename(stored.file_path)]
+
+        attachment = stored.to_model("mail_1")
+        assert (attachment.file_size, attachment.content_sha256) == (len(data), stored.sha256)
+
+    def test_attachment_limit_stops_early_and_cleans_up(self, tmp_path):
+        """첨부파일 제한을 넘는 청크에서 읽기를 멈추고 임시 파일을 삭제"""
+        upload = _upload(b"x" * (CHUNK * 100))
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(store_upload(upload, str(tmp_path), _limits(CHUNK * 3, 10 ** 6), chunk_size=CHUNK))
+
+        assert exc_info.value.status_code == 413
+        assert upload.file.tell() == CHUNK * 4
+        assert os.listdir(tmp_path) == []
+
+    def test_mail_total_limit_counts_previous_bytes(self, tmp_path):
+        """본문과 앞선 첨부파일을 포함한 메일 전체 크기 제한 적용"""
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(store_upload(
+                _upload(b"x" * (CHUNK * 2)), str(tmp_path), _limits(10 ** 6, CHUNK * 3),
+                mail_bytes_so_far=CHUNK * 2, chunk_size=CHUNK
+            ))
+
+        assert exc_info.value.status_code == 413
+        assert "메일 전체 크기 초과" in exc_info.value.detail
+        assert os.listdir(tmp_path) == []
+
+    def test_discard_removes_stored_files(self, tmp_path):
+        """요청 실패 시 저장된 첨부파일 삭제"""
+        async def scenario():
+            stored = [await store_upload(_upload(b"data"), str(tmp_path), _limits(10 ** 6, 10 ** 6)) for _ in range(2)]
+            await discard_stored(stored)
+
+        asyncio.run(scenario())
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,381 @@
+"""
+clamd 연결 풀 테스트
+
+IDSESSION/INSTREAM 만 처리하는 가짜 clamd 서버를 띄워 연결 재사용, 동시 연결 제한,
+타임아웃, 끊긴 연결 재연결, 크기 제한, 스트리밍 검사와 업로드 중 검사를 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import hashlib
+import io
+import struct
+import uuid
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.service.attachment_upload_service import store_upload
+from app.service.virus_scan_service import ScanVerdictCache, VirusScanService
+from app.utils.clamd_pool import (
+    ClamdConnectionError, ClamdConnectionPool, ClamdError, ClamdPoolManager, ClamdSizeLimitError, parse_scan_reply
+)
+
+EICAR = b"X5O!P%@AP[4\\PZX54(P^)7CC)7$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+VERSION = "ClamAV 1.0.0/27000/Thu Jan  1 00:00:00 2026"
+
+
+class FakeClamd:
+    """zIDSESSION/zPING/zVERSION/zINSTREAM/zEND 만 처리하는 가짜 clamd"""
+
+    def __init__(self, delay: float = 0.0, drop_after: int = 0, max_stream: int = 10 ** 6):
+        self.delay = delay
+        self.drop_after = drop_after
+        self.max_stream = max_stream
+        self.connections = 0
+        self.active_scans = 0
+        self.max_active_scans = 0
+        self.scanned = []
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        session = False
+        request_id = 0
+        replies = 0
+        try:
+            while True:
+                command = (await reader.readuntil(b"\0"))[:-1].decode()
+                if command == "zIDSESSION":
+                    session = True
+                    continue
+                if command == "zEND":
+                    break
+                request_id += 1
+                if command == "zPING":
+                    reply = "PONG"
+                elif command == "zVERSION":
+                    reply = VERSION
+                elif command == "zINSTREAM":
+                    reply = await self._instream(reader)
+                else:
+                    reply = "UNKNOWN COMMAND"
+                prefix = f"{request_id}: " if session else ""
+                writer.write(f"{prefix}{reply}\0".encode())
+                await writer.drain()
+                replies += 1
+                if reply.endswith("ERROR") or (self.drop_after and replies >= self.drop_after):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _instream(self, reader) -> str:
+        self.active_scans += 1
+        self.max_active_scans = max(self.max_active_scans, self.active_scans)
+        try:
+            data = b""
+            while True:
+                (length,) = struct.unpack("!L", await reader.readexactly(4))
+                if not length:
+                    break
+                data += await reader.readexactly(length)
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            self.scanned.append(data)
+            if len(data) > self.max_stream:
+                return "INSTREAM size limit exceeded. ERROR"
+            return "stream: Eicar-Test-Signature FOUND" if EICAR in data else "stream: OK"
+        finally:
+            self.active_scans -= 1
+
+
+def _run(fake: FakeClamd, scenario):
+    async def main():
+        await fake.start()
+        try:
+            return await scenario()
+        finally:
+            await fake.stop()
+    return asyncio.run(main())
+
+
+def test_parse_scan_reply():
+    """INSTREAM 응답 해석"""
+    assert parse_scan_reply("stream: OK").infected is False
+    found = parse_scan_reply("stream: Win.Test.EICAR_HDB-1 FOUND")
+    assert found.infected and found.virus_name == "Win.Test.EICAR_HDB-1"
+    with pytest.raises(ClamdError):
+        parse_scan_reply("INSTREAM size limit exceeded. ERROR")
+
+
+class TestClamdConnectionPool:
+    """clamd 연결 풀 테스트"""
+
+    def test_reuses_session_connection(self):
+        """IDSESSION 연결 하나로 여러 명령 처리"""
+        fake = FakeClamd()
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port, chunk_size=8)
+            assert await pool.ping()
+            assert await pool.version() == VERSION
+            clean = await pool.scan_bytes(b"hello world" * 10)
+            infected = await pool.scan_bytes(EICAR)
+            await pool.close()
+            return pool.metrics(), clean, infected
+
+        metrics, clean, infected = _run(fake, scenario)
+        assert not clean.infected
+        assert infected.infected and infected.virus_name == "Eicar-Test-Signature"
+        assert fake.connections == 1
+        assert fake.scanned == [b"hello world" * 10, EICAR]
+        assert (metrics["created"], metrics["reused"], metrics["scans"], metrics["infected"]) == (1, 3, 2, 1)
+
+    def test_scan_file_returns_hash(self, tmp_path):
+        """파일을 한 번 읽으며 검사와 SHA-256 계산"""
+        fake = FakeClamd()
+        data = b"a" * 100 + EICAR
+        path = tmp_path / "sample.bin"
+        path.write_bytes(data)
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port, chunk_size=16)
+            result = await pool.scan_file(str(path))
+            await pool.close()
+            return result
+
+        result, sha256 = _run(fake, scenario)
+        assert result.infected
+        assert sha256 == hashlib.sha256(data).hexdigest()
+        assert fake.scanned == [data]
+
+    def test_limits_concurrent_connections(self):
+        """최대 연결 수를 넘는 검사는 대기"""
+        fake = FakeClamd(delay=0.05)
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port, max_connections=2)
+            results = await asyncio.gather(*(pool.scan_bytes(b"x%d" % i) for i in range(6)))
+            await pool.close()
+            return results
+
+        results = _run(fake, scenario)
+        assert len(results) == 6 and not any(r.infected for r in results)
+        assert fake.max_active_scans == 2
+        assert fake.connections == 2
+
+    def test_reconnects_when_reused_connection_dropped(self):
+        """clamd 가 닫은 유휴 연결은 새 연결로 재시도"""
+        fake = FakeClamd(drop_after=1)
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port)
+            first = await pool.scan_bytes(b"one")
+            await asyncio.sleep(0.01)
+            second = await pool.scan_bytes(EICAR)
+            await pool.close()
+            return pool.metrics(), first, second
+
+        metrics, first, second = _run(fake, scenario)
+        assert not first.infected and second.infected
+        assert fake.connections >= 2
+        assert metrics["reconnects"] + metrics["expired"] >= 1
+
+    def test_timeout_raises_connection_error(self):
+        """응답이 타임아웃을 넘으면 ClamdConnectionError"""
+        fake = FakeClamd(delay=0.5)
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port, timeout=0.1)
+            with pytest.raises(ClamdConnectionError):
+                await pool.scan_bytes(b"slow")
+            metrics = pool.metrics()
+            await pool.close()
+            return metrics
+
+        metrics = _run(fake, scenario)
+        assert metrics["failures"] == 1 and metrics["idle"] == 0 and metrics["in_use"] == 0
+
+    def test_error_reply_is_not_connection_error(self):
+        """크기 제한 초과 응답은 ClamdError (연결 오류 아님) 이고 연결은 버림"""
+        fake = FakeClamd(max_stream=4)
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port)
+            with pytest.raises(ClamdError) as exc_info:
+                await pool.scan_bytes(b"too large")
+            metrics = pool.metrics()
+            await pool.close()
+            return exc_info.value, metrics
+
+        error, metrics = _run(fake, scenario)
+        assert not isinstance(error, ClamdConnectionError)
+        assert metrics["idle"] == 0
+
+    def test_stream_chunks(self):
+        """청크를 받는 대로 보내는 스트리밍 검사, 완료 후 연결 반납"""
+        fake = FakeClamd()
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port)
+            stream = await pool.open_stream()
+            for offset in range(0, len(EICAR), 10):
+                await stream.write(EICAR[offset:offset + 10])
+            result = await stream.finish()
+            assert await pool.ping()
+            metrics = pool.metrics()
+            await pool.close()
+            return result, metrics
+
+        result, metrics = _run(fake, scenario)
+        assert result.infected
+        assert fake.scanned == [EICAR]
+        assert metrics["in_use"] == 0 and metrics["created"] == 1
+
+    def test_size_limit_checked_before_sending(self, tmp_path):
+        """StreamMaxLength 를 넘는 데이터는 clamd 로 보내지 않고 ClamdSizeLimitError"""
+        fake = FakeClamd()
+        path = tmp_path / "large.bin"
+        path.write_bytes(b"x" * 9)
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port, max_stream_bytes=8)
+            with pytest.raises(ClamdSizeLimitError):
+                await pool.scan_bytes(b"x" * 9)
+            with pytest.raises(ClamdSizeLimitError):
+                await pool.scan_file(str(path))
+            stream = await pool.open_stream()
+            await stream.write(b"x" * 8)
+            with pytest.raises(ClamdSizeLimitError):
+                await stream.write(b"x")
+            metrics = pool.metrics()
+            await pool.close()
+            return metrics
+
+        metrics = _run(fake, scenario)
+        assert fake.scanned == []
+        assert metrics["in_use"] == 0 and metrics["failures"] == 0
+
+    def test_waiting_for_slot_times_out(self):
+        """연결 슬롯을 타임아웃 안에 얻지 못하면 ClamdError (연결 오류 아님)"""
+        fake = FakeClamd()
+
+        async def scenario():
+            pool = ClamdConnectionPool(port=fake.port, max_connections=1, timeout=0.1)
+            stream = await pool.open_stream()
+            with pytest.raises(ClamdError) as exc_info:
+                await pool.ping()
+            await stream.abort()
+            assert await pool.ping()
+            await pool.close()
+            return exc_info.value
+
+        error = _run(fake, scenario)
+        assert not isinstance(error, ClamdConnectionError)
+
+    def test_unreachable_clamd(self):
+        """연결할 수 없으면 ClamdConnectionError"""
+        async def scenario():
+            pool = ClamdConnectionPool(host="127.0.0.1", port=1, timeout=1)
+            with pytest.raises(ClamdConnectionError):
+                await pool.ping()
+
+        asyncio.run(scenario())
+
+
+def _scanner(fake: FakeClamd) -> VirusScanService:
+    cache = ScanVerdictCache(name=f"test-verdict-{uuid.uuid4().hex}", redis_url="redis://127.0.0.1:1/0")
+    return VirusScanService(
+        verdict_cache=cache,
+        clamd_pools=ClamdPoolManager(host="127.0.0.1", port=fake.port, timeout=1)
+    )
+
+
+def _limits(max_attachment: int, max_mail: int) -> dict:
+    return {
+        "max_attachment_bytes": max_attachment,
+        "max_attachment_mb": max_attachment / (1024 * 1024),
+        "max_mail_bytes": max_mail,
+        "max_mail_mb": max_mail / (1024 * 1024),
+    }
+
+
+class TestVirusScanServiceWithClamd:
+    """clamd 를 사용하는 바이러스 검사 서비스 테스트"""
+
+    def test_scan_file_uses_clamd_and_caches_by_signature(self, tmp_path):
+        """clamd 로 검사하고 시그니처 버전 기준으로 결과 캐시"""
+        fake = FakeClamd()
+        path = tmp_path / "eicar.bin"
+        path.write_bytes(EICAR)
+        sha256 = hashlib.sha256(EICAR).hexdigest()
+
+        async def scenario():
+            scanner = _scanner(fake)
+            first = await scanner.scan_file_async(str(path))
+            second = await scanner.scan_file_async(str(path), sha256)
+            await scanner.clamd_pools.close_all()
+            return scanner, first, second
+
+        scanner, first, second = _run(fake, scenario)
+        assert first.engine == "clamav" and first.is_infected and first.file_hash == sha256
+        assert second.is_infected and second.virus_name == "Eicar-Test-Signature"
+        assert len(fake.scanned) == 1
+        assert scanner.verdict_cache.local.get(("ClamAV-1.0.0/27000", sha256)) is not None
+
+    def test_file_over_stream_limit_does_not_disable_clamd(self, tmp_path):
+        """StreamMaxLength 를 넘는 파일은 휴리스틱으로 검사하고 clamd 는 계속 사용"""
+        fake = FakeClamd()
+        large, small = tmp_path / "large.bin", tmp_path / "small.bin"
+        large.write_bytes(b"a" * 200)
+        small.write_bytes(EICAR)
+
+        async def scenario():
+            scanner = _scanner(fake)
+            scanner.clamd_pools.get_pool().max_stream_bytes = 100
+            large_result = await scanner.scan_file_async(str(large))
+            small_result = await scanner.scan_file_async(str(small))
+            await scanner.clamd_pools.close_all()
+            return large_result, small_result
+
+        large_result, small_result = _run(fake, scenario)
+        assert large_result.engine == "heuristic" and not large_result.is_infected
+        assert small_result.engine == "clamav" and small_result.is_infected
+        assert fake.scanned == [EICAR]
+
+    def test_upload_scanned_while_written(self, tmp_path):
+        """업로드 중 검사에서 바이러스가 발견되면 422 후 임시 파일 삭제"""
+        fake = FakeClamd()
+
+        async def scenario():
+            scanner = _scanner(fake)
+            clean = await store_upload(
+                UploadFile(filename="clean.txt", file=io.BytesIO(b"hello" * 100)),
+                str(tmp_path), _limits(10 ** 6, 10 ** 6), chunk_size=64, virus_scanner=scanner
+            )
+            with pytest.raises(HTTPException) as exc_info:
+                await store_upload(
+                    UploadFile(filename="eicar.com", file=io.BytesIO(EICAR)),
+                    str(tmp_path), _limits(10 ** 6, 10 ** 6), chunk_size=16, virus_scanner=scanner
+                )
+            await scanner.clamd_pools.close_all()
+            return scanner, clean, exc_info.value
+
+        scanner, clean, error = _run(fake, scenario)
+        assert error.status_code == 422
+        assert os.listdir(tmp_path) == [os.path.basename(clean.file_path)]
+        assert fake.scanned == [b"hello" * 100, EICAR]
+        assert scanner.verdict_cache.local.get(("ClamAV-1.0.0/27000", clean.sha256))["is_infected"] is False
@@ -0,0 +1,203 @@
+"""
+폴더 카운터(folder_counters) 테스트
+
+MailInFolder 추가/이동/삭제와 읽음 상태 변경이 같은 트랜잭션에서 카운터에 반영되는지,
+롤백 시 반영되지 않는지, 일괄 처리 훅과 보정 작업이 실제 값과 일치시키는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+
+from sqlalchemy import insert
+
+from app.model import (
+    FolderCounter, FolderType, Mail, MailAttachment, MailFolder, MailInFolder, MailUser, Organization
+)
+from app.service import folder_counter_service
+from app.service.folder_counter_service import FolderCounts, get_count, get_counts, reconcile_folder_counters
+from app.service.mail_recipient_service import MailRecipientService
+
+
+def _seed(db):
+    """조직, 사용자, 받은편지함/휴지통 폴더를 생성합니다."""
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="카운터 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    user = MailUser(user_id=f"user_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                    email="user@example.org", password_hash="x")
+    db.add(user)
+    folders = {}
+    for folder_type in (FolderType.INBOX, FolderType.TRASH):
+        folder = MailFolder(folder_uuid=str(uuid.uuid4()), user_uuid=user.user_uuid, org_id=org_id,
+                            name=folder_type.value, folder_type=folder_type, is_system=True)
+        folders[folder_type] = folder
+        db.add(folder)
+    db.commit()
+    return org_id, user, folders[FolderType.INBOX], folders[FolderType.TRASH]
+
+
+def _mail(db, org_id, user, body="12345", attachment_size=0):
+    mail = Mail(mail_uuid=f"mail_{uuid.uuid4().hex[:12]}", org_id=org_id, sender_uuid=user.user_uuid,
+                subject="제목", body_text=body, status="sent")
+    db.add(mail)
+    if attachment_size:
+        db.add(MailAttachment(attachment_uuid=str(uuid.uuid4()), mail_uuid=mail.mail_uuid, filename="a.bin",
+                              file_path="/tmp/a.bin", file_size=attachment_size))
+    return mail
+
+
+def _counts(db, folder):
+    return get_count(db, folder.folder_uuid)
+
+
+class TestFolderCounterEvents:
+    """세션 이벤트로 유지되는 카운터 테스트"""
+
+    def test_insert_read_move_delete(self, memory_db):
+        """추가 → 읽음 → 이동 → 삭제 순서로 카운터와 크기가 맞게 증감"""
+        db = memory_db
+        org_id, user, inbox, trash = _seed(db)
+        first = _mail(db, org_id, user, body="12345", attachment_size=100)
+        second = _mail(db, org_id, user, body="abc")
+        first_link = MailInFolder(mail_uuid=first.mail_uuid, folder_uuid=inbox.folder_uuid, user_uuid=user.user_uuid)
+        db.add(first_link)
+        db.add(MailInFolder(mail_uuid=second.mail_uuid, folder_uuid=inbox.folder_uuid,
+                            user_uuid=user.user_uuid, is_read=True))
+        db.commit()
+        assert _counts(db, inbox) == FolderCounts(total=2, unread=1, bytes=108)
+
+        first_link.is_read = True
+        db.commit()
+        assert _counts(db, inbox) == FolderCounts(total=2, unread=0, bytes=108)
+
+        first_link.folder_uuid = trash.folder_uuid
+        first_link.is_read = False
+        db.commit()
+        assert _counts(db, inbox) == FolderCounts(total=1, unread=0, bytes=3)
+        assert _counts(db, trash) == FolderCounts(total=1, unread=1, bytes=105)
+
+        db.delete(first_link)
+        db.commit()
+        assert _counts(db, trash) == FolderCounts(total=0, unread=0, bytes=0)
+
+    def test_counts_visible_before_commit_and_discarded_on_rollback(self, memory_db):
+        """flush 후 같은 트랜잭션에서는 개수가 보이고, 롤백하면 반영되지 않음"""
+        db = memory_db
+        org_id, user, inbox, _ = _seed(db)
+        mail = _mail(db, org_id, user)
+        db.add(MailInFolder(mail_uuid=mail.mail_uuid, folder_uuid=inbox.folder_uuid, user_uuid=user.user_uuid))
+        db.flush()
+        assert _counts(db, inbox).total == 1
+
+        db.rollback()
+        assert _counts(db, inbox) == FolderCounts()
+        assert db.query(FolderCounter).count() == 0
+
+    def test_added_and_removed_in_same_transaction(self, memory_db):
+        """같은 트랜잭션에서 추가 후 삭제한 행은 크기에 영향 없음"""
+        db = memory_db
+        org_id, user, inbox, _ = _seed(db)
+        mail = _mail(db, org_id, user, body="hello")
+        link = MailInFolder(mail_uuid=mail.mail_uuid, folder_uuid=inbox.folder_uuid, user_uuid=user.user_uuid)
+        db.add(link)
+        db.flush()
+        db.delete(link)
+        db.commit()
+        assert _counts(db, inbox) == FolderCounts()
+
+
+class TestBulkHooks:
+    """ORM 을 거치지 않는 일괄 처리 훅 테스트"""
+
+    def test_record_inserted_and_move_folder(self, memory_db):
+        """일괄 INSERT 반영 후 폴더 전체 이동 시 카운터 합산"""
+        db = memory_db
+        org_id, user, inbox, trash = _seed(db)
+        mails = [_mail(db, org_id, user, body="x" * 10) for _ in range(3)]
+        db.commit()
+
+        rows = [{"mail_uuid": mail.mail_uuid, "folder_uuid": trash.folder_uuid, "user_uuid": user.user_uuid,
+                 "is_read": False} for mail in mails]
+        db.execute(insert(MailInFolder), rows)
+        folder_counter_service.record_inserted(db, rows)
+        db.commit()
+        assert _counts(db, trash) == FolderCounts(total=3, unread=3, bytes=30)
+
+        db.query(MailInFolder).filter(MailInFolder.folder_uuid == trash.folder_uuid).update(
+            {"folder_uuid": inbox.folder_uuid}
+        )
+        folder_counter_service.move_folder(db, trash.folder_uuid, inbox.folder_uuid)
+        db.commit()
+        assert _counts(db, inbox) == FolderCounts(total=3, unread=3, bytes=30)
+        assert _counts(db, trash) == FolderCounts()
+
+    def test_move_into_folder_created_in_same_flush(self, memory_db):
+        """같은 flush 에서 만든 폴더로 이동한 메일도 카운터에 반영"""
+        db = memory_db
+        org_id, user, inbox, _ = _seed(db)
+        mail = _mail(db, org_id, user, body="abc")
+        link = MailInFolder(mail_uuid=mail.mail_uuid, folder_uuid=inbox.folder_uuid, user_uuid=user.user_uuid)
+        db.add(link)
+        db.commit()
+
+        archive = MailFolder(folder_uuid=str(uuid.uuid4()), user_uuid=user.user_uuid, org_id=org_id,
+                             name="보관함", folder_type=FolderType.CUSTOM)
+        db.add(archive)
+        link.folder_uuid = archive.folder_uuid
+        db.commit()
+        assert _counts(db, inbox) == FolderCounts()
+        assert _counts(db, archive) == FolderCounts(total=1, unread=1, bytes=3)
+
+
+def test_send_updates_sent_folder_and_inbox_counters(memory_db):
+    """/send 와 같은 순서(보낸편지함 ORM 추가 + 받은편지함 일괄 INSERT)로 저장하면 두 폴더 카운터가 모두 반영"""
+    db = memory_db
+    org_id, recipient, inbox, _ = _seed(db)
+    sender = MailUser(user_id=f"sender_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                      email="sender@example.org", password_hash="x")
+    sent_folder = MailFolder(folder_uuid=str(uuid.uuid4()), user_uuid=sender.user_uuid, org_id=org_id,
+                             name="sent", folder_type=FolderType.SENT, is_system=True)
+    db.add_all([sender, sent_folder])
+    db.commit()
+
+    mail = _mail(db, org_id, sender, body="hello")
+    recipient_service = MailRecipientService(db)
+    recipients = recipient_service.resolve(org_id=org_id, to_emails=[recipient.email])
+    recipient_service.add_recipients(mail.mail_uuid, recipients)
+    db.add(MailInFolder(mail_uuid=mail.mail_uuid, folder_uuid=sent_folder.folder_uuid, user_uuid=sender.user_uuid))
+    assert recipient_service.deliver_to_inboxes(mail.mail_uuid, org_id, recipients) == 1
+    db.commit()
+
+    # 폴더 목록(mail_advanced_router)과 같은 조회
+    counts = get_counts(db, [sent_folder.folder_uuid, inbox.folder_uuid])
+    assert counts[sent_folder.folder_uuid] == FolderCounts(total=1, unread=1, bytes=5)
+    assert counts[inbox.folder_uuid] == FolderCounts(total=1, unread=1, bytes=5)
+
+    reconcile_folder_counters(db)
+    assert get_counts(db, [sent_folder.folder_uuid, inbox.folder_uuid]) == counts
+
+
+def test_reconcile_repairs_drift(memory_db):
+    """어긋난 카운터와 누락된 카운터를 실제 값으로 보정하고 고아 카운터는 삭제"""
+    db = memory_db
+    org_id, user, inbox, trash = _seed(db)
+    mail = _mail(db, org_id, user, body="abcd", attachment_size=6)
+    db.add(MailInFolder(mail_uuid=mail.mail_uuid, folder_uuid=inbox.folder_uuid, user_uuid=user.user_uuid))
+    db.commit()
+
+    db.query(FolderCounter).filter(FolderCounter.folder_uuid == inbox.folder_uuid).update(
+        {"total_count": 42, "unread_count": 7, "total_bytes": 1}
+    )
+    db.add(FolderCounter(folder_uuid="orphan-folder", total_count=1, unread_count=1, total_bytes=1))
+    db.commit()
+
+    result = reconcile_folder_counters(db, batch_size=1)
+
+    assert result == {"checked": 2, "corrected": 1, "orphaned": 1}
+    assert _counts(db, inbox) == FolderCounts(total=1, unread=1, bytes=10)
+    assert _counts(db, trash) == FolderCounts()
+    assert db.query(FolderCounter).count() == 2
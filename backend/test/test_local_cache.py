@@ -0,0 +1,114 @@
+"""
+로컬 LRU + TTL 캐시 및 캐시 무효화 버스 테스트
+
+캐시 크기 제한, 만료, 적중/미스 통계와 조직 정보 캐시 무효화를 검증합니다.
+워커 간 전파 테스트는 로컬 Redis가 있을 때만 실행됩니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.middleware.tenant_middleware import tenant_cache, invalidate_organization_cache
+from app.utils.cache_invalidation import CacheInvalidationBus
+from app.utils.local_cache import LRUTTLCache, get_cache_stats
+
+
+def _redis_available() -> bool:
+    """로컬 Redis 접속 가능 여부"""
+    try:
+        import redis
+        return bool(redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.2).ping())
+    except Exception:
+        return False
+
+
+class TestLRUTTLCache:
+    """LRU + TTL 캐시 테스트"""
+
+    def test_evicts_least_recently_used(self):
+        """최대 크기를 넘으면 가장 오래 사용하지 않은 항목 제거"""
+        cache = LRUTTLCache(f"test-{uuid.uuid4().hex}", max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a 사용 -> b가 가장 오래됨
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_expires_after_ttl(self):
+        """TTL이 지난 항목은 미스로 처리"""
+        cache = LRUTTLCache(f"test-{uuid.uuid4().hex}", max_size=10, ttl_seconds=60)
+        cache.set("short", "v", ttl_seconds=0.01)
+        cache.set("long", "v")
+        time.sleep(0.02)
+
+        assert cache.get("short") is None
+        assert cache.get("long") == "v"
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+    def test_registered_for_monitoring(self):
+        """생성된 캐시는 이름으로 통계 조회 가능"""
+        name = f"test-{uuid.uuid4().hex}"
+        cache = LRUTTLCache(name, max_size=10, ttl_seconds=60)
+        cache.get("missing")
+
+        assert get_cache_stats()[name]["misses"] == 1
+
+
+class TestTenantCacheInvalidation:
+    """조직 정보 캐시 무효화 테스트"""
+
+    def test_invalidates_every_key_of_organization(self):
+        """조직 코드/ID/서브도메인 키와 기본 조직 키를 모두 삭제하고 다른 조직은 유지"""
+        org_id, other_id = str(uuid.uuid4()), str(uuid.uuid4())
+        org = {"id": org_id, "org_code": "acme", "subdomain": "acme", "is_active": True}
+        other = {"id": other_id, "org_code": "other", "subdomain": "other", "is_active": True}
+        tenant_cache.set(f"org_code:acme-{org_id}", org)
+        tenant_cache.set(f"org_id_uuid:{org_id}", org)
+        tenant_cache.set(f"org_subdomain:acme-{org_id}", org)
+        tenant_cache.set(f"default_org:default-{org_id}", other)
+        tenant_cache.set(f"org_id_uuid:{other_id}", other)
+
+        # Redis가 없어도 로컬 캐시는 즉시 무효화
+        asyncio.run(invalidate_organization_cache(org_id))
+
+        assert tenant_cache.get(f"org_code:acme-{org_id}") is None
+        assert tenant_cache.get(f"org_id_uuid:{org_id}") is None
+        assert tenant_cache.get(f"org_subdomain:acme-{org_id}") is None
+        assert tenant_cache.get(f"default_org:default-{org_id}") is None
+        assert tenant_cache.get(f"org_id_uuid:{other_id}") == other
+        tenant_cache.delete(f"org_id_uuid:{other_id}")
+
+    @pytest.mark.skipif(not _redis_available(), reason="로컬 Redis 없음")
+    def test_invalidation_reaches_other_worker(self):
+        """다른 워커(버스 인스턴스)가 보낸 무효화 메시지를 받아 처리"""
+        channel = f"cache:invalidate:test:{uuid.uuid4().hex}"
+        sender = CacheInvalidationBus(channel=channel)
+        receiver = CacheInvalidationBus(channel=channel)
+        received = []
+        receiver.register("tenant", received.append)
+
+        async def scenario():
+            await receiver.start()
+            await asyncio.sleep(0.2)  # 구독 완료 대기
+            await sender.publish("tenant", org_id="org-1")
+            for _ in range(50):
+                if received:
+                    break
+                await asyncio.sleep(0.02)
+            await receiver.stop()
+            await sender.stop()
+
+        asyncio.run(scenario())
+        assert received == [{"org_id": "org-1"}]
@@ -0,0 +1,123 @@
+"""
+로깅 설정 테스트
+
+큐 기반 로깅이 리스너 스레드에서 structlog JSON 으로 파일에 기록하는지,
+로거별 레벨과 호출 위치별 샘플링, 크기 기준 로테이션이 동작하는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import json
+import logging
+
+import pytest
+import structlog
+
+from app import logging_config
+from app.config import settings
+from app.logging_config import LocalQueueHandler, RateLimitFilter, parse_size, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def logging_dir(tmp_path, monkeypatch):
+    """테스트 전용 로그 디렉토리 (종료 시 루트 로거 상태 복원)"""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    monkeypatch.setattr(settings, "LOG_FORMAT", "json")
+    try:
+        yield tmp_path
+    finally:
+        shutdown_logging()
+        root.handlers = [handler for handler in handlers if not isinstance(handler, LocalQueueHandler)]
+        root.setLevel(level)
+
+
+def _read_json_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _record(lineno, created, level=logging.INFO):
+    record = logging.LogRecord("bench", level, "/app/router.py", lineno, "메시지", None, None)
+    record.created = created
+    return record
+
+
+def test_parse_size():
+    assert parse_size("10MB") == 10 * 1024 ** 2
+    assert parse_size("500kb") == 500 * 1024
+    assert parse_size("1.5G") == int(1.5 * 1024 ** 3)
+    assert parse_size("2048") == 2048
+    with pytest.raises(ValueError):
+        parse_size("열 메가")
+
+
+def test_rate_limit_filter_samples_per_call_site():
+    """같은 위치는 구간당 최대 수까지만 통과, 생략 수는 다음 구간 첫 로그에 기록"""
+    sampler = RateLimitFilter(max_per_window=2, window_seconds=1.0)
+    assert [sampler.filter(_record(10, 100.0 + i * 0.1)) for i in range(5)] == [True, True, False, False, False]
+    # 다른 호출 위치와 WARNING 이상은 영향 없음
+    assert sampler.filter(_record(20, 100.5))
+    assert sampler.filter(_record(10, 100.6, logging.WARNING))
+
+    record = _record(10, 101.2)
+    assert sampler.filter(record)
+    assert record.sampled_dropped == 3
+    assert sampler.dropped_total == 3
+
+
+def test_logs_json_through_queue_with_logger_levels(logging_dir, monkeypatch):
+    """루트에는 큐 핸들러만 있고, 파일에는 JSON 으로 기록되며 로거별 레벨이 적용됨"""
+    monkeypatch.setattr(settings, "LOG_LEVELS", {"test.logging.noisy": "WARNING"})
+    setup_logging(log_dir=str(logging_dir), console_stream=io.StringIO())
+    assert [type(handler) for handler in logging.getLogger().handlers] == [LocalQueueHandler]
+
+    logger = logging.getLogger("test.logging.app")
+    logger.info("📤 메일 발송 - 수신자 수: %d", 3)
+    logging.getLogger("test.logging.noisy").info("기록되지 않음")
+    try:
+        raise ValueError("실패")
+    except ValueError:
+        logger.exception("❌ 처리 실패")
+    structlog.get_logger("test.logging.struct").info("구조화 로그", org_id="org-1")
+    shutdown_logging()
+
+    lines = [line for line in _read_json_lines(logging_dir / "app.log") if line["logger"].startswith("test.logging")]
+    assert [line["event"] for line in lines] == ["📤 메일 발송 - 수신자 수: 3", "❌ 처리 실패", "구조화 로그"]
+    assert lines[0]["level"] == "info"
+    assert "timestamp" in lines[0]
+    assert "ValueError: 실패" in lines[1]["exception"]
+    assert lines[2]["org_id"] == "org-1"
+
+
+def test_rotates_by_size(logging_dir, monkeypatch):
+    """LOG_ROTATION_SIZE 를 넘으면 백업 파일로 넘김"""
+    monkeypatch.setattr(settings, "LOG_ROTATION_SIZE", "2KB")
+    monkeypatch.setattr(settings, "LOG_BACKUP_COUNT", 2)
+    monkeypatch.setattr(settings, "LOG_SAMPLE_MAX_PER_WINDOW", 0)
+    setup_logging(log_dir=str(logging_dir), console_stream=io.StringIO())
+
+    logger = logging.getLogger("test.logging.rotate")
+    for i in range(100):
+        logger.info(f"회전 테스트 {i} " + "x" * 50)
+    shutdown_logging()
+
+    assert (logging_dir / "app.log.1").exists()
+    assert (logging_dir / "app.log.2").exists()
+    assert not (logging_dir / "app.log.3").exists()
+    assert os.path.getsize(logging_dir / "app.log") <= 2 * 1024
+    assert logging_config._listener is None
+
+
+def test_shutdown_switches_to_direct_console_handler(logging_dir):
+    """리스너 종료 후의 로그는 큐에 쌓이지 않고 콘솔에 바로 기록"""
+    console = io.StringIO()
+    setup_logging(log_dir=str(logging_dir), console_stream=console)
+    shutdown_logging()
+
+    handlers = logging.getLogger().handlers
+    assert not any(isinstance(handler, LocalQueueHandler) for handler in handlers)
+    logging.getLogger("test.logging.after").warning("종료 후 로그")
+    assert json.loads(console.getvalue().splitlines()[-1])["event"] == "종료 후 로그"
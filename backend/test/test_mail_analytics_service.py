@@ -0,0 +1,102 @@
+"""
+메일 분석 서비스 테스트
+
+SQL 집계 결과(일별/우선순위/상위 발신자·수신자)가 기존 응답 형식과 맞는지,
+지난 날짜 구간은 캐시된 값을 쓰고 오늘 구간만 다시 집계하는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+from datetime import datetime
+
+import pytest
+from app.model import Mail, MailRecipient, MailUser, Organization
+from app.service.mail_analytics_service import MailAnalyticsService, analytics_cache
+
+NOW = datetime(2025, 11, 10, 12, 0, 0)
+
+
+@pytest.fixture
+def analytics_db(memory_db):
+    """분석 캐시를 비운 인메모리 SQLite 세션"""
+    analytics_cache.clear()
+    yield memory_db
+    analytics_cache.clear()
+
+
+def _seed(db):
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="분석 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    users = {}
+    for name in ("me", "bob", "carol"):
+        users[name] = MailUser(user_id=f"{name}_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                               email=f"{name}@example.org", password_hash="x")
+        db.add(users[name])
+    db.commit()
+    return org_id, users
+
+
+def _mail(db, org_id, sender, recipients, created_at, priority="normal", status="sent"):
+    mail = Mail(mail_uuid=f"mail_{uuid.uuid4().hex[:12]}", org_id=org_id, sender_uuid=sender.user_uuid,
+                subject="제목", priority=priority, status=status, created_at=created_at)
+    db.add(mail)
+    for recipient in recipients:
+        if isinstance(recipient, MailUser):
+            db.add(MailRecipient(mail_uuid=mail.mail_uuid, recipient_uuid=recipient.user_uuid,
+                                 recipient_email=recipient.email))
+        else:
+            db.add(MailRecipient(mail_uuid=mail.mail_uuid, recipient_email=recipient))
+    db.commit()
+
+
+def test_aggregates_daily_priority_and_top_correspondents(analytics_db):
+    """일별/우선순위 개수와 상위 발신자·수신자를 SQL 로 집계"""
+    db = analytics_db
+    org_id, users = _seed(db)
+    me, bob, carol = users["me"], users["bob"], users["carol"]
+    _mail(db, org_id, me, [bob, "ext@partner.com"], datetime(2025, 11, 8, 9), priority="high")
+    _mail(db, org_id, me, ["ext@partner.com"], datetime(2025, 11, 9, 9))
+    _mail(db, org_id, me, [bob], datetime(2025, 11, 9, 10), status="draft")       # 제외 (발송 안 됨)
+    _mail(db, org_id, bob, [me], datetime(2025, 11, 9, 11), priority="low")
+    _mail(db, org_id, bob, [me], datetime(2025, 11, 10, 8))
+    _mail(db, org_id, carol, [me], datetime(2025, 11, 10, 9), priority="urgent")  # 알 수 없는 값은 normal
+    _mail(db, org_id, carol, [me], datetime(2025, 10, 1, 9))                     # 기간 밖
+
+    data = MailAnalyticsService(db).get_analytics(org_id, me.user_uuid, "week", now=NOW)
+
+    assert data["summary"] == {"total_sent": 2, "total_received": 3, "total_mails": 5}
+    assert len(data["daily_stats"]) == 8
+    assert data["daily_stats"]["2025-11-08"] == {"sent": 1, "received": 0}
+    assert data["daily_stats"]["2025-11-09"] == {"sent": 1, "received": 1}
+    assert data["daily_stats"]["2025-11-10"] == {"sent": 0, "received": 2}
+    assert data["priority_stats"] == {"high": 1, "normal": 3, "low": 1}
+    assert data["top_senders"] == [
+        {"email": "bob@example.org", "count": 2}, {"email": "carol@example.org", "count": 1}
+    ]
+    assert data["top_recipients"] == [
+        {"email": "ext@partner.com", "count": 2}, {"email": "bob@example.org", "count": 1}
+    ]
+
+
+def test_closed_days_are_cached_and_today_is_live(analytics_db):
+    """지난 날짜 구간은 캐시된 집계를 쓰고, 오늘 받은 메일은 바로 반영"""
+    db = analytics_db
+    org_id, users = _seed(db)
+    me, bob = users["me"], users["bob"]
+    _mail(db, org_id, bob, [me], datetime(2025, 11, 9, 9))
+    service = MailAnalyticsService(db)
+    assert service.get_analytics(org_id, me.user_uuid, "month", now=NOW)["summary"]["total_received"] == 1
+
+    _mail(db, org_id, bob, [me], datetime(2025, 11, 8, 9))    # 캐시된 지난 구간 (다음 날 반영)
+    _mail(db, org_id, bob, [me], datetime(2025, 11, 10, 11))  # 오늘 구간
+    data = service.get_analytics(org_id, me.user_uuid, "month", now=NOW)
+
+    assert data["summary"]["total_received"] == 2
+    assert data["top_senders"] == [{"email": "bob@example.org", "count": 2}]
+    assert service.get_analytics(org_id, me.user_uuid, "month",
+                                 now=datetime(2025, 11, 11, 0, 5))["summary"]["total_received"] == 3
@@ -0,0 +1,188 @@
+"""
+메일 백업 내보내기 테스트
+
+배치 단위 일괄 조회로 메일 수와 무관한 SQL 문 수, NDJSON ZIP 형식,
+진행 상태 기록과 생성 중 스트리밍 다운로드를 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import io
+import json
+import threading
+import time
+import uuid
+import zipfile
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.model import Organization, MailUser, Mail, MailRecipient, MailAttachment
+from app.service.mail_backup_service import (
+    NDJSON_ENTRY, BackupJob, BackupJobStatus, MailBackupService,
+    read_job_status, run_backup_job, stream_backup_file, write_job_status
+)
+
+
+class StatementCounter:
+    """실행된 SQL 문 개수를 세는 컨텍스트 매니저"""
+
+    def __init__(self, session):
+        self.engine = session.get_bind()
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def _seed_mailbox(session_factory, mail_count: int, attachment_dir=None):
+    """보낸 메일과 받은 메일이 섞인 메일함을 만들고 백업 작업 정보를 반환합니다."""
+    db = session_factory()
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="백업 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    owner = MailUser(user_id=f"owner_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                     email="owner@example.org", password_hash="x")
+    peer = MailUser(user_id=f"peer_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                    email="peer@example.org", password_hash="x")
+    db.add_all([owner, peer])
+    for i in range(mail_count):
+        outgoing = i % 2 == 0
+        mail_uuid = f"mail_{uuid.uuid4().hex[:12]}"
+        db.add(Mail(mail_uuid=mail_uuid, org_id=org_id,
+                    sender_uuid=owner.user_uuid if outgoing else peer.user_uuid,
+                    subject=f"제목 {i}", body_text=f"본문 {i}", status="sent"))
+        db.add(MailRecipient(mail_uuid=mail_uuid, recipient_uuid=peer.user_uuid if outgoing else owner.user_uuid,
+                             recipient_email="peer@example.org" if outgoing else "owner@example.org",
+                             recipient_type="to"))
+        if attachment_dir is not None:
+            file_path = os.path.join(attachment_dir, f"{mail_uuid}.txt")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(f"첨부 {i}")
+            db.add(MailAttachment(attachment_uuid=str(uuid.uuid4()), mail_uuid=mail_uuid, filename="note.txt",
+                                  file_path=file_path, file_size=os.path.getsize(file_path),
+                                  content_type="text/plain"))
+    # 다른 사용자끼리의 메일은 백업 대상이 아님
+    db.add(Mail(mail_uuid=f"mail_{uuid.uuid4().hex[:12]}", org_id=org_id, sender_uuid=peer.user_uuid,
+                subject="무관", body_text="무관", status="sent"))
+    db.commit()
+    job = BackupJob(backup_filename="mail_backup_owner@example.org_test.zip", org_id=org_id,
+                    user_uuid=owner.user_uuid, include_attachments=attachment_dir is not None)
+    db.close()
+    return job
+
+
+def _read_entries(backup_path):
+    with zipfile.ZipFile(backup_path) as zipf:
+        with zipf.open(NDJSON_ENTRY) as ndjson:
+            return [json.loads(line) for line in io.TextIOWrapper(ndjson, encoding="utf-8")], zipf.namelist()
+
+
+class TestMailBackupService:
+    """메일 백업 내보내기 테스트"""
+
+    def test_statement_count_does_not_grow_with_mails(self, memory_session_factory, tmp_path):
+        """메일 5건과 200건 백업의 SQL 문 수가 같음 (배치 내 일괄 조회)"""
+        counts = []
+        for mail_count in (5, 200):
+            job = _seed_mailbox(memory_session_factory, mail_count)
+            db = memory_session_factory()
+            mail_user = db.query(MailUser).filter(MailUser.user_uuid == job.user_uuid).one()
+            with StatementCounter(db) as counter:
+                MailBackupService(db, batch_size=1000).export(str(tmp_path / f"{mail_count}.zip"), job, mail_user)
+            db.close()
+            counts.append(counter.count)
+
+        assert counts[0] == counts[1]
+
+    def test_writes_ndjson_zip_and_completes_job(self, memory_session_factory, tmp_path):
+        """보내거나 받은 메일만 한 줄씩 기록하고 첨부파일을 포함하며 상태 파일에 완료를 기록"""
+        job = _seed_mailbox(memory_session_factory, 7, attachment_dir=str(tmp_path))
+        backup_path = str(tmp_path / job.backup_filename)
+        write_job_status(backup_path, job)
+
+        result = run_backup_job(backup_path, job, session_factory=memory_session_factory)
+
+        entries, names = _read_entries(backup_path)
+        assert result.status == BackupJobStatus.COMPLETED
+        assert len(entries) == 7
+        by_subject = {entry["subject"]: entry for entry in entries}
+        assert by_subject["제목 0"]["sender_email"] == "owner@example.org"
+        assert by_subject["제목 0"]["recipients"][0]["email"] == "peer@example.org"
+        assert by_subject["제목 1"]["sender_email"] == "peer@example.org"
+        assert by_subject["제목 1"]["attachments"][0]["filename"] == "note.txt"
+        assert sum(name.startswith("attachments/") for name in names) == 7
+
+        saved = read_job_status(backup_path)
+        assert (saved.status, saved.total, saved.processed, saved.progress) == ("completed", 7, 7, 100.0)
+        assert saved.backup_size == os.path.getsize(backup_path)
+
+    def test_refreshes_status_while_adding_files(self, memory_session_factory, tmp_path, monkeypatch):
+        """메일 데이터 기록 후 첨부파일을 추가하는 동안에도 파일 수 간격으로 상태 파일을 갱신"""
+        monkeypatch.setattr(settings, "MAIL_BACKUP_STATUS_EVERY_FILES", 2)
+        job = _seed_mailbox(memory_session_factory, 6, attachment_dir=str(tmp_path))
+        backup_path = str(tmp_path / job.backup_filename)
+
+        refreshed = []
+        monkeypatch.setattr("app.service.mail_backup_service.write_job_status",
+                            lambda path, current: refreshed.append(current.processed))
+        db = memory_session_factory()
+        mail_user = db.query(MailUser).filter(MailUser.user_uuid == job.user_uuid).one()
+        MailBackupService(db, batch_size=1000).export(backup_path, job, mail_user)
+        db.close()
+
+        # 시작 + 메일 배치 1회 + 첨부파일 6개를 2개씩 3회 + 완료
+        assert refreshed == [0, 6, 6, 6, 6, 6]
+        assert job.status == BackupJobStatus.COMPLETED
+
+    def test_stream_follows_file_until_job_completes(self, memory_session_factory, tmp_path):
+        """생성 중에 시작한 다운로드가 완료 시점까지 기록된 전체 ZIP을 전송"""
+        job = _seed_mailbox(memory_session_factory, 50)
+        backup_path = str(tmp_path / job.backup_filename)
+        open(backup_path, "wb").close()
+        write_job_status(backup_path, job)
+
+        async def download():
+            chunks = []
+            async for chunk in stream_backup_file(backup_path, chunk_size=256, poll_interval=0.01):
+                chunks.append(chunk)
+            return b"".join(chunks)
+
+        def produce():
+            time.sleep(0.05)
+            run_backup_job(backup_path, job, session_factory=memory_session_factory)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        downloaded = asyncio.run(download())
+        producer.join()
+
+        with open(backup_path, "rb") as f:
+            assert downloaded == f.read()
+        entries, _ = _read_entries(backup_path)
+        assert len(entries) == 50
+
+    def test_stream_stops_when_job_fails(self, tmp_path):
+        """작업이 실패하면 기다리지 않고 전송을 끝냄"""
+        backup_path = str(tmp_path / "failed.zip")
+        with open(backup_path, "wb") as f:
+            f.write(b"partial")
+        job = BackupJob(backup_filename="failed.zip", org_id="org", user_uuid="user",
+                        include_attachments=False, status=BackupJobStatus.FAILED, error="boom")
+        write_job_status(backup_path, job)
+
+        async def download():
+            return [chunk async for chunk in stream_backup_file(backup_path, poll_interval=0.01)]
+
+        assert asyncio.run(download()) == [b"partial"]
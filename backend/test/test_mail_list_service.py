@@ -0,0 +1,239 @@
+"""
+메일 목록 엔진 테스트
+
+페이지 크기가 커져도 한 페이지를 구성하는 쿼리 수가 늘어나지 않는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.model import (
+    Organization, User, MailUser, Mail, MailRecipient, MailAttachment, MailFolder, MailInFolder, FolderType
+)
+from app.service.mail_list_service import MailListService, text_search_condition
+from app.service.mail_service import MailService
+
+
+class QueryCounter:
+    """실행된 SQL 문 개수를 세는 컨텍스트 매니저"""
+
+    def __init__(self, session):
+        self.engine = session.get_bind()
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def _seed_mailbox(db, mail_count: int):
+    """조직, 사용자, 폴더와 mail_count 개의 받은/보낸 메일을 생성합니다."""
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="목록 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    user = User(
+        user_id=f"user_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+        email="owner@example.org", username="owner", hashed_password="x", is_active=True
+    )
+    owner = MailUser(user_id=user.user_id, user_uuid=user.user_uuid, org_id=org_id,
+                     email=user.email, password_hash="x")
+    db.add_all([user, owner])
+
+    folders = {}
+    for folder_type in (FolderType.INBOX, FolderType.SENT, FolderType.DRAFT, FolderType.TRASH):
+        folders[folder_type] = MailFolder(
+            folder_uuid=str(uuid.uuid4()), user_uuid=owner.user_uuid, org_id=org_id,
+            name=folder_type.value.upper(), folder_type=folder_type, is_system=True
+        )
+    db.add_all(folders.values())
+
+    base_time = datetime(2025, 1, 1)
+    for i in range(mail_count):
+        sender = MailUser(user_id=f"ext_{uuid.uuid4().hex[:12]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                          email=f"sender{i}@example.com", password_hash="x")
+        received = Mail(mail_uuid=f"in_{i}_{uuid.uuid4().hex[:8]}", org_id=org_id, sender_uuid=sender.user_uuid,
+                        subject=f"받은 메일 {i}", body_text="본문", status="sent",
+                        created_at=base_time + timedelta(minutes=i), sent_at=base_time + timedelta(minutes=i))
+        sent = Mail(mail_uuid=f"out_{i}_{uuid.uuid4().hex[:8]}", org_id=org_id, sender_uuid=owner.user_uuid,
+                    subject=f"보낸 메일 {i}", body_text="본문", status="sent",
+                    created_at=base_time + timedelta(minutes=i), sent_at=base_time + timedelta(minutes=i))
+        db.add_all([sender, received, sent])
+        db.add_all([
+            MailRecipient(mail_uuid=received.mail_uuid, recipient_uuid=owner.user_uuid,
+                          recipient_email=owner.email, recipient_type="to"),
+            MailRecipient(mail_uuid=received.mail_uuid, recipient_email="cc@example.com", recipient_type="cc"),
+            MailRecipient(mail_uuid=sent.mail_uuid, recipient_email="to@example.com", recipient_type="to"),
+            MailAttachment(attachment_uuid=str(uuid.uuid4()), mail_uuid=received.mail_uuid,
+                           filename="a.txt", file_path="a.txt", file_size=1),
+            MailInFolder(mail_uuid=received.mail_uuid, folder_uuid=folders[FolderType.INBOX].folder_uuid,
+                         user_uuid=owner.user_uuid, is_read=(i % 2 == 0)),
+            MailInFolder(mail_uuid=sent.mail_uuid, folder_uuid=folders[FolderType.SENT].folder_uuid,
+                         user_uuid=owner.user_uuid, is_read=True),
+        ])
+    db.commit()
+    return org_id, owner, folders
+
+
+def _count_page_queries(db, owner, org_id, folder_type, limit, **kwargs) -> int:
+    """한 페이지 구성에 사용된 쿼리 수를 반환합니다."""
+    db.expire_all()
+    db.refresh(owner)
+    service = MailListService(db)
+    with QueryCounter(db) as counter:
+        list_page = service.build_page(mail_user=owner, org_id=org_id, folder_type=folder_type,
+                                       page=1, limit=limit, **kwargs)
+        # 응답 구성 시 지연 로딩이 발생하지 않는지까지 포함해 측정
+        for item in list_page.mails:
+            item.model_dump()
+    assert len(list_page.mails) == limit
+    return counter.count
+
+
+class TestMailListService:
+    """메일 목록 엔진 테스트 클래스"""
+
+    @pytest.mark.parametrize("folder_type", ["inbox", "sent"])
+    def test_query_count_does_not_grow_with_page_size(self, memory_db, folder_type):
+        """페이지 크기가 달라져도 쿼리 수가 동일해야 함"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 30)
+
+        small = _count_page_queries(memory_db, owner, org_id, folder_type, 5)
+        large = _count_page_queries(memory_db, owner, org_id, folder_type, 30)
+
+        assert small == large
+        assert large <= 5
+
+    def test_query_count_with_recipients_loaded(self, memory_db):
+        """수신자 목록을 함께 로드해도 쿼리 수가 고정되어야 함"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 30)
+
+        small = _count_page_queries(memory_db, owner, org_id, "inbox", 5, include_recipients=True)
+        large = _count_page_queries(memory_db, owner, org_id, "inbox", 30, include_recipients=True)
+
+        assert small == large
+
+    def test_inbox_page_contents(self, memory_db):
+        """받은 메일함 페이지의 발신자, 개수, 읽음 상태가 올바른지 확인"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 3)
+
+        list_page = MailListService(memory_db).build_page(
+            mail_user=owner, org_id=org_id, folder_type="inbox", page=1, limit=10
+        )
+
+        assert list_page.total == 3
+        assert list_page.total_pages == 1
+        newest = list_page.mails[0]
+        assert newest.subject == "받은 메일 2"
+        assert newest.sender.email == "sender2@example.com"
+        assert newest.recipient_count == 2
+        assert newest.attachment_count == 1
+        assert newest.is_read is True
+        assert list_page.mails[1].is_read is False
+
+    def test_unsupported_folder_type(self, memory_db):
+        """지원하지 않는 폴더 타입은 ValueError"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 1)
+
+        with pytest.raises(ValueError):
+            MailListService(memory_db).build_page(mail_user=owner, org_id=org_id, folder_type="spam")
+
+    def test_mail_service_get_mails_by_folder_uses_engine(self, memory_db):
+        """MailService.get_mails_by_folder가 목록 엔진 결과를 반환하는지 확인"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 4)
+
+        result = asyncio.run(MailService(memory_db).get_mails_by_folder(
+            org_id=org_id, user_uuid=owner.user_uuid, folder_type="sent", page=1, limit=2
+        ))
+
+        assert result["pagination"]["total_items"] == 4
+        assert result["pagination"]["total_pages"] == 2
+        assert len(result["mails"]) == 2
+        assert result["mails"][0]["sender_email"] == owner.email
+        assert result["mails"][0]["recipients"] == [{"email": "to@example.com", "type": "to"}]
+
+    def test_cursor_walks_whole_folder_without_duplicates(self, memory_db):
+        """커서 방식으로 끝까지 넘기면 모든 메일을 중복 없이 최신순으로 반환"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 12)
+        service = MailListService(memory_db)
+
+        seen = []
+        cursor = None
+        while True:
+            list_page = service.build_page(mail_user=owner, org_id=org_id, folder_type="inbox", limit=5,
+                                           cursor=cursor, use_cursor=True, include_total=False)
+            assert list_page.total is None
+            seen.extend(item.mail_uuid for item in list_page.mails)
+            if not list_page.has_next:
+                assert list_page.next_cursor is None
+                break
+            cursor = list_page.next_cursor
+
+        assert len(seen) == 12
+        assert len(set(seen)) == 12
+        assert seen[0].startswith("in_11_")
+
+    def test_cursor_deep_page_costs_same_as_first_page(self, memory_db):
+        """커서 방식의 깊은 페이지도 첫 페이지와 같은 쿼리 수"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 30)
+        service = MailListService(memory_db)
+        first = service.build_page(mail_user=owner, org_id=org_id, folder_type="sent", limit=5,
+                                   use_cursor=True, include_total=False)
+
+        memory_db.expire_all()
+        memory_db.refresh(owner)
+        with QueryCounter(memory_db) as first_counter:
+            service.build_page(mail_user=owner, org_id=org_id, folder_type="sent", limit=5,
+                               use_cursor=True, include_total=False)
+        with QueryCounter(memory_db) as deep_counter:
+            deep = service.build_page(mail_user=owner, org_id=org_id, folder_type="sent", limit=5,
+                                      cursor=first.next_cursor, include_total=False)
+
+        assert first_counter.count == deep_counter.count
+        assert deep.mails[0].mail_uuid != first.mails[-1].mail_uuid
+
+    def test_invalid_cursor(self, memory_db):
+        """잘못된 커서는 ValueError"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 1)
+
+        with pytest.raises(ValueError):
+            MailListService(memory_db).build_page(mail_user=owner, org_id=org_id, folder_type="inbox",
+                                                cursor="not-a-cursor")
+
+    def test_paginate_arbitrary_query_for_search(self, memory_db):
+        """검색용 임의 쿼리도 커서 방식과 읽음 상태를 지원"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 6)
+        query = memory_db.query(Mail).filter(Mail.org_id == org_id, Mail.subject.like("받은 메일%"))
+
+        list_page = MailListService(memory_db).paginate_mails(query, mail_user=owner, limit=4, use_cursor=True)
+
+        assert list_page.total == 6
+        assert list_page.has_next is True
+        assert len(list_page.mails) == 4
+        assert list_page.mails[0].sender.email == "sender5@example.com"
+        assert list_page.mails[0].is_read is False
+        assert list_page.mails[1].is_read is True
+
+    def test_text_search_falls_back_to_ilike(self, memory_db):
+        """PostgreSQL 외 DB에서는 search_vector 없이 부분일치 검색"""
+        org_id, owner, folders = _seed_mailbox(memory_db, 3)
+
+        condition = text_search_condition(memory_db, "받은 메일")
+        matched = memory_db.query(Mail).filter(Mail.org_id == org_id, condition).count()
+
+        assert "search_vector" not in str(condition)
+        assert matched == 3
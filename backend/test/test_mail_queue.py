@@ -0,0 +1,292 @@
+"""
+메일 발송 큐 및 발송 워커 테스트
+
+Redis 없이 InMemoryMailQueue와 인메모리 SQLite로 큐 등록, 재시도 백오프,
+최종 실패, 중단된 워커 복구, 메일 상태/로그 갱신, 중복 작업 선점과 발송 중 하트비트를 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+import asyncio
+
+
+from app.config import settings
+from app.model import Organization, MailUser, Mail, MailRecipient, MailLog
+from app.service.mail_queue_service import InMemoryMailQueue, MailJob, retry_delay_seconds
+from app.tasks.mail_delivery import MailDeliveryWorker
+
+
+def _seed_queued_mail(memory_session_factory, status: str = "queued"):
+    """queued 상태의 메일 한 통을 생성합니다."""
+    db = memory_session_factory()
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="큐 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    sender = MailUser(user_id=f"user_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                      email="sender@example.org", password_hash="x")
+    mail = Mail(mail_uuid=f"queued_{uuid.uuid4().hex[:12]}", org_id=org_id, sender_uuid=sender.user_uuid,
+                subject="큐 메일", body_text="본문", status=status)
+    db.add_all([sender, mail])
+    db.add(MailRecipient(mail_uuid=mail.mail_uuid, recipient_email="to@example.com", recipient_type="to"))
+    db.commit()
+    job = MailJob(mail_uuid=mail.mail_uuid, org_id=org_id)
+    db.close()
+    return job
+
+
+def _mail_state(memory_session_factory, mail_uuid):
+    """메일 상태와 로그 액션 목록을 반환합니다."""
+    db = memory_session_factory()
+    try:
+        mail = db.query(Mail).filter(Mail.mail_uuid == mail_uuid).first()
+        actions = [log.action for log in db.query(MailLog).filter(MailLog.mail_uuid == mail_uuid).order_by(MailLog.id)]
+        return mail.status, mail.sent_at, actions
+    finally:
+        db.close()
+
+
+class FakeDeliver:
+    """발송 결과를 순서대로 돌려주는 가짜 발송 함수"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    async def __call__(self, db, mail, sender, recipient_emails, attachments):
+        self.calls.append((mail.mail_uuid, sender.email, list(recipient_emails)))
+        return self.results.pop(0)
+
+
+class TestInMemoryMailQueue:
+    """인메모리 큐 테스트"""
+
+    def test_fifo_and_ack(self):
+        """등록 순서대로 꺼내고 ack 후 처리 중 목록에서 제거"""
+        async def scenario():
+            queue = InMemoryMailQueue()
+            for i in range(3):
+                await queue.enqueue(MailJob(mail_uuid=f"m{i}", org_id="org"))
+            first = await queue.dequeue("w1", timeout=0)
+            assert first.mail_uuid == "m0"
+            assert (await queue.stats())["processing"] == 1
+            await queue.ack("w1", first)
+            return await queue.stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["ready"] == 2
+        assert stats["processing"] == 0
+
+    def test_delayed_retry_is_promoted_when_due(self):
+        """재시도 작업은 대기 시간이 지나야 ready로 이동"""
+        async def scenario():
+            queue = InMemoryMailQueue()
+            await queue.enqueue(MailJob(mail_uuid="m", org_id="org"))
+            job = await queue.dequeue("w1", timeout=0)
+            await queue.retry("w1", job, delay=0.05)
+            assert await queue.promote_due() == 0
+            await asyncio.sleep(0.06)
+            assert await queue.promote_due() == 1
+            return await queue.dequeue("w1", timeout=0)
+
+        assert asyncio.run(scenario()).mail_uuid == "m"
+
+    def test_recovers_jobs_of_dead_worker(self):
+        """하트비트가 없는 워커의 처리 중 작업은 ready로 복구"""
+        async def scenario():
+            queue = InMemoryMailQueue()
+            await queue.enqueue(MailJob(mail_uuid="m", org_id="org"))
+            await queue.dequeue("crashed", timeout=0)
+            recovered = await queue.recover_orphaned()
+            return recovered, await queue.stats()
+
+        recovered, stats = asyncio.run(scenario())
+        assert recovered == 1
+        assert stats["ready"] == 1
+        assert stats["processing"] == 0
+
+
+class TestMailDeliveryWorker:
+    """발송 워커 테스트"""
+
+    def test_delivers_and_marks_sent(self, memory_session_factory):
+        """발송 성공 시 sent 상태, 발송 시간, SEND 로그 기록"""
+        job = _seed_queued_mail(memory_session_factory)
+        queue = InMemoryMailQueue()
+        deliver = FakeDeliver({"success": True})
+        worker = MailDeliveryWorker(queue=queue, session_factory=memory_session_factory, deliver=deliver, worker_id="w1")
+
+        async def scenario():
+            await queue.enqueue(job)
+            return await worker.process_one(timeout=0), await queue.stats()
+
+        result, stats = asyncio.run(scenario())
+        status, sent_at, actions = _mail_state(memory_session_factory, job.mail_uuid)
+
+        assert result is True
+        assert deliver.calls == [(job.mail_uuid, "sender@example.org", ["to@example.com"])]
+        assert status == "sent"
+        assert sent_at is not None
+        assert actions == ["SEND"]
+        assert stats["ready"] == 0 and stats["processing"] == 0
+
+    def test_failure_schedules_retry_with_backoff(self, memory_session_factory):
+        """발송 실패 시 queued 상태 유지, SEND_RETRY 로그, 백오프 후 재시도 등록"""
+        job = _seed_queued_mail(memory_session_factory)
+        queue = InMemoryMailQueue()
+        deliver = FakeDeliver({"success": False, "error": "relay down"})
+        worker = MailDeliveryWorker(queue=queue, session_factory=memory_session_factory, deliver=deliver,
+                                    worker_id="w1", max_attempts=3)
+
+        async def scenario():
+            await queue.enqueue(job)
+            return await worker.process_one(timeout=0), await queue.stats()
+
+        result, stats = asyncio.run(scenario())
+        status, _, actions = _mail_state(memory_session_factory, job.mail_uuid)
+
+        assert result is False
+        assert status == "queued"
+        assert actions == ["SEND_RETRY"]
+        assert stats["delayed"] == 1 and stats["ready"] == 0
+        assert retry_delay_seconds(2) == 2 * retry_delay_seconds(1)
+
+    def test_marks_failed_after_max_attempts(self, memory_session_factory):
+        """최대 시도 초과 시 failed 상태, SEND_FAILED 로그, dead 목록 이동"""
+        job = _seed_queued_mail(memory_session_factory)
+        queue = InMemoryMailQueue()
+        deliver = FakeDeliver({"success": False, "error": "relay down"})
+        worker = MailDeliveryWorker(queue=queue, session_factory=memory_session_factory, deliver=deliver,
+                                    worker_id="w1", max_attempts=1)
+
+        async def scenario():
+            await queue.enqueue(job)
+            await worker.process_one(timeout=0)
+            return await queue.stats()
+
+        stats = asyncio.run(scenario())
+        status, _, actions = _mail_state(memory_session_factory, job.mail_uuid)
+
+        assert status == "failed"
+        assert actions == ["SEND_FAILED"]
+        assert stats["dead"] == 1 and stats["delayed"] == 0
+
+    def test_skips_already_sent_mail(self, memory_session_factory):
+        """복구 등으로 중복 처리되는 작업은 다시 발송하지 않음"""
+        job = _seed_queued_mail(memory_session_factory, status="sent")
+        queue = InMemoryMailQueue()
+        deliver = FakeDeliver()
+        worker = MailDeliveryWorker(queue=queue, session_factory=memory_session_factory, deliver=deliver, worker_id="w1")
+
+        async def scenario():
+            await queue.enqueue(job)
+            return await worker.process_one(timeout=0)
+
+        assert asyncio.run(scenario()) is True
+        assert deliver.calls == []
+
+    def test_concurrent_duplicate_job_is_not_sent_twice(self, memory_session_factory):
+        """같은 메일 작업이 두 워커에 동시에 전달되어도 선점한 워커만 발송하고 다른 워커는 나중에 다시 확인"""
+        job = _seed_queued_mail(memory_session_factory)
+        queue = InMemoryMailQueue()
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_deliver(db, mail, sender, recipient_emails, attachments):
+            calls.append(mail.mail_uuid)
+            await release.wait()
+            return {"success": True}
+
+        first = MailDeliveryWorker(queue=queue, session_factory=memory_session_factory, deliver=slow_deliver, worker_id="w1")
+        second = MailDeliveryWorker(queue=queue, session_factory=memory_session_factory, deliver=slow_deliver, worker_id="w2")
+
+        async def scenario():
+            await queue.enqueue(job)
+            await queue.enqueue(job)
+            sending = asyncio.create_task(first.process_one(timeout=0))
+            while not calls:
+                await asyncio.sleep(0.01)
+            duplicate = await second.process_one(timeout=0)
+            release.set()
+            return await sending, duplicate, await queue.stats()
+
+        sent, duplicate, stats = asyncio.run(scenario())
+        status, _, actions = _mail_state(memory_session_factory, job.mail_uuid)
+
+        assert (sent, duplicate) == (True, False)
+        assert calls == [job.mail_uuid]
+        assert status == "sent"
+        assert actions == ["SEND"]
+        assert stats["delayed"] == 1 and stats["processing"] == 0
+
+    def test_heartbeat_is_refreshed_during_long_send(self, memory_session_factory, monkeypatch):
+        """발송이 하트비트 TTL 보다 오래 걸려도 생존 신호가 갱신되어 작업이 복구되지 않음"""
+        monkeypatch.setattr(settings, "MAIL_QUEUE_HEARTBEAT_TTL_SECONDS", 0.3)
+        job = _seed_queued_mail(memory_session_factory)
+        queue = InMemoryMailQueue()
+
+        async def slow_deliver(db, mail, sender, recipient_emails, attachments):
+            await asyncio.sleep(0.5)
+            recovered.append(await queue.recover_orphaned())
+            return {"success": True}
+
+        recovered = []
+        worker = MailDeliveryWorker(queue=queue, session_factory=memory_session_factory, deliver=slow_deliver, worker_id="w1")
+
+        async def scenario():
+            await queue.enqueue(job)
+            await queue.heartbeat("w1")
+            return await worker.process_one(timeout=0)
+
+        assert asyncio.run(scenario()) is True
+        assert recovered == [0]
+
+    def test_failed_sent_commit_is_retried_without_resending(self, memory_session_factory, monkeypatch):
+        """SMTP 수락 후 sent 기록이 실패하면 재시도에서는 다시 발송하지 않고 기록만 수행"""
+        monkeypatch.setattr(settings, "MAIL_QUEUE_MARK_SENT_ATTEMPTS", 2)
+        monkeypatch.setattr(settings, "MAIL_QUEUE_RETRY_BASE_SECONDS", 0)
+        job = _seed_queued_mail(memory_session_factory)
+        queue = InMemoryMailQueue()
+        failing = {"commits": 0}
+
+        def session_factory():
+            session = memory_session_factory()
+            commit = session.commit
+
+            def flaky_commit():
+                if failing["commits"] > 0:
+                    failing["commits"] -= 1
+                    raise RuntimeError("DB 연결 끊김")
+                commit()
+            session.commit = flaky_commit
+            return session
+
+        async def deliver(db, mail, sender, recipient_emails, attachments):
+            calls.append(mail.mail_uuid)
+            # 발송 직후 커밋과 재시도의 첫 sent 기록이 실패
+            failing["commits"] = 2
+            return {"success": True}
+
+        calls = []
+        worker = MailDeliveryWorker(queue=queue, session_factory=session_factory, deliver=deliver, worker_id="w1")
+
+        async def scenario():
+            await queue.enqueue(job)
+            first = await worker.process_one(timeout=0)
+            state = _mail_state(memory_session_factory, job.mail_uuid)
+            await queue.promote_due()
+            second = await worker.process_one(timeout=0)
+            return first, state, second, await queue.stats()
+
+        first, (status_after_failure, _, _), second, stats = asyncio.run(scenario())
+        status, sent_at, actions = _mail_state(memory_session_factory, job.mail_uuid)
+
+        assert (first, second) == (False, True)
+        assert status_after_failure == "sending"
+        assert calls == [job.mail_uuid]
+        assert status == "sent" and sent_at is not None
+        assert actions == ["SEND"]
+        assert stats["delayed"] == 0 and stats["processing"] == 0
@@ -0,0 +1,141 @@
+"""
+메일 수신자 일괄 처리 테스트
+
+수신자 수가 늘어나도 수신자 처리 단계의 SQL 문 수가 고정되는지,
+외부 사용자 생성과 받은편지함 할당이 올바른지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+
+from sqlalchemy import event
+
+from app.model import Organization, MailUser, Mail, MailRecipient, MailFolder, MailInFolder, FolderType
+from app.service.mail_recipient_service import MailRecipientService, split_addresses
+
+
+class StatementCounter:
+    """실행된 SQL 문 개수를 세는 컨텍스트 매니저"""
+
+    def __init__(self, session):
+        self.engine = session.get_bind()
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def _seed_org(db, internal_count: int):
+    """조직, 발신자, 받은편지함을 가진 내부 사용자 internal_count 명과 발송할 메일을 생성합니다."""
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="수신자 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    sender = MailUser(user_id=f"sender_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                      email="sender@example.org", password_hash="x")
+    db.add(sender)
+    internal = []
+    for i in range(internal_count):
+        user = MailUser(user_id=f"user{i}_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                        email=f"user{i}@example.org", password_hash="x")
+        internal.append(user)
+        db.add(user)
+        db.add(MailFolder(folder_uuid=str(uuid.uuid4()), user_uuid=user.user_uuid, org_id=org_id,
+                          name="INBOX", folder_type=FolderType.INBOX, is_system=True))
+    mail = Mail(mail_uuid=f"mail_{uuid.uuid4().hex[:12]}", org_id=org_id, sender_uuid=sender.user_uuid,
+                subject="공지", body_text="본문", status="queued")
+    db.add(mail)
+    db.commit()
+    return org_id, mail, internal
+
+
+def _process(db, org_id, mail, to, cc=None, bcc=None):
+    """수신자 처리 전체 단계를 실행하고 (수신자 목록, SQL 문 수)를 반환합니다."""
+    service = MailRecipientService(db)
+    mail_uuid = mail.mail_uuid
+    with StatementCounter(db) as counter:
+        recipients = service.resolve(org_id=org_id, to_emails=to, cc_emails=cc, bcc_emails=bcc)
+        service.add_recipients(mail_uuid, recipients)
+        service.deliver_to_inboxes(mail_uuid, org_id, recipients)
+    db.commit()
+    return recipients, counter.count
+
+
+class TestMailRecipientService:
+    """수신자 일괄 처리 테스트"""
+
+    def test_statement_count_does_not_grow_with_recipients(self, memory_db):
+        """5명과 500명 수신자 처리의 SQL 문 수가 같음"""
+        org_id, small_mail, _ = _seed_org(memory_db, 3)
+        _, small_count = _process(
+            memory_db, org_id, small_mail,
+            to=["user0@example.org", "ext0@example.com"], cc=["user1@example.org"],
+            bcc=["user2@example.org", "ext1@example.com"]
+        )
+
+        org_id, big_mail, internal = _seed_org(memory_db, 200)
+        to = [user.email for user in internal] + [f"ext{i}@example.com" for i in range(250)]
+        cc = [f"cc{i}@example.net" for i in range(50)]
+        recipients, big_count = _process(memory_db, org_id, big_mail, to=to, cc=cc)
+
+        assert len(recipients) == 500
+        assert big_count == small_count
+        # 받은편지함 폴더 카운터 UPSERT 1회 포함
+        assert big_count <= 7
+
+    def test_creates_external_users_and_recipients(self, memory_db):
+        """조직에 없는 주소는 비활성 외부 사용자로 생성되고 모든 수신자 행이 저장됨"""
+        org_id, mail, internal = _seed_org(memory_db, 1)
+        recipients, _ = _process(memory_db, org_id, mail,
+                                 to=["user0@example.org", "new@example.com"], bcc=["hidden@example.com"])
+
+        external = memory_db.query(MailUser).filter(MailUser.email == "new@example.com").one()
+        assert external.is_active is False
+        assert external.password_hash == "external_user"
+        assert [r.is_external for r in recipients] == [False, True, True]
+
+        rows = memory_db.query(MailRecipient.recipient_email, MailRecipient.recipient_type,
+                                  MailRecipient.recipient_uuid).filter(
+            MailRecipient.mail_uuid == mail.mail_uuid).order_by(MailRecipient.id).all()
+        assert rows == [
+            ("user0@example.org", "to", internal[0].user_uuid),
+            ("new@example.com", "to", external.user_uuid),
+            ("hidden@example.com", "bcc", recipients[2].user_uuid),
+        ]
+
+    def test_reuses_existing_external_user(self, memory_db):
+        """이전에 생성된 외부 사용자는 다시 만들지 않음"""
+        org_id, mail, _ = _seed_org(memory_db, 0)
+        _process(memory_db, org_id, mail, to=["repeat@example.com"])
+        _process(memory_db, org_id, mail, to=["repeat@example.com"])
+
+        assert memory_db.query(MailUser).filter(MailUser.email == "repeat@example.com").count() == 1
+
+    def test_inbox_assigned_once_per_internal_user(self, memory_db):
+        """TO와 CC에 모두 있는 내부 사용자도 받은편지함에는 한 번만 할당, 외부 사용자는 제외"""
+        org_id, mail, internal = _seed_org(memory_db, 2)
+        _process(memory_db, org_id, mail,
+                 to=["user0@example.org", "user0@example.org", "outside@example.com"],
+                 cc=["user0@example.org", "user1@example.org"])
+
+        assigned = memory_db.query(MailInFolder.user_uuid, MailInFolder.is_read).filter(
+            MailInFolder.mail_uuid == mail.mail_uuid).all()
+        assert sorted(assigned) == sorted([(internal[0].user_uuid, False), (internal[1].user_uuid, False)])
+
+        # 같은 타입 내 중복 주소는 하나로 처리
+        assert memory_db.query(MailRecipient).filter(MailRecipient.mail_uuid == mail.mail_uuid).count() == 4
+
+    def test_split_addresses(self):
+        """쉼표 구분 주소 문자열 파싱"""
+        assert split_addresses(" a@example.com, ,b@example.com ") == ["a@example.com", "b@example.com"]
+        assert split_addresses(None) == []
@@ -0,0 +1,117 @@
+"""
+Prometheus 메트릭 테스트
+
+요청 메트릭이 경로 변수 대신 라우트 템플릿/메서드/상태 라벨로 기록되는지,
+DB 연결 풀 대기 시간이 기록되는지, 대시보드 성능 요약이 같은 메트릭에서 계산되는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from types import SimpleNamespace
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.utils import metrics
+from app.utils.metrics import TimedQueuePool, metrics_middleware, metrics_response, performance_summary, render_metrics
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def metrics_middleware_wrapper(request: Request, call_next):
+        return await metrics_middleware(request, call_next)
+
+    @app.get("/metrics-test/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404, detail="없음")
+        return {"item_id": item_id}
+
+    @app.get("/metrics-test/boom")
+    async def boom():
+        raise HTTPException(status_code=503, detail="점검 중")
+
+    return app
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_records_route_template_method_and_status():
+    """같은 라우트의 요청은 경로 변수와 관계없이 하나의 라벨로 합산"""
+    route = "/metrics-test/items/{item_id}"
+    ok = {"method": "GET", "route": route, "status": "200"}
+    missing = {"method": "GET", "route": route, "status": "404"}
+    unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = (_sample("http_request_duration_seconds_count", ok),
+              _sample("http_request_duration_seconds_count", missing),
+              _sample("http_request_duration_seconds_count", unmatched))
+
+    client = TestClient(_app())
+    assert client.get("/metrics-test/items/1").status_code == 200
+    assert client.get("/metrics-test/items/2").status_code == 200
+    assert client.get("/metrics-test/items/0").status_code == 404
+    assert client.get("/metrics-test/nowhere").status_code == 404
+
+    assert _sample("http_request_duration_seconds_count", ok) == before[0] + 2
+    assert _sample("http_request_duration_seconds_count", missing) == before[1] + 1
+    assert _sample("http_request_duration_seconds_count", unmatched) == before[2] + 1
+    assert _sample("http_requests_in_progress", {"method": "GET"}) == 0
+
+    body = render_metrics().decode()
+    assert 'route="/metrics-test/items/{item_id}"' in body
+    assert "/metrics-test/items/1" not in body
+    assert metrics_response().media_type.startswith("text/plain; version=0.0.4")
+
+
+def test_pool_checkout_wait_is_recorded():
+    """연결을 얻을 때마다 풀 대기 시간 관측값이 추가됨"""
+    labels = {"pool": "sync"}
+    before = _sample("db_pool_checkout_wait_seconds_count", labels)
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0)
+    try:
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+    finally:
+        engine.dispose()
+    assert _sample("db_pool_checkout_wait_seconds_count", labels) == before + 3
+
+
+def test_performance_summary_reflects_requests():
+    """대시보드 성능 요약이 요청 메트릭에서 계산됨 (5xx 만 오류로 집계)"""
+    client = TestClient(_app())
+    client.get("/metrics-test/items/1")
+    client.get("/metrics-test/boom")
+
+    summary = performance_summary()
+    assert set(summary) == {
+        "response_time_ms", "p95_response_time_ms", "throughput", "error_rate",
+        "requests_in_progress", "db_pool_wait_ms", "redis_latency_ms",
+    }
+    assert summary["throughput"] >= 0
+    assert 0 < summary["error_rate"] < 100
+    assert summary["p95_response_time_ms"] >= 1.0
+
+
+def test_throughput_is_rate_between_reads(monkeypatch):
+    """처리량은 누적 요청 수가 아니라 직전 조회 이후 증가분으로 계산 (첫 조회는 기준점)"""
+    monkeypatch.setattr(metrics, "_throughput_state", {})
+    clock = [1000.0]
+    monkeypatch.setattr(metrics, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    assert metrics._throughput(500) == 0.0
+    clock[0] += 10
+    assert metrics._throughput(550) == 5.0
+    # 최소 간격 이내의 재조회는 직전 값
+    clock[0] += 0.5
+    assert metrics._throughput(560) == 5.0
+    # 카운트가 줄면(메트릭 디렉터리 초기화) 기준점을 다시 잡음
+    clock[0] += 5
+    assert metrics._throughput(10) == 0.0
@@ -0,0 +1,97 @@
+"""
+스트리밍 MIME 작성기 / 메일 원문 저장소 테스트
+
+작성한 원문을 email 파서로 다시 읽어 헤더·본문·첨부파일이 보존되는지,
+원문이 메일별로 한 번만 작성되고 재사용되는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+from email import policy
+from email.parser import BytesParser
+
+from app.service.raw_message_store import RawMessageStore
+from app.utils import mime_composer
+from app.utils.mime_composer import MimeComposer, compose_to_spool
+
+
+def _composer(attachments=None, **kwargs) -> MimeComposer:
+    return MimeComposer(
+        "sender@example.com", ["a@example.com", "b@example.com"], "테스트 제목",
+        body_text=kwargs.get("body_text", "텍스트 본문"), body_html=kwargs.get("body_html", "<p>HTML 본문</p>"),
+        attachments=attachments, message_id="<fixed@example.com>"
+    )
+
+
+class TestMimeComposer:
+    """MIME 작성기 테스트"""
+
+    def test_round_trip_with_chunked_attachment(self, tmp_path, monkeypatch):
+        """여러 청크로 인코딩한 첨부파일이 원본과 같고 모든 줄이 CRLF, SMTP 줄 길이 제한 이하"""
+        monkeypatch.setattr(mime_composer, "BASE64_READ_SIZE", 57 * 3)
+        payload = os.urandom(57 * 3 * 5 + 11)
+        attachment = tmp_path / "data.bin"
+        attachment.write_bytes(payload)
+
+        raw = io.BytesIO()
+        size = _composer([
+            {"file_path": str(attachment), "filename": "보고서.bin", "content_type": "application/pdf"},
+            {"file_path": str(tmp_path / "missing.bin"), "filename": "missing.bin"},
+        ]).write_to(raw)
+        data = raw.getvalue()
+
+        assert size == len(data)
+        assert b"\n" not in data.replace(b"\r\n", b"")
+        assert max(len(line) for line in data.split(b"\r\n")) <= 998
+
+        message = BytesParser(policy=policy.default).parsebytes(data)
+        assert message["Subject"] == "테스트 제목"
+        assert message["Message-ID"] == "<fixed@example.com>"
+        assert message.get_body(("plain",)).get_content().strip() == "텍스트 본문"
+        assert message.get_body(("html",)).get_content().strip() == "<p>HTML 본문</p>"
+
+        attachments = list(message.iter_attachments())
+        assert len(attachments) == 1
+        assert attachments[0].get_filename() == "보고서.bin"
+        assert attachments[0].get_content_type() == "application/pdf"
+        assert attachments[0].get_content() == payload
+
+    def test_spool_rolls_over_to_disk(self, tmp_path):
+        """메모리 한도를 넘는 원문은 디스크 임시 파일에 작성"""
+        attachment = tmp_path / "large.bin"
+        attachment.write_bytes(os.urandom(64 * 1024))
+
+        spool = compose_to_spool(_composer([{"file_path": str(attachment), "filename": "large.bin"}]), max_memory=1024)
+        try:
+            assert spool._rolled
+            assert spool.read(5) == b"From:"
+        finally:
+            spool.close()
+
+
+class TestRawMessageStore:
+    """메일 원문 저장소 테스트"""
+
+    def test_composes_once_and_reuses(self, tmp_path):
+        """같은 메일은 원문을 한 번만 작성하고 이후에는 저장된 파일을 재사용"""
+        store = RawMessageStore(root=str(tmp_path))
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return _composer()
+
+        with store.open_or_compose("org-1", "mail-1", factory) as first:
+            first_data = first.read()
+        with store.open_or_compose("org-1", "mail-1", factory) as second:
+            second_data = second.read()
+
+        assert len(calls) == 1
+        assert first_data == second_data
+        assert os.listdir(tmp_path / "org-1") == ["mail-1.eml"]
+
+        store.delete("org-1", "mail-1")
+        store.delete("org-1", "mail-1")
+        assert not store.exists("org-1", "mail-1")
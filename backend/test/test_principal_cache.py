@@ -0,0 +1,149 @@
+"""
+인증 주체 캐시 테스트
+
+캐시 적중 시 신원 조회 쿼리가 없는지, 사용자 변경 commit 과 조직 무효화 시
+캐시 항목이 삭제되는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+from app.middleware.tenant_middleware import invalidate_organization_cache
+from app.model import Organization, User, MailUser
+from app.service.auth_service import AuthService, get_current_user, get_current_mail_user
+
+
+class StatementCounter:
+    """실행된 SQL 문 개수를 세는 컨텍스트 매니저"""
+
+    def __init__(self, session):
+        self.engine = session.get_bind()
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def _seed_user(session_factory):
+    """조직, 사용자, 메일 사용자를 만들고 (org_id, user_uuid, 토큰 자격 증명)을 반환합니다."""
+    db = session_factory()
+    org_id = str(uuid.uuid4())
+    user_uuid = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="캐시 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    db.add(User(user_id=f"user_{org_id[:8]}", user_uuid=user_uuid, org_id=org_id,
+                email="user@example.org", username="user", hashed_password="x", role="user"))
+    db.add(MailUser(user_id=f"user_{org_id[:8]}", user_uuid=user_uuid, org_id=org_id,
+                    email="user@example.org", password_hash="x"))
+    db.commit()
+    db.close()
+    token = AuthService.create_access_token({"sub": user_uuid, "org_id": org_id})
+    return org_id, user_uuid, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def _resolve(session_factory, credentials, org_id):
+    """요청 하나의 인증 의존성을 실행하고 (User, MailUser, SQL 문 수)를 반환합니다."""
+    db = session_factory()
+    try:
+        with StatementCounter(db) as counter:
+            user = get_current_user(credentials=credentials, db=db)
+            mail_user = get_current_mail_user(current_user=user, current_org_id=org_id, db=db)
+        return user, mail_user, counter.count
+    finally:
+        db.close()
+
+
+class TestPrincipalCache:
+    """인증 주체 캐시 테스트"""
+
+    def test_cache_hit_runs_no_identity_queries(self, memory_session_factory):
+        """첫 요청은 조회하고 같은 토큰의 다음 요청은 쿼리 없이 같은 사용자를 반환"""
+        org_id, user_uuid, credentials = _seed_user(memory_session_factory)
+
+        _, _, first_count = _resolve(memory_session_factory, credentials, org_id)
+        user, mail_user, second_count = _resolve(memory_session_factory, credentials, org_id)
+
+        assert first_count == 3
+        assert second_count == 0
+        assert (user.user_uuid, user.role, mail_user.email) == (user_uuid, "user", "user@example.org")
+
+    def test_cached_user_can_be_modified_and_committed(self, memory_session_factory):
+        """캐시에서 꺼낸 사용자는 요청 세션의 영속 객체로 수정 후 commit 가능"""
+        org_id, user_uuid, credentials = _seed_user(memory_session_factory)
+        _resolve(memory_session_factory, credentials, org_id)
+
+        db = memory_session_factory()
+        user = get_current_user(credentials=credentials, db=db)
+        user.username = "renamed"
+        db.commit()
+        db.close()
+
+        db = memory_session_factory()
+        assert db.query(User).filter(User.user_uuid == user_uuid).one().username == "renamed"
+        db.close()
+
+    @pytest.mark.parametrize("field, value", [
+        ("role", "admin"),
+        ("is_active", False),
+        ("hashed_password", "changed"),
+    ])
+    def test_user_change_commit_invalidates(self, memory_session_factory, field, value):
+        """역할 변경, 비활성화, 비밀번호 변경이 commit 되면 다음 요청은 새 값을 조회"""
+        org_id, user_uuid, credentials = _seed_user(memory_session_factory)
+        _resolve(memory_session_factory, credentials, org_id)
+
+        db = memory_session_factory()
+        setattr(db.query(User).filter(User.user_uuid == user_uuid).one(), field, value)
+        db.commit()
+        db.close()
+
+        user, _, count = _resolve(memory_session_factory, credentials, org_id)
+        assert count == 3
+        assert getattr(user, field) == value
+
+    def test_rollback_keeps_cache(self, memory_session_factory):
+        """롤백된 변경은 캐시를 무효화하지 않음"""
+        org_id, user_uuid, credentials = _seed_user(memory_session_factory)
+        _resolve(memory_session_factory, credentials, org_id)
+
+        db = memory_session_factory()
+        db.query(User).filter(User.user_uuid == user_uuid).one().role = "admin"
+        db.flush()
+        db.rollback()
+        db.close()
+
+        user, _, count = _resolve(memory_session_factory, credentials, org_id)
+        assert count == 0
+        assert user.role == "user"
+
+    def test_organization_invalidation_clears_members(self, memory_session_factory):
+        """조직 캐시 무효화(비활성화 등) 시 조직 사용자의 항목도 삭제되어 다시 확인"""
+        org_id, _, credentials = _seed_user(memory_session_factory)
+        _resolve(memory_session_factory, credentials, org_id)
+
+        db = memory_session_factory()
+        db.query(Organization).filter(Organization.org_id == org_id).one().is_active = False
+        db.commit()
+        db.close()
+        asyncio.run(invalidate_organization_cache(org_id))
+
+        with pytest.raises(HTTPException) as exc_info:
+            _resolve(memory_session_factory, credentials, org_id)
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,155 @@
+"""
+비동기 속도 제한기 테스트
+
+토큰 버킷 대체 제한기, Redis 장애 시 대체 동작, 요청별 제한 스코프 구성을 검증합니다.
+Redis 슬라이딩 윈도우 스크립트 테스트는 로컬 Redis가 있을 때만 실행됩니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import uuid
+
+import pytest
+from jose import jwt
+from starlette.requests import Request
+
+from app.config import settings
+from app.middleware.rate_limit_middleware import RateLimitService
+from app.utils.rate_limiter import (
+    RateLimitRule, SlidingWindowRateLimiter, TokenBucketLimiter
+)
+
+
+def _redis_available() -> bool:
+    """로컬 Redis 접속 가능 여부"""
+    try:
+        import redis
+        return bool(redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.2).ping())
+    except Exception:
+        return False
+
+
+def _request(path: str, token: str = None, ip: str = "10.0.0.1") -> Request:
+    """테스트용 Starlette 요청 객체를 생성합니다."""
+    headers = [(b"user-agent", b"pytest")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request({
+        "type": "http", "method": "POST", "path": path, "query_string": b"",
+        "headers": headers, "client": (ip, 12345), "server": ("testserver", 80), "scheme": "http"
+    })
+
+
+class TestTokenBucketLimiter:
+    """토큰 버킷 테스트"""
+
+    def test_denies_after_limit_and_refills(self):
+        """limit 회 이후 거부되고, 시간이 지나면 다시 허용"""
+        limiter = TokenBucketLimiter(window_seconds=60)
+        rules = [RateLimitRule("ip", "1.1.1.1", 3)]
+
+        results = [limiter.hit(rules, now=100.0) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[2].remaining == 0
+        assert results[3].retry_after == 20  # 토큰 1개 충전에 60/3초
+
+        assert limiter.hit(rules, now=120.0).allowed
+
+    def test_denied_request_consumes_no_tokens(self):
+        """한 스코프라도 초과하면 다른 스코프의 토큰도 소비하지 않음"""
+        limiter = TokenBucketLimiter()
+        ip = RateLimitRule("ip", "1.1.1.1", 10)
+        login = RateLimitRule("endpoint", "/api/auth/login:1.1.1.1", 2)
+
+        for _ in range(5):
+            limiter.hit([ip, login], now=0.0)
+        result = limiter.hit([ip], now=0.0)
+
+        assert result.allowed
+        assert result.remaining == 7  # 허용된 2회 + 이번 1회만 차감
+        denied = limiter.hit([ip, login], now=0.0)
+        assert not denied.allowed
+        assert denied.scope == "endpoint"
+
+    def test_evicts_least_recently_used_keys(self):
+        """버킷 수가 max_keys를 넘으면 오래된 키부터 제거"""
+        limiter = TokenBucketLimiter(max_keys=2)
+        for ip in ("a", "b", "c"):
+            limiter.hit([RateLimitRule("ip", ip, 1)], now=0.0)
+
+        # a는 제거되어 새 버킷으로 다시 허용됨, c는 이미 소진
+        assert limiter.hit([RateLimitRule("ip", "a", 1)], now=0.0).allowed
+        assert not limiter.hit([RateLimitRule("ip", "c", 1)], now=0.0).allowed
+
+
+class TestSlidingWindowRateLimiter:
+    """Redis 슬라이딩 윈도우 제한기 테스트"""
+
+    def test_falls_back_to_token_bucket_when_redis_down(self):
+        """Redis 접속 실패 시 로컬 토큰 버킷으로 제한하고 재시도 전까지 Redis를 건너뜀"""
+        limiter = SlidingWindowRateLimiter(redis_url="redis://127.0.0.1:1/0", timeout=0.2, retry_seconds=60)
+        rules = [RateLimitRule("ip", "2.2.2.2", 2)]
+
+        async def scenario():
+            try:
+                return [await limiter.hit(rules) for _ in range(3)]
+            finally:
+                await limiter.close()
+
+        results = asyncio.run(scenario())
+        assert [r.backend for r in results] == ["local", "local", "local"]
+        assert [r.allowed for r in results] == [True, True, False]
+        assert limiter.redis_available is False
+
+    @pytest.mark.skipif(not _redis_available(), reason="로컬 Redis 없음")
+    def test_redis_sliding_window_checks_all_scopes_atomically(self):
+        """모든 스코프를 한 번에 검사하고 거부된 요청은 카운터를 올리지 않음"""
+        suffix = uuid.uuid4().hex
+        ip = RateLimitRule("ip", f"bench-{suffix}", 5)
+        login = RateLimitRule("endpoint", f"/api/auth/login:{suffix}", 2)
+        limiter = SlidingWindowRateLimiter()
+
+        async def scenario():
+            try:
+                results = [await limiter.hit([ip, login]) for _ in range(3)]
+                results.append(await limiter.hit([ip]))
+                return results
+            finally:
+                await limiter.close()
+
+        results = asyncio.run(scenario())
+        assert [r.backend for r in results] == ["redis"] * 4
+        assert [r.allowed for r in results] == [True, True, False, True]
+        assert results[2].scope == "endpoint"
+        assert results[3].remaining == 2
+
+
+class TestRateLimitServiceRules:
+    """요청별 제한 스코프 구성 테스트"""
+
+    def test_authenticated_login_request_gets_all_scopes(self):
+        """유효한 토큰이면 IP/사용자/조직, 로그인 경로면 엔드포인트 제한까지 적용"""
+        service = RateLimitService()
+        token = jwt.encode({"sub": "user-1", "org_id": "org-1"}, settings.SECRET_KEY, algorithm="HS256")
+        request = _request(f"{settings.API_V1_PREFIX}/auth/login", token=token)
+
+        rules = service._build_rules(request, service._extract_client_info(request))
+
+        assert [(r.scope, r.identifier, r.limit) for r in rules] == [
+            ("ip", "10.0.0.1", service.default_limits["per_ip"]),
+            ("user", "user-1", service.default_limits["per_user"]),
+            ("organization", "org-1", service.default_limits["per_org"]),
+            ("endpoint", "/api/auth/login:10.0.0.1", service.default_limits["auth_endpoints"]),
+        ]
+
+    def test_invalid_token_only_limits_ip(self):
+        """서명이 잘못된 토큰의 사용자/조직 정보는 사용하지 않음"""
+        service = RateLimitService()
+        forged = jwt.encode({"sub": "user-1", "org_id": "org-1"}, "wrong-secret", algorithm="HS256")
+        request = _request(f"{settings.API_V1_PREFIX}/mail/inbox", token=forged)
+
+        rules = service._build_rules(request, service._extract_client_info(request))
+
+        assert [r.scope for r in rules] == ["ip"]
@@ -18,6 +18,7 @@ from app.service.two_factor_service import TwoFactorService
 from app.service.sso_service import SSOService
 from app.service.rbac_service import RBACService
 from app.middleware.rate_limit_middleware import RateLimitService
+from app.utils.rate_limiter import RateLimitResult
 
 from app.model.user_model import User
 from app.model.organization_model import Organization
@@ -161,27 +162,18 @@ class TestSecurityIntegration:
         mock_request.url.path = "/api/auth/login"
         mock_request.method = "POST"
         
-        client_info = {
-            "ip": "192.168.1.100",
-            "user_agent": "test-agent",
-            "path": "/api/auth/login",
-            "method": "POST"
-        }
-        
         # 1. 정상적인 요청 (제한 내)
         for i in range(5):  # 기본 제한: 10회/분
-            is_allowed, _ = self.rate_limit_service._check_rate_limits(
-                mock_request, client_info
-            )
-            assert is_allowed, f"요청 {i+1}이 제한되었습니다"
+            result = await self.rate_limit_service.check_request(mock_request)
+            assert result.allowed, f"요청 {i+1}이 제한되었습니다"
         
         # 2. 제한 초과 시뮬레이션
-        with patch.object(self.rate_limit_service, '_check_rate_limits') as mock_check:
-            mock_check.return_value = (False, {"limit": 10, "remaining": 0})
+        with patch.object(self.rate_limit_service, 'check_request') as mock_check:
+            mock_check.return_value = RateLimitResult(allowed=False, limit=10, remaining=0)
             
-            is_allowed, status = mock_check(mock_request, client_info)
-            assert not is_allowed, "제한 초과 시 요청이 거부되어야 합니다"
-            assert status["remaining"] == 0, "남은 요청 수가 0이어야 합니다"
+            status = await mock_check(mock_request)
+            assert not status.allowed, "제한 초과 시 요청이 거부되어야 합니다"
+            assert status.remaining == 0, "남은 요청 수가 0이어야 합니다"
 
     @pytest.mark.asyncio
     async def test_multi_factor_security_flow(self):
@@ -193,17 +185,8 @@ class TestSecurityIntegration:
         mock_request.url.path = "/api/auth/login"
         mock_request.method = "POST"
         
-        client_info = {
-            "ip": "192.168.1.200",
-            "user_agent": "test-agent",
-            "path": "/api/auth/login",
-            "method": "POST"
-        }
-        
-        rate_check, _ = self.rate_limit_service._check_rate_limits(
-            mock_request, client_info
-        )
-        assert rate_check, "속도 제한 확인 실패"
+        rate_check = await self.rate_limit_service.check_request(mock_request)
+        assert rate_check.allowed, "속도 제한 확인 실패"
         
         # 2. 사용자 인증
         with patch.object(self.auth_service, 'authenticate_user_by_email') as mock_auth:
@@ -0,0 +1,240 @@
+"""
+SMTP 연결 풀 테스트
+
+간단한 가짜 SMTP 서버를 띄워 연결 재사용, 릴레이별 동시성 제한, 끊긴 연결 재연결을 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import io
+import logging
+from email.mime.text import MIMEText
+
+import pytest
+
+from app.utils import smtp_pool
+from app.utils.smtp_pool import SMTPConnectionPool
+
+
+class FakeSMTPServer:
+    """EHLO/MAIL/RCPT/DATA/RSET/QUIT만 처리하는 가짜 SMTP 서버"""
+
+    def __init__(self, delay: float = 0.0, drop_after: int = 0):
+        self.delay = delay
+        self.drop_after = drop_after
+        self.connections = 0
+        self.active_sessions = 0
+        self.max_active_sessions = 0
+        self.messages = []
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        delivered = 0
+        writer.write(b"220 fake ESMTP\r\n")
+        await writer.drain()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode().strip().upper()
+                if command.startswith("EHLO") or command.startswith("HELO"):
+                    writer.write(b"250-fake\r\n250 8BITMIME\r\n")
+                elif command.startswith("MAIL"):
+                    self.active_sessions += 1
+                    self.max_active_sessions = max(self.max_active_sessions, self.active_sessions)
+                    writer.write(b"250 OK\r\n")
+                elif command.startswith("RCPT") or command.startswith("NOOP"):
+                    writer.write(b"250 OK\r\n")
+                elif command.startswith("RSET"):
+                    writer.write(b"250 OK\r\n")
+                elif command == "DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    data = []
+                    while True:
+                        data_line = await reader.readline()
+                        if data_line in (b".\r\n", b""):
+                            break
+                        data.append(data_line)
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    self.messages.append(b"".join(data))
+                    self.active_sessions -= 1
+                    delivered += 1
+                    writer.write(b"250 Queued\r\n")
+                    if self.drop_after and delivered >= self.drop_after:
+                        await writer.drain()
+                        break
+                elif command == "QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"502 Not implemented\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def _message(index: int) -> MIMEText:
+    """테스트 메시지 생성"""
+    msg = MIMEText(f"본문 {index}", "plain", "utf-8")
+    msg["From"] = "sender@example.com"
+    msg["To"] = "receiver@example.com"
+    msg["Subject"] = f"테스트 {index}"
+    return msg
+
+
+def _run_with_server(server: FakeSMTPServer, scenario):
+    """가짜 서버를 띄운 상태로 시나리오를 실행합니다."""
+    async def runner():
+        await server.start()
+        try:
+            return await scenario(server.port)
+        finally:
+            await server.stop()
+    return asyncio.run(runner())
+
+
+class TestSMTPConnectionPool:
+    """SMTP 연결 풀 테스트"""
+
+    def test_reuses_single_connection_for_sequential_sends(self):
+        """연속 발송은 하나의 연결을 재사용"""
+        server = FakeSMTPServer()
+
+        async def scenario(port):
+            pool = SMTPConnectionPool("127.0.0.1", port, max_connections=3)
+            for i in range(5):
+                await pool.send_message(_message(i))
+            metrics = pool.metrics()
+            await pool.close()
+            return metrics
+
+        metrics = _run_with_server(server, scenario)
+
+        assert server.connections == 1
+        assert len(server.messages) == 5
+        assert metrics["created"] == 1
+        assert metrics["reused"] == 4
+        assert metrics["sent"] == 5
+
+    def test_caps_concurrency_per_relay(self):
+        """동시 발송은 max_connections를 넘지 않음"""
+        server = FakeSMTPServer(delay=0.05)
+
+        async def scenario(port):
+            pool = SMTPConnectionPool("127.0.0.1", port, max_connections=2)
+            await asyncio.gather(*(pool.send_message(_message(i)) for i in range(6)))
+            metrics = pool.metrics()
+            await pool.close()
+            return metrics
+
+        metrics = _run_with_server(server, scenario)
+
+        assert len(server.messages) == 6
+        assert server.connections == 2
+        assert server.max_active_sessions <= 2
+        assert metrics["in_use"] == 0
+        assert metrics["idle"] == 2
+
+    def test_reconnects_when_server_drops_connection(self):
+        """서버가 연결을 끊으면 새 연결로 재시도"""
+        server = FakeSMTPServer(drop_after=1)
+
+        async def scenario(port):
+            pool = SMTPConnectionPool("127.0.0.1", port, max_connections=1)
+            for i in range(3):
+                await pool.send_message(_message(i))
+            return pool.metrics()
+
+        metrics = _run_with_server(server, scenario)
+
+        assert len(server.messages) == 3
+        assert server.connections == 3
+        assert metrics["sent"] == 3
+        assert metrics["failures"] == 0
+
+    def test_closed_pool_rejects_send(self):
+        """닫힌 풀은 발송을 거부"""
+        async def scenario():
+            pool = SMTPConnectionPool("127.0.0.1", 1)
+            await pool.close()
+            with pytest.raises(RuntimeError):
+                await pool.send_message(_message(0))
+
+        asyncio.run(scenario())
+
+    def test_send_raw_streams_with_dot_stuffing(self, monkeypatch):
+        """저장된 원문을 작은 청크로 나눠 보내도 줄 시작의 "." 은 ".." 로 전송"""
+        monkeypatch.setattr(smtp_pool, "RAW_SEND_CHUNK_SIZE", 7)
+        server = FakeSMTPServer()
+        raw = b"Subject: raw\r\n\r\n.first\r\nmiddle\r\n..second\r\nlast"
+
+        async def scenario(port):
+            pool = SMTPConnectionPool("127.0.0.1", port)
+            refused, _ = await pool.send_raw(io.BytesIO(raw), "sender@example.com", ["receiver@example.com"])
+            await pool.close()
+            return refused
+
+        refused = _run_with_server(server, scenario)
+
+        assert refused == {}
+        assert server.messages == [b"Subject: raw\r\n\r\n..first\r\nmiddle\r\n...second\r\nlast\r\n"]
+
+    def test_send_raw_resends_from_start_after_reconnect(self):
+        """재연결 후 재시도하면 원문을 처음부터 다시 전송"""
+        server = FakeSMTPServer(drop_after=1)
+        raw = b"Subject: retry\r\n\r\nbody\r\n"
+
+        async def scenario(port):
+            pool = SMTPConnectionPool("127.0.0.1", port, max_connections=1)
+            source = io.BytesIO(raw)
+            await pool.send_raw(source, "sender@example.com", ["receiver@example.com"])
+            await pool.send_raw(source, "sender@example.com", ["receiver@example.com"])
+            return pool.metrics()
+
+        metrics = _run_with_server(server, scenario)
+
+        assert server.messages == [raw, raw]
+        assert metrics["sent"] == 2
+
+    def test_raw_stream_adapter_supports_installed_aiosmtplib(self):
+        """설치된(requirements.txt 고정) aiosmtplib 버전에서는 원문 스트리밍 어댑터 사용"""
+        client = smtp_pool.aiosmtplib.SMTP(hostname="127.0.0.1", port=25)
+        assert smtp_pool._RawDataStream.supported(client)
+
+    def test_send_raw_falls_back_to_public_api_on_unsupported_version(self, monkeypatch, caplog):
+        """확인하지 않은 aiosmtplib 버전이면 내부 API 없이 sendmail 로 같은 원문을 발송"""
+        monkeypatch.setattr(smtp_pool, "RAW_STREAM_AIOSMTPLIB_MAJOR_VERSIONS", ())
+        monkeypatch.setattr(smtp_pool._RawDataStream, "write", None)
+        server = FakeSMTPServer()
+        raw = b"Subject: raw\r\n\r\n.first\r\nlast\r\n"
+
+        async def scenario(port):
+            pool = SMTPConnectionPool("127.0.0.1", port)
+            refused, _ = await pool.send_raw(io.BytesIO(raw), "sender@example.com", ["receiver@example.com"])
+            await pool.send_raw(io.BytesIO(raw), "sender@example.com", ["receiver@example.com"])
+            await pool.close()
+            return refused
+
+        with caplog.at_level(logging.WARNING, logger=smtp_pool.logger.name):
+            refused = _run_with_server(server, scenario)
+
+        assert refused == {}
+        assert server.messages == [b"Subject: raw\r\n\r\n..first\r\nlast\r\n"] * 2
+        # 지원 여부는 풀마다 한 번만 확인하고 경고도 한 번만 기록
+        assert len([record for record in caplog.records if "스트리밍 미지원" in record.getMessage()]) == 1
@@ -0,0 +1,70 @@
+"""
+시스템 상태 수집기 테스트
+
+수집 샘플이 링 버퍼에 보관되고(최대 크기 유지), latest()/history() 로 조회되는지,
+대시보드 시스템 상태가 요청 중에 대기하지 않고 최근 샘플(또는 즉시 측정값)을 반환하는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+
+from app.service.monitoring_service import MonitoringService
+from app.utils import system_health
+from app.utils.system_health import SystemHealthSampler, sample_host
+
+# 접속할 수 없는 Redis 주소 (연결 거부는 즉시 실패)
+UNREACHABLE_REDIS = "redis://127.0.0.1:1/0"
+
+
+def test_sample_host_returns_pool_stats():
+    """호스트 측정값과 DB 연결 풀 상태를 대기 없이 반환"""
+    host = sample_host()
+    assert 0.0 <= host["cpu_usage_percent"] <= 100.0
+    assert 0.0 <= host["memory_usage_percent"] <= 100.0
+    assert set(host["db_pools"]) == {"sync", "async"}
+    assert host["db_connections"] >= 0
+
+
+def test_samples_fill_ring_buffer():
+    """최대 크기만큼만 보관하고 오래된 순으로 조회, Redis 실패는 None 으로 기록"""
+    sampler = SystemHealthSampler(interval_seconds=60, history_size=3, redis_url=UNREACHABLE_REDIS, timeout=0.5)
+    assert sampler.latest() is None
+
+    async def run():
+        samples = [await sampler.sample() for _ in range(4)]
+        await sampler.stop()
+        return samples
+
+    samples = asyncio.run(run())
+    assert sampler.history() == samples[1:]
+    assert sampler.history(2) == samples[2:]
+    assert sampler.latest() is samples[-1]
+    assert samples[-1]["redis_connected_clients"] is None
+    assert samples[-1]["active_connections"] == samples[-1]["db_connections"]
+
+
+def test_dashboard_system_health_reads_latest_sample(monkeypatch):
+    """대시보드 시스템 상태는 최근 샘플을 그대로 사용하고 수집 전에는 즉시 측정값 사용"""
+    sampler = SystemHealthSampler(interval_seconds=60, history_size=3, redis_url=UNREACHABLE_REDIS)
+    monkeypatch.setattr("app.service.monitoring_service.system_health_sampler", sampler)
+    service = MonitoringService(db=None)
+
+    started = time.perf_counter()
+    fallback = service._get_system_health()
+    assert time.perf_counter() - started < 0.5
+    assert fallback.email_queue_size == 0
+
+    sampler._history.append({
+        **system_health.sample_host(),
+        "sampled_at": "2025-11-12T00:00:00+00:00",
+        "cpu_usage_percent": 42.0,
+        "active_connections": 7,
+        "email_queue_size": 5,
+    })
+    health = service._get_system_health()
+    assert health.cpu_usage_percent == 42.0
+    assert health.active_connections == 7
+    assert health.email_queue_size == 5
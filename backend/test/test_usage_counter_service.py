@@ -0,0 +1,250 @@
+"""
+조직 사용량 카운터 (Redis + write-behind) 테스트
+
+organization_usage 일괄 기록이 여러 번 실행해도 같은 결과인지, Redis 장애 시 None 을 반환하여
+DB 방식으로 대체되는지 검증합니다. 예약/발송 확정/기록 테스트는 로컬 Redis가 있을 때만 실행됩니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.model import MailUser, Organization, OrganizationUsage, User
+from app.service.mail_service import MailService
+from app.service.usage_counter_service import (
+    QuotaReservation, UsageCounter, UsageSnapshot, counter_key, write_usage_snapshots
+)
+
+
+def _redis_available() -> bool:
+    """로컬 Redis 접속 가능 여부"""
+    try:
+        import redis
+        return bool(redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.2).ping())
+    except Exception:
+        return False
+
+
+def _org(db) -> str:
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="사용량 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org"
+    ))
+    db.commit()
+    return org_id
+
+
+async def _no_usage():
+    return 0, 0
+
+
+def test_write_usage_snapshots_is_idempotent(memory_db):
+    """같은 스냅샷을 다시 기록해도 누적 수가 두 번 더해지지 않고, 증가분만 누적"""
+    db = memory_db
+    org_id = _org(db)
+    day = date(2025, 11, 8)
+
+    write_usage_snapshots(db, [UsageSnapshot(org_id, day, sent=5, received=2)])
+    write_usage_snapshots(db, [UsageSnapshot(org_id, day, sent=5, received=2)])
+    write_usage_snapshots(db, [UsageSnapshot(org_id, day, sent=8, received=2)])
+    # 늦게 도착한 이전 스냅샷은 값을 되돌리지 않음
+    write_usage_snapshots(db, [UsageSnapshot(org_id, day, sent=6, received=1)])
+
+    usage = db.query(OrganizationUsage).filter(OrganizationUsage.org_id == org_id).one()
+    assert (usage.emails_sent_today, usage.total_emails_sent) == (8, 8)
+    assert (usage.emails_received_today, usage.total_emails_received) == (2, 2)
+
+
+def test_methods_return_none_when_redis_unreachable():
+    """Redis 에 연결할 수 없으면 None 을 반환하고 재시도 대기 동안 접속하지 않음"""
+    counter = UsageCounter(redis_url="redis://127.0.0.1:1/0", timeout=0.05, retry_seconds=60)
+
+    async def scenario():
+        reservation = await counter.reserve("org", "mail-1", 1, 10, _no_usage)
+        sent = await counter.commit_sent("org", 1, _no_usage, reservation_id="mail-1")
+        await counter.close()
+        return reservation, sent
+
+    assert asyncio.run(scenario()) == (None, None)
+    assert not counter.redis_available
+
+
+@pytest.mark.skipif(not _redis_available(), reason="로컬 Redis 없음")
+def test_reserve_commit_and_flush(memory_db):
+    """예약 포함 제한 검사 → 발송 확정 → 기록 후 organization_usage 에 반영"""
+    db = memory_db
+    org_id = _org(db)
+    counter = UsageCounter()
+    written = []
+
+    async def seed():
+        return 2, 0
+
+    async def writer(snapshots):
+        written.extend(snapshots)
+        write_usage_snapshots(db, snapshots)
+
+    async def scenario():
+        first = await counter.reserve(org_id, "mail-1", 3, 5, seed)
+        denied = await counter.reserve(org_id, "mail-2", 1, 5, seed)
+        sent = await counter.commit_sent(org_id, 3, seed, reservation_id="mail-1")
+        second = await counter.reserve(org_id, "mail-2", 1, 6, seed)
+        await counter.release(org_id, "mail-2")
+        received = await counter.add_received(org_id, 4, seed)
+        await counter.flush(writer)
+        await counter.close()
+        return first, denied, sent, second, received
+
+    first, denied, sent, second, received = asyncio.run(scenario())
+
+    assert (first.allowed, first.used) == (True, 5)
+    assert (denied.allowed, denied.used) == (False, 5)
+    assert sent == 5
+    assert (second.allowed, second.used) == (True, 6)
+    assert received == 4
+    assert any(snapshot.org_id == org_id for snapshot in written)
+    usage = db.query(OrganizationUsage).filter(OrganizationUsage.org_id == org_id).one()
+    assert (usage.emails_sent_today, usage.emails_received_today) == (5, 4)
+
+
+def test_fallback_usage_is_kept_until_redis_recovers(memory_db, monkeypatch):
+    """Redis 장애 동안 DB 에 직접 더한 발송 수는 Redis 에 반영될 때까지 보관"""
+    counter = UsageCounter(redis_url="redis://127.0.0.1:1/0", timeout=0.05, retry_seconds=60)
+    monkeypatch.setattr("app.service.mail_service.usage_counter", counter)
+    org_id = _org(memory_db)
+    key = counter_key(org_id, datetime.now(timezone.utc).date())
+
+    async def scenario():
+        await MailService(memory_db)._update_organization_usage(org_id, 3)
+        # 재시도 대기가 끝났지만 Redis 가 여전히 응답하지 않음
+        counter._redis_disabled_until = 0.0
+        reservation = await counter.reserve(org_id, "mail-1", 1, 10, _no_usage)
+        await counter.close()
+        return reservation
+
+    assert asyncio.run(scenario()) is None
+    usage = memory_db.query(OrganizationUsage).filter(OrganizationUsage.org_id == org_id).one()
+    assert usage.emails_sent_today == 3
+    assert counter._fallback_deltas == {key: [3, 0]}
+
+
+@pytest.mark.skipif(not _redis_available(), reason="로컬 Redis 없음")
+def test_redis_recovery_merges_fallback_usage(memory_db):
+    """장애 동안 DB 에 더한 수가 복구 후 제한 검사와 기록에 반영"""
+    db = memory_db
+    org_id = _org(db)
+    counter = UsageCounter()
+
+    async def seed():
+        return 2, 0
+
+    async def writer(snapshots):
+        write_usage_snapshots(db, snapshots)
+
+    async def scenario():
+        await counter.reserve(org_id, "mail-1", 2, 10, seed)
+        await counter.commit_sent(org_id, 2, seed, reservation_id="mail-1")
+        await counter.flush(writer)
+        # 장애: 호출자가 organization_usage 에 직접 5 를 더함
+        counter._redis_disabled_until = float("inf")
+        write_usage_snapshots(db, [UsageSnapshot(org_id, datetime.now(timezone.utc).date(), sent=9, received=0)])
+        counter.record_fallback(org_id, "sent", 5)
+        # 복구
+        counter._redis_disabled_until = 0.0
+        denied = await counter.reserve(org_id, "mail-2", 2, 10, seed)
+        sent = await counter.commit_sent(org_id, 1, seed)
+        await counter.flush(writer)
+        await counter.close()
+        return denied, sent
+
+    denied, sent = asyncio.run(scenario())
+
+    assert (denied.allowed, denied.used) == (False, 9)
+    assert sent == 10
+    usage = db.query(OrganizationUsage).filter(OrganizationUsage.org_id == org_id).one()
+    assert (usage.emails_sent_today, usage.total_emails_sent) == (10, 10)
+
+
+class _RecordingCounter:
+    """호출을 기록하는 사용량 카운터 (send_mail 예약/확정/해제 순서 확인용)"""
+
+    def __init__(self, db):
+        self.db = db
+        self.calls = []
+
+    async def reserve(self, org_id, reservation_id, count, limit, seed):
+        self.calls.append(("reserve", reservation_id))
+        return QuotaReservation(allowed=True, used=count)
+
+    async def commit_sent(self, org_id, count, seed, reservation_id=None):
+        self.calls.append(("commit_sent", reservation_id, self.db.in_transaction()))
+        return count
+
+    async def add_received(self, org_id, count, seed):
+        self.calls.append(("add_received", count, self.db.in_transaction()))
+        return count
+
+    async def release(self, org_id, reservation_id):
+        self.calls.append(("release", reservation_id))
+
+    def record_fallback(self, org_id, field, count):
+        self.calls.append(("record_fallback", field, count))
+
+
+def _sender(db) -> tuple:
+    org_id = _org(db)
+    user = User(user_id=f"sender_{org_id[:8]}", user_uuid=str(uuid.uuid4()), org_id=org_id,
+                email="sender@example.org", username=f"sender_{org_id[:8]}", hashed_password="x")
+    db.add(user)
+    db.add(MailUser(user_id=user.user_id, user_uuid=user.user_uuid, org_id=org_id,
+                    email=user.email, password_hash="x"))
+    db.commit()
+    return org_id, user.user_uuid
+
+
+def test_failed_send_releases_reservation(memory_db, monkeypatch):
+    """SMTP 발송이 실패하면 예약을 해제하고 발송/수신 수는 더하지 않음"""
+    counter = _RecordingCounter(memory_db)
+    monkeypatch.setattr("app.service.mail_service.usage_counter", counter)
+    org_id, sender_uuid = _sender(memory_db)
+
+    async def failing_smtp(*args, **kwargs):
+        raise RuntimeError("SMTP 연결 실패")
+
+    service = MailService(memory_db)
+    monkeypatch.setattr(service, "_send_smtp_mail", failing_smtp)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.send_mail(org_id, sender_uuid, ["outside@example.net"], "제목", "본문"))
+
+    assert exc_info.value.status_code == 500
+    (_, reserved), *rest = counter.calls
+    assert rest == [("release", reserved)]
+
+
+def test_successful_send_counts_usage_after_commit(memory_db, monkeypatch):
+    """발송 수 확정과 수신 수 반영은 메일이 커밋된 뒤에 실행"""
+    counter = _RecordingCounter(memory_db)
+    monkeypatch.setattr("app.service.mail_service.usage_counter", counter)
+    org_id, sender_uuid = _sender(memory_db)
+
+    async def sent_smtp(*args, **kwargs):
+        return {"success": True}
+
+    service = MailService(memory_db)
+    monkeypatch.setattr(service, "_send_smtp_mail", sent_smtp)
+    result = asyncio.run(service.send_mail(
+        org_id, sender_uuid, ["outside@example.net"], "제목", "본문", save_to_sent=False
+    ))
+
+    assert result["success"]
+    assert counter.calls[0] == ("reserve", result["mail_uuid"])
+    assert ("commit_sent", result["mail_uuid"], False) in counter.calls
+    assert all(call[0] != "release" for call in counter.calls)
@@ -0,0 +1,123 @@
+"""
+일일 사용량 리셋 / 주간·월간 집계 테스트
+
+활성 조직의 오늘 사용량 행이 한 문장으로 생성되는지, 전날 사용량이 주간/월간 집계에
+한 번만 누적되고 누락된 날은 다음 실행에서 반영되는지 검증합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uuid
+from datetime import date
+
+from sqlalchemy import text
+
+from app.model import Organization, OrganizationUsage, OrganizationUsageRollup
+from app.schemas.monitoring_schema import UsageRequest
+from app.service.monitoring_service import MonitoringService
+from app.tasks.usage_reset import period_bounds, rollover_daily_usage
+
+
+def _org(db, is_active=True) -> str:
+    org_id = str(uuid.uuid4())
+    db.add(Organization(
+        org_id=org_id, org_code=f"org{org_id[:8]}", name="집계 테스트 조직",
+        subdomain=f"sub{org_id[:8]}", admin_email="admin@example.org", is_active=is_active
+    ))
+    db.commit()
+    return org_id
+
+
+def _usage(db, org_id, day, sent, received=0, users=0, storage=0):
+    # 애플리케이션과 같이 usage_date 를 날짜 값으로 기록
+    db.execute(text("""
+        INSERT INTO organization_usage (
+            org_id, usage_date, current_users, current_storage_gb,
+            emails_sent_today, emails_received_today, total_emails_sent, total_emails_received
+        ) VALUES (:org_id, :day, :users, :storage, :sent, :received, 0, 0)
+    """), {"org_id": org_id, "day": day, "users": users, "storage": storage, "sent": sent, "received": received})
+    db.commit()
+
+
+def _rollup(db, org_id, period_type):
+    return db.query(OrganizationUsageRollup).filter(
+        OrganizationUsageRollup.org_id == org_id,
+        OrganizationUsageRollup.period_type == period_type
+    ).order_by(OrganizationUsageRollup.period_start).all()
+
+
+def test_period_bounds():
+    """주는 월요일 시작, 월은 1일 ~ 말일"""
+    assert period_bounds("week", date(2025, 11, 9)) == (date(2025, 11, 3), date(2025, 11, 9))
+    assert period_bounds("month", date(2024, 2, 10)) == (date(2024, 2, 1), date(2024, 2, 29))
+
+
+def test_creates_today_rows_for_active_orgs_only(memory_db):
+    """활성 조직에만 오늘 행을 만들고, 다시 실행해도 중복 생성하지 않음"""
+    db = memory_db
+    active = _org(db)
+    _org(db, is_active=False)
+
+    assert rollover_daily_usage(db, date(2025, 11, 5))["created"] == 1
+    assert rollover_daily_usage(db, date(2025, 11, 5))["created"] == 0
+    assert [usage.org_id for usage in db.query(OrganizationUsage).all()] == [active]
+
+
+def test_rollup_is_cumulative_idempotent_and_catches_up(memory_db):
+    """전날 사용량을 한 번만 더하고, 실행이 빠진 날과 이전 주 마지막 날도 반영"""
+    db = memory_db
+    org_id = _org(db)
+    _usage(db, org_id, date(2025, 11, 2), sent=1)             # 이전 주 일요일
+    _usage(db, org_id, date(2025, 11, 3), sent=5, received=2, users=4, storage=3)
+    _usage(db, org_id, date(2025, 11, 4), sent=7, received=1, users=6, storage=2)
+
+    rollover_daily_usage(db, date(2025, 11, 4))
+    rollover_daily_usage(db, date(2025, 11, 4))
+    week = _rollup(db, org_id, "week")
+    assert [(w.period_start, w.emails_sent, w.days_counted) for w in week] == [
+        (date(2025, 10, 27), 1, 1), (date(2025, 11, 3), 5, 1)
+    ]
+
+    # 11월 5일 작업이 실행되지 않아도 6일 실행에서 4, 5일이 함께 반영
+    _usage(db, org_id, date(2025, 11, 5), sent=3, users=5, storage=1)
+    rollover_daily_usage(db, date(2025, 11, 6))
+    db.expire_all()
+    current = _rollup(db, org_id, "week")[-1]
+    assert (current.emails_sent, current.emails_received, current.days_counted) == (15, 3, 3)
+    assert (current.user_days, current.peak_storage_gb, current.rolled_through) == (15, 3, date(2025, 11, 5))
+
+    november = _rollup(db, org_id, "month")[-1]
+    assert (november.period_start, november.period_end, november.emails_sent) == (
+        date(2025, 11, 1), date(2025, 11, 30), 16
+    )
+
+    stats = MonitoringService(db).get_usage_statistics(
+        org_id, UsageRequest(start_date=date(2025, 11, 1), end_date=date(2025, 11, 30))
+    )
+    assert [(w.week_start, w.total_emails_sent) for w in stats.weekly_stats] == [
+        (date(2025, 10, 27), 1), (date(2025, 11, 3), 15)
+    ]
+    assert stats.weekly_stats[-1].avg_daily_active_users == 5.0
+    assert [(m.year, m.month, m.total_emails_sent) for m in stats.monthly_stats] == [(2025, 11, 16)]
+
+
+def test_rollup_picks_up_usage_raised_after_it_was_rolled_up(memory_db):
+    """집계된 날의 사용량이 나중에 올라가면(Redis 카운터 기록 등) 다음 실행에서 주간/월간 집계에 반영"""
+    db = memory_db
+    org_id = _org(db)
+    _usage(db, org_id, date(2025, 11, 3), sent=5)
+    rollover_daily_usage(db, date(2025, 11, 4))
+
+    db.execute(text("""
+        UPDATE organization_usage SET emails_sent_today = 8, emails_received_today = 2
+        WHERE org_id = :org_id AND usage_date = :day
+    """), {"org_id": org_id, "day": date(2025, 11, 3)})
+    db.commit()
+    rollover_daily_usage(db, date(2025, 11, 5))
+    db.expire_all()
+
+    week = _rollup(db, org_id, "week")[-1]
+    assert (week.emails_sent, week.emails_received, week.days_counted) == (8, 2, 2)
+    assert _rollup(db, org_id, "month")[-1].emails_sent == 8
+
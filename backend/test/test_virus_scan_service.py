@@ -0,0 +1,143 @@
+"""
+바이러스 검사 서비스 테스트
+
+한 번 읽기(해시 + 휴리스틱), 해시 기준 검사 결과 캐시, 병렬 일괄 검사와
+지연 시간 히스토그램을 검증합니다. (clamd 에 연결할 수 없어 휴리스틱 엔진 사용)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import hashlib
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.service.virus_scan_service import (
+    HEURISTIC_SIGNATURE, ScanVerdictCache, VirusScanService
+)
+from app.utils.clamd_pool import ClamdPoolManager
+from app.utils.latency_histogram import LatencyHistogram, get_histogram_stats
+
+EICAR = b"X5O!P%@AP[4\\PZX54(P^)7CC)7$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+
+
+@pytest.fixture
+def scanner():
+    # 사용하지 않는 포트로 Redis/clamd 를 지정하여 워커별 캐시와 휴리스틱 검사만 사용
+    cache = ScanVerdictCache(name=f"test-verdict-{uuid.uuid4().hex}", redis_url="redis://127.0.0.1:1/0")
+    return VirusScanService(
+        max_workers=4,
+        verdict_cache=cache,
+        clamd_pools=ClamdPoolManager(host="127.0.0.1", port=1, timeout=1)
+    )
+
+
+def _write(tmp_path, data: bytes) -> str:
+    path = tmp_path / f"{uuid.uuid4().hex}.bin"
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestHeuristicScan:
+    """휴리스틱 검사 테스트"""
+
+    def test_detects_pattern_across_chunk_boundary(self, scanner, tmp_path, monkeypatch):
+        """청크 경계에 걸친 EICAR 패턴 탐지 및 같은 읽기에서 해시 계산"""
+        monkeypatch.setattr(settings, "ATTACHMENT_UPLOAD_CHUNK_SIZE", 16)
+        data = b"a" * 10 + EICAR + b"b" * 50
+        result = scanner.scan_file(_write(tmp_path, data))
+
+        assert result.is_infected and result.virus_name == "EICAR-Test-File"
+        assert result.file_hash == hashlib.sha256(data).hexdigest()
+
+    def test_clean_file(self, scanner, tmp_path):
+        """패턴이 없으면 안전"""
+        data = b"hello" * 1000
+        result = scanner.scan_file(_write(tmp_path, data))
+
+        assert result.status == "clean" and result.engine == "heuristic"
+        assert result.file_hash == hashlib.sha256(data).hexdigest()
+
+
+class TestVerdictCache:
+    """검사 결과 캐시 테스트"""
+
+    def test_known_hash_hits_cache_without_scanning(self, scanner, tmp_path, monkeypatch):
+        """해시를 알고 있으면 캐시 적중 시 파일을 다시 검사하지 않음"""
+        data = EICAR
+        sha256 = hashlib.sha256(data).hexdigest()
+        first = scanner.scan_file(_write(tmp_path, data), sha256)
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("캐시 적중 시 검사하면 안 됨")
+
+        monkeypatch.setattr(scanner, "_scan_uncached", fail)
+        second = asyncio.run(scanner.scan_file_async(_write(tmp_path, data), sha256))
+
+        assert first.is_infected and second.is_infected
+        assert second.virus_name == "EICAR-Test-File" and second.file_hash == sha256
+        stats = scanner.verdict_cache.stats()
+        assert (stats["lookups"], stats["local_hits"]) == (2, 1)
+        assert scanner.verdict_cache.local.get((HEURISTIC_SIGNATURE, sha256))["is_infected"] is True
+
+    def test_errors_are_not_cached(self, scanner, tmp_path):
+        """없는 파일 결과는 캐시하지 않음"""
+        result = scanner.scan_file(str(tmp_path / "missing.bin"), "0" * 64)
+
+        assert result.status == "error"
+        assert len(scanner.verdict_cache.local) == 0
+
+
+class TestBatchScan:
+    """일괄 검사 테스트"""
+
+    def test_scan_files_keeps_order_and_scans_each_hash_once(self, scanner, tmp_path, monkeypatch):
+        """입력 순서대로 결과를 반환하고 같은 해시는 한 번만 검사"""
+        clean, infected = b"report" * 100, EICAR
+        files = [
+            (_write(tmp_path, clean), hashlib.sha256(clean).hexdigest()),
+            (_write(tmp_path, infected), hashlib.sha256(infected).hexdigest()),
+            (_write(tmp_path, clean), hashlib.sha256(clean).hexdigest()),
+            (_write(tmp_path, infected + b"!"), None),
+        ]
+        scanned = []
+        original = scanner._scan_uncached
+
+        async def counting(file_path, file_hash):
+            scanned.append(file_path)
+            return await original(file_path, file_hash)
+
+        monkeypatch.setattr(scanner, "_scan_uncached", counting)
+        results = asyncio.run(scanner.scan_files(files))
+
+        assert [r.file_path for r in results] == [path for path, _ in files]
+        assert [r.is_infected for r in results] == [False, True, False, True]
+        assert len(scanned) == 3
+        assert results[2].file_hash == files[0][1]
+
+    def test_scan_multiple_files_in_pool(self, scanner, tmp_path):
+        """동기 일괄 검사도 입력 순서 유지"""
+        paths = [_write(tmp_path, EICAR if i % 2 else b"safe") for i in range(6)]
+        results = scanner.scan_multiple_files(paths)
+
+        assert [r.file_path for r in results] == paths
+        assert [r.is_infected for r in results] == [bool(i % 2) for i in range(6)]
+
+
+class TestLatencyHistogram:
+    """지연 시간 히스토그램 테스트"""
+
+    def test_cumulative_buckets_and_quantiles(self):
+        """누적 버킷 카운트와 근사 분위수"""
+        histogram = LatencyHistogram(f"test-{uuid.uuid4().hex}", buckets=[0.01, 0.1, 1.0])
+        for seconds in (0.005, 0.05, 0.05, 0.5, 5.0):
+            histogram.observe(seconds)
+
+        stats = histogram.stats()
+        assert stats["count"] == 5
+        assert stats["buckets"] == {"0.01": 1, "0.1": 3, "1.0": 4, "+Inf": 5}
+        assert stats["p50"] == 0.1
+        assert histogram.name in get_histogram_stats()